@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""Benchmark: server cold start.
+
+Spawns ``python -m gitlab_mr_mcp`` and times how long it takes to answer the
+MCP ``initialize`` request, then reports the ``-X importtime`` totals of
+importing the server and of the tool modules it defers to the first call.
+
+Usage: python benchmarks/bench_cold_start.py [--runs 5] [--max-ms 0]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+INITIALIZE = json.dumps(
+    {
+        "jsonrpc": "2.0",
+        "id": 1,
+        "method": "initialize",
+        "params": {
+            "protocolVersion": "2024-11-05",
+            "capabilities": {},
+            "clientInfo": {"name": "bench", "version": "1"},
+        },
+    }
+)
+
+ENV = {
+    **os.environ,
+    "GITLAB_URL": "https://gitlab.example.com",
+    "GITLAB_ACCESS_TOKEN": "bench-token",
+    "GITLAB_PROJECT_ID": "1",
+}
+
+
+def time_to_initialize():
+    """Seconds from spawning the server to reading its initialize response"""
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "gitlab_mr_mcp"],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        env=ENV,
+        text=True,
+    )
+    process.stdin.write(INITIALIZE + "\n")
+    process.stdin.flush()
+    response = json.loads(process.stdout.readline())
+    elapsed = time.perf_counter() - started
+    process.stdin.close()
+    process.wait(timeout=10)
+    assert "result" in response, response
+    return elapsed
+
+
+def import_times(statement):
+    """Cumulative import time in seconds by module name, from ``-X importtime``"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement], capture_output=True, text=True, env=ENV, check=True
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        times[name.strip()] = int(cumulative_us) / 1e6
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--max-ms", type=float, default=0, help="Exit with status 1 if the median exceeds this")
+    options = parser.parse_args()
+
+    timings = [time_to_initialize() for _ in range(options.runs)]
+    median = statistics.median(timings)
+    print(f"initialize response: median {median * 1000:.0f} ms, min {min(timings) * 1000:.0f} ms ({options.runs} runs)")
+
+    startup = import_times("import gitlab_mr_mcp.server")
+    print(f"import gitlab_mr_mcp.server: {startup['gitlab_mr_mcp.server'] * 1000:.0f} ms")
+    print(f"  of which mcp: {startup.get('mcp', 0) * 1000:.0f} ms")
+    deferred = import_times("import gitlab_mr_mcp.server; import gitlab_mr_mcp.tools")
+    print(f"deferred to the first tool call: gitlab_mr_mcp.tools {deferred['gitlab_mr_mcp.tools'] * 1000:.0f} ms")
+
+    if options.max_ms and median * 1000 > options.max_ms:
+        print(f"median initialize time exceeds {options.max_ms:.0f} ms")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
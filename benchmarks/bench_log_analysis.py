@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""Throughput benchmark: failure-signature scan of a large job trace.
+
+Builds a synthetic trace (200 MB by default) of parallel test-runner output
+with a repeated error every few thousand lines, and measures the time and
+peak traced memory of one ``log_analysis.analyze_trace_stream`` pass.
+
+Usage: python benchmarks/bench_log_analysis.py [--megabytes 200] [--error-every 5000]
+"""
+
+import argparse
+import asyncio
+import time
+import tracemalloc
+
+from gitlab_mr_mcp.log_analysis import analyze_trace_stream
+
+CHUNK_SIZE = 64 * 1024
+
+
+def build_block(error_every):
+    """Build one block of trace lines ending with an error, as raw bytes"""
+    lines = [
+        f"[gw{index % 16}] tests/test_module{index % 40}.py::test_case_{index} PASSED [{index % 100:3d}%]"
+        for index in range(error_every - 1)
+    ]
+    lines.append("[gw3] ERROR tests/test_db.py::test_connect - ConnectionRefusedError: [Errno 111]")
+    return ("\n".join(lines) + "\n").encode()
+
+
+async def iter_chunks(block, total_bytes):
+    data = block * max(CHUNK_SIZE // len(block), 1)
+    sent = 0
+    while sent < total_bytes:
+        for start in range(0, len(data), CHUNK_SIZE):
+            yield data[start : start + CHUNK_SIZE]
+        sent += len(data)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--megabytes", type=int, default=200)
+    parser.add_argument("--error-every", type=int, default=5000, help="one error line every N lines")
+    options = parser.parse_args()
+
+    block = build_block(options.error_every)
+    total_bytes = options.megabytes * 1024 * 1024
+
+    tracemalloc.start()
+    started = time.perf_counter()
+    analysis = asyncio.run(analyze_trace_stream(iter_chunks(block, total_bytes), tail_bytes=15000))
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    size_mb = analysis["byte_count"] / 1e6
+    hits = sum(signature["count"] for window in analysis["windows"] for signature in window["signatures"])
+    print(f"Trace: {size_mb:.0f} MB, {analysis['line_count']:,} lines, {hits:,} error lines")
+    print(f"Scan: {elapsed:.2f}s ({size_mb / elapsed:.0f} MB/s, traced), peak {peak / 1e6:.2f} MB")
+    print(f"Signatures kept: {analysis['signature_count']}")
+
+
+if __name__ == "__main__":
+    main()
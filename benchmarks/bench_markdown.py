@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""Benchmark: building large tool output with MarkdownBuilder vs string concatenation.
+
+Renders get_merge_request_reviews for a merge request with 5k discussion
+threads, in full and compact form, and get_merge_request_test_report for a
+report with 10k failures (API calls patched with synthetic data), then appends the same output parts to a
+string with ``+=`` while another reference to it is held, which defeats
+CPython's in-place resize, and with MarkdownBuilder.
+
+Usage: python benchmarks/bench_markdown.py [--threads 5000] [--failures 10000]
+"""
+
+import argparse
+import asyncio
+import importlib
+import os
+import time
+from unittest.mock import patch
+
+from gitlab_mr_mcp.markdown import MarkdownBuilder
+
+# The tools package re-exports the functions under the module names
+reviews_module = importlib.import_module("gitlab_mr_mcp.tools.get_merge_request_reviews")
+report_module = importlib.import_module("gitlab_mr_mcp.tools.get_merge_request_test_report")
+
+
+def build_discussions(threads):
+    return [
+        {
+            "id": f"d{i:06x}",
+            "resolved": i % 3 == 0,
+            "notes": [
+                {
+                    "id": i * 10 + n,
+                    "author": {"name": f"Reviewer {n}", "username": f"reviewer{n}"},
+                    "created_at": "2024-05-01T12:00:00Z",
+                    "body": f"Please rename this variable (note {n} on thread {i}).",
+                    "position": {"new_path": f"src/module_{i % 50}.py", "new_line": i % 400},
+                }
+                for n in range(3)
+            ],
+        }
+        for i in range(threads)
+    ]
+
+
+def build_report(failures):
+    return {
+        "total_time": 300.0,
+        "total_count": failures * 2,
+        "success_count": failures,
+        "failed_count": failures,
+        "skipped_count": 0,
+        "error_count": 0,
+        "test_suites": [
+            {
+                "name": f"suite-{s}",
+                "total_count": 200,
+                "success_count": 100,
+                "failed_count": 100,
+                "error_count": 0,
+                "test_cases": [
+                    {
+                        "status": "failed",
+                        "name": f"test_case_{s}_{i}",
+                        "classname": f"pkg.module{s}.TestClass",
+                        "file": f"tests/test_module{s}.py",
+                        "execution_time": 0.012,
+                        "system_output": "Traceback (most recent call last):\n  ...\nAssertionError: 1 != 2",
+                    }
+                    for i in range(100)
+                ],
+            }
+            for s in range(failures // 100)
+        ],
+    }
+
+
+def timed(func):
+    started = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - started
+
+
+def render_reviews(discussions, compact=False):
+    async def fake_reviews(*_args):
+        return {"discussions": (200, discussions, ""), "approvals": (200, {}, "")}
+
+    async def unavailable(*_args):
+        return (404, None, "")
+
+    with (
+        patch.object(reviews_module, "api_get_merge_request_reviews", fake_reviews),
+        patch.object(reviews_module, "get_merge_request_details", unavailable),
+        patch.object(reviews_module, "get_merge_request_pipeline", unavailable),
+        patch.object(reviews_module, "get_merge_request_changes", unavailable),
+    ):
+        args = {"merge_request_iid": 1, "limit": len(discussions), "compact": compact}
+        return asyncio.run(reviews_module.get_merge_request_reviews("https://gitlab.example.com", 1, "t", args))
+
+
+def render_report(report):
+    async def fake_pipeline(*_args):
+        return (200, {"id": 1}, "")
+
+    async def fake_report(*_args):
+        return (200, report, "")
+
+    with (
+        patch.object(report_module, "get_merge_request_pipeline", fake_pipeline),
+        patch.object(report_module, "get_pipeline_test_report", fake_report),
+    ):
+        args = {"merge_request_iid": 1}
+        return asyncio.run(report_module.get_merge_request_test_report("https://gitlab.example.com", 1, "t", args))
+
+
+def concatenate(parts):
+    result = ""
+    held = []
+    for part in parts:
+        result += part
+        # Another live reference forces a copy on the next append
+        held[:] = [result]
+    return result
+
+
+def build(parts):
+    result = MarkdownBuilder()
+    for part in parts:
+        result += part
+    return result.build()
+
+
+def compare(name, text):
+    parts = text.splitlines(keepends=True)
+    _, concat_time = timed(lambda: concatenate(parts))
+    _, builder_time = timed(lambda: build(parts))
+    print(
+        f"{name}: {len(parts):,} parts, {len(text) / 1e6:.1f} MB | "
+        f"+= {concat_time:6.3f}s  builder {builder_time:6.3f}s  ({concat_time / builder_time:.0f}x)"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--threads", type=int, default=5000)
+    parser.add_argument("--failures", type=int, default=10000)
+    options = parser.parse_args()
+    # Render the full reports: the output budget would cut them short
+    os.environ["GITLAB_OUTPUT_TOKEN_BUDGET"] = "0"
+
+    reviews, reviews_time = timed(lambda: render_reviews(build_discussions(options.threads)))
+    print(f"get_merge_request_reviews, {options.threads:,} threads: {reviews_time:.2f}s")
+    compact, compact_time = timed(lambda: render_reviews(build_discussions(options.threads), compact=True))
+    print(
+        f"get_merge_request_reviews compact: {compact_time:.2f}s, "
+        f"{len(compact[0].text) / 1e6:.1f} MB vs {len(reviews[0].text) / 1e6:.1f} MB"
+    )
+    report, report_time = timed(lambda: render_report(build_report(options.failures)))
+    print(f"get_merge_request_test_report, {options.failures:,} failures: {report_time:.2f}s")
+
+    compare("reviews output", reviews[0].text)
+    compare("test report output", report[0].text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""Memory benchmark: streaming test report parser vs json.loads.
+
+Builds a synthetic pipeline test report (120k test cases by default, 1% failing)
+and compares the peak traced memory and wall time of parsing it with
+``json.loads`` against ``report_parser.parse_test_report_stream``.
+
+Usage: python benchmarks/bench_test_report.py [--suites 40] [--cases 3000] [--fail-every 100]
+"""
+
+import argparse
+import asyncio
+import json
+import time
+import tracemalloc
+
+from gitlab_mr_mcp.report_parser import parse_test_report_stream
+
+CHUNK_SIZE = 64 * 1024
+
+
+def build_report(suites, cases_per_suite, fail_every):
+    """Build a synthetic test report as raw JSON bytes"""
+    test_suites = []
+    for s in range(suites):
+        failed = cases_per_suite // fail_every
+        test_cases = [
+            {
+                "status": "failed" if i % fail_every == 0 else "success",
+                "name": f"test_case_{s}_{i}",
+                "classname": f"pkg.module{s}.TestClass",
+                "file": f"tests/test_module{s}.py",
+                "execution_time": 0.012,
+                "system_output": "Traceback (most recent call last):\nAssertionError" if i % fail_every == 0 else None,
+                "stack_trace": None,
+                "recent_failures": None,
+            }
+            for i in range(cases_per_suite)
+        ]
+        test_suites.append(
+            {
+                "name": f"suite-{s}",
+                "total_time": 12.5,
+                "total_count": cases_per_suite,
+                "success_count": cases_per_suite - failed,
+                "failed_count": failed,
+                "skipped_count": 0,
+                "error_count": 0,
+                "suite_error": None,
+                "test_cases": test_cases,
+            }
+        )
+    report = {
+        "total_time": 12.5 * suites,
+        "total_count": suites * cases_per_suite,
+        "success_count": sum(suite["success_count"] for suite in test_suites),
+        "failed_count": sum(suite["failed_count"] for suite in test_suites),
+        "skipped_count": 0,
+        "error_count": 0,
+        "test_suites": test_suites,
+    }
+    return json.dumps(report).encode()
+
+
+async def iter_chunks(data):
+    for start in range(0, len(data), CHUNK_SIZE):
+        yield data[start : start + CHUNK_SIZE]
+
+
+def measure(func):
+    """Return (result, peak traced bytes, seconds) for func()"""
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, peak, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--suites", type=int, default=40)
+    parser.add_argument("--cases", type=int, default=3000, help="test cases per suite")
+    parser.add_argument("--fail-every", type=int, default=100, help="one failing case every N cases")
+    options = parser.parse_args()
+
+    data = build_report(options.suites, options.cases, options.fail_every)
+    print(f"Report: {options.suites * options.cases:,} test cases, {len(data) / 1e6:.1f} MB of JSON")
+
+    _, json_peak, json_time = measure(lambda: json.loads(data))
+    report, stream_peak, stream_time = measure(lambda: asyncio.run(parse_test_report_stream(iter_chunks(data))))
+    kept = sum(len(suite["test_cases"]) for suite in report["test_suites"])
+
+    print(f"json.loads:       peak {json_peak / 1e6:8.2f} MB  {json_time:6.2f}s (traced)")
+    print(f"streaming parser: peak {stream_peak / 1e6:8.2f} MB  {stream_time:6.2f}s (traced), {kept:,} cases kept")
+    print(f"Peak memory reduction: {json_peak / stream_peak:.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,27 +1,113 @@
 #!/usr/bin/env python3
 """Configuration management for GitLab MCP Server."""
 
+import json
 import os
 
 
 def get_gitlab_config():
     """Get GitLab configuration from environment variables."""
-    gitlab_url = os.environ.get("GITLAB_URL", "https://gitlab.com")
+    gitlab_url = os.environ.get("GITLAB_URL", "https://gitlab.com").rstrip("/")
     project_id = os.environ.get("GITLAB_PROJECT_ID")
     access_token = os.environ.get("GITLAB_ACCESS_TOKEN")
 
     if not access_token:
         raise ValueError("GITLAB_ACCESS_TOKEN environment variable is required")
 
+    default_instance = {
+        "name": os.environ.get("GITLAB_INSTANCE_NAME", "default"),
+        "gitlab_url": gitlab_url,
+        "access_token": access_token,
+        "project_id": project_id,
+        "path_prefixes": [],
+        "max_connections": None,
+    }
+
     return {
         "gitlab_url": gitlab_url,
         "project_id": project_id,
         "access_token": access_token,
+        # The first instance is the default one
+        "instances": [default_instance] + get_extra_instances(default_instance["name"]),
         "server_name": os.environ.get("SERVER_NAME", "gitlab-mcp-server"),
         "server_version": os.environ.get("SERVER_VERSION", "1.0.0"),
     }
 
 
+def get_extra_instances(default_name):
+    """Get additional GitLab instances from GITLAB_INSTANCES, a JSON object of instances by name.
+
+    Each instance has a ``url`` and an ``access_token``, or ``access_token_env``
+    naming the variable that holds it, and optionally a default ``project_id``,
+    ``path_prefixes`` of the projects routed to it and ``max_connections``.
+    """
+    value = os.environ.get("GITLAB_INSTANCES", "").strip()
+    if not value:
+        return []
+    try:
+        definitions = json.loads(value)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"GITLAB_INSTANCES is not valid JSON: {e}")
+    if not isinstance(definitions, dict):
+        raise ValueError("GITLAB_INSTANCES must be a JSON object of instances by name")
+
+    instances = []
+    for name, definition in definitions.items():
+        if name == default_name:
+            raise ValueError(f"GITLAB_INSTANCES: {name!r} is the name of the default instance")
+        if not isinstance(definition, dict) or not definition.get("url"):
+            raise ValueError(f"GITLAB_INSTANCES: instance {name!r} needs a url")
+        access_token = definition.get("access_token")
+        if definition.get("access_token_env"):
+            access_token = os.environ.get(definition["access_token_env"])
+        if not access_token:
+            raise ValueError(f"GITLAB_INSTANCES: instance {name!r} needs an access_token or access_token_env")
+        instances.append(
+            {
+                "name": name,
+                "gitlab_url": definition["url"].rstrip("/"),
+                "access_token": access_token,
+                "project_id": definition.get("project_id"),
+                "path_prefixes": list(definition.get("path_prefixes") or []),
+                "max_connections": definition.get("max_connections"),
+            }
+        )
+    return instances
+
+
+TRANSPORTS = ("stdio", "http")
+
+
+def _positive_number(name, default, cast=int):
+    value = os.environ.get(name)
+    if not value:
+        return default
+    try:
+        number = cast(value)
+    except ValueError:
+        raise ValueError(f"{name} must be a number, got {value!r}")
+    if number <= 0:
+        raise ValueError(f"{name} must be positive, got {value!r}")
+    return number
+
+
+def get_transport_config():
+    """Get the MCP transport configuration from environment variables."""
+    transport = os.environ.get("GITLAB_MCP_TRANSPORT", "stdio").strip().lower()
+    if transport not in TRANSPORTS:
+        raise ValueError(f"GITLAB_MCP_TRANSPORT must be one of {', '.join(TRANSPORTS)}, got {transport!r}")
+
+    return {
+        "transport": transport,
+        "host": os.environ.get("GITLAB_MCP_HOST", "127.0.0.1"),
+        "port": _positive_number("GITLAB_MCP_PORT", 8000),
+        "path": os.environ.get("GITLAB_MCP_PATH", "/mcp"),
+        # Each session holds its own server state; past the limit new sessions are refused with 503
+        "max_sessions": _positive_number("GITLAB_MCP_MAX_SESSIONS", 100),
+        "session_idle_timeout": _positive_number("GITLAB_MCP_SESSION_IDLE_TIMEOUT", 1800, cast=float),
+    }
+
+
 def get_headers(access_token):
     """Get HTTP headers for GitLab API requests."""
     return {"Private-Token": access_token, "Content-Type": "application/json"}
@@ -1,42 +1,177 @@
+import asyncio
 import contextlib
+import contextvars
+import copy
 import os
+import re
+from urllib.parse import quote, unquote
 
 import aiohttp
 
+from gitlab_mr_mcp.cache import TTLCache
+from gitlab_mr_mcp.governor import GovernedSession, request_governor
+from gitlab_mr_mcp.log_analysis import analyze_trace_stream, grep_trace_stream
+from gitlab_mr_mcp.log_stream import LogStream, SectionIndex, decode_slice, incomplete_char_length
+from gitlab_mr_mcp.report_parser import parse_test_report_stream
+from gitlab_mr_mcp.trace_store import TraceStore, iter_view
 
-def _get_connector():
+# Size of the chunks read from streamed responses
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# "bytes 0-99/1000", "bytes */1000" or "bytes 0-99/*"
+_CONTENT_RANGE_RE = re.compile(r"bytes (?:(\d+)-(\d+)|\*)/(\d+|\*)")
+
+# Job statuses after which a job no longer changes (unless retried or, for manual jobs, started)
+FINISHED_JOB_STATUSES = ("success", "failed", "canceled", "skipped", "manual")
+
+# Job graphs of finished pipelines; the TTL bounds staleness if a job is retried
+_job_graph_cache = TTLCache(max_entries=64, ttl=600)
+
+# Section indexes of job traces whose sections have all ended
+_section_index_cache = TTLCache(max_entries=256, ttl=3600)
+
+# Traces of finished jobs, kept on disk and read through mmap
+trace_store = TraceStore.from_env()
+
+# Sessions opened by shared_session() by GitLab URL, reused by every API call to that instance made within it
+_shared_sessions = contextvars.ContextVar("gitlab_shared_sessions", default=None)
+
+# Sessions opened by pooled_sessions(), one per GitLab instance, reused by API calls from any task while open
+_pooled_sessions = None
+
+# Connection limits of the pooled sessions by GitLab URL
+_pool_limits = {}
+
+
+def _get_connector(limit=None):
     socks_proxy = os.environ.get("SOCKS_PROXY")
     if socks_proxy:
         from aiohttp_socks import ProxyConnector
 
-        return ProxyConnector.from_url(socks_proxy)
+        return ProxyConnector.from_url(socks_proxy, **({"limit": limit} if limit else {}))
+    if limit:
+        return aiohttp.TCPConnector(limit=limit)
     return None
 
 
+def _pooled_session(gitlab_url):
+    session = _pooled_sessions.get(gitlab_url)
+    if session is None:
+        session = aiohttp.ClientSession(connector=_get_connector(_pool_limits.get(gitlab_url)))
+        session = _pooled_sessions[gitlab_url] = GovernedSession(session, request_governor, gitlab_url)
+    return session
+
+
 @contextlib.asynccontextmanager
-async def get_session():
+async def get_session(gitlab_url=None):
+    session = (_shared_sessions.get() or {}).get(gitlab_url)
+    if session is None and _pooled_sessions is not None and gitlab_url:
+        session = _pooled_session(gitlab_url)
+    if session is not None:
+        yield session
+        return
     connector = _get_connector()
     async with aiohttp.ClientSession(connector=connector) as session:
-        yield session
+        yield GovernedSession(session, request_governor, gitlab_url)
+
+
+@contextlib.asynccontextmanager
+async def shared_session(gitlab_url=None):
+    """Reuse a single session, and its connection pool, for all API calls to gitlab_url made inside the block"""
+    shared = _shared_sessions.get() or {}
+    if gitlab_url in shared:
+        yield shared[gitlab_url]
+        return
+    async with get_session(gitlab_url) as session:
+        token = _shared_sessions.set({**shared, gitlab_url: session})
+        try:
+            yield session
+        finally:
+            _shared_sessions.reset(token)
+
+
+@contextlib.asynccontextmanager
+async def pooled_sessions(instances=()):
+    """Keep one session per GitLab instance open for all API calls until the block exits.
+
+    Used by long-running servers, where the calls of every client reuse the same
+    connections. An instance's session opens at most its ``max_connections``.
+    """
+    global _pooled_sessions, _pool_limits
+    _pooled_sessions = {}
+    _pool_limits = {instance["gitlab_url"]: instance["max_connections"] for instance in instances}
+    try:
+        yield
+    finally:
+        sessions, _pooled_sessions = _pooled_sessions, None
+        for session in sessions.values():
+            await session.close()
+
+
+def _project_path(project_id):
+    """Project ID for API URLs: paths like 'group/project' are URL-encoded, as GitLab requires"""
+    return quote(unquote(str(project_id)), safe="")
 
 
 def _headers(access_token):
     return {"Private-Token": access_token, "Content-Type": "application/json"}
 
 
+async def _get_all_pages(session, url, headers, params=None, per_page=100):
+    """Fetch every page of a list endpoint.
+
+    The first page is requested on its own; when GitLab reports ``X-Total-Pages``
+    the remaining pages are requested concurrently. GitLab omits that header for
+    very large collections, in which case pages are followed one by one.
+    """
+    base_params = dict(params or {}, per_page=per_page)
+
+    async def fetch_page(page):
+        async with session.get(url, headers=headers, params={**base_params, "page": page}) as response:
+            if response.status != 200:
+                # Error pages are not always JSON (proxies answer with HTML)
+                return response.status, None, await response.text(), response.headers
+            return response.status, await response.json(), None, response.headers
+
+    status, first_page, error, response_headers = await fetch_page(1)
+    if status != 200:
+        return (status, first_page, error)
+
+    all_items = list(first_page or [])
+    total_pages = response_headers.get("X-Total-Pages")
+
+    if total_pages and total_pages.isdigit():
+        pages = await asyncio.gather(*(fetch_page(page) for page in range(2, int(total_pages) + 1)))
+        for status, page_data, error, _ in pages:
+            if status != 200:
+                return (status, page_data, error)
+            all_items.extend(page_data or [])
+        return (200, all_items, "Success")
+
+    page, page_data = 1, first_page
+    while page_data and 'rel="next"' in response_headers.get("Link", ""):
+        page += 1
+        status, page_data, error, response_headers = await fetch_page(page)
+        if status != 200:
+            return (status, page_data, error)
+        all_items.extend(page_data or [])
+
+    return (200, all_items, "Success")
+
+
 async def get_merge_requests(gitlab_url, project_id, access_token, params):
-    url = f"{gitlab_url}/api/v4/projects/{project_id}/merge_requests"
+    url = f"{gitlab_url}/api/v4/projects/{_project_path(project_id)}/merge_requests"
     headers = _headers(access_token)
-    async with get_session() as session:
+    async with get_session(gitlab_url) as session:
         async with session.get(url, headers=headers, params=params) as response:
             return (response.status, await response.json(), await response.text())
 
 
 async def get_merge_request_pipeline(gitlab_url, project_id, access_token, mr_iid):
     """Get the latest pipeline for a merge request"""
-    url = f"{gitlab_url}/api/v4/projects/{project_id}/" f"merge_requests/{mr_iid}/pipelines"
+    url = f"{gitlab_url}/api/v4/projects/{_project_path(project_id)}/" f"merge_requests/{mr_iid}/pipelines"
     headers = _headers(access_token)
-    async with get_session() as session:
+    async with get_session(gitlab_url) as session:
         params = {"per_page": 1}
         async with session.get(url, headers=headers, params=params) as response:
             data = await response.json()
@@ -44,96 +179,398 @@ async def get_merge_request_pipeline(gitlab_url, project_id, access_token, mr_ii
 
 
 async def get_pipeline_jobs(gitlab_url, project_id, access_token, pipeline_id):
-    """Get all jobs for a specific pipeline"""
-    url = f"{gitlab_url}/api/v4/projects/{project_id}/" f"pipelines/{pipeline_id}/jobs"
+    """Get all jobs for a specific pipeline (handles pagination)"""
+    url = f"{gitlab_url}/api/v4/projects/{_project_path(project_id)}/" f"pipelines/{pipeline_id}/jobs"
     headers = _headers(access_token)
-    async with get_session() as session:
-        params = {"per_page": 100}
-        async with session.get(url, headers=headers, params=params) as response:
+    async with get_session(gitlab_url) as session:
+        return await _get_all_pages(session, url, headers)
+
+
+async def get_pipeline_bridges(gitlab_url, project_id, access_token, pipeline_id):
+    """Get all bridge (trigger) jobs for a specific pipeline (handles pagination)"""
+    url = f"{gitlab_url}/api/v4/projects/{_project_path(project_id)}/" f"pipelines/{pipeline_id}/bridges"
+    headers = _headers(access_token)
+    async with get_session(gitlab_url) as session:
+        return await _get_all_pages(session, url, headers)
+
+
+async def get_pipeline_job_graph(gitlab_url, project_id, access_token, pipeline_id, max_depth=2):
+    """Get jobs of a pipeline and of its downstream (child/multi-project) pipelines.
+
+    Jobs and bridges of each pipeline are fetched concurrently, and downstream
+    pipelines triggered by bridges are followed concurrently up to ``max_depth``
+    levels. Returns ``(status, graph, text)`` where ``graph["pipelines"]`` lists
+    each pipeline with its ``jobs`` and ``bridges``, the requested one first.
+    Graphs in which every job has finished are cached; callers get their own
+    copy, so changing it does not alter the cache.
+    """
+    cache_key = (gitlab_url, str(project_id), pipeline_id, max_depth)
+    graph = _job_graph_cache.get(cache_key)
+    if graph is not None:
+        return (200, copy.deepcopy(graph), "Success (cached)")
+
+    async def collect(pipeline_project_id, current_pipeline_id, depth, triggered_by, status):
+        entry = {
+            "id": current_pipeline_id,
+            "project_id": pipeline_project_id,
+            "status": status,
+            "depth": depth,
+            "triggered_by": triggered_by,
+            "jobs": [],
+            "bridges": [],
+        }
+        jobs_result, bridges_result = await asyncio.gather(
+            get_pipeline_jobs(gitlab_url, pipeline_project_id, access_token, current_pipeline_id),
+            get_pipeline_bridges(gitlab_url, pipeline_project_id, access_token, current_pipeline_id),
+        )
+        jobs_status, jobs, jobs_error = jobs_result
+        if jobs_status != 200:
+            entry["error"] = jobs_result
+            return [entry]
+        entry["jobs"] = jobs
+        # Bridges are optional: older GitLab versions or restricted tokens may not expose them
+        bridges_status, bridges, _bridges_error = bridges_result
+        entry["bridges"] = bridges if bridges_status == 200 else []
+
+        if depth >= max_depth:
+            return [entry]
+        # Downstream pipelines are fetched concurrently but listed depth-first, each after its parent
+        children = await asyncio.gather(
+            *(
+                collect(
+                    bridge["downstream_pipeline"].get("project_id", pipeline_project_id),
+                    bridge["downstream_pipeline"]["id"],
+                    depth + 1,
+                    bridge.get("name"),
+                    bridge["downstream_pipeline"].get("status"),
+                )
+                for bridge in entry["bridges"]
+                if (bridge.get("downstream_pipeline") or {}).get("id")
+            )
+        )
+        return [entry] + [pipeline for child in children for pipeline in child]
+
+    pipelines = await collect(project_id, pipeline_id, 0, None, None)
+    if "error" in pipelines[0]:
+        return pipelines[0]["error"]
+
+    graph = {"pipelines": pipelines}
+    if _job_graph_finished(graph):
+        _job_graph_cache.set(cache_key, copy.deepcopy(graph))
+    return (200, graph, "Success")
+
+
+def _job_graph_finished(graph):
+    if any("error" in pipeline for pipeline in graph["pipelines"]):
+        return False
+    return all(
+        job.get("status") in FINISHED_JOB_STATUSES
+        for pipeline in graph["pipelines"]
+        for job in pipeline["jobs"] + pipeline["bridges"]
+    )
+
+
+async def get_job(gitlab_url, project_id, access_token, job_id):
+    """Get a single job, including its status"""
+    url = f"{gitlab_url}/api/v4/projects/{_project_path(project_id)}/jobs/{job_id}"
+    headers = _headers(access_token)
+    async with get_session(gitlab_url) as session:
+        async with session.get(url, headers=headers) as response:
             return (response.status, await response.json(), await response.text())
 
 
-async def get_job_trace(gitlab_url, project_id, access_token, job_id):
-    """Get the trace/log output for a specific job"""
-    url = f"{gitlab_url}/api/v4/projects/{project_id}/" f"jobs/{job_id}/trace"
+async def get_job_trace(gitlab_url, project_id, access_token, job_id, offset=None, length=None):
+    """Get the trace/log output for a specific job, or a byte range of it.
+
+    With ``length`` alone the last ``length`` bytes are requested, with ``offset``
+    the bytes from ``offset`` on (``length`` of them if given). Returns
+    ``(status, text, window)`` where ``window`` holds the ``start``/``end`` byte
+    offsets of the text, the trace's ``total_size`` and its ``line_count`` (None
+    when unknown). When GitLab ignores the Range header the full trace is
+    streamed with constant memory and only the requested window is kept.
+    Traces held in the trace store are read from disk instead.
+    """
+    store_key = (gitlab_url, str(project_id), job_id)
+    with trace_store.open(store_key) as view:
+        if view is not None:
+            return _read_stored_window(view, offset, length, trace_store.line_count(store_key))
+
+    url = f"{gitlab_url}/api/v4/projects/{_project_path(project_id)}/" f"jobs/{job_id}/trace"
+    headers = _headers(access_token)
+    if offset is not None:
+        headers["Range"] = f"bytes={offset}-{offset + length - 1}" if length else f"bytes={offset}-"
+    elif length:
+        headers["Range"] = f"bytes=-{length}"
+
+    async with get_session(gitlab_url) as session:
+        async with session.get(url, headers=headers) as response:
+            if response.status == 416:
+                # Offset past the end of the trace
+                _, _, total = _parse_content_range(response.headers.get("Content-Range"))
+                return (200, "", {"start": offset or 0, "end": offset or 0, "total_size": total, "line_count": None})
+            if response.status not in (200, 206):
+                return (response.status, await response.text(), await response.text())
+
+            if response.status == 206:
+                data = await response.read()
+                start, end, total = _parse_content_range(response.headers.get("Content-Range"))
+                start = start if start is not None else 0
+                line_count = None
+                if total is None and (length is None or len(data) < length):
+                    # Fewer bytes than asked for, or all from the offset on: the trace ends with them
+                    total = start + len(data)
+            else:
+                data, start, total, line_count = await _read_trace_window(response, offset, length)
+
+    end = start + len(data)
+    if line_count is None and start == 0 and end == total:
+        line_count = data.count(b"\n") + (bool(data) and not data.endswith(b"\n"))
+    cut_end = total is None or end < total
+    text = decode_slice(data, cut_start=start > 0, cut_end=cut_end)
+    if cut_end:
+        # The window ends after the last character decoded, so the next one starts at a character
+        end -= incomplete_char_length(data)
+    return (200, text, {"start": start, "end": end, "total_size": total, "line_count": line_count})
+
+
+async def get_job_trace_analysis(
+    gitlab_url,
+    project_id,
+    access_token,
+    job_id,
+    extra_patterns=None,
+    context_lines=3,
+    tail_bytes=None,
+    compact_tail=False,
+):
+    """Scan the full trace of a job for failure signatures in one streaming pass.
+
+    Returns ``(status, analysis, text)``; see ``log_analysis.analyze_trace_stream``.
+    """
+    status, analysis, text, finished = await _consume_full_trace(
+        gitlab_url,
+        project_id,
+        access_token,
+        job_id,
+        lambda chunks: analyze_trace_stream(
+            chunks, extra_patterns, context_lines=context_lines, tail_bytes=tail_bytes, compact_tail=compact_tail
+        ),
+    )
+    if status != 200:
+        return (status, None, text)
+    # A running job may be between two sections, with more to come
+    if finished and analysis["sections_complete"]:
+        _section_index_cache.set((gitlab_url, str(project_id), job_id), analysis["sections"])
+    return (200, analysis, text)
+
+
+async def grep_job_trace(gitlab_url, project_id, access_token, job_id, pattern, **options):
+    """Search the trace of a job for a regex in one streaming pass.
+
+    Reading stops once the match limit is reached. Returns ``(status, result,
+    text)``; see ``log_analysis.grep_trace_stream``.
+    """
+    status, result, text, _finished = await _consume_full_trace(
+        gitlab_url, project_id, access_token, job_id, lambda chunks: grep_trace_stream(chunks, pattern, **options)
+    )
+    return (status, result, text)
+
+
+async def get_job_trace_sections(gitlab_url, project_id, access_token, job_id, use_cache=True):
+    """Get the section index of a job trace (see ``log_stream.SectionIndex``).
+
+    The trace is streamed once and only the section markers are kept. Indexes of
+    finished jobs in which every section has ended are cached.
+    """
+    cache_key = (gitlab_url, str(project_id), job_id)
+    sections = _section_index_cache.get(cache_key) if use_cache else None
+    if sections is not None:
+        return (200, sections, "Success (cached)")
+
+    section_index = SectionIndex()
+
+    async def index_sections(chunks):
+        async for chunk in chunks:
+            section_index.feed(chunk)
+        return section_index.close()
+
+    status, sections, text, finished = await _consume_full_trace(
+        gitlab_url, project_id, access_token, job_id, index_sections
+    )
+    if status != 200:
+        return (status, None, text)
+    if finished and section_index.complete:
+        _section_index_cache.set(cache_key, sections)
+    return (200, sections, text)
+
+
+async def _consume_full_trace(gitlab_url, project_id, access_token, job_id, consume):
+    """Run the coroutine function consume over the chunks of a full job trace.
+
+    Stored traces are read from the trace store. Otherwise the trace is
+    streamed from GitLab and, if the job has finished, written to the store
+    as it passes; traces of running jobs bypass the store. Returns
+    ``(status, result, text, finished)``, finished telling whether the job
+    had finished before its trace was read.
+    """
+    key = (gitlab_url, str(project_id), job_id)
+    with trace_store.open(key) as view:
+        if view is not None:
+            return (200, await consume(iter_view(view, STREAM_CHUNK_SIZE)), "Success (stored)", True)
+
+    # Read the status first: once it is final, the trace read after it is complete
+    job_status, job, _ = await get_job(gitlab_url, project_id, access_token, job_id)
+    finished = job_status == 200 and job.get("status") in FINISHED_JOB_STATUSES
+
+    url = f"{gitlab_url}/api/v4/projects/{_project_path(project_id)}/" f"jobs/{job_id}/trace"
     headers = _headers(access_token)
-    async with get_session() as session:
+    async with get_session(gitlab_url) as session:
         async with session.get(url, headers=headers) as response:
-            return (response.status, await response.text(), response.status)
+            if response.status != 200:
+                return (response.status, None, await response.text(), finished)
+            chunks = response.content.iter_chunked(STREAM_CHUNK_SIZE)
+            if not finished or not trace_store.enabled:
+                return (200, await consume(chunks), "Success", finished)
+            # Consumers that stop early (grep at its match limit) leave the trace unstored
+            with trace_store.writer(key) as writer:
+                result = await consume(writer.tee(chunks))
+            return (200, result, "Success", finished)
+
+
+def _read_stored_window(view, offset, length, line_count):
+    """Slice the requested window out of a stored trace, like get_job_trace"""
+    total = len(view)
+    if offset is None:
+        start = max(total - length, 0) if length else 0
+        end = total
+    else:
+        start = min(offset, total)
+        end = min(offset + length, total) if length else total
+    data = view[start:end]
+    text = decode_slice(data, cut_start=start > 0, cut_end=end < total)
+    if end < total:
+        end -= incomplete_char_length(data)
+    return (200, text, {"start": start, "end": end, "total_size": total, "line_count": line_count})
+
+
+def _parse_content_range(value):
+    """Parse a Content-Range header into (start, end, total); unknown parts are None"""
+    match = _CONTENT_RANGE_RE.match(value or "")
+    if not match:
+        return None, None, None
+    start, end, total = match.groups()
+    return (
+        int(start) if start is not None else None,
+        int(end) if end is not None else None,
+        int(total) if total.isdigit() else None,
+    )
+
+
+async def _read_trace_window(response, offset, length):
+    """Stream a full trace body, keeping only the requested window.
+
+    Returns ``(data, start, total, line_count)``. ``total`` is None when reading
+    stopped before the end of the body and its size is not advertised;
+    ``line_count`` is only known when the whole body was read.
+    """
+    if offset is None:
+        stream = LogStream(tail_bytes=length)
+        async for chunk in response.content.iter_chunked(STREAM_CHUNK_SIZE):
+            stream.feed(chunk)
+        return stream.tail, stream.tail_start, stream.byte_count, stream.line_count
+
+    window = bytearray()
+    position = 0
+    end = offset + length if length else None
+    async for chunk in response.content.iter_chunked(STREAM_CHUNK_SIZE):
+        chunk_start, position = position, position + len(chunk)
+        if position > offset:
+            window += chunk[max(offset - chunk_start, 0) : None if end is None else end - chunk_start]
+        if end is not None and position >= end:
+            return bytes(window), offset, response.content_length, None
+    return bytes(window), min(offset, position), position, None
 
 
 async def get_pipeline_test_report(gitlab_url, project_id, access_token, pipeline_id):
-    """Get test report for a specific pipeline"""
-    url = f"{gitlab_url}/api/v4/projects/{project_id}/" f"pipelines/{pipeline_id}/test_report"
+    """Get test report for a specific pipeline.
+
+    The response is parsed as it streams in and only non-passing test cases are
+    kept in each suite's ``test_cases``; suite and report totals are preserved.
+    """
+    url = f"{gitlab_url}/api/v4/projects/{_project_path(project_id)}/" f"pipelines/{pipeline_id}/test_report"
     headers = _headers(access_token)
-    async with get_session() as session:
+    async with get_session(gitlab_url) as session:
         async with session.get(url, headers=headers) as response:
-            return (response.status, await response.json(), await response.text())
+            if response.status != 200:
+                return (response.status, await response.json(), await response.text())
+            report = await parse_test_report_stream(response.content.iter_chunked(STREAM_CHUNK_SIZE))
+            return (response.status, report, "Success")
 
 
 async def get_pipeline_test_report_summary(gitlab_url, project_id, access_token, pipeline_id):
     """Get test report summary for a specific pipeline"""
-    url = f"{gitlab_url}/api/v4/projects/{project_id}/" f"pipelines/{pipeline_id}/test_report_summary"
+    url = f"{gitlab_url}/api/v4/projects/{_project_path(project_id)}/" f"pipelines/{pipeline_id}/test_report_summary"
     headers = _headers(access_token)
-    async with get_session() as session:
+    async with get_session(gitlab_url) as session:
         async with session.get(url, headers=headers) as response:
             return (response.status, await response.json(), await response.text())
 
 
 async def get_merge_request_changes(gitlab_url, project_id, access_token, mr_iid):
     """Get changes/diff stats for a merge request"""
-    url = f"{gitlab_url}/api/v4/projects/{project_id}/" f"merge_requests/{mr_iid}/changes"
+    url = f"{gitlab_url}/api/v4/projects/{_project_path(project_id)}/" f"merge_requests/{mr_iid}/changes"
     headers = _headers(access_token)
-    async with get_session() as session:
+    async with get_session(gitlab_url) as session:
         async with session.get(url, headers=headers) as response:
             return (response.status, await response.json(), await response.text())
 
 
 async def get_project_info(gitlab_url, project_id, access_token):
     """Get project information to check for merge conflicts"""
-    url = f"{gitlab_url}/api/v4/projects/{project_id}"
+    url = f"{gitlab_url}/api/v4/projects/{_project_path(project_id)}"
     headers = _headers(access_token)
-    async with get_session() as session:
+    async with get_session(gitlab_url) as session:
         async with session.get(url, headers=headers) as response:
             return (response.status, await response.json(), await response.text())
 
 
-async def get_merge_request_reviews(gitlab_url, project_id, access_token, mr_iid):
-    discussions_result = await get_merge_request_discussions_paginated(gitlab_url, project_id, access_token, mr_iid)
-    discussions_status, discussions, discussions_text = discussions_result
-
-    approvals_url = f"{gitlab_url}/api/v4/projects/{project_id}/merge_requests/{mr_iid}/approvals"
+async def get_merge_request_approvals(gitlab_url, project_id, access_token, mr_iid):
+    """Get approval state for a merge request"""
+    url = f"{gitlab_url}/api/v4/projects/{_project_path(project_id)}/merge_requests/{mr_iid}/approvals"
     headers = _headers(access_token)
-    async with get_session() as session:
-        async with session.get(approvals_url, headers=headers) as approvals_response:
-            if approvals_response.status == 200:
-                approvals = await approvals_response.json()
-            else:
-                approvals = None
-            approvals_status = approvals_response.status
-            approvals_text = await approvals_response.text()
+    async with get_session(gitlab_url) as session:
+        async with session.get(url, headers=headers) as response:
+            approvals = await response.json() if response.status == 200 else None
+            return (response.status, approvals, await response.text())
+
+
+async def get_merge_request_reviews(gitlab_url, project_id, access_token, mr_iid):
+    discussions_result, approvals_result = await asyncio.gather(
+        get_merge_request_discussions_paginated(gitlab_url, project_id, access_token, mr_iid),
+        get_merge_request_approvals(gitlab_url, project_id, access_token, mr_iid),
+    )
 
     return {
-        "discussions": (discussions_status, discussions, discussions_text),
-        "approvals": (approvals_status, approvals, approvals_text),
+        "discussions": discussions_result,
+        "approvals": approvals_result,
     }
 
 
 async def get_merge_request_details(gitlab_url, project_id, access_token, mr_iid):
-    url = f"{gitlab_url}/api/v4/projects/{project_id}/merge_requests/{mr_iid}"
+    url = f"{gitlab_url}/api/v4/projects/{_project_path(project_id)}/merge_requests/{mr_iid}"
     headers = _headers(access_token)
-    async with get_session() as session:
+    async with get_session(gitlab_url) as session:
         async with session.get(url, headers=headers) as response:
             return (response.status, await response.json(), await response.text())
 
 
 async def create_merge_request_discussion(gitlab_url, project_id, access_token, mr_iid, body):
     """Create a new discussion/comment on a merge request"""
-    url = f"{gitlab_url}/api/v4/projects/{project_id}/merge_requests/" f"{mr_iid}/discussions"
+    url = f"{gitlab_url}/api/v4/projects/{_project_path(project_id)}/merge_requests/" f"{mr_iid}/discussions"
     headers = _headers(access_token)
     data = {"body": body}
 
-    async with get_session() as session:
+    async with get_session(gitlab_url) as session:
         async with session.post(url, headers=headers, json=data) as response:
             json_data = await response.json() if response.content_type == "application/json" else {}
             return (response.status, json_data, await response.text())
@@ -141,11 +578,14 @@ async def create_merge_request_discussion(gitlab_url, project_id, access_token,
 
 async def reply_to_merge_request_discussion(gitlab_url, project_id, access_token, mr_iid, discussion_id, body):
     """Reply to an existing discussion on a merge request"""
-    url = f"{gitlab_url}/api/v4/projects/{project_id}/merge_requests/" f"{mr_iid}/discussions/{discussion_id}/notes"
+    url = (
+        f"{gitlab_url}/api/v4/projects/{_project_path(project_id)}/merge_requests/"
+        f"{mr_iid}/discussions/{discussion_id}/notes"
+    )
     headers = _headers(access_token)
     data = {"body": body}
 
-    async with get_session() as session:
+    async with get_session(gitlab_url) as session:
         async with session.post(url, headers=headers, json=data) as response:
             json_data = await response.json() if response.content_type == "application/json" else {}
             return (response.status, json_data, await response.text())
@@ -153,11 +593,14 @@ async def reply_to_merge_request_discussion(gitlab_url, project_id, access_token
 
 async def resolve_merge_request_discussion(gitlab_url, project_id, access_token, mr_iid, discussion_id, resolved):
     """Resolve or unresolve a discussion on a merge request"""
-    url = f"{gitlab_url}/api/v4/projects/{project_id}/merge_requests/" f"{mr_iid}/discussions/{discussion_id}"
+    url = (
+        f"{gitlab_url}/api/v4/projects/{_project_path(project_id)}/merge_requests/"
+        f"{mr_iid}/discussions/{discussion_id}"
+    )
     headers = _headers(access_token)
     data = {"resolved": resolved}
 
-    async with get_session() as session:
+    async with get_session(gitlab_url) as session:
         async with session.put(url, headers=headers, json=data) as response:
             json_data = await response.json() if response.content_type == "application/json" else {}
             return (response.status, json_data, await response.text())
@@ -167,154 +610,59 @@ async def get_branch_merge_requests(gitlab_url, project_id, access_token, branch
     """Get merge requests for a specific branch"""
     params = {"source_branch": branch_name, "state": "all", "per_page": 100}
 
-    url = f"{gitlab_url}/api/v4/projects/{project_id}/merge_requests"
+    url = f"{gitlab_url}/api/v4/projects/{_project_path(project_id)}/merge_requests"
     headers = _headers(access_token)
 
-    async with get_session() as session:
+    async with get_session(gitlab_url) as session:
         async with session.get(url, headers=headers, params=params) as response:
             return (response.status, await response.json(), await response.text())
 
 
 async def get_merge_request_commits(gitlab_url, project_id, access_token, mr_iid):
     """Get all commits in a merge request (handles pagination)"""
-    base_url = f"{gitlab_url}/api/v4/projects/{project_id}/" f"merge_requests/{mr_iid}/commits"
+    url = f"{gitlab_url}/api/v4/projects/{_project_path(project_id)}/" f"merge_requests/{mr_iid}/commits"
     headers = _headers(access_token)
-    all_commits = []
-    page = 1
-    per_page = 100  # Maximum allowed per page
 
-    async with get_session() as session:
-        while True:
-            params = {"page": page, "per_page": per_page}
-            async with session.get(base_url, headers=headers, params=params) as response:
-                if response.status != 200:
-                    return (response.status, await response.json(), await response.text())
-
-                page_data = await response.json()
-                if not page_data:  # No more results
-                    break
-
-                all_commits.extend(page_data)
-
-                # If we got fewer results than per_page, we're done
-                if len(page_data) < per_page:
-                    break
-
-                page += 1
-
-        return (200, all_commits, "Success")
+    async with get_session(gitlab_url) as session:
+        return await _get_all_pages(session, url, headers)
 
 
 async def get_commit_comments(gitlab_url, project_id, access_token, commit_sha):
     """Get simple comments for a specific commit"""
-    url = f"{gitlab_url}/api/v4/projects/{project_id}/" f"repository/commits/{commit_sha}/comments"
+    url = f"{gitlab_url}/api/v4/projects/{_project_path(project_id)}/" f"repository/commits/{commit_sha}/comments"
     headers = _headers(access_token)
-    async with get_session() as session:
+    async with get_session(gitlab_url) as session:
         async with session.get(url, headers=headers) as response:
             return (response.status, await response.json(), await response.text())
 
 
 async def get_commit_discussions(gitlab_url, project_id, access_token, commit_sha):
     """Get discussions/comments for a specific commit"""
-    url = f"{gitlab_url}/api/v4/projects/{project_id}/" f"repository/commits/{commit_sha}/discussions"
+    url = f"{gitlab_url}/api/v4/projects/{_project_path(project_id)}/" f"repository/commits/{commit_sha}/discussions"
     headers = _headers(access_token)
-    async with get_session() as session:
+    async with get_session(gitlab_url) as session:
         async with session.get(url, headers=headers) as response:
             return (response.status, await response.json(), await response.text())
 
 
-async def get_commit_all_comments_and_discussions(gitlab_url, project_id, access_token, commit_sha):
-    """Get both comments and discussions for a commit, combining them"""
-    discussions_result = await get_commit_discussions(gitlab_url, project_id, access_token, commit_sha)
-    discussions_status, discussions_data, discussions_error = discussions_result
-
-    comments_result = await get_commit_comments(gitlab_url, project_id, access_token, commit_sha)
-    comments_status, comments_data, comments_error = comments_result
-
-    combined_data = []
-
-    if discussions_status == 200 and discussions_data:
-        combined_data.extend(discussions_data)
-
-    if comments_status == 200 and comments_data:
-        for comment in comments_data:
-            discussion_format = {
-                "id": f"comment_{comment.get('id', 'unknown')}",
-                "individual_note": True,
-                "notes": [
-                    {
-                        "id": comment.get("id"),
-                        "body": comment.get("note", ""),
-                        "author": comment.get("author", {}),
-                        "created_at": comment.get("created_at"),
-                        "updated_at": comment.get("created_at"),
-                        "system": False,
-                        "noteable_type": "Commit",
-                        "noteable_id": commit_sha,
-                        "resolvable": False,
-                        "position": (
-                            {
-                                "new_path": comment.get("path"),
-                                "new_line": comment.get("line"),
-                                "line_type": comment.get("line_type"),
-                            }
-                            if comment.get("path")
-                            else None
-                        ),
-                    }
-                ],
-            }
-        combined_data.append(discussion_format)
-
-    if combined_data:
-        return (200, combined_data, "Success")
-    elif discussions_status == 200 or comments_status == 200:
-        return (200, [], "No comments or discussions found")
-    else:
-        return discussions_result
-
-
 async def get_merge_request_discussions_paginated(gitlab_url, project_id, access_token, mr_iid):
-    """Get all discussions from a merge request with pagination"""
-    all_discussions = []
-    page = 1
-    per_page = 100  # Maximum allowed per page
-
-    async with get_session() as session:
-        headers = _headers(access_token)
-
-        while True:
-            url = f"{gitlab_url}/api/v4/projects/{project_id}/" f"merge_requests/{mr_iid}/discussions"
-            params = {"page": page, "per_page": per_page}
-
-            async with session.get(url, headers=headers, params=params) as response:
-                if response.status != 200:
-                    return (response.status, await response.json(), await response.text())
-
-                discussions = await response.json()
-                if not discussions:  # No more results
-                    break
-
-                all_discussions.extend(discussions)
-
-                link_header = response.headers.get("Link", "")
-                if 'rel="next"' not in link_header:
-                    break
-
-                page += 1
+    """Get all discussions from a merge request, fetching pages concurrently"""
+    url = f"{gitlab_url}/api/v4/projects/{_project_path(project_id)}/" f"merge_requests/{mr_iid}/discussions"
+    headers = _headers(access_token)
 
-        return (200, all_discussions, "Success")
+    async with get_session(gitlab_url) as session:
+        return await _get_all_pages(session, url, headers)
 
 
 async def get_project_members(gitlab_url, project_id, access_token):
     """Get all project members including inherited from groups"""
-    url = f"{gitlab_url}/api/v4/projects/{project_id}/members/all"
+    url = f"{gitlab_url}/api/v4/projects/{_project_path(project_id)}/members/all"
     headers = _headers(access_token)
     all_members = []
     page = 1
     per_page = 100
 
-    async with get_session() as session:
+    async with get_session(gitlab_url) as session:
         while True:
             params = {"page": page, "per_page": per_page}
             async with session.get(url, headers=headers, params=params) as response:
@@ -337,13 +685,13 @@ async def get_project_members(gitlab_url, project_id, access_token):
 
 async def get_project_labels(gitlab_url, project_id, access_token):
     """Get all project labels including inherited from groups"""
-    url = f"{gitlab_url}/api/v4/projects/{project_id}/labels"
+    url = f"{gitlab_url}/api/v4/projects/{_project_path(project_id)}/labels"
     headers = _headers(access_token)
     all_labels = []
     page = 1
     per_page = 100
 
-    async with get_session() as session:
+    async with get_session(gitlab_url) as session:
         while True:
             params = {"page": page, "per_page": per_page, "include_ancestor_groups": "true"}
             async with session.get(url, headers=headers, params=params) as response:
@@ -366,10 +714,10 @@ async def get_project_labels(gitlab_url, project_id, access_token):
 
 async def create_merge_request(gitlab_url, project_id, access_token, data):
     """Create a new merge request"""
-    url = f"{gitlab_url}/api/v4/projects/{project_id}/merge_requests"
+    url = f"{gitlab_url}/api/v4/projects/{_project_path(project_id)}/merge_requests"
     headers = _headers(access_token)
 
-    async with get_session() as session:
+    async with get_session(gitlab_url) as session:
         async with session.post(url, headers=headers, json=data) as response:
             json_data = await response.json() if response.content_type == "application/json" else {}
             return (response.status, json_data, await response.text())
@@ -377,10 +725,10 @@ async def create_merge_request(gitlab_url, project_id, access_token, data):
 
 async def update_merge_request(gitlab_url, project_id, access_token, mr_iid, data):
     """Update an existing merge request"""
-    url = f"{gitlab_url}/api/v4/projects/{project_id}/merge_requests/{mr_iid}"
+    url = f"{gitlab_url}/api/v4/projects/{_project_path(project_id)}/merge_requests/{mr_iid}"
     headers = _headers(access_token)
 
-    async with get_session() as session:
+    async with get_session(gitlab_url) as session:
         async with session.put(url, headers=headers, json=data) as response:
             json_data = await response.json() if response.content_type == "application/json" else {}
             return (response.status, json_data, await response.text())
@@ -388,10 +736,10 @@ async def update_merge_request(gitlab_url, project_id, access_token, mr_iid, dat
 
 async def merge_merge_request(gitlab_url, project_id, access_token, mr_iid, data=None):
     """Merge a merge request"""
-    url = f"{gitlab_url}/api/v4/projects/{project_id}/merge_requests/{mr_iid}/merge"
+    url = f"{gitlab_url}/api/v4/projects/{_project_path(project_id)}/merge_requests/{mr_iid}/merge"
     headers = _headers(access_token)
 
-    async with get_session() as session:
+    async with get_session(gitlab_url) as session:
         async with session.put(url, headers=headers, json=data or {}) as response:
             json_data = await response.json() if response.content_type == "application/json" else {}
             return (response.status, json_data, await response.text())
@@ -399,13 +747,13 @@ async def merge_merge_request(gitlab_url, project_id, access_token, mr_iid, data
 
 async def approve_merge_request(gitlab_url, project_id, access_token, mr_iid, sha=None):
     """Approve a merge request"""
-    url = f"{gitlab_url}/api/v4/projects/{project_id}/merge_requests/{mr_iid}/approve"
+    url = f"{gitlab_url}/api/v4/projects/{_project_path(project_id)}/merge_requests/{mr_iid}/approve"
     headers = _headers(access_token)
     data = {}
     if sha:
         data["sha"] = sha
 
-    async with get_session() as session:
+    async with get_session(gitlab_url) as session:
         async with session.post(url, headers=headers, json=data) as response:
             json_data = await response.json() if response.content_type == "application/json" else {}
             return (response.status, json_data, await response.text())
@@ -413,10 +761,10 @@ async def approve_merge_request(gitlab_url, project_id, access_token, mr_iid, sh
 
 async def unapprove_merge_request(gitlab_url, project_id, access_token, mr_iid):
     """Unapprove a merge request"""
-    url = f"{gitlab_url}/api/v4/projects/{project_id}/merge_requests/{mr_iid}/unapprove"
+    url = f"{gitlab_url}/api/v4/projects/{_project_path(project_id)}/merge_requests/{mr_iid}/unapprove"
     headers = _headers(access_token)
 
-    async with get_session() as session:
+    async with get_session(gitlab_url) as session:
         async with session.post(url, headers=headers) as response:
             json_data = await response.json() if response.content_type == "application/json" else {}
             return (response.status, json_data, await response.text())
@@ -424,7 +772,7 @@ async def unapprove_merge_request(gitlab_url, project_id, access_token, mr_iid):
 
 async def create_project_label(gitlab_url, project_id, access_token, name, color=None, description=None):
     """Create a new project label"""
-    url = f"{gitlab_url}/api/v4/projects/{project_id}/labels"
+    url = f"{gitlab_url}/api/v4/projects/{_project_path(project_id)}/labels"
     headers = _headers(access_token)
 
     data = {"name": name}
@@ -435,7 +783,7 @@ async def create_project_label(gitlab_url, project_id, access_token, name, color
     if description:
         data["description"] = description
 
-    async with get_session() as session:
+    async with get_session(gitlab_url) as session:
         async with session.post(url, headers=headers, json=data) as response:
             json_data = await response.json() if response.content_type == "application/json" else {}
             return (response.status, json_data, await response.text())
@@ -452,7 +800,7 @@ async def search_projects(gitlab_url, access_token, search=None, membership=True
     if membership:
         params["membership"] = "true"
 
-    async with get_session() as session:
+    async with get_session(gitlab_url) as session:
         async with session.get(url, headers=headers, params=params) as response:
             return (response.status, await response.json(), await response.text())
 
@@ -468,6 +816,6 @@ async def list_user_projects(gitlab_url, access_token, owned=False, membership=T
     if membership:
         params["membership"] = "true"
 
-    async with get_session() as session:
+    async with get_session(gitlab_url) as session:
         async with session.get(url, headers=headers, params=params) as response:
             return (response.status, await response.json(), await response.text())
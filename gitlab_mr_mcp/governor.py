@@ -0,0 +1,230 @@
+"""Priority-aware cap on the GitLab requests in flight.
+
+MCP clients can call several tools at once, and one bulk tool can fan out into
+dozens of requests. Every GitLab request waits for a slot from the governor,
+which allows at most ``GITLAB_MAX_CONCURRENT_REQUESTS`` (16 by default) in
+flight across all calls. When they are all taken, waiting requests are admitted
+by priority, then in arrival order: interactive fetches of a single resource
+ahead of bulk fan-outs, and both ahead of speculative prefetches. The priority
+of a request is that of the tool call it is made for. A GitLab instance
+configured with ``max_connections`` also gets a cap of its own, taken before a
+global slot. The requests of a ``RequestGroup``, like those of a prefetch, take
+the group's priority, which can be raised while they wait.
+"""
+
+import asyncio
+import contextlib
+import contextvars
+import heapq
+import itertools
+import logging
+import os
+import time
+
+# Priority class of the GitLab requests a tool makes, most urgent first
+INTERACTIVE = "interactive"  # a few requests for the resource the user asked about
+BULK = "bulk"  # fan-out over many merge requests, jobs or commits
+PREFETCH = "prefetch"  # speculative requests no one is waiting for yet
+
+PRIORITIES = (INTERACTIVE, BULK, PREFETCH)
+
+DEFAULT_MAX_IN_FLIGHT = 16
+
+# Priority of the GitLab requests made by the current tool call
+request_priority = contextvars.ContextVar("gitlab_request_priority", default=INTERACTIVE)
+
+# Budget of the GitLab requests the current tool call may still make, None when unlimited
+request_budget = contextvars.ContextVar("gitlab_request_budget", default=None)
+
+# Group of the GitLab requests made by the current tool call, if its priority may be raised later
+request_group = contextvars.ContextVar("gitlab_request_group", default=None)
+
+
+class RequestGroup:
+    """The GitLab requests of one tool call, queued with a priority that ``promote`` can raise"""
+
+    def __init__(self, priority):
+        self.priority = priority
+
+
+class RequestBudgetExceeded(Exception):
+    """Raised when a request would exceed the budget of its tool call"""
+
+
+class RequestBudget:
+    """Number of GitLab requests a tool call may make, shared by the tasks it fans out into"""
+
+    def __init__(self, requests):
+        self.remaining = requests
+
+    def spend(self):
+        if self.remaining <= 0:
+            raise RequestBudgetExceeded("GitLab request budget exhausted")
+        self.remaining -= 1
+
+
+class QueueWaitStats:
+    """How many requests of a priority were admitted and how long they waited for a slot"""
+
+    def __init__(self):
+        self.requests = 0
+        self.queued = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def record(self, wait, queued):
+        self.requests += 1
+        self.queued += queued
+        self.total_wait += wait
+        self.max_wait = max(self.max_wait, wait)
+
+    def as_dict(self):
+        return {
+            "requests": self.requests,
+            "queued": self.queued,
+            "mean_wait_ms": round(self.total_wait / self.requests * 1000, 1) if self.requests else 0.0,
+            "max_wait_ms": round(self.max_wait * 1000, 1),
+        }
+
+
+class RequestGovernor:
+    """Caps the requests in flight and hands freed slots to the most urgent waiting request."""
+
+    def __init__(self, max_in_flight=DEFAULT_MAX_IN_FLIGHT):
+        self.max_in_flight = max_in_flight
+        self.in_flight = 0
+        self._waiting = []
+        self._arrival = itertools.count()
+        self._stats = {priority: QueueWaitStats() for priority in PRIORITIES}
+        self._instance_governors = {}
+
+    @classmethod
+    def from_env(cls):
+        value = os.environ.get("GITLAB_MAX_CONCURRENT_REQUESTS", str(DEFAULT_MAX_IN_FLIGHT))
+        try:
+            max_in_flight = int(value)
+            if max_in_flight <= 0:
+                raise ValueError
+        except ValueError:
+            logging.warning(f"Invalid GITLAB_MAX_CONCURRENT_REQUESTS {value!r}, using {DEFAULT_MAX_IN_FLIGHT}")
+            max_in_flight = DEFAULT_MAX_IN_FLIGHT
+        return cls(max_in_flight)
+
+    def limit_instances(self, instances):
+        """Cap the requests in flight to each instance configured with max_connections"""
+        self._instance_governors = {
+            instance["gitlab_url"]: RequestGovernor(instance["max_connections"])
+            for instance in instances
+            if instance.get("max_connections")
+        }
+
+    @property
+    def waiting(self):
+        return sum(1 for _rank, _arrival, future, _group in self._waiting if not future.done())
+
+    def promote(self, group, priority):
+        """Raise the priority of a request group, for its requests already waiting as well as later ones"""
+        rank = PRIORITIES.index(priority)
+        if rank >= PRIORITIES.index(group.priority):
+            return
+        group.priority = priority
+        for governor in (self, *self._instance_governors.values()):
+            governor._waiting = [
+                (rank if waiting_group is group else waiting_rank, arrival, future, waiting_group)
+                for waiting_rank, arrival, future, waiting_group in governor._waiting
+            ]
+            heapq.heapify(governor._waiting)
+
+    @contextlib.asynccontextmanager
+    async def slot(self, priority=None, gitlab_url=None):
+        """Hold one of the in-flight slots, and one of gitlab_url's if it is capped, for the duration of the block"""
+        if priority is not None:
+            group = RequestGroup(priority)
+        else:
+            group = request_group.get() or RequestGroup(request_priority.get())
+        budget = request_budget.get()
+        if budget is not None:
+            budget.spend()
+        instance_governor = self._instance_governors.get(gitlab_url)
+        if instance_governor is None:
+            async with self._hold(group):
+                yield
+            return
+        # Requests queued behind their instance's cap do not hold a global slot meanwhile
+        async with instance_governor._hold(group), self._hold(group):
+            yield
+
+    @contextlib.asynccontextmanager
+    async def _hold(self, group):
+        started = time.monotonic()
+        queued = not self._try_acquire()
+        if queued:
+            await self._wait(PRIORITIES.index(group.priority), group)
+        self._stats[group.priority].record(time.monotonic() - started, queued)
+        try:
+            yield
+        finally:
+            self._release()
+
+    def _try_acquire(self):
+        if self.in_flight < self.max_in_flight and not self.waiting:
+            self.in_flight += 1
+            return True
+        return False
+
+    async def _wait(self, rank, group):
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiting, (rank, next(self._arrival), future, group))
+        try:
+            await future
+        except asyncio.CancelledError:
+            # The slot may have been handed over just before the cancellation
+            if future.done() and not future.cancelled():
+                self._release()
+            raise
+
+    def _release(self):
+        # A freed slot goes straight to the most urgent waiter; cancelled waiters are skipped
+        while self._waiting:
+            _rank, _arrival, future, _group = heapq.heappop(self._waiting)
+            if not future.done():
+                future.set_result(None)
+                return
+        self.in_flight -= 1
+
+    def stats(self):
+        """Queue-wait metrics by priority"""
+        return {priority: stats.as_dict() for priority, stats in self._stats.items()}
+
+
+class GovernedSession:
+    """Wraps an aiohttp session so that each of its requests holds a governor slot until its response is closed"""
+
+    def __init__(self, session, governor, gitlab_url=None):
+        self._session = session
+        self._governor = governor
+        self._gitlab_url = gitlab_url
+
+    def __getattr__(self, name):
+        return getattr(self._session, name)
+
+    @contextlib.asynccontextmanager
+    async def _request(self, method, url, **kwargs):
+        async with self._governor.slot(gitlab_url=self._gitlab_url):
+            async with getattr(self._session, method)(url, **kwargs) as response:
+                yield response
+
+    def get(self, url, **kwargs):
+        return self._request("get", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self._request("post", url, **kwargs)
+
+    def put(self, url, **kwargs):
+        return self._request("put", url, **kwargs)
+
+    def delete(self, url, **kwargs):
+        return self._request("delete", url, **kwargs)
+
+
+request_governor = RequestGovernor.from_env()
@@ -0,0 +1,66 @@
+"""Streamable HTTP transport: one long-running server for many MCP clients.
+
+With ``GITLAB_MCP_TRANSPORT=http`` the server listens on
+``GITLAB_MCP_HOST:GITLAB_MCP_PORT`` (127.0.0.1:8000 by default) instead of
+stdio. All MCP sessions share the process: one pooled GitLab connection
+session per instance and the caches and stores of ``gitlab_api``. Every client acts with
+the server's access token, so bind to a non-loopback address only behind
+something that authenticates clients.
+"""
+
+import contextlib
+import inspect
+import logging
+
+import uvicorn
+from mcp.server.streamable_http_manager import StreamableHTTPSessionManager
+from starlette.applications import Starlette
+from starlette.routing import Route
+
+from gitlab_mr_mcp.gitlab_api import pooled_sessions
+
+
+class StreamableHTTPEndpoint:
+    """ASGI endpoint passing every request to the session manager"""
+
+    def __init__(self, session_manager):
+        self.session_manager = session_manager
+
+    async def __call__(self, scope, receive, send):
+        await self.session_manager.handle_request(scope, receive, send)
+
+
+def session_manager_options(transport):
+    """Session limits supported by the installed mcp version"""
+    options = {"max_sessions": transport["max_sessions"], "session_idle_timeout": transport["session_idle_timeout"]}
+    supported = inspect.signature(StreamableHTTPSessionManager).parameters
+    for name in list(options):
+        if name not in supported:
+            if options[name] is not None:
+                logging.warning(f"{name} needs a newer mcp package and is ignored")
+            del options[name]
+    return options
+
+
+def create_app(server, transport, instances=()):
+    """Starlette app serving the MCP server at the configured path"""
+    session_manager = StreamableHTTPSessionManager(app=server, **session_manager_options(transport))
+
+    @contextlib.asynccontextmanager
+    async def lifespan(_app):
+        async with pooled_sessions(instances), session_manager.run():
+            yield
+
+    return Starlette(
+        routes=[Route(transport["path"], endpoint=StreamableHTTPEndpoint(session_manager))],
+        lifespan=lifespan,
+    )
+
+
+async def serve_http(server, transport, instances=()):
+    """Serve MCP over Streamable HTTP until the process is stopped"""
+    logging.info(f"Starting MCP Streamable HTTP server on {transport['host']}:{transport['port']}{transport['path']}")
+    config = uvicorn.Config(
+        create_app(server, transport, instances), host=transport["host"], port=transport["port"], log_config=None
+    )
+    await uvicorn.Server(config).serve()
@@ -0,0 +1,69 @@
+"""Routing of tool calls between the configured GitLab instances.
+
+A call goes to the instance named by its ``instance`` argument, else to the
+instance with the longest path prefix matching its ``project_id``, else to the
+default (first) instance. Project discovery tools ask every instance at once.
+"""
+
+import asyncio
+import logging
+
+
+def instance_names(instances):
+    return [instance["name"] for instance in instances]
+
+
+def select_instance(instances, arguments):
+    """Return the instance a tool call is routed to"""
+    name = arguments.get("instance")
+    if name:
+        for instance in instances:
+            if instance["name"] == name:
+                return instance
+        raise ValueError(f"Unknown instance {name!r}; configured instances: {', '.join(instance_names(instances))}")
+
+    project_id = str(arguments.get("project_id") or "")
+    matches = [
+        (len(prefix), index)
+        for index, instance in enumerate(instances)
+        for prefix in instance["path_prefixes"]
+        if project_id.startswith(prefix)
+    ]
+    return instances[max(matches)[1]] if matches else instances[0]
+
+
+def instance_schema(instances):
+    """Input schema of the ``instance`` argument"""
+    return {
+        "type": "string",
+        "enum": instance_names(instances),
+        "description": (
+            f"GitLab instance to use (default: {instances[0]['name']}; "
+            "projects under an instance's path prefixes are routed to it)"
+        ),
+    }
+
+
+async def gather_from_instances(instances, fetch, action):
+    """Run ``fetch(instance)`` on all instances concurrently.
+
+    ``fetch`` returns a ``(status, data, error)`` tuple. Returns the
+    ``(instance, data)`` pairs of the instances that answered and the errors
+    of the others, and raises if none answered.
+    """
+    results = await asyncio.gather(*(fetch(instance) for instance in instances), return_exceptions=True)
+    answered = []
+    errors = []
+    for instance, result in zip(instances, results):
+        if isinstance(result, Exception):
+            status, data, error = None, None, str(result)
+        else:
+            status, data, error = result
+        if status == 200:
+            answered.append((instance, data))
+        else:
+            logging.error(f"Error {action} on {instance['name']}: {status} - {error}")
+            errors.append(f"{status} - {error}" if len(instances) == 1 else f"{instance['name']}: {status} - {error}")
+    if not answered:
+        raise Exception(f"Error {action}: {'; '.join(errors)}")
+    return answered, errors
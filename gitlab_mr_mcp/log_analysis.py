@@ -0,0 +1,463 @@
+"""Failure-signature extraction for job traces.
+
+A job trace is scanned in a single streaming pass for lines that look like
+failures: Python tracebacks, ``ERROR``/``FAILED`` markers, compiler errors,
+non-zero exit codes, OOM kills and any configured extra patterns. All patterns
+are combined into one precompiled regex, but the regex only runs on lines that
+contain one of a few trigger literals, found with ``str.find`` over whole
+blocks of lines. Lines without a trigger are never split out of their block, so
+a pass costs little more than reading the trace.
+
+Hits are deduplicated by their line with numbers normalized, so the same error
+repeated by a thousand parallel workers is reported once with a count, together
+with the lines around its first occurrence.
+
+``TraceGrep`` searches a trace for a user regex in the same streaming fashion,
+keeping the byte offset of every line it reports.
+"""
+
+import codecs
+import json
+import os
+import re
+from collections import deque
+
+from gitlab_mr_mcp.log_stream import (
+    CompactTail,
+    LogStream,
+    SectionIndex,
+    clean_trace_text,
+    decode_slice,
+    section_at_line,
+)
+
+# (name, regex) pairs matched against each line of the trace
+DEFAULT_FAILURE_PATTERNS = [
+    ("traceback", r"^\s*Traceback \(most recent call last\):"),
+    ("error", r"\bERROR\b|(?i:^\s*(?:fatal )?error(?:\[\w+\])?:)"),
+    ("failed", r"\bFAILED\b|\bFAIL:|^--- FAIL:"),
+    ("compiler", r"^\S+?:\d+(?::\d+)?: (?:fatal )?error\b|\berror (?:TS|CS)\d+\b"),
+    ("exit_code", r"(?i:exit(?:ed with)? (?:code|status):? [1-9]\d*)"),
+    ("oom", r"OOMKilled|(?i:out of memory)|\bMemoryError\b|oom-kill|\bKilled\s*$|signal 9\b"),
+    ("crash", r"\bpanic:|Segmentation fault|core dumped"),
+]
+
+# Lowercase literals of which every line matching a default pattern contains at least one.
+# Blocks are searched for these with str.find, which is far cheaper than running the regex.
+DEFAULT_PATTERN_TRIGGERS = (
+    "traceback (most recent call last)",
+    "error",
+    "fail",
+    "exit",
+    "oom",
+    "out of memory",
+    "killed",
+    "signal 9",
+    "panic:",
+    "segmentation fault",
+    "core dumped",
+)
+
+# Extra patterns as a JSON list of regexes, e.g. '["^FATAL:", "deadlock detected"]'
+PATTERNS_ENV_VAR = "GITLAB_LOG_PATTERNS"
+
+DEFAULT_CONTEXT_LINES = 3
+DEFAULT_MAX_SIGNATURES = 20
+
+# Lines following a hit that are kept, per pattern; tracebacks end with the exception
+AFTER_CONTEXT_LINES = {"traceback": 15}
+
+# Longest line kept; longer lines are cut, which also bounds memory on logs without newlines
+MAX_LINE_CHARS = 1000
+
+_NUMBER_RE = re.compile(r"0x[0-9a-fA-F]+|\d+")
+
+
+def configured_patterns():
+    """Return extra failure patterns configured through the environment"""
+    value = os.environ.get(PATTERNS_ENV_VAR)
+    if not value:
+        return []
+    try:
+        patterns = json.loads(value)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"{PATTERNS_ENV_VAR} must be a JSON list of regexes: {e}")
+    if not isinstance(patterns, list) or not all(isinstance(pattern, str) for pattern in patterns):
+        raise ValueError(f"{PATTERNS_ENV_VAR} must be a JSON list of regexes")
+    return patterns
+
+
+class FailurePatterns:
+    """Compiled failure patterns: the defaults as one combined regex plus its prefilter, and the extra ones."""
+
+    def __init__(self, extra_patterns=None):
+        self.group_names = {f"p{index}": name for index, (name, _) in enumerate(DEFAULT_FAILURE_PATTERNS)}
+        self.regex = re.compile(
+            "|".join(f"(?P<p{index}>{pattern})" for index, (_, pattern) in enumerate(DEFAULT_FAILURE_PATTERNS)),
+            re.MULTILINE,
+        )
+        # Extra patterns are compiled on their own, as inline flags and backreferences
+        # would break or change meaning inside a combined regex
+        self.custom = []
+        for index, pattern in enumerate(extra_patterns or []):
+            try:
+                self.custom.append((f"custom_{index}", re.compile(pattern, re.MULTILINE)))
+            except re.error as e:
+                raise ValueError(f"Invalid log pattern {pattern!r}: {e}")
+
+    def match(self, line):
+        """Return the name of the first pattern matching line, or None"""
+        match = self.regex.search(line)
+        if match:
+            return self.group_names[match.lastgroup]
+        for name, regex in self.custom:
+            if regex.search(line):
+                return name
+        return None
+
+    def candidate_line_starts(self, block):
+        """Return the sorted start offsets of the lines in block that may match, or None to scan every line"""
+        lowered = block.lower()
+        if len(lowered) != len(block):
+            # A few characters change length when lowercased, which would shift offsets
+            return None
+
+        starts = set()
+        for trigger in DEFAULT_PATTERN_TRIGGERS:
+            position = lowered.find(trigger)
+            while position != -1:
+                line_end = block.find("\n", position)
+                starts.add(block.rfind("\n", 0, position) + 1)
+                if line_end == -1:
+                    break
+                position = lowered.find(trigger, line_end)
+        # Extra patterns have no known trigger literals and are searched for directly
+        for _name, regex in self.custom:
+            for match in regex.finditer(block):
+                starts.add(block.rfind("\n", 0, match.start()) + 1)
+        return sorted(starts)
+
+
+def compile_failure_patterns(extra_patterns=None):
+    """Compile the default and extra failure patterns, raising ValueError for invalid ones"""
+    return FailurePatterns(extra_patterns)
+
+
+def signature_key(pattern_name, line):
+    """Key under which repeated hits are deduplicated: the line with numbers normalized"""
+    return pattern_name, _NUMBER_RE.sub("N", line.strip())[:200]
+
+
+class FailureScanner:
+    """Scan decoded trace text fed in chunks for failure signatures."""
+
+    def __init__(self, extra_patterns=None, context_lines=DEFAULT_CONTEXT_LINES, max_signatures=DEFAULT_MAX_SIGNATURES):
+        self._patterns = compile_failure_patterns(extra_patterns)
+        self.context_lines = context_lines
+        self.max_signatures = max_signatures
+        self.line_count = 0
+        self.signatures = {}
+        self.windows = []
+        self.dropped_hits = 0
+        self._recent = deque(maxlen=context_lines)
+        # Window still collecting lines after its hits
+        self._open_window = None
+        self._partial = ""
+
+    def feed(self, text):
+        """Consume the next chunk of decoded trace text"""
+        text = self._partial + text
+        cut = text.rfind("\n")
+        if cut == -1:
+            self._partial = text[:MAX_LINE_CHARS]
+            return
+        self._partial = text[cut + 1 :][:MAX_LINE_CHARS]
+        self._scan_block(clean_trace_text(text[:cut]))
+
+    def close(self):
+        """Finish the scan and return the failure windows, in order of appearance"""
+        if self._partial:
+            self._scan_block(clean_trace_text(self._partial))
+            self._partial = ""
+        self._open_window = None
+        return self.windows
+
+    def _scan_block(self, block):
+        """Scan a block of complete lines (without the final newline)"""
+        starts = self._patterns.candidate_line_starts(block)
+        if starts is None:
+            for line in block.split("\n"):
+                self._scan_line(line[:MAX_LINE_CHARS])
+            return
+
+        # Only candidate lines are examined one by one; the lines between them are skipped in bulk
+        position = 0
+        for start in starts:
+            if start > position:
+                self._skip_lines(block[position : start - 1])
+            end = block.find("\n", start)
+            end = len(block) if end == -1 else end
+            self._scan_line(block[start:end][:MAX_LINE_CHARS])
+            position = end + 1
+        if position <= len(block):
+            self._skip_lines(block[position:])
+
+    def _skip_lines(self, text):
+        """Consume lines known not to match, only splitting off those an open window still needs"""
+        if self._open_window is not None:
+            head = text.split("\n", self._open_window["remaining"])
+            if len(head) <= self._open_window["remaining"]:
+                for line in head:
+                    self._scan_line(line[:MAX_LINE_CHARS])
+                return
+            for line in head[:-1]:
+                self._scan_line(line[:MAX_LINE_CHARS])
+            text = head[-1]
+
+        self.line_count += text.count("\n") + 1
+        if self.context_lines:
+            last_lines = text.rsplit("\n", self.context_lines)[-self.context_lines :]
+            self._recent.extend(line[:MAX_LINE_CHARS] for line in last_lines)
+
+    def _scan_line(self, line):
+        self.line_count += 1
+        if self._open_window is not None:
+            self._open_window["lines"].append(line)
+            self._open_window["remaining"] -= 1
+
+        pattern_name = self._patterns.match(line)
+        if pattern_name:
+            self._record_hit(pattern_name, line)
+        if self._open_window is not None and self._open_window["remaining"] <= 0:
+            self._open_window = None
+        self._recent.append(line)
+
+    def _record_hit(self, pattern_name, line):
+        key = signature_key(pattern_name, line)
+        signature = self.signatures.get(key)
+        if signature is not None:
+            signature["count"] += 1
+            return
+        if len(self.signatures) >= self.max_signatures:
+            self.dropped_hits += 1
+            return
+
+        after = AFTER_CONTEXT_LINES.get(pattern_name, self.context_lines)
+        signature = {"pattern": pattern_name, "line": line.strip(), "line_number": self.line_count, "count": 1}
+        self.signatures[key] = signature
+
+        # A hit inside a window that is still collecting context extends that window
+        if self._open_window is not None:
+            self._open_window["signatures"].append(signature)
+            self._open_window["remaining"] = max(self._open_window["remaining"], after)
+            return
+
+        window = {
+            "first_line": self.line_count - len(self._recent),
+            "lines": list(self._recent) + [line],
+            "signatures": [signature],
+            "remaining": after,
+        }
+        self.windows.append(window)
+        if after:
+            self._open_window = window
+
+
+async def analyze_trace_stream(
+    chunks, extra_patterns=None, context_lines=DEFAULT_CONTEXT_LINES, tail_bytes=None, compact_tail=False
+):
+    """Scan a trace from an async iterable of raw byte chunks.
+
+    Returns a dict with the failure ``windows`` (each tagged with the
+    ``section`` it falls in), the trace ``sections`` and whether they are all
+    ``sections_complete``, the ``byte_count`` and ``line_count`` of the trace,
+    and its last ``tail_bytes`` bytes as ``tail`` (starting at byte
+    ``tail_start``, not yet cleaned of ANSI codes). With ``compact_tail`` the
+    tail is instead the last ``tail_bytes`` characters of the cleaned and
+    compacted text, with its ``collapsed_lines``.
+    """
+    scanner = FailureScanner(extra_patterns, context_lines=context_lines)
+    stream = LogStream(tail_bytes=tail_bytes)
+    section_index = SectionIndex()
+    compact = CompactTail(tail_bytes) if compact_tail and tail_bytes else None
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    async for chunk in chunks:
+        stream.feed(chunk)
+        section_index.feed(chunk)
+        text = decoder.decode(chunk)
+        scanner.feed(text)
+        if compact is not None:
+            compact.feed(text)
+    text = decoder.decode(b"", final=True)
+    scanner.feed(text)
+    windows = scanner.close()
+    sections = section_index.close()
+
+    for window in windows:
+        section = section_at_line(sections, window["signatures"][0]["line_number"])
+        window["section"] = section["name"] if section else None
+
+    analysis = {
+        "windows": windows,
+        "signature_count": len(scanner.signatures),
+        "dropped_hits": scanner.dropped_hits,
+        "sections": sections,
+        "sections_complete": section_index.complete,
+        "byte_count": stream.byte_count,
+        "line_count": stream.line_count,
+        "tail_start": stream.tail_start,
+        "tail": decode_slice(stream.tail, cut_start=stream.tail_start > 0, cut_end=False),
+    }
+    if compact is not None:
+        compact.feed(text)
+        analysis |= {"tail": compact.close(), "tail_start": compact.start, "collapsed_lines": compact.collapsed_lines}
+    return analysis
+
+
+DEFAULT_GREP_CONTEXT_LINES = 2
+DEFAULT_GREP_MAX_MATCHES = 50
+
+# Lines longer than this are searched in pieces; their line numbers may then run ahead
+MAX_GREP_LINE_BYTES = 1024 * 1024
+
+
+def compile_grep_pattern(pattern, ignore_case=False):
+    """Compile a user search pattern, raising ValueError if it is invalid"""
+    try:
+        return re.compile(pattern, re.MULTILINE | (re.IGNORECASE if ignore_case else 0))
+    except re.error as e:
+        raise ValueError(f"Invalid search pattern {pattern!r}: {e}")
+
+
+class TraceGrep:
+    """Search raw trace bytes fed in chunks for a regex, keeping matching regions with context.
+
+    Lines are cleaned of ANSI codes and progress noise before matching. Each
+    region records the ``lines`` around its matches as ``(line_number,
+    byte_offset, text, matched)`` tuples, where ``byte_offset`` is the offset of
+    the line in the raw trace.
+    """
+
+    def __init__(
+        self,
+        pattern,
+        before=DEFAULT_GREP_CONTEXT_LINES,
+        after=DEFAULT_GREP_CONTEXT_LINES,
+        max_matches=DEFAULT_GREP_MAX_MATCHES,
+        ignore_case=False,
+    ):
+        self._regex = compile_grep_pattern(pattern, ignore_case)
+        self.after = after
+        self.max_matches = max_matches
+        self.match_count = 0
+        # Set once a match beyond max_matches is seen
+        self.limit_reached = False
+        self.line_count = 0
+        self.byte_count = 0
+        self.regions = []
+        self._recent = deque(maxlen=before)
+        self._open_region = None
+        self._partial = b""
+
+    @property
+    def done(self):
+        """Whether a match beyond the limit was seen and the last region has its context"""
+        return self.limit_reached and self._open_region is None
+
+    def feed(self, chunk):
+        """Consume the next chunk of raw trace bytes"""
+        data = self._partial + chunk
+        data_start = self.byte_count - len(self._partial)
+        self.byte_count += len(chunk)
+        cut = data.rfind(b"\n")
+        if cut != -1:
+            self._scan_block(data[:cut], data_start)
+            self._partial = data[cut + 1 :]
+        else:
+            self._partial = data
+        if len(self._partial) > MAX_GREP_LINE_BYTES:
+            self._scan_block(self._partial, self.byte_count - len(self._partial))
+            self._partial = b""
+
+    def close(self):
+        """Finish the search and return the matching regions"""
+        if self._partial and not self.done:
+            self._scan_block(self._partial, self.byte_count - len(self._partial))
+            self._partial = b""
+        self._open_region = None
+        return self.regions
+
+    def _scan_block(self, block, base):
+        """Scan raw complete lines (without the final newline) starting at byte offset base"""
+        if self.done:
+            return
+        text = clean_trace_text(block.decode("utf-8", errors="replace"))
+        if self._open_region is None and not self._regex.search(text):
+            self.line_count += block.count(b"\n") + 1
+            if self._recent.maxlen:
+                self._remember_last_lines(block, text, base)
+            return
+
+        offset = base
+        for raw_line, line in zip(block.split(b"\n"), text.split("\n")):
+            self._scan_line(line, offset)
+            offset += len(raw_line) + 1
+            if self.done:
+                return
+
+    def _remember_last_lines(self, block, text, base):
+        count = self._recent.maxlen
+        raw_lines = block.rsplit(b"\n", count)[-count:]
+        lines = text.rsplit("\n", count)[-count:]
+        first_number = self.line_count - len(lines) + 1
+        offset = base + len(block) - sum(len(raw_line) + 1 for raw_line in raw_lines) + 1
+        for index, (raw_line, line) in enumerate(zip(raw_lines, lines)):
+            self._recent.append((first_number + index, offset, line[:MAX_LINE_CHARS], False))
+            offset += len(raw_line) + 1
+
+    def _scan_line(self, line, offset):
+        self.line_count += 1
+        matched = self._regex.search(line) is not None
+        if matched and self.match_count >= self.max_matches:
+            self.limit_reached = True
+            matched = False
+        entry = (self.line_count, offset, line[:MAX_LINE_CHARS], matched)
+
+        if matched:
+            self.match_count += 1
+            if self._open_region is None:
+                self._open_region = {"lines": list(self._recent), "matches": 0, "remaining": 0}
+                self.regions.append(self._open_region)
+            self._open_region["lines"].append(entry)
+            self._open_region["matches"] += 1
+            self._open_region["remaining"] = self.after
+        elif self._open_region is not None:
+            self._open_region["lines"].append(entry)
+            self._open_region["remaining"] -= 1
+
+        if self._open_region is not None and self._open_region["remaining"] <= 0:
+            self._open_region = None
+        self._recent.append(entry)
+
+
+async def grep_trace_stream(chunks, pattern, **options):
+    """Search a trace from an async iterable of raw byte chunks, stopping at the match limit.
+
+    Returns a dict with the matching ``regions``, the ``match_count``, whether
+    the ``limit_reached`` (a match beyond the limit was seen; the rest of the
+    trace is then not searched), and the ``byte_count`` and ``line_count``
+    searched.
+    """
+    grep = TraceGrep(pattern, **options)
+    async for chunk in chunks:
+        grep.feed(chunk)
+        if grep.done:
+            break
+    regions = grep.close()
+    return {
+        "regions": regions,
+        "match_count": grep.match_count,
+        "limit_reached": grep.limit_reached,
+        "byte_count": grep.byte_count,
+        "line_count": grep.line_count,
+    }
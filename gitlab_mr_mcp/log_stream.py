@@ -0,0 +1,384 @@
+"""Constant-memory processing of streamed job traces.
+
+Job traces of long integration jobs run to hundreds of megabytes. The helpers
+here consume a trace chunk by chunk: byte and line counters are kept as the
+chunks pass, and only a fixed-size tail is retained, so memory use does not
+depend on the size of the log.
+
+Traces are terminal output: they carry ANSI colour codes, carriage-return
+progress bars and GitLab's ``section_start``/``section_end`` markers.
+``clean_trace_text`` strips the noise, ``LineCompactor`` collapses runs of
+near-identical lines, ``CompactTail`` keeps the compacted end of a trace and
+``SectionIndex`` records where each section starts and ends.
+"""
+
+import codecs
+import collections
+import re
+
+_ANSI_RE = re.compile(r"\x1b\[[0-9;?]*[A-Za-z]")
+
+# Text followed by a bare carriage return is overwritten on a terminal (progress bars, section markers)
+_CR_OVERWRITE_RE = re.compile(r"^[^\n]*\r(?!\n|\Z)", re.MULTILINE)
+
+# section_start:1560896352:step_script[collapsed=true]
+_SECTION_RE = re.compile(rb"section_(start|end):(\d+):([\w.-]+)")
+
+# Lines that differ only in their numbers (progress counters, timings) compact into one run
+_NUMBER_RE = re.compile(r"\d+")
+
+# Shortest run of similar lines that is collapsed; shorter runs would not get shorter
+COMPACT_MIN_RUN = 4
+
+# Marker lines are short; longer partial lines are scanned early and dropped to bound memory
+MAX_MARKER_LINE_BYTES = 64 * 1024
+
+
+def decode_slice(data, cut_start, cut_end):
+    """Decode a slice of a UTF-8 trace, dropping characters split by the slice boundaries"""
+    if cut_start:
+        # Skip continuation bytes of a character that started before the slice
+        skip = 0
+        while skip < min(len(data), 3) and data[skip] & 0xC0 == 0x80:
+            skip += 1
+        data = data[skip:]
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    return decoder.decode(data, final=not cut_end)
+
+
+def incomplete_char_length(data):
+    """Number of bytes at the end of a UTF-8 slice that start a character it cuts off"""
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    decoder.decode(data[-3:])
+    return len(decoder.getstate()[0])
+
+
+def clean_trace_text(text):
+    """Strip ANSI escape codes and text overwritten by carriage returns, keeping every newline"""
+    if "\r" in text:
+        text = _CR_OVERWRITE_RE.sub("", text)
+    if "\x1b" in text:
+        text = _ANSI_RE.sub("", text)
+    return text
+
+
+class LineCompactor:
+    """Collapse runs of lines that differ only in their numbers, fed decoded text in chunks.
+
+    A run keeps its first and last line, with the lines in between replaced by
+    a summary such as ``… 1,240 similar lines …``.
+    """
+
+    def __init__(self, min_run=COMPACT_MIN_RUN):
+        self.min_run = min_run
+        self.collapsed_lines = 0
+        self._partial = ""
+        self._run_key = None
+        self._run = []
+        self._run_length = 0
+
+    def feed(self, text):
+        """Consume the next chunk of text and return the compacted text that is final"""
+        lines = (self._partial + text).split("\n")
+        self._partial = lines.pop()
+        output = []
+        for line in lines:
+            self.add_line(line, output)
+        return "".join(line + "\n" for _offset, line, _hidden in output)
+
+    def close(self):
+        """Return the rest of the compacted text"""
+        output = []
+        if self._partial:
+            self.add_line(self._partial, output)
+            self._partial = ""
+            self.flush(output)
+            return "\n".join(line for _offset, line, _hidden in output)
+        self.flush(output)
+        return "".join(line + "\n" for _offset, line, _hidden in output)
+
+    def add_line(self, line, output, offset=None):
+        """Add one complete line; the entries that become final are appended to output.
+
+        Entries are ``(offset, line, hidden)`` tuples, where ``offset`` is that
+        of the line given (None if not) and ``hidden`` the number of lines a
+        summary line stands for.
+        """
+        key = _NUMBER_RE.sub("0", line.rstrip())
+        if key != self._run_key:
+            self.flush(output)
+            self._run_key = key
+        # Only the first and last lines of a long run are kept
+        if self._run_length < self.min_run - 1:
+            self._run.append((offset, line))
+        else:
+            self._run[-1] = (offset, line)
+        self._run_length += 1
+
+    def flush(self, output):
+        """End the current run, appending its entries to output"""
+        if self._run_length >= self.min_run:
+            hidden = self._run_length - 2
+            self.collapsed_lines += hidden
+            (first_offset, first), (summary_offset, _), (last_offset, last) = self._run[0], self._run[1], self._run[-1]
+            output.extend(
+                [
+                    (first_offset, first, 0),
+                    (summary_offset, f"… {hidden:,} similar lines …", hidden),
+                    (last_offset, last, 0),
+                ]
+            )
+        else:
+            output.extend((offset, line, 0) for offset, line in self._run)
+        self._run = []
+        self._run_length = 0
+        self._run_key = None
+
+
+def compact_trace_text(text, min_run=COMPACT_MIN_RUN):
+    """Collapse runs of near-identical lines in cleaned trace text; returns (text, collapsed_lines)"""
+    compactor = LineCompactor(min_run)
+    compacted = compactor.feed(text) + compactor.close()
+    return compacted, compactor.collapsed_lines
+
+
+class CompactTail:
+    """Keep the end of a trace's cleaned and compacted text, fed decoded text in chunks.
+
+    Runs of similar lines are collapsed as the text passes, before the tail is
+    cut to ``max_chars`` characters, so repeated progress output does not use up
+    the tail. ``start`` is the byte offset of the first line kept, counting from
+    the ``offset`` of the first chunk.
+    """
+
+    def __init__(self, max_chars, offset=0, min_run=COMPACT_MIN_RUN):
+        self.max_chars = max_chars
+        self.start = offset
+        self._offset = offset
+        self._partial = ""
+        self._compactor = LineCompactor(min_run)
+        self._kept = collections.deque()
+        self._kept_chars = 0
+
+    def feed(self, text):
+        """Consume the next chunk of decoded trace text"""
+        lines = (self._partial + text).split("\n")
+        self._partial = lines.pop()
+        output = []
+        for line in lines:
+            self._add_line(line, output)
+            self._offset += 1
+        if len(self._partial) > self.max_chars:
+            # Only the end of an overlong line can be kept
+            self._offset += len(self._partial[: -self.max_chars].encode())
+            self._partial = self._partial[-self.max_chars :]
+        self._keep(output)
+
+    def close(self):
+        """Return the kept text"""
+        output = []
+        if self._partial:
+            self._add_line(self._partial, output)
+        self._compactor.flush(output)
+        self._keep(output)
+        text = "\n".join(line for _offset, line, _hidden in self._kept)
+        return text if self._partial or not self._kept else text + "\n"
+
+    @property
+    def collapsed_lines(self):
+        """Number of lines collapsed in the kept text"""
+        return sum(hidden for _offset, _line, hidden in self._kept)
+
+    def _add_line(self, line, output):
+        offset = self._offset
+        self._offset += len(line.encode())
+        if len(line) > self.max_chars:
+            offset += len(line[: -self.max_chars].encode())
+            line = line[-self.max_chars :]
+        self._compactor.add_line(clean_trace_text(line), output, offset)
+
+    def _keep(self, output):
+        for entry in output:
+            self._kept.append(entry)
+            self._kept_chars += len(entry[1]) + 1
+        while self._kept_chars > self.max_chars and len(self._kept) > 1:
+            _offset, line, _hidden = self._kept.popleft()
+            self._kept_chars -= len(line) + 1
+        if self._kept:
+            self.start = self._kept[0][0]
+
+
+class RingBuffer:
+    """Fixed-capacity byte buffer that keeps the most recently written bytes."""
+
+    def __init__(self, capacity):
+        if capacity <= 0:
+            raise ValueError("RingBuffer capacity must be positive")
+        self.capacity = capacity
+        self._buffer = bytearray(capacity)
+        self._write_pos = 0
+        self._size = 0
+
+    def write(self, data):
+        """Append data, overwriting the oldest bytes once the buffer is full"""
+        data = memoryview(data)
+        if len(data) >= self.capacity:
+            self._buffer[:] = data[len(data) - self.capacity :]
+            self._write_pos = 0
+            self._size = self.capacity
+            return
+
+        first = min(len(data), self.capacity - self._write_pos)
+        self._buffer[self._write_pos : self._write_pos + first] = data[:first]
+        rest = len(data) - first
+        if rest:
+            self._buffer[:rest] = data[first:]
+        self._write_pos = (self._write_pos + len(data)) % self.capacity
+        self._size = min(self._size + len(data), self.capacity)
+
+    def getvalue(self):
+        """Return the buffered bytes, oldest first"""
+        if self._size < self.capacity:
+            return bytes(self._buffer[: self._size])
+        return bytes(self._buffer[self._write_pos :] + self._buffer[: self._write_pos])
+
+    def __len__(self):
+        return self._size
+
+
+class LogStream:
+    """Count bytes and lines of a trace fed in chunks, keeping only its tail."""
+
+    def __init__(self, tail_bytes=None):
+        self.byte_count = 0
+        self.newline_count = 0
+        self._tail = RingBuffer(tail_bytes) if tail_bytes else bytearray()
+        self._last_byte = None
+
+    def feed(self, chunk):
+        """Consume the next chunk of raw trace bytes"""
+        if not chunk:
+            return
+        self.byte_count += len(chunk)
+        self.newline_count += chunk.count(b"\n")
+        self._last_byte = chunk[-1:]
+        if isinstance(self._tail, RingBuffer):
+            self._tail.write(chunk)
+        else:
+            self._tail += chunk
+
+    @property
+    def line_count(self):
+        """Number of lines, counting a final line without a trailing newline"""
+        if self._last_byte is None:
+            return 0
+        return self.newline_count + (self._last_byte != b"\n")
+
+    @property
+    def tail(self):
+        """The retained bytes: the last ``tail_bytes`` bytes, or everything when unbounded"""
+        if isinstance(self._tail, RingBuffer):
+            return self._tail.getvalue()
+        return bytes(self._tail)
+
+    @property
+    def tail_start(self):
+        """Byte offset of the first retained byte"""
+        return self.byte_count - len(self._tail)
+
+
+class SectionIndex:
+    """Index the sections of a trace fed in raw byte chunks.
+
+    Each section records its ``name``, nesting ``depth``, the byte offsets
+    ``start`` (of its start marker line) and ``end`` (after its end marker
+    line), the matching 1-based ``start_line``/``end_line``, and its
+    ``duration`` in seconds. ``end`` and ``duration`` stay None for sections
+    that have not ended.
+    """
+
+    def __init__(self):
+        self.sections = []
+        self._open = []
+        self._partial = b""
+        self._partial_start = 0
+        self._line_count = 0
+
+    def feed(self, chunk):
+        """Consume the next chunk of raw trace bytes"""
+        data = self._partial + chunk
+        data_start = self._partial_start
+        cut = data.rfind(b"\n") + 1
+        if cut:
+            self._scan(data[:cut], data_start)
+        self._partial, self._partial_start = data[cut:], data_start + cut
+        if len(self._partial) > MAX_MARKER_LINE_BYTES:
+            self._scan(self._partial, self._partial_start)
+            self._partial_start += len(self._partial)
+            self._partial = b""
+
+    def close(self):
+        """Finish indexing and return the sections, in order of their start"""
+        if self._partial:
+            self._scan(self._partial, self._partial_start)
+            self._partial = b""
+        return self.sections
+
+    @property
+    def complete(self):
+        """Whether every section seen so far has ended"""
+        return not self._open
+
+    def _scan(self, block, base):
+        first_line = self._line_count + 1
+        self._line_count += block.count(b"\n")
+        if b"section_" not in block:
+            return
+
+        for match in _SECTION_RE.finditer(block):
+            kind, timestamp, name = match.group(1), int(match.group(2)), match.group(3).decode()
+            line_start = block.rfind(b"\n", 0, match.start()) + 1
+            line_number = first_line + block.count(b"\n", 0, line_start)
+            if kind == b"start":
+                section = {
+                    "name": name,
+                    "depth": len(self._open),
+                    "start": base + line_start,
+                    "end": None,
+                    "start_line": line_number,
+                    "end_line": None,
+                    "started_at": timestamp,
+                    "duration": None,
+                }
+                self.sections.append(section)
+                self._open.append(section)
+                continue
+
+            # Close the innermost open section of that name, and any left open inside it
+            for index in range(len(self._open) - 1, -1, -1):
+                if self._open[index]["name"] == name:
+                    line_end = block.find(b"\n", match.end())
+                    section = self._open[index]
+                    section["end"] = base + (line_end + 1 if line_end != -1 else len(block))
+                    section["end_line"] = line_number
+                    section["duration"] = max(timestamp - section["started_at"], 0)
+                    del self._open[index:]
+                    break
+
+
+def find_section(sections, name):
+    """Return the first section called name, or None"""
+    return next((section for section in sections if section["name"] == name), None)
+
+
+def section_at_line(sections, line_number):
+    """Return the innermost section containing line_number, or None"""
+    found = None
+    for section in sections:
+        if section["start_line"] > line_number:
+            break
+        end_line = section["end_line"]
+        if end_line is None or line_number <= end_line:
+            if found is None or section["depth"] >= found["depth"]:
+                found = section
+    return found
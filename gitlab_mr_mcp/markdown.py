@@ -0,0 +1,118 @@
+"""Builder for the Markdown text returned by the tools.
+
+Tool output used to be built with ``result += ...`` in loops, which copies the
+whole string on every append once CPython cannot resize it in place. The
+builder collects the parts in a list and joins them once, so building a report
+of thousands of threads or test failures stays linear. ``+=`` appends a part,
+so string-building code converts with a changed initializer and a final
+``build()``.
+
+Reports that can grow without bound render their items in priority order with
+``add_items``, which stops rendering once the output budget is spent. The items
+left out are kept in the result store for ``fetch_more``.
+"""
+
+import logging
+import os
+
+from gitlab_mr_mcp.result_store import result_store
+
+OUTPUT_BUDGET_ENV_VAR = "GITLAB_OUTPUT_TOKEN_BUDGET"
+
+DEFAULT_OUTPUT_TOKEN_BUDGET = 12000
+
+# Rough size of a token in English text and Markdown
+CHARS_PER_TOKEN = 4
+
+
+def configured_output_budget():
+    """Return the output budget in characters from GITLAB_OUTPUT_TOKEN_BUDGET, None if disabled"""
+    value = os.environ.get(OUTPUT_BUDGET_ENV_VAR, "").strip()
+    tokens = DEFAULT_OUTPUT_TOKEN_BUDGET
+    if value:
+        try:
+            tokens = int(value)
+        except ValueError:
+            logging.warning(f"Invalid {OUTPUT_BUDGET_ENV_VAR} {value!r}, using {DEFAULT_OUTPUT_TOKEN_BUDGET}")
+    return tokens * CHARS_PER_TOKEN if tokens > 0 else None
+
+
+class MarkdownBuilder:
+    """Collect Markdown output in parts, joined once by ``build()``."""
+
+    def __init__(self, text=""):
+        self._parts = [text] if text else []
+        self._length = len(text)
+
+    def _append(self, text):
+        self._parts.append(text)
+        self._length += len(text)
+        return self
+
+    def __iadd__(self, text):
+        return self._append(text)
+
+    def add(self, text):
+        """Append raw text"""
+        return self._append(text)
+
+    def line(self, text=""):
+        """Append a line of text"""
+        return self._append(f"{text}\n")
+
+    def heading(self, text, level=1):
+        """Append a heading followed by a blank line"""
+        return self._append(f"{'#' * level} {text}\n\n")
+
+    def field(self, name, value):
+        """Append a ``**name**: value`` line"""
+        return self._append(f"**{name}**: {value}\n")
+
+    def bullet(self, text, indent=0):
+        """Append a list item, indented by two spaces per level"""
+        return self._append(f"{'  ' * indent}- {text}\n")
+
+    def code_block(self, text, language=""):
+        """Append a fenced code block"""
+        return self._append(f"```{language}\n{text}\n```\n")
+
+    def add_items(self, items, render, budget, reserve=0):
+        """Append ``render(item)`` for each item while the output stays within ``budget`` characters.
+
+        ``reserve`` characters are kept free for text appended afterwards.
+        Items are rendered one at a time and rendering stops at the first item
+        that does not fit; the items left out are returned. A budget of None
+        renders everything.
+        """
+        items = list(items)
+        for index, item in enumerate(items):
+            text = render(item)
+            if budget is not None and self._length + len(text) + reserve > budget:
+                return items[index:]
+            self._append(text)
+        return []
+
+    def omitted(self, count, noun, hint="", cursor=None):
+        """Append the marker for items left out by ``add_items``"""
+        if cursor:
+            hint += f'; fetch_more(cursor="{cursor}") returns them'
+        if count:
+            self._append(f"*{count} more {noun} omitted (output budget reached){hint}.*\n\n")
+        return self
+
+    def omit_items(self, items, render, noun, hint=""):
+        """Mark items left out by ``add_items``, keeping their rendered text for fetch_more"""
+        cursor = result_store.add([render(item) for item in items], noun) if items else None
+        return self.omitted(len(items), noun, hint, cursor)
+
+    def __len__(self):
+        return self._length
+
+    def __bool__(self):
+        return any(self._parts)
+
+    def build(self):
+        """Return the collected text"""
+        return "".join(self._parts)
+
+    __str__ = build
@@ -0,0 +1,417 @@
+"""Output schemas of the read tools, declared when structured output is the default.
+
+Kept apart from the tool modules, so that listing the tools does not import
+them (and aiohttp with them).
+"""
+
+from gitlab_mr_mcp.structured import ANY, BOOLEAN, INTEGER, NUMBER, STRING, array_schema, nullable, object_schema
+
+# search_projects
+PROJECT_SCHEMA = object_schema(
+    {
+        "id": INTEGER,
+        "name": STRING,
+        "path_with_namespace": STRING,
+        "description": nullable("string"),
+        "visibility": nullable("string"),
+        "default_branch": nullable("string"),
+        "web_url": STRING,
+        "instance": STRING,
+    },
+    required=["id", "name", "path_with_namespace"],
+)
+
+SEARCH_PROJECTS_OUTPUT_SCHEMA = object_schema(
+    {"projects": array_schema(PROJECT_SCHEMA), "unavailable": array_schema(STRING)}
+)
+
+# list_my_projects
+LIST_MY_PROJECTS_OUTPUT_SCHEMA = object_schema(
+    {
+        "projects": array_schema(
+            {**PROJECT_SCHEMA, "properties": {**PROJECT_SCHEMA["properties"], "open_issues_count": nullable("integer")}}
+        ),
+        "unavailable": array_schema(STRING),
+    }
+)
+
+# list_merge_requests
+MERGE_REQUEST_SCHEMA = object_schema(
+    {
+        "iid": INTEGER,
+        "title": STRING,
+        "state": STRING,
+        "author": nullable("string"),
+        "source_branch": STRING,
+        "target_branch": STRING,
+        "updated_at": nullable("string"),
+        "pipeline_status": nullable("string"),
+        "changes": nullable("string"),
+        "readiness": STRING,
+        "labels": array_schema(STRING),
+        "draft": BOOLEAN,
+        "has_conflicts": BOOLEAN,
+        "web_url": STRING,
+    },
+    required=["iid", "title", "state", "web_url"],
+)
+
+LIST_MERGE_REQUESTS_OUTPUT_SCHEMA = object_schema({"merge_requests": array_schema(MERGE_REQUEST_SCHEMA)})
+
+# get_branch_merge_requests
+GET_BRANCH_MERGE_REQUESTS_OUTPUT_SCHEMA = object_schema({"merge_requests": array_schema(MERGE_REQUEST_SCHEMA)})
+
+# get_merge_request_reviews
+GET_MERGE_REQUEST_REVIEWS_OUTPUT_SCHEMA = object_schema(
+    {
+        "overview": {
+            "type": ["object", "null"],
+            "properties": {
+                "title": STRING,
+                "author": nullable("string"),
+                "state": STRING,
+                "pipeline_status": nullable("string"),
+                "changes": nullable("string"),
+                "readiness": STRING,
+                "has_conflicts": BOOLEAN,
+            },
+        },
+        "approvals": object_schema(
+            {"approved_by": array_schema(STRING), "required": INTEGER, "left": INTEGER},
+        ),
+        "discussions": object_schema({"total": INTEGER, "resolved": INTEGER, "unresolved": INTEGER}),
+        "matching_threads": INTEGER,
+        "offset": INTEGER,
+        "threads": array_schema(
+            object_schema(
+                {
+                    "id": STRING,
+                    "resolved": BOOLEAN,
+                    "notes": array_schema(
+                        object_schema(
+                            {
+                                "id": INTEGER,
+                                "author": nullable("string"),
+                                "created_at": nullable("string"),
+                                "body": STRING,
+                                "path": nullable("string"),
+                                "line": nullable("integer"),
+                            },
+                            required=["id", "body"],
+                        )
+                    ),
+                }
+            )
+        ),
+        "action_items": array_schema(STRING),
+    }
+)
+
+# get_merge_request_details
+GET_MERGE_REQUEST_DETAILS_OUTPUT_SCHEMA = object_schema(
+    {
+        "iid": INTEGER,
+        "title": STRING,
+        "state": STRING,
+        "author": nullable("string"),
+        "source_branch": STRING,
+        "target_branch": STRING,
+        "created_at": nullable("string"),
+        "updated_at": nullable("string"),
+        "pipeline_status": nullable("string"),
+        "changes": nullable("string"),
+        "readiness": STRING,
+        "labels": array_schema(STRING),
+        "draft": BOOLEAN,
+        "has_conflicts": BOOLEAN,
+        "assignees": array_schema(STRING),
+        "reviewers": array_schema(STRING),
+        "approved_by": array_schema(STRING),
+        "approvals_left": nullable("integer"),
+        "discussions": object_schema({"total": INTEGER, "resolved": INTEGER, "unresolved": INTEGER}),
+        "description": nullable("string"),
+        "web_url": STRING,
+    },
+    required=["iid", "title", "state", "web_url"],
+)
+
+# get_merge_requests_overview
+GET_MERGE_REQUESTS_OVERVIEW_OUTPUT_SCHEMA = object_schema(
+    {
+        "merge_requests": array_schema(
+            object_schema(
+                {
+                    "project_id": ANY,
+                    "iid": INTEGER,
+                    "title": STRING,
+                    "state": STRING,
+                    "pipeline_status": nullable("string"),
+                    "approved": nullable("integer"),
+                    "approvals_required": nullable("integer"),
+                    "has_conflicts": BOOLEAN,
+                    "readiness": STRING,
+                    "web_url": nullable("string"),
+                    "error": STRING,
+                },
+                required=["project_id", "iid"],
+            )
+        )
+    }
+)
+
+# get_merge_request_pipeline
+GET_MERGE_REQUEST_PIPELINE_OUTPUT_SCHEMA = object_schema(
+    {
+        "pipeline": {
+            "type": ["object", "null"],
+            "properties": {
+                "id": INTEGER,
+                "status": nullable("string"),
+                "sha": nullable("string"),
+                "ref": nullable("string"),
+                "source": nullable("string"),
+                "created_at": nullable("string"),
+                "duration": nullable("number"),
+                "coverage": ANY,
+                "web_url": nullable("string"),
+            },
+        },
+        "jobs": array_schema(
+            object_schema(
+                {
+                    "id": INTEGER,
+                    "name": nullable("string"),
+                    "stage": nullable("string"),
+                    "status": nullable("string"),
+                    "duration": nullable("number"),
+                    "pipeline_id": INTEGER,
+                    "project_id": ANY,
+                },
+                required=["id", "pipeline_id"],
+            )
+        ),
+        "downstream_pipelines": array_schema(
+            object_schema(
+                {
+                    "id": INTEGER,
+                    "project_id": ANY,
+                    "status": nullable("string"),
+                    "depth": INTEGER,
+                    "triggered_by": nullable("string"),
+                    "error": STRING,
+                },
+                required=["id", "project_id", "depth"],
+            )
+        ),
+    }
+)
+
+# get_pipeline_failure_digest
+JOB_REF_SCHEMA = object_schema({"id": INTEGER, "name": nullable("string"), "project_id": ANY})
+
+GET_PIPELINE_FAILURE_DIGEST_OUTPUT_SCHEMA = object_schema(
+    {
+        "pipeline": {"type": ["object", "null"], "properties": {"id": INTEGER, "status": nullable("string")}},
+        "failed_job_count": INTEGER,
+        "jobs_read": INTEGER,
+        "tail_bytes": INTEGER,
+        "groups": array_schema(
+            object_schema({"pattern": STRING, "jobs": array_schema(JOB_REF_SCHEMA), "lines": array_schema(STRING)})
+        ),
+        "unmatched": array_schema(object_schema({"job": JOB_REF_SCHEMA, "last_lines": array_schema(STRING)})),
+        "unavailable": array_schema(object_schema({"job": JOB_REF_SCHEMA, "error": STRING})),
+    }
+)
+
+# get_pipeline_test_summary
+COUNTS_SCHEMA = object_schema(
+    {"total": INTEGER, "success": INTEGER, "failed": INTEGER, "error": INTEGER, "skipped": INTEGER, "time": NUMBER}
+)
+
+GET_PIPELINE_TEST_SUMMARY_OUTPUT_SCHEMA = object_schema(
+    {
+        "pipeline": {"type": ["object", "null"], "properties": {"id": INTEGER, "web_url": nullable("string")}},
+        "available": BOOLEAN,
+        "counts": {**COUNTS_SCHEMA, "type": ["object", "null"]},
+        "suites": array_schema(
+            object_schema(
+                {
+                    "name": STRING,
+                    "total": INTEGER,
+                    "success": INTEGER,
+                    "failed": INTEGER,
+                    "error": INTEGER,
+                    "time": NUMBER,
+                }
+            )
+        ),
+    }
+)
+
+# get_merge_request_test_report
+CASE_SCHEMA = object_schema(
+    {
+        "suite": STRING,
+        "name": STRING,
+        "status": STRING,
+        "classname": nullable("string"),
+        "file": nullable("string"),
+        "execution_time": nullable("number"),
+        "output": nullable("string"),
+    },
+    required=["suite", "name", "status"],
+)
+
+GET_MERGE_REQUEST_TEST_REPORT_OUTPUT_SCHEMA = object_schema(
+    {
+        "pipeline": GET_PIPELINE_TEST_SUMMARY_OUTPUT_SCHEMA["properties"]["pipeline"],
+        "available": BOOLEAN,
+        "counts": {**COUNTS_SCHEMA, "type": ["object", "null"]},
+        "suites": GET_PIPELINE_TEST_SUMMARY_OUTPUT_SCHEMA["properties"]["suites"],
+        "failed": array_schema(CASE_SCHEMA),
+        "skipped": array_schema(object_schema({"suite": STRING, "name": STRING})),
+    }
+)
+
+# get_job_log
+SECTION_SCHEMA = object_schema(
+    {
+        "name": STRING,
+        "depth": INTEGER,
+        "start_line": INTEGER,
+        "end_line": nullable("integer"),
+        "duration": nullable("number"),
+    }
+)
+
+# Which keys are present depends on the mode: text and window for raw output,
+# failures for errors, job_status and finished for follow
+GET_JOB_LOG_OUTPUT_SCHEMA = object_schema(
+    {
+        "job_id": INTEGER,
+        "mode": STRING,
+        "text": STRING,
+        "collapsed_lines": INTEGER,
+        "window": object_schema(
+            {
+                "start": INTEGER,
+                "end": INTEGER,
+                "total_size": nullable("integer"),
+                "line_count": nullable("integer"),
+            },
+            required=["start", "end"],
+        ),
+        "section": {**SECTION_SCHEMA, "type": ["object", "null"]},
+        "sections": array_schema(SECTION_SCHEMA),
+        "failures": array_schema(
+            object_schema(
+                {
+                    "signatures": array_schema(
+                        object_schema({"pattern": STRING, "line_number": INTEGER, "count": INTEGER})
+                    ),
+                    "section": nullable("string"),
+                    "first_line": INTEGER,
+                    "lines": array_schema(STRING),
+                }
+            )
+        ),
+        "byte_count": INTEGER,
+        "line_count": INTEGER,
+        "dropped_hits": INTEGER,
+        "job_status": STRING,
+        "finished": BOOLEAN,
+    },
+    required=["job_id", "mode"],
+)
+
+# grep_job_log
+GREP_JOB_LOG_OUTPUT_SCHEMA = object_schema(
+    {
+        "job_id": INTEGER,
+        "pattern": STRING,
+        "ignore_case": BOOLEAN,
+        "match_count": INTEGER,
+        "limit_reached": BOOLEAN,
+        "byte_count": INTEGER,
+        "line_count": INTEGER,
+        "regions": array_schema(
+            array_schema(object_schema({"line": INTEGER, "offset": INTEGER, "text": STRING, "matched": BOOLEAN}))
+        ),
+    }
+)
+
+# get_commit_discussions
+NOTE_SCHEMA = object_schema(
+    {
+        "discussion_id": nullable("string"),
+        "author": nullable("string"),
+        "body": STRING,
+        "path": nullable("string"),
+        "line": nullable("integer"),
+        "created_at": nullable("string"),
+    },
+    required=["body"],
+)
+
+GET_COMMIT_DISCUSSIONS_OUTPUT_SCHEMA = object_schema(
+    {
+        "commit_count": INTEGER,
+        "discussion_count": INTEGER,
+        "not_found": array_schema(STRING),
+        "commit_comments": array_schema(
+            object_schema(
+                {"sha": STRING, "title": STRING, "comments": {"type": ["array", "null"], "items": NOTE_SCHEMA}}
+            )
+        ),
+        "commits": array_schema(
+            object_schema(
+                {
+                    "sha": STRING,
+                    "title": STRING,
+                    "author": nullable("string"),
+                    "committed_date": nullable("string"),
+                    "notes": array_schema(NOTE_SCHEMA),
+                }
+            )
+        ),
+    }
+)
+
+# list_project_members
+LIST_PROJECT_MEMBERS_OUTPUT_SCHEMA = object_schema(
+    {
+        "members": array_schema(
+            object_schema(
+                {
+                    "id": INTEGER,
+                    "username": STRING,
+                    "name": STRING,
+                    "state": nullable("string"),
+                    "access_level": INTEGER,
+                    "role": STRING,
+                },
+                required=["id", "username"],
+            )
+        )
+    }
+)
+
+# list_project_labels
+LIST_PROJECT_LABELS_OUTPUT_SCHEMA = object_schema(
+    {
+        "labels": array_schema(
+            object_schema(
+                {
+                    "name": STRING,
+                    "description": nullable("string"),
+                    "color": nullable("string"),
+                    "is_project_label": BOOLEAN,
+                },
+                required=["name"],
+            )
+        )
+    }
+)
+
+# fetch_more
+FETCH_MORE_OUTPUT_SCHEMA = object_schema({"text": STRING, "next_cursor": nullable("string"), "remaining": INTEGER})
@@ -0,0 +1,216 @@
+"""Speculative prefetch of the tool calls likely to follow a foreground call.
+
+Agent workflows are predictable: after ``get_merge_request_pipeline`` shows
+failed jobs the next call is usually ``get_job_log`` on one of them, after
+``list_merge_requests`` it is ``get_merge_request_details`` on the top merge
+request. When a tool call returns, the rule registered for the tool predicts
+such calls and makes them in the background, at prefetch priority and within a
+budget of ``GITLAB_PREFETCH_MAX_REQUESTS`` GitLab requests (20 by default, 0
+disables prefetching). A later call with the same arguments is answered with
+the prefetched result, or waits for the prefetch still in flight, whose
+requests then move up to the priority of the call. Any foreground call cancels
+the speculation still in progress, and a write call also drops the results
+prefetched so far. Each MCP session has an engine of its own, so sessions
+served by one HTTP server neither cancel nor receive each other's prefetches.
+"""
+
+import asyncio
+import importlib
+import json
+import logging
+import os
+import weakref
+
+from gitlab_mr_mcp.cache import TTLCache
+from gitlab_mr_mcp.governor import (
+    PREFETCH,
+    RequestBudget,
+    RequestGroup,
+    request_budget,
+    request_governor,
+    request_group,
+    request_priority,
+)
+from gitlab_mr_mcp.registry import DEFAULT_PROJECT, PROJECT
+from gitlab_mr_mcp.tool_specs import registry
+
+DEFAULT_MAX_REQUESTS = 20
+
+# Seconds a prefetched result may answer a call
+PREFETCH_TTL = 60
+
+# Rules by the tool whose call triggers them, given by dotted path like tool handlers.
+# A rule is called as rule(gitlab_url, project_id, access_token, args) with the
+# arguments of the triggering call and returns the predicted (tool name, arguments).
+RULES = {
+    "get_merge_request_pipeline": "gitlab_mr_mcp.prefetch_rules.failed_job_logs",
+    "list_merge_requests": "gitlab_mr_mcp.prefetch_rules.top_merge_request_details",
+}
+
+# Arguments of the triggering call carried over to the predicted calls
+INHERITED_ARGUMENTS = ("instance", "output_format")
+
+
+def _resolve(rule):
+    if isinstance(rule, str):
+        module_name, _, function_name = rule.rpartition(".")
+        return getattr(importlib.import_module(module_name), function_name)
+    return rule
+
+
+class PrefetchEngine:
+    """Runs the rules triggered by foreground tool calls and keeps the results of the calls they predict."""
+
+    def __init__(self, tools, rules, max_requests=DEFAULT_MAX_REQUESTS, ttl=PREFETCH_TTL, stats=None):
+        self.tools = tools
+        self.rules = dict(rules)
+        self.max_requests = max_requests
+        self.results = TTLCache(max_entries=64, ttl=ttl)
+        self._pending = {}
+        self._rule_tasks = set()
+        self.stats = stats if stats is not None else {"prefetched": 0, "hits": 0, "cancelled": 0}
+
+    @property
+    def enabled(self):
+        return self.max_requests > 0
+
+    def key(self, spec, config, arguments):
+        """Identity of a call for matching it against prefetches, None if its result cannot be reused"""
+        if spec is None or not spec.cacheable or spec.scope not in (PROJECT, DEFAULT_PROJECT):
+            return None
+        try:
+            instance, project_id = spec.route(config, arguments)
+        except ValueError:
+            return None
+        # Arguments left at their declared default match calls that omit them
+        properties = spec.input_schema["properties"]
+        rest = {
+            name: value
+            for name, value in arguments.items()
+            if name not in ("project_id", "instance")
+            and value is not None
+            and not ("default" in properties.get(name, {}) and properties[name]["default"] == value)
+        }
+        return (spec.name, instance["name"], str(project_id), json.dumps(rest, sort_keys=True, default=str))
+
+    async def call(self, spec, config, arguments):
+        """Make a foreground tool call, answered by a matching prefetch when there is one, then run its rule"""
+        key = self.key(spec, config, arguments) if self.enabled else None
+        in_flight = self._pending.pop(key, None) if key else None
+        self.cancel()
+        if not spec.read_only:
+            # A write makes the prefetched results stale
+            self.results.clear()
+
+        result = None
+        if in_flight is not None:
+            task, group = in_flight
+            # Someone waits for the prefetch now, so its queued requests must not wait behind speculation
+            request_governor.promote(group, spec.priority)
+            result = await task
+        elif key is not None:
+            result = self.results.pop(key)
+        if result is not None:
+            self.stats["hits"] += 1
+            logging.info(f"Answered {spec.name} from a prefetch")
+        else:
+            result = await spec.call(config, arguments)
+
+        self.trigger(spec, config, arguments)
+        return result
+
+    def trigger(self, spec, config, arguments):
+        """Start the rule of the tool just called, if it has one"""
+        rule = self.rules.get(spec.name)
+        if rule is None or not self.enabled:
+            return
+        task = asyncio.create_task(self._run_rule(rule, spec, config, arguments))
+        self._rule_tasks.add(task)
+        task.add_done_callback(self._rule_tasks.discard)
+
+    def cancel(self):
+        """Cancel the speculation in progress; results already prefetched are kept"""
+        for task in self._rule_tasks:
+            task.cancel()
+        for task, _group in self._pending.values():
+            task.cancel()
+        self.stats["cancelled"] += len(self._pending)
+        self._pending.clear()
+
+    async def _run_rule(self, rule, spec, config, arguments):
+        # Set in this task's context, so inherited by the prefetches it starts
+        request_budget.set(RequestBudget(self.max_requests))
+        request_priority.set(PREFETCH)
+        try:
+            instance, project_id = spec.route(config, arguments)
+            predictions = await _resolve(rule)(instance["gitlab_url"], project_id, instance["access_token"], arguments)
+        except Exception as e:
+            logging.info(f"Prefetch rule of {spec.name} failed: {e}")
+            return
+
+        for name, predicted_arguments in predictions:
+            predicted_arguments = {
+                **{argument: arguments[argument] for argument in INHERITED_ARGUMENTS if argument in arguments},
+                **predicted_arguments,
+            }
+            predicted = self.tools.get(name)
+            key = self.key(predicted, config, predicted_arguments)
+            if key is None or key in self._pending or key in self.results:
+                continue
+            group = RequestGroup(PREFETCH)
+            task = asyncio.create_task(self._prefetch(predicted, config, predicted_arguments, key, group))
+            self._pending[key] = (task, group)
+
+    async def _prefetch(self, spec, config, arguments, key, group):
+        """Make a predicted call; its result is kept unless a foreground call already took it over"""
+        request_group.set(group)
+        try:
+            result = await spec.call(config, arguments, priority=PREFETCH)
+        except Exception as e:
+            logging.info(f"Prefetch of {spec.name} failed: {e}")
+            self._release(key)
+            return None
+        self.stats["prefetched"] += 1
+        if self._release(key):
+            self.results.set(key, result)
+        return result
+
+    def _release(self, key):
+        """Stop tracking the current prefetch task; False if a foreground call has taken it over"""
+        task, _group = self._pending.get(key, (None, None))
+        if task is asyncio.current_task():
+            del self._pending[key]
+            return True
+        return False
+
+
+class SessionPrefetchEngines:
+    """A prefetch engine per MCP session, dropped with the session; stats are summed over all sessions."""
+
+    def __init__(self, tools, rules=RULES, max_requests=DEFAULT_MAX_REQUESTS):
+        self.tools = tools
+        self.rules = rules
+        self.max_requests = max_requests
+        self.stats = {"prefetched": 0, "hits": 0, "cancelled": 0}
+        self._engines = weakref.WeakKeyDictionary()
+
+    @classmethod
+    def from_env(cls, tools, rules=RULES):
+        value = os.environ.get("GITLAB_PREFETCH_MAX_REQUESTS", str(DEFAULT_MAX_REQUESTS))
+        try:
+            max_requests = max(int(value), 0)
+        except ValueError:
+            logging.warning(f"Invalid GITLAB_PREFETCH_MAX_REQUESTS {value!r}, using {DEFAULT_MAX_REQUESTS}")
+            max_requests = DEFAULT_MAX_REQUESTS
+        return cls(tools, rules, max_requests)
+
+    def for_session(self, session):
+        """The engine of an MCP session, created on its first tool call"""
+        engine = self._engines.get(session)
+        if engine is None:
+            engine = PrefetchEngine(self.tools, self.rules, self.max_requests, stats=self.stats)
+            self._engines[session] = engine
+        return engine
+
+
+prefetch_engines = SessionPrefetchEngines.from_env(registry)
@@ -0,0 +1,52 @@
+"""Prefetch rules: the tool calls likely to follow a call, see ``prefetch``."""
+
+from gitlab_mr_mcp.gitlab_api import get_merge_request_pipeline, get_merge_requests, get_pipeline_job_graph
+from gitlab_mr_mcp.tools.get_merge_request_pipeline import DEFAULT_DOWNSTREAM_DEPTH
+from gitlab_mr_mcp.tools.list_merge_requests import merge_request_params
+
+# Failed jobs whose logs are prefetched after a pipeline is shown
+MAX_FAILED_JOB_LOGS = 3
+
+
+async def failed_job_logs(gitlab_url, project_id, access_token, args):
+    """After get_merge_request_pipeline: the tails of the logs of the first failed jobs.
+
+    Only tails are prefetched, as the failure scan downloads whole logs.
+    Finished job graphs are cached, so only the pipeline lookup is repeated.
+    """
+    status, pipeline, _ = await get_merge_request_pipeline(
+        gitlab_url, project_id, access_token, args["merge_request_iid"]
+    )
+    if status != 200 or not pipeline or not pipeline.get("id"):
+        return []
+    status, graph, _ = await get_pipeline_job_graph(
+        gitlab_url,
+        project_id,
+        access_token,
+        pipeline["id"],
+        max_depth=args.get("downstream_depth", DEFAULT_DOWNSTREAM_DEPTH),
+    )
+    if status != 200:
+        return []
+    failed = [
+        (job_pipeline["project_id"], job)
+        for job_pipeline in graph["pipelines"]
+        for job in job_pipeline["jobs"]
+        if job.get("status") == "failed"
+    ]
+    return [
+        ("get_job_log", {"project_id": str(job_project_id), "job_id": job["id"], "mode": "tail"})
+        for job_project_id, job in failed[:MAX_FAILED_JOB_LOGS]
+    ]
+
+
+async def top_merge_request_details(gitlab_url, project_id, access_token, args):
+    """After list_merge_requests: the details of the merge request listed first"""
+    status, merge_requests, _ = await get_merge_requests(
+        gitlab_url, project_id, access_token, {**merge_request_params(args), "per_page": 1}
+    )
+    if status != 200 or not merge_requests:
+        return []
+    return [
+        ("get_merge_request_details", {"project_id": str(project_id), "merge_request_iid": merge_requests[0]["iid"]})
+    ]
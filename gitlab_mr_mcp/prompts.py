@@ -12,6 +12,7 @@ TO FIND MERGE REQUEST:
 - Know the MR number? → Use it directly as merge_request_iid
 - Know the branch? → get_branch_merge_requests(branch_name="...")
 - Want to browse? → list_merge_requests(state="opened")
+- Checking many MRs at once? → get_merge_requests_overview(merge_request_iids=[...])
 
 All other tools need project_id + merge_request_iid.
 """
@@ -24,12 +25,14 @@ FOR TEST FAILURES:
 2. get_merge_request_test_report → Detailed errors + stack traces (use this for fixing)
 
 FOR BUILD/OTHER FAILURES:
-1. get_merge_request_pipeline → See all jobs, find failed job_id
-2. get_job_log(job_id=...) → Get full output for that job
+1. get_pipeline_failure_digest → Failures of all failed jobs at once, grouped across jobs
+2. get_merge_request_pipeline → See all jobs, find failed job_id
+3. get_job_log(job_id=...) → Failures found in that job's log, with context
+4. grep_job_log(job_id=..., pattern=...) → Find specific lines in a huge log
 
 DECISION TREE:
 - "Tests failed" → Start with test_report
-- "Build failed" → Start with pipeline → job_log
+- "Build failed" → Start with failure_digest, then job_log for one job
 - "Quick status check" → Use test_summary
 """
 
@@ -38,6 +41,7 @@ Code review workflow:
 
 READ REVIEWS:
 - get_merge_request_reviews → Returns discussions with discussion_id
+- Large MR? → get_merge_request_reviews(unresolved_only=true) or filter by file_path/author
 
 RESPOND:
 - reply_to_review_comment(discussion_id, body) → Reply to thread
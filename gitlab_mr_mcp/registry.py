@@ -0,0 +1,178 @@
+"""Declarative registry of the tools the server exposes.
+
+Each tool is declared once, as a ``ToolSpec`` in ``tool_specs``: its MCP
+definition, the handler that implements it and metadata about the GitLab
+requests it makes. The MCP ``Tool`` objects are built once per output format
+default, and a call is dispatched with a dict lookup by tool name. Handlers
+given by dotted path are imported on first call, which keeps the tool modules
+and aiohttp off the startup path.
+"""
+
+import importlib
+
+from mcp.types import Tool
+
+from gitlab_mr_mcp.governor import INTERACTIVE, request_priority
+from gitlab_mr_mcp.instances import instance_names, instance_schema, select_instance
+from gitlab_mr_mcp.structured import OUTPUT_FORMAT_SCHEMA
+
+# How the server calls a tool's handler
+PROJECT = "project"  # handler(gitlab_url, project_id, access_token, args), project_id required
+DEFAULT_PROJECT = "default_project"  # as PROJECT, but the configured project_id is only a default
+INSTANCES = "instances"  # handler(instances, args), asking every instance unless one is named
+LOCAL = "local"  # handler(args), without calling GitLab
+
+
+def resolve_project_id(arguments, default_project_id):
+    """Resolve project_id from arguments or fall back to default."""
+    project_id = arguments.get("project_id") or default_project_id
+    if not project_id:
+        raise ValueError(
+            "project_id is required but not provided. "
+            "Please call search_projects(search='project name') or list_my_projects() first to find the project ID, "
+            "then pass it as project_id parameter."
+        )
+    return project_id
+
+
+class ToolSpec:
+    """A tool's MCP definition, its handler and metadata about the requests it makes.
+
+    Read-only tools accept ``output_format``, declare the ``output_schema`` of
+    their structured results and are cacheable unless stated otherwise;
+    ``priority`` is the class of the GitLab requests they make.
+    """
+
+    def __init__(
+        self,
+        name,
+        title,
+        description,
+        input_schema,
+        handler,
+        scope=PROJECT,
+        read_only=True,
+        destructive=False,
+        cacheable=None,
+        priority=INTERACTIVE,
+        output_schema=None,
+    ):
+        self.name = name
+        self.title = title
+        self.description = description
+        self._handler = handler
+        self.scope = scope
+        self.read_only = read_only
+        self.destructive = destructive
+        self.cacheable = read_only if cacheable is None else cacheable
+        self.priority = priority
+        self.output_schema = output_schema if read_only else None
+        if read_only:
+            input_schema = {
+                **input_schema,
+                "properties": {**input_schema["properties"], "output_format": OUTPUT_FORMAT_SCHEMA},
+            }
+        self.input_schema = input_schema
+
+    @property
+    def handler(self):
+        """The handler function; a dotted path is imported on first use"""
+        if isinstance(self._handler, str):
+            module_name, _, function_name = self._handler.rpartition(".")
+            self._handler = getattr(importlib.import_module(module_name), function_name)
+        return self._handler
+
+    @property
+    def annotations(self):
+        annotations = {"readOnlyHint": self.read_only}
+        if self.destructive:
+            annotations["destructiveHint"] = True
+        return annotations
+
+    def definition(self, structured_default, instances=()):
+        """The MCP Tool; the output schema is declared when structured output is the default.
+
+        With several GitLab instances, tools that call GitLab take an ``instance`` argument.
+        """
+        input_schema = self.input_schema
+        if len(instances) > 1 and self.scope != LOCAL:
+            input_schema = {
+                **input_schema,
+                "properties": {**input_schema["properties"], "instance": instance_schema(instances)},
+            }
+        return Tool(
+            name=self.name,
+            title=self.title,
+            description=self.description,
+            annotations=self.annotations,
+            inputSchema=input_schema,
+            outputSchema=self.output_schema if structured_default else None,
+        )
+
+    async def call(self, config, arguments, priority=None):
+        """Call the handler with the arguments its scope needs, on the instance the call is routed to.
+
+        The GitLab requests it makes are queued with the spec's priority unless another is given.
+        """
+        token = request_priority.set(priority or self.priority)
+        try:
+            return await self._call(config, arguments)
+        finally:
+            request_priority.reset(token)
+
+    async def _call(self, config, arguments):
+        if self.scope == LOCAL:
+            return await self.handler(arguments)
+        instances = config["instances"]
+        if self.scope == INSTANCES:
+            if arguments.get("instance"):
+                instances = [select_instance(instances, arguments)]
+            return await self.handler(instances, arguments)
+        instance, project_id = self.route(config, arguments)
+        return await self.handler(instance["gitlab_url"], project_id, instance["access_token"], arguments)
+
+    def route(self, config, arguments):
+        """The instance and project a project-scoped call goes to"""
+        instance = select_instance(config["instances"], arguments)
+        if self.scope == DEFAULT_PROJECT:
+            return instance, arguments.get("project_id") or instance["project_id"]
+        return instance, resolve_project_id(arguments, instance["project_id"])
+
+
+class ToolRegistry:
+    """Tool specs by name, with their MCP definitions built once."""
+
+    def __init__(self, specs=()):
+        self._specs = {}
+        self._definitions = {}
+        for spec in specs:
+            self.register(spec)
+
+    def register(self, spec):
+        if spec.name in self._specs:
+            raise ValueError(f"Tool {spec.name!r} is already registered")
+        self._specs[spec.name] = spec
+        self._definitions.clear()
+        return spec
+
+    def get(self, name):
+        return self._specs.get(name)
+
+    def __getitem__(self, name):
+        return self._specs[name]
+
+    def __contains__(self, name):
+        return name in self._specs
+
+    def __iter__(self):
+        return iter(self._specs.values())
+
+    def __len__(self):
+        return len(self._specs)
+
+    def definitions(self, structured_default=False, instances=()):
+        """The MCP Tools of all registered specs, in registration order"""
+        key = (structured_default, tuple(instance_names(instances)))
+        if key not in self._definitions:
+            self._definitions[key] = [spec.definition(structured_default, instances) for spec in self]
+        return self._definitions[key]
@@ -0,0 +1,210 @@
+"""Incremental parser for GitLab pipeline test reports.
+
+The ``/pipelines/:id/test_report`` response of a large monorepo can hold
+hundreds of thousands of test cases, while only the non-passing ones are ever
+rendered. ``TestReportParser`` walks the JSON as it arrives and keeps the report
+and suite level fields, but only materializes test cases that did not pass.
+Each test case object is decoded on its own with the C JSON decoder, so the
+parser stays fast while peak memory is bounded by the read buffer plus the
+failures that are kept.
+"""
+
+import codecs
+import json
+
+PASSED_STATUSES = ("success",)
+
+SUITE_COUNT_KEYS = {
+    "success": "success_count",
+    "failed": "failed_count",
+    "skipped": "skipped_count",
+    "error": "error_count",
+}
+
+_WHITESPACE = " \t\n\r"
+_NUMBER_CHARS = "0123456789.eE+-"
+_COMPACT_THRESHOLD = 64 * 1024
+_LITERALS = ("true", "false", "null", "NaN", "Infinity", "-Infinity")
+
+
+def _may_continue(error):
+    """Whether a decode error may only be due to the value running past the end of the buffer"""
+    rest = error.doc[error.pos :].lstrip(_WHITESPACE)
+    if error.msg.startswith("Unterminated string"):
+        return True
+    if error.msg.startswith("Invalid \\uXXXX escape"):
+        return len(rest) < 6
+    return all(char in _NUMBER_CHARS for char in rest) or any(literal.startswith(rest) for literal in _LITERALS)
+
+
+class TestReportParser:
+    """Parse a test report fed in text chunks, keeping only non-passing test cases.
+
+    Call ``feed`` with decoded text as it arrives and ``close`` at the end of the
+    stream to get the report dict. The result has the same shape as GitLab's
+    response, except that each suite's ``test_cases`` only lists test cases whose
+    status is not ``success``.
+    """
+
+    __test__ = False  # not a pytest test class
+
+    def __init__(self):
+        self.report = {}
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+        self._done = False
+        self._parser = self._parse_report()
+        next(self._parser)
+
+    def feed(self, text):
+        """Feed the next chunk of the document"""
+        if self._done:
+            if text.strip():
+                raise ValueError("Unexpected data after end of test report")
+            return
+        # Consumed text is dropped before appending, so the old and new buffers are never both large
+        self._buffer = self._buffer[self._pos :] + text
+        self._pos = 0
+        self._resume()
+
+    def close(self):
+        """Signal end of input and return the parsed report"""
+        self._eof = True
+        if not self._done:
+            self._resume()
+        if not self._done:
+            raise ValueError("Truncated test report")
+        return self.report
+
+    def _resume(self):
+        try:
+            self._parser.send(None)
+        except StopIteration:
+            self._done = True
+
+    # Primitive readers. They are generators that yield whenever they need more
+    # input; ``_resume`` drives them again once more text has been fed.
+
+    def _peek(self):
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in _WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if self._eof:
+                raise ValueError("Truncated test report")
+            yield
+
+    def _expect(self, char):
+        found = yield from self._peek()
+        if found != char:
+            raise ValueError(f"Invalid test report: expected {char!r} at offset {self._pos}, found {found!r}")
+        self._pos += 1
+
+    def _read_value(self):
+        yield from self._peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError as e:
+                # Malformed input fails right away rather than after buffering the rest of the stream
+                if self._eof or not _may_continue(e):
+                    raise
+            else:
+                # A number running into the end of the buffer may continue in the next chunk
+                cut_off = type(value) in (int, float) and (
+                    end == len(self._buffer) or self._buffer[end] in _NUMBER_CHARS
+                )
+                if self._eof or not cut_off:
+                    self._pos = end
+                    self._compact()
+                    return value
+            yield
+
+    def _compact(self):
+        if self._pos > _COMPACT_THRESHOLD:
+            self._buffer = self._buffer[self._pos :]
+            self._pos = 0
+
+    def _walk_object(self, on_member):
+        yield from self._expect("{")
+        if (yield from self._peek()) == "}":
+            self._pos += 1
+            return
+        while True:
+            key = yield from self._read_value()
+            yield from self._expect(":")
+            yield from on_member(key)
+            separator = yield from self._peek()
+            self._pos += 1
+            if separator == "}":
+                return
+            if separator != ",":
+                raise ValueError(f"Invalid test report: unexpected {separator!r} at offset {self._pos - 1}")
+
+    def _walk_array(self, on_item):
+        yield from self._expect("[")
+        if (yield from self._peek()) == "]":
+            self._pos += 1
+            return
+        while True:
+            yield from on_item()
+            separator = yield from self._peek()
+            self._pos += 1
+            if separator == "]":
+                return
+            if separator != ",":
+                raise ValueError(f"Invalid test report: unexpected {separator!r} at offset {self._pos - 1}")
+
+    # Report structure
+
+    def _parse_report(self):
+        yield
+        self.report["test_suites"] = []
+
+        def on_member(key):
+            if key == "test_suites":
+                yield from self._walk_array(self._parse_suite)
+            else:
+                self.report[key] = yield from self._read_value()
+
+        yield from self._walk_object(on_member)
+
+    def _parse_suite(self):
+        suite = {"test_cases": []}
+        counts = dict.fromkeys(SUITE_COUNT_KEYS.values(), 0)
+        counts["total_count"] = 0
+
+        def on_case():
+            test_case = yield from self._read_value()
+            status = test_case.get("status") if isinstance(test_case, dict) else None
+            counts["total_count"] += 1
+            if status in SUITE_COUNT_KEYS:
+                counts[SUITE_COUNT_KEYS[status]] += 1
+            if status not in PASSED_STATUSES:
+                suite["test_cases"].append(test_case)
+
+        def on_member(key):
+            if key == "test_cases":
+                yield from self._walk_array(on_case)
+            else:
+                suite[key] = yield from self._read_value()
+
+        yield from self._walk_object(on_member)
+
+        # Fall back to counted aggregates when GitLab did not report them
+        for key, value in counts.items():
+            suite.setdefault(key, value)
+        self.report["test_suites"].append(suite)
+
+
+async def parse_test_report_stream(chunks):
+    """Parse a test report from an async iterable of raw byte chunks"""
+    parser = TestReportParser()
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    async for chunk in chunks:
+        parser.feed(decoder.decode(chunk))
+    parser.feed(decoder.decode(b"", final=True))
+    return parser.close()
@@ -0,0 +1,116 @@
+"""In-memory store for the parts of tool output cut by the output budget.
+
+When a report does not fit in the output budget, the items left out are
+rendered and kept here under a random cursor, so ``fetch_more`` can return
+them page by page without calling GitLab again. Entries expire after
+``GITLAB_RESULT_STORE_TTL`` seconds (900 by default) and the store holds at
+most ``GITLAB_RESULT_STORE_MAX_MB`` of text (32 by default, 0 disables it),
+dropping the oldest entries first.
+"""
+
+import logging
+import os
+import secrets
+import time
+from collections import OrderedDict
+
+DEFAULT_MAX_MB = 32
+
+DEFAULT_TTL = 900
+
+
+class ResultStore:
+    """Size-bounded, expiring store of rendered output chunks keyed by cursor."""
+
+    def __init__(self, max_bytes=DEFAULT_MAX_MB * 1024 * 1024, ttl=DEFAULT_TTL):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.total_bytes = 0
+        self._entries = OrderedDict()
+
+    @classmethod
+    def from_env(cls):
+        max_mb = os.environ.get("GITLAB_RESULT_STORE_MAX_MB", str(DEFAULT_MAX_MB))
+        try:
+            max_bytes = int(float(max_mb) * 1024 * 1024)
+        except ValueError:
+            logging.warning(f"Invalid GITLAB_RESULT_STORE_MAX_MB {max_mb!r}, using {DEFAULT_MAX_MB}")
+            max_bytes = DEFAULT_MAX_MB * 1024 * 1024
+        ttl = os.environ.get("GITLAB_RESULT_STORE_TTL", str(DEFAULT_TTL))
+        try:
+            ttl = float(ttl)
+        except ValueError:
+            logging.warning(f"Invalid GITLAB_RESULT_STORE_TTL {ttl!r}, using {DEFAULT_TTL}")
+            ttl = DEFAULT_TTL
+        return cls(max_bytes, ttl)
+
+    @property
+    def enabled(self):
+        return self.max_bytes > 0
+
+    def add(self, chunks, noun):
+        """Store the remaining output chunks and return their cursor, or None if they cannot be kept"""
+        chunks = [chunk for chunk in chunks if chunk]
+        size = sum(len(chunk) for chunk in chunks)
+        if not self.enabled or not chunks or size > self.max_bytes:
+            return None
+        self._expire()
+        cursor = secrets.token_urlsafe(12)
+        self._entries[cursor] = (chunks, noun, size, time.monotonic() + self.ttl)
+        self.total_bytes += size
+        while self.total_bytes > self.max_bytes:
+            self._drop(next(iter(self._entries)))
+        return cursor
+
+    def take(self, cursor, budget):
+        """Remove the entry for cursor and return ``(chunks, noun, next_cursor)``.
+
+        ``chunks`` are the leading chunks that fit in ``budget`` characters,
+        at least one so every call makes progress; the rest is stored again
+        under ``next_cursor``. Returns None for unknown or expired cursors.
+        """
+        self._expire()
+        if cursor not in self._entries:
+            return None
+        chunks, noun, _size, _expires_at = self._entries[cursor]
+        self._drop(cursor)
+
+        taken, used = [], 0
+        for chunk in chunks:
+            if taken and budget is not None and used + len(chunk) > budget:
+                break
+            taken.append(chunk)
+            used += len(chunk)
+        return taken, noun, self.add(chunks[len(taken) :], noun)
+
+    def remaining(self, cursor):
+        """Number of chunks stored under cursor"""
+        entry = self._entries.get(cursor)
+        return len(entry[0]) if entry else 0
+
+    def clear(self):
+        self._entries.clear()
+        self.total_bytes = 0
+
+    def __contains__(self, cursor):
+        self._expire()
+        return cursor in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _expire(self):
+        now = time.monotonic()
+        # Entries share one TTL, so they expire in insertion order
+        while self._entries:
+            cursor = next(iter(self._entries))
+            if self._entries[cursor][3] > now:
+                break
+            self._drop(cursor)
+
+    def _drop(self, cursor):
+        _chunks, _noun, size, _expires_at = self._entries.pop(cursor)
+        self.total_bytes -= size
+
+
+result_store = ResultStore.from_env()
@@ -0,0 +1,72 @@
+"""Structured (JSON) output for the read tools.
+
+Read tools render Markdown by default. With ``output_format="json"`` in a call,
+or ``GITLAB_OUTPUT_FORMAT=json`` for the whole server, they skip rendering and
+return a compact dict instead, which the server sends as ``structuredContent``
+(and as minified JSON text for clients that only read content). When JSON is
+the server default each read tool also declares its ``outputSchema``.
+"""
+
+import json
+import logging
+import os
+
+OUTPUT_FORMATS = ("markdown", "json")
+
+OUTPUT_FORMAT_ENV_VAR = "GITLAB_OUTPUT_FORMAT"
+
+OUTPUT_FORMAT_SCHEMA = {
+    "type": "string",
+    "enum": list(OUTPUT_FORMATS),
+    "description": "markdown: formatted text (default); json: compact structured result",
+}
+
+
+def configured_output_format():
+    """Return the server-wide output format from GITLAB_OUTPUT_FORMAT"""
+    output_format = os.environ.get(OUTPUT_FORMAT_ENV_VAR, "markdown").strip().lower()
+    if output_format not in OUTPUT_FORMATS:
+        logging.warning(f"Invalid {OUTPUT_FORMAT_ENV_VAR} {output_format!r}, using markdown")
+        return "markdown"
+    return output_format
+
+
+def wants_json(args):
+    """Whether a tool call asked for structured output, explicitly or through the server default"""
+    return (args.get("output_format") or configured_output_format()) == "json"
+
+
+def dump_json(data):
+    """Serialize structured output without whitespace"""
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+def pick(data, *keys):
+    """Return the given keys of a GitLab API object"""
+    return {key: data.get(key) for key in keys}
+
+
+def username(user):
+    return user.get("username") if user else None
+
+
+# Schema helpers; nullable fields use ["<type>", "null"]
+
+
+def object_schema(properties, required=None):
+    return {"type": "object", "properties": properties, "required": list(required or properties)}
+
+
+def array_schema(items):
+    return {"type": "array", "items": items}
+
+
+def nullable(schema_type):
+    return {"type": [schema_type, "null"]}
+
+
+STRING = {"type": "string"}
+INTEGER = {"type": "integer"}
+NUMBER = {"type": "number"}
+BOOLEAN = {"type": "boolean"}
+ANY = {}
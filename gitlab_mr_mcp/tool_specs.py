@@ -0,0 +1,882 @@
+"""Specs of the tools the server exposes, in the order clients list them.
+
+Handlers are given by dotted path, so a tool module (and aiohttp with it) is
+only imported when a tool is first called; output schemas come from the light
+``output_schemas`` module.
+"""
+
+from gitlab_mr_mcp.governor import BULK
+from gitlab_mr_mcp.output_schemas import (
+    FETCH_MORE_OUTPUT_SCHEMA,
+    GET_BRANCH_MERGE_REQUESTS_OUTPUT_SCHEMA,
+    GET_COMMIT_DISCUSSIONS_OUTPUT_SCHEMA,
+    GET_JOB_LOG_OUTPUT_SCHEMA,
+    GET_MERGE_REQUEST_DETAILS_OUTPUT_SCHEMA,
+    GET_MERGE_REQUEST_PIPELINE_OUTPUT_SCHEMA,
+    GET_MERGE_REQUEST_REVIEWS_OUTPUT_SCHEMA,
+    GET_MERGE_REQUEST_TEST_REPORT_OUTPUT_SCHEMA,
+    GET_MERGE_REQUESTS_OVERVIEW_OUTPUT_SCHEMA,
+    GET_PIPELINE_FAILURE_DIGEST_OUTPUT_SCHEMA,
+    GET_PIPELINE_TEST_SUMMARY_OUTPUT_SCHEMA,
+    GREP_JOB_LOG_OUTPUT_SCHEMA,
+    LIST_MERGE_REQUESTS_OUTPUT_SCHEMA,
+    LIST_MY_PROJECTS_OUTPUT_SCHEMA,
+    LIST_PROJECT_LABELS_OUTPUT_SCHEMA,
+    LIST_PROJECT_MEMBERS_OUTPUT_SCHEMA,
+    SEARCH_PROJECTS_OUTPUT_SCHEMA,
+)
+from gitlab_mr_mcp.registry import INSTANCES, LOCAL, ToolRegistry, ToolSpec
+
+PROJECT_ID_SCHEMA = {
+    "type": "string",
+    "description": (
+        "GitLab project ID or path (e.g., '12345' or 'group/project'). "
+        "IMPORTANT: If unknown, first call search_projects or list_my_projects to find it."
+    ),
+}
+
+registry = ToolRegistry(
+    [
+        ToolSpec(
+            name="search_projects",
+            title="Search Projects",
+            description=(
+                "PRIMARY tool to find projects. Use when user mentions ANY project name. "
+                "ALWAYS prefer this over list_my_projects."
+            ),
+            handler="gitlab_mr_mcp.tools.search_projects.search_projects",
+            output_schema=SEARCH_PROJECTS_OUTPUT_SCHEMA,
+            scope=INSTANCES,
+            input_schema={
+                "type": "object",
+                "properties": {
+                    "search": {
+                        "type": "string",
+                        "description": "Project name or partial name (e.g., 'backend', 'api', 'frontend')",
+                    },
+                    "membership": {
+                        "type": "boolean",
+                        "default": True,
+                        "description": "Only show projects user is a member of",
+                    },
+                    "limit": {
+                        "type": "integer",
+                        "default": 10,
+                        "minimum": 1,
+                        "maximum": 100,
+                        "description": "Maximum number of results",
+                    },
+                },
+                "additionalProperties": False,
+            },
+        ),
+        ToolSpec(
+            name="list_my_projects",
+            title="List All Projects",
+            description=(
+                "List ALL projects (slow). Only use when user asks 'what projects do I have' "
+                "or needs to browse without knowing any name."
+            ),
+            handler="gitlab_mr_mcp.tools.list_my_projects.list_my_projects",
+            output_schema=LIST_MY_PROJECTS_OUTPUT_SCHEMA,
+            scope=INSTANCES,
+            input_schema={
+                "type": "object",
+                "properties": {
+                    "owned": {
+                        "type": "boolean",
+                        "default": False,
+                        "description": "Only show projects owned by the user",
+                    },
+                    "limit": {
+                        "type": "integer",
+                        "default": 20,
+                        "minimum": 1,
+                        "maximum": 100,
+                        "description": "Maximum number of results",
+                    },
+                },
+                "additionalProperties": False,
+            },
+        ),
+        ToolSpec(
+            name="list_merge_requests",
+            title="List Merge Requests",
+            description="List merge requests for a GitLab project with optional filters.",
+            handler="gitlab_mr_mcp.tools.list_merge_requests.list_merge_requests",
+            output_schema=LIST_MERGE_REQUESTS_OUTPUT_SCHEMA,
+            priority=BULK,
+            input_schema={
+                "type": "object",
+                "properties": {
+                    "project_id": PROJECT_ID_SCHEMA,
+                    "state": {
+                        "type": "string",
+                        "enum": ["opened", "closed", "merged", "all"],
+                        "default": "opened",
+                        "description": "Filter by merge request state",
+                    },
+                    "target_branch": {
+                        "type": "string",
+                        "description": "Filter by target branch (optional)",
+                    },
+                    "limit": {
+                        "type": "integer",
+                        "default": 10,
+                        "minimum": 1,
+                        "maximum": 100,
+                        "description": "Maximum number of results",
+                    },
+                },
+                "additionalProperties": False,
+            },
+        ),
+        ToolSpec(
+            name="get_merge_request_reviews",
+            title="Get MR Reviews",
+            description=(
+                "Get reviews and discussions for a merge request. Returns discussion IDs for replying. "
+                "Filter threads (unresolved_only, file_path, author, since) and page with offset/limit."
+            ),
+            handler="gitlab_mr_mcp.tools.get_merge_request_reviews.get_merge_request_reviews",
+            output_schema=GET_MERGE_REQUEST_REVIEWS_OUTPUT_SCHEMA,
+            input_schema={
+                "type": "object",
+                "properties": {
+                    "project_id": PROJECT_ID_SCHEMA,
+                    "merge_request_iid": {
+                        "type": "integer",
+                        "minimum": 1,
+                        "description": "Internal ID of the merge request",
+                    },
+                    "unresolved_only": {
+                        "type": "boolean",
+                        "default": False,
+                        "description": "Only show unresolved discussion threads",
+                    },
+                    "file_path": {
+                        "type": "string",
+                        "description": "Only show inline threads on files whose path contains this text",
+                    },
+                    "author": {
+                        "type": "string",
+                        "description": "Only show threads with a note by this username",
+                    },
+                    "since": {
+                        "type": "string",
+                        "description": "Only show threads with notes created/updated since this ISO date",
+                    },
+                    "offset": {
+                        "type": "integer",
+                        "default": 0,
+                        "minimum": 0,
+                        "description": "Number of matching threads to skip",
+                    },
+                    "limit": {
+                        "type": "integer",
+                        "default": 50,
+                        "minimum": 1,
+                        "maximum": 500,
+                        "description": "Maximum number of threads to show",
+                    },
+                    "compact": {
+                        "type": "boolean",
+                        "default": False,
+                        "description": "List participants once and refer to them by @username",
+                    },
+                },
+                "required": ["merge_request_iid"],
+                "additionalProperties": False,
+            },
+        ),
+        ToolSpec(
+            name="get_merge_request_details",
+            title="Get MR Details",
+            description="Get MR details including status, approvals, and merge readiness.",
+            handler="gitlab_mr_mcp.tools.get_merge_request_details.get_merge_request_details",
+            output_schema=GET_MERGE_REQUEST_DETAILS_OUTPUT_SCHEMA,
+            input_schema={
+                "type": "object",
+                "properties": {
+                    "project_id": PROJECT_ID_SCHEMA,
+                    "merge_request_iid": {
+                        "type": "integer",
+                        "minimum": 1,
+                        "description": "Internal ID of the merge request",
+                    },
+                },
+                "required": ["merge_request_iid"],
+                "additionalProperties": False,
+            },
+        ),
+        ToolSpec(
+            name="get_merge_requests_overview",
+            title="Get MRs Overview",
+            description=(
+                "Get a compact status table (state, pipeline, approvals, conflicts, readiness) for "
+                "several merge requests at once. Use instead of repeated get_merge_request_details calls."
+            ),
+            handler="gitlab_mr_mcp.tools.get_merge_requests_overview.get_merge_requests_overview",
+            output_schema=GET_MERGE_REQUESTS_OVERVIEW_OUTPUT_SCHEMA,
+            scope=INSTANCES,
+            priority=BULK,
+            input_schema={
+                "type": "object",
+                "properties": {
+                    "project_id": PROJECT_ID_SCHEMA,
+                    "merge_request_iids": {
+                        "type": "array",
+                        "items": {"type": ["integer", "string"]},
+                        "minItems": 1,
+                        "maxItems": 50,
+                        "description": (
+                            "Merge requests to include: IIDs in project_id, or 'group/project!iid' "
+                            "references for other projects, each fetched from the instance its project lives on"
+                        ),
+                    },
+                },
+                "required": ["merge_request_iids"],
+                "additionalProperties": False,
+            },
+        ),
+        ToolSpec(
+            name="get_merge_request_pipeline",
+            title="Get MR Pipeline",
+            description=(
+                "Get pipeline data with all jobs and statuses, including jobs of child/downstream "
+                "pipelines. Returns job IDs for get_job_log."
+            ),
+            handler="gitlab_mr_mcp.tools.get_merge_request_pipeline.get_merge_request_pipeline",
+            output_schema=GET_MERGE_REQUEST_PIPELINE_OUTPUT_SCHEMA,
+            input_schema={
+                "type": "object",
+                "properties": {
+                    "project_id": PROJECT_ID_SCHEMA,
+                    "merge_request_iid": {
+                        "type": "integer",
+                        "minimum": 1,
+                        "description": "Internal ID of the merge request",
+                    },
+                    "downstream_depth": {
+                        "type": "integer",
+                        "default": 2,
+                        "minimum": 0,
+                        "maximum": 5,
+                        "description": "How many levels of child/downstream pipelines to include (0 = none)",
+                    },
+                },
+                "required": ["merge_request_iid"],
+                "additionalProperties": False,
+            },
+        ),
+        ToolSpec(
+            name="get_pipeline_failure_digest",
+            title="Get Pipeline Failure Digest",
+            description=(
+                "Read the logs of all failed jobs in an MR's latest pipeline (including downstream "
+                "pipelines) concurrently and return their failures, with identical failures across "
+                "jobs (e.g. matrix shards) grouped into one entry. Use instead of calling get_job_log "
+                "for each failed job."
+            ),
+            handler="gitlab_mr_mcp.tools.get_pipeline_failure_digest.get_pipeline_failure_digest",
+            output_schema=GET_PIPELINE_FAILURE_DIGEST_OUTPUT_SCHEMA,
+            priority=BULK,
+            input_schema={
+                "type": "object",
+                "properties": {
+                    "project_id": PROJECT_ID_SCHEMA,
+                    "merge_request_iid": {
+                        "type": "integer",
+                        "minimum": 1,
+                        "description": "Internal ID of the merge request",
+                    },
+                    "tail_bytes": {
+                        "type": "integer",
+                        "default": 65536,
+                        "minimum": 1024,
+                        "maximum": 1048576,
+                        "description": "Bytes read from the end of each failed job's log",
+                    },
+                    "patterns": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Extra regexes to treat as failures",
+                    },
+                    "downstream_depth": {
+                        "type": "integer",
+                        "default": 2,
+                        "minimum": 0,
+                        "maximum": 5,
+                        "description": "How many levels of child/downstream pipelines to include (0 = none)",
+                    },
+                },
+                "required": ["merge_request_iid"],
+                "additionalProperties": False,
+            },
+        ),
+        ToolSpec(
+            name="get_merge_request_test_report",
+            title="Get MR Test Report",
+            description="Get test report with failures, error messages, and stack traces.",
+            handler="gitlab_mr_mcp.tools.get_merge_request_test_report.get_merge_request_test_report",
+            output_schema=GET_MERGE_REQUEST_TEST_REPORT_OUTPUT_SCHEMA,
+            input_schema={
+                "type": "object",
+                "properties": {
+                    "project_id": PROJECT_ID_SCHEMA,
+                    "merge_request_iid": {
+                        "type": "integer",
+                        "minimum": 1,
+                        "description": "Internal ID of the merge request",
+                    },
+                },
+                "required": ["merge_request_iid"],
+                "additionalProperties": False,
+            },
+        ),
+        ToolSpec(
+            name="get_pipeline_test_summary",
+            title="Get Test Summary",
+            description="Get test summary with pass/fail counts. Faster than full test report.",
+            handler="gitlab_mr_mcp.tools.get_pipeline_test_summary.get_pipeline_test_summary",
+            output_schema=GET_PIPELINE_TEST_SUMMARY_OUTPUT_SCHEMA,
+            input_schema={
+                "type": "object",
+                "properties": {
+                    "project_id": PROJECT_ID_SCHEMA,
+                    "merge_request_iid": {
+                        "type": "integer",
+                        "minimum": 1,
+                        "description": "Internal ID of the merge request",
+                    },
+                },
+                "required": ["merge_request_iid"],
+                "additionalProperties": False,
+            },
+        ),
+        ToolSpec(
+            name="get_job_log",
+            title="Get Job Log",
+            description=(
+                "Get trace/log output for a pipeline job. To debug a CI/CD failure, pass mode='errors'. "
+                "By default returns the end of the log; mode='errors' scans the whole log and returns the "
+                "failures found (tracebacks, errors, failed tests, exit codes, OOM kills) with context and a "
+                "table of log sections; section='step_script' returns one section; offset/length page through "
+                "raw output; mode='follow' polls a running job for new output only."
+            ),
+            handler="gitlab_mr_mcp.tools.get_job_log.get_job_log",
+            output_schema=GET_JOB_LOG_OUTPUT_SCHEMA,
+            input_schema={
+                "type": "object",
+                "properties": {
+                    "project_id": PROJECT_ID_SCHEMA,
+                    "job_id": {
+                        "type": "integer",
+                        "minimum": 1,
+                        "description": "ID of the pipeline job (from get_merge_request_pipeline)",
+                    },
+                    "offset": {
+                        "type": "integer",
+                        "minimum": 0,
+                        "description": "Byte offset to start reading from (omit to read the end of the log)",
+                    },
+                    "length": {
+                        "type": "integer",
+                        "default": 15000,
+                        "minimum": 1,
+                        "maximum": 200000,
+                        "description": "Number of bytes of log to return",
+                    },
+                    "mode": {
+                        "type": "string",
+                        "enum": ["errors", "tail", "follow"],
+                        "default": "tail",
+                        "description": (
+                            "errors: failure signatures with context; tail: end of the raw log; "
+                            "follow: only output added since the previous follow call, plus job status"
+                        ),
+                    },
+                    "patterns": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Extra regexes to treat as failures (errors mode)",
+                    },
+                    "section": {
+                        "type": "string",
+                        "description": "Only return this section of the log, e.g. 'step_script'",
+                    },
+                    "context_lines": {
+                        "type": "integer",
+                        "default": 3,
+                        "minimum": 0,
+                        "maximum": 20,
+                        "description": "Lines of context around each failure (errors mode)",
+                    },
+                    "compact": {
+                        "type": "boolean",
+                        "default": True,
+                        "description": "Collapse runs of repeated or progress lines in raw output",
+                    },
+                },
+                "required": ["job_id"],
+                "additionalProperties": False,
+            },
+        ),
+        ToolSpec(
+            name="grep_job_log",
+            title="Search Job Log",
+            description=(
+                "Search a pipeline job's log for a regex on the server and return only matching lines "
+                "with context and byte offsets (usable as get_job_log offset). Use for large logs."
+            ),
+            handler="gitlab_mr_mcp.tools.grep_job_log.grep_job_log",
+            output_schema=GREP_JOB_LOG_OUTPUT_SCHEMA,
+            input_schema={
+                "type": "object",
+                "properties": {
+                    "project_id": PROJECT_ID_SCHEMA,
+                    "job_id": {
+                        "type": "integer",
+                        "minimum": 1,
+                        "description": "ID of the pipeline job (from get_merge_request_pipeline)",
+                    },
+                    "pattern": {
+                        "type": "string",
+                        "minLength": 1,
+                        "description": "Regular expression (Python syntax) matched against each log line",
+                    },
+                    "ignore_case": {
+                        "type": "boolean",
+                        "default": False,
+                        "description": "Match case-insensitively",
+                    },
+                    "before": {
+                        "type": "integer",
+                        "default": 2,
+                        "minimum": 0,
+                        "maximum": 20,
+                        "description": "Lines of context before each match",
+                    },
+                    "after": {
+                        "type": "integer",
+                        "default": 2,
+                        "minimum": 0,
+                        "maximum": 20,
+                        "description": "Lines of context after each match",
+                    },
+                    "max_matches": {
+                        "type": "integer",
+                        "default": 50,
+                        "minimum": 1,
+                        "maximum": 500,
+                        "description": "Stop searching after this many matching lines",
+                    },
+                },
+                "required": ["job_id", "pattern"],
+                "additionalProperties": False,
+            },
+        ),
+        ToolSpec(
+            name="get_branch_merge_requests",
+            title="Get Branch MRs",
+            description="Get all merge requests for a specific branch.",
+            handler="gitlab_mr_mcp.tools.get_branch_merge_requests.get_branch_merge_requests",
+            output_schema=GET_BRANCH_MERGE_REQUESTS_OUTPUT_SCHEMA,
+            priority=BULK,
+            input_schema={
+                "type": "object",
+                "properties": {
+                    "project_id": PROJECT_ID_SCHEMA,
+                    "branch_name": {
+                        "type": "string",
+                        "description": "Name of the branch",
+                    },
+                },
+                "required": ["branch_name"],
+                "additionalProperties": False,
+            },
+        ),
+        ToolSpec(
+            name="reply_to_review_comment",
+            title="Reply to Discussion",
+            description="Reply to a discussion thread in a merge request review.",
+            handler="gitlab_mr_mcp.tools.reply_to_review_comment.reply_to_review_comment",
+            read_only=False,
+            input_schema={
+                "type": "object",
+                "properties": {
+                    "project_id": PROJECT_ID_SCHEMA,
+                    "merge_request_iid": {
+                        "type": "integer",
+                        "minimum": 1,
+                        "description": "Internal ID of the merge request",
+                    },
+                    "discussion_id": {
+                        "type": "string",
+                        "description": "ID of the discussion thread to reply to",
+                    },
+                    "body": {
+                        "type": "string",
+                        "description": "Content of the reply comment",
+                    },
+                },
+                "required": ["merge_request_iid", "discussion_id", "body"],
+                "additionalProperties": False,
+            },
+        ),
+        ToolSpec(
+            name="create_review_comment",
+            title="Create Discussion",
+            description="Create a new discussion thread in a merge request.",
+            handler="gitlab_mr_mcp.tools.reply_to_review_comment.create_review_comment",
+            read_only=False,
+            input_schema={
+                "type": "object",
+                "properties": {
+                    "project_id": PROJECT_ID_SCHEMA,
+                    "merge_request_iid": {
+                        "type": "integer",
+                        "minimum": 1,
+                        "description": "Internal ID of the merge request",
+                    },
+                    "body": {
+                        "type": "string",
+                        "description": "Content of the new discussion comment",
+                    },
+                },
+                "required": ["merge_request_iid", "body"],
+                "additionalProperties": False,
+            },
+        ),
+        ToolSpec(
+            name="resolve_review_discussion",
+            title="Resolve Discussion",
+            description="Resolve or unresolve a discussion thread in a merge request.",
+            handler="gitlab_mr_mcp.tools.reply_to_review_comment.resolve_review_discussion",
+            read_only=False,
+            input_schema={
+                "type": "object",
+                "properties": {
+                    "project_id": PROJECT_ID_SCHEMA,
+                    "merge_request_iid": {
+                        "type": "integer",
+                        "minimum": 1,
+                        "description": "Internal ID of the merge request",
+                    },
+                    "discussion_id": {
+                        "type": "string",
+                        "description": "ID of the discussion thread to resolve/unresolve",
+                    },
+                    "resolved": {
+                        "type": "boolean",
+                        "default": True,
+                        "description": "Whether to resolve (true) or unresolve (false)",
+                    },
+                },
+                "required": ["merge_request_iid", "discussion_id"],
+                "additionalProperties": False,
+            },
+        ),
+        ToolSpec(
+            name="get_commit_discussions",
+            title="Get Commit Discussions",
+            description=(
+                "Get discussions and comments on commits within a merge request. "
+                "Pass commit_shas to also fetch plain commit comments for those commits."
+            ),
+            handler="gitlab_mr_mcp.tools.get_commit_discussions.get_commit_discussions",
+            output_schema=GET_COMMIT_DISCUSSIONS_OUTPUT_SCHEMA,
+            priority=BULK,
+            input_schema={
+                "type": "object",
+                "properties": {
+                    "project_id": PROJECT_ID_SCHEMA,
+                    "merge_request_iid": {
+                        "type": "integer",
+                        "minimum": 1,
+                        "description": "Internal ID of the merge request",
+                    },
+                    "commit_shas": {
+                        "type": "array",
+                        "items": {"type": "string", "minLength": 7},
+                        "maxItems": 50,
+                        "description": "Full or short (7+ characters) SHAs of commits to fetch commit comments for",
+                    },
+                    "compact": {
+                        "type": "boolean",
+                        "default": False,
+                        "description": "List participants once and refer to them by @username",
+                    },
+                },
+                "required": ["merge_request_iid"],
+                "additionalProperties": False,
+            },
+        ),
+        ToolSpec(
+            name="list_project_members",
+            title="List Project Members",
+            description="List project members with usernames and access levels.",
+            handler="gitlab_mr_mcp.tools.list_project_members.list_project_members",
+            output_schema=LIST_PROJECT_MEMBERS_OUTPUT_SCHEMA,
+            input_schema={
+                "type": "object",
+                "properties": {
+                    "project_id": PROJECT_ID_SCHEMA,
+                },
+                "additionalProperties": False,
+            },
+        ),
+        ToolSpec(
+            name="list_project_labels",
+            title="List Project Labels",
+            description="List all available labels in the project including inherited group labels.",
+            handler="gitlab_mr_mcp.tools.list_project_labels.list_project_labels",
+            output_schema=LIST_PROJECT_LABELS_OUTPUT_SCHEMA,
+            input_schema={
+                "type": "object",
+                "properties": {
+                    "project_id": PROJECT_ID_SCHEMA,
+                },
+                "additionalProperties": False,
+            },
+        ),
+        ToolSpec(
+            name="create_merge_request",
+            title="Create Merge Request",
+            description="Create a new merge request. Accepts usernames for assignees and reviewers.",
+            handler="gitlab_mr_mcp.tools.create_merge_request.create_merge_request",
+            read_only=False,
+            input_schema={
+                "type": "object",
+                "properties": {
+                    "project_id": PROJECT_ID_SCHEMA,
+                    "source_branch": {
+                        "type": "string",
+                        "description": "The source branch name",
+                    },
+                    "target_branch": {
+                        "type": "string",
+                        "description": "The target branch name (e.g., 'main', 'develop')",
+                    },
+                    "title": {
+                        "type": "string",
+                        "description": "Title of the merge request",
+                    },
+                    "description": {
+                        "type": "string",
+                        "description": "Description/body of the merge request (optional)",
+                    },
+                    "draft": {
+                        "type": "boolean",
+                        "default": False,
+                        "description": "Create as draft/WIP merge request",
+                    },
+                    "squash": {
+                        "type": "boolean",
+                        "description": "Squash commits when merging (optional)",
+                    },
+                    "remove_source_branch": {
+                        "type": "boolean",
+                        "description": "Remove source branch after merge (optional)",
+                    },
+                    "labels": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Labels to apply (optional)",
+                    },
+                    "create_missing_labels": {
+                        "type": "boolean",
+                        "default": False,
+                        "description": "Create labels if they don't exist (default: false)",
+                    },
+                    "assignees": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Usernames to assign (e.g., ['john.doe', 'jane.smith'])",
+                    },
+                    "reviewers": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Usernames to request review from",
+                    },
+                },
+                "required": ["source_branch", "target_branch", "title"],
+                "additionalProperties": False,
+            },
+        ),
+        ToolSpec(
+            name="update_merge_request",
+            title="Update Merge Request",
+            description="Update a merge request. Pass empty arrays to clear assignees/reviewers/labels.",
+            handler="gitlab_mr_mcp.tools.update_merge_request.update_merge_request",
+            read_only=False,
+            input_schema={
+                "type": "object",
+                "properties": {
+                    "project_id": PROJECT_ID_SCHEMA,
+                    "merge_request_iid": {
+                        "type": "integer",
+                        "minimum": 1,
+                        "description": "Internal ID of the merge request to update",
+                    },
+                    "title": {
+                        "type": "string",
+                        "description": "New title (optional)",
+                    },
+                    "description": {
+                        "type": "string",
+                        "description": "New description (optional)",
+                    },
+                    "target_branch": {
+                        "type": "string",
+                        "description": "New target branch (optional)",
+                    },
+                    "draft": {
+                        "type": "boolean",
+                        "description": "Set draft status (true=draft, false=ready)",
+                    },
+                    "squash": {
+                        "type": "boolean",
+                        "description": "Squash commits when merging",
+                    },
+                    "remove_source_branch": {
+                        "type": "boolean",
+                        "description": "Remove source branch after merge",
+                    },
+                    "labels": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Labels to set (replaces existing). Empty array clears.",
+                    },
+                    "assignees": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Usernames to assign (replaces existing). Empty array clears.",
+                    },
+                    "reviewers": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Usernames for review (replaces existing). Empty array clears.",
+                    },
+                },
+                "required": ["merge_request_iid"],
+                "additionalProperties": False,
+            },
+        ),
+        ToolSpec(
+            name="merge_merge_request",
+            title="Merge MR",
+            description="Merge a merge request. Check merge status with get_merge_request_details first.",
+            handler="gitlab_mr_mcp.tools.merge_merge_request.merge_merge_request",
+            read_only=False,
+            destructive=True,
+            input_schema={
+                "type": "object",
+                "properties": {
+                    "project_id": PROJECT_ID_SCHEMA,
+                    "merge_request_iid": {
+                        "type": "integer",
+                        "minimum": 1,
+                        "description": "Internal ID of the merge request to merge",
+                    },
+                    "squash": {
+                        "type": "boolean",
+                        "default": False,
+                        "description": "Squash commits into a single commit",
+                    },
+                    "should_remove_source_branch": {
+                        "type": "boolean",
+                        "default": False,
+                        "description": "Remove source branch after merge",
+                    },
+                    "merge_when_pipeline_succeeds": {
+                        "type": "boolean",
+                        "default": False,
+                        "description": "Merge when pipeline succeeds (auto-merge)",
+                    },
+                    "sha": {
+                        "type": "string",
+                        "description": "HEAD SHA to ensure no new commits (safety check)",
+                    },
+                    "merge_commit_message": {
+                        "type": "string",
+                        "description": "Custom merge commit message (optional)",
+                    },
+                    "squash_commit_message": {
+                        "type": "string",
+                        "description": "Custom squash commit message (optional)",
+                    },
+                },
+                "required": ["merge_request_iid"],
+                "additionalProperties": False,
+            },
+        ),
+        ToolSpec(
+            name="approve_merge_request",
+            title="Approve MR",
+            description="Approve a merge request. Note: You cannot approve your own MRs.",
+            handler="gitlab_mr_mcp.tools.approve_merge_request.approve_merge_request",
+            read_only=False,
+            input_schema={
+                "type": "object",
+                "properties": {
+                    "project_id": PROJECT_ID_SCHEMA,
+                    "merge_request_iid": {
+                        "type": "integer",
+                        "minimum": 1,
+                        "description": "Internal ID of the merge request to approve",
+                    },
+                    "sha": {
+                        "type": "string",
+                        "description": "HEAD SHA to ensure approving the right version (optional)",
+                    },
+                },
+                "required": ["merge_request_iid"],
+                "additionalProperties": False,
+            },
+        ),
+        ToolSpec(
+            name="unapprove_merge_request",
+            title="Unapprove MR",
+            description="Revoke your approval from a merge request.",
+            handler="gitlab_mr_mcp.tools.approve_merge_request.unapprove_merge_request",
+            read_only=False,
+            input_schema={
+                "type": "object",
+                "properties": {
+                    "project_id": PROJECT_ID_SCHEMA,
+                    "merge_request_iid": {
+                        "type": "integer",
+                        "minimum": 1,
+                        "description": "Internal ID of the merge request to unapprove",
+                    },
+                },
+                "required": ["merge_request_iid"],
+                "additionalProperties": False,
+            },
+        ),
+        ToolSpec(
+            name="fetch_more",
+            title="Fetch More Output",
+            description=(
+                "Continue a tool output that was cut by the output budget. Pass the cursor from the "
+                "'omitted' note; returns the next part from memory without calling GitLab again."
+            ),
+            handler="gitlab_mr_mcp.tools.fetch_more.fetch_more",
+            output_schema=FETCH_MORE_OUTPUT_SCHEMA,
+            scope=LOCAL,
+            cacheable=False,
+            input_schema={
+                "type": "object",
+                "properties": {
+                    "cursor": {
+                        "type": "string",
+                        "description": "Cursor from an 'omitted' note; cursors expire after 15 minutes",
+                    },
+                },
+                "required": ["cursor"],
+                "additionalProperties": False,
+            },
+        ),
+    ]
+)
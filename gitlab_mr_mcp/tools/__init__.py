@@ -7,6 +7,7 @@ Each tool provides specific functionality for interacting with GitLab's API.
 
 from .approve_merge_request import approve_merge_request, unapprove_merge_request
 from .create_merge_request import create_merge_request
+from .fetch_more import fetch_more
 from .get_branch_merge_requests import get_branch_merge_requests
 from .get_commit_discussions import get_commit_discussions
 from .get_job_log import get_job_log
@@ -14,7 +15,10 @@ from .get_merge_request_details import get_merge_request_details
 from .get_merge_request_pipeline import get_merge_request_pipeline
 from .get_merge_request_reviews import get_merge_request_reviews
 from .get_merge_request_test_report import get_merge_request_test_report
+from .get_merge_requests_overview import get_merge_requests_overview
+from .get_pipeline_failure_digest import get_pipeline_failure_digest
 from .get_pipeline_test_summary import get_pipeline_test_summary
+from .grep_job_log import grep_job_log
 from .list_merge_requests import list_merge_requests
 from .list_my_projects import list_my_projects
 from .list_project_labels import list_project_labels
@@ -30,10 +34,13 @@ __all__ = [
     "list_merge_requests",
     "get_merge_request_reviews",
     "get_merge_request_details",
+    "get_merge_requests_overview",
     "get_merge_request_pipeline",
+    "get_pipeline_failure_digest",
     "get_merge_request_test_report",
     "get_pipeline_test_summary",
     "get_job_log",
+    "grep_job_log",
     "get_branch_merge_requests",
     "reply_to_review_comment",
     "create_review_comment",
@@ -46,4 +53,5 @@ __all__ = [
     "merge_merge_request",
     "approve_merge_request",
     "unapprove_merge_request",
+    "fetch_more",
 ]
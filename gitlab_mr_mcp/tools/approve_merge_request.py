@@ -4,6 +4,7 @@ from mcp.types import TextContent
 
 from gitlab_mr_mcp.gitlab_api import approve_merge_request as api_approve_merge_request
 from gitlab_mr_mcp.gitlab_api import unapprove_merge_request as api_unapprove_merge_request
+from gitlab_mr_mcp.markdown import MarkdownBuilder
 
 
 async def approve_merge_request(gitlab_url, project_id, access_token, args):
@@ -19,46 +20,50 @@ async def approve_merge_request(gitlab_url, project_id, access_token, args):
     status, data, error = await api_approve_merge_request(gitlab_url, project_id, access_token, mr_iid, sha)
 
     if status in (200, 201):
-        result = "# Merge Request Approved\n\n"
-        result += f"**MR**: !{mr_iid}\n"
+        result = MarkdownBuilder()
+        result.heading("Merge Request Approved")
+        result.field("MR", f"!{mr_iid}")
 
         # Show approval info
         approved_by = data.get("approved_by", [])
         if approved_by:
             approvers = ", ".join(f"@{a['user']['username']}" for a in approved_by)
-            result += f"**Approved By**: {approvers}\n"
+            result.field("Approved By", approvers)
 
         approvals_required = data.get("approvals_required", 0)
         approvals_left = data.get("approvals_left", 0)
-        result += f"**Approvals**: {len(approved_by)}/{approvals_required}\n"
+        result.field("Approvals", f"{len(approved_by)}/{approvals_required}")
 
         if approvals_left == 0:
-            result += "**Status**: All required approvals received\n"
+            result.field("Status", "All required approvals received")
         else:
-            result += f"**Status**: {approvals_left} more approval(s) needed\n"
+            result.field("Status", f"{approvals_left} more approval(s) needed")
 
-        return [TextContent(type="text", text=result)]
+        return [TextContent(type="text", text=result.build())]
 
     elif status == 401:
-        result = "# Approval Failed: Unauthorized\n\n"
-        result += "Your access token doesn't have permission to approve.\n"
-        result += "Ensure your token has `api` scope.\n"
-        return [TextContent(type="text", text=result)]
+        result = MarkdownBuilder()
+        result.heading("Approval Failed: Unauthorized")
+        result.line("Your access token doesn't have permission to approve.")
+        result.line("Ensure your token has `api` scope.")
+        return [TextContent(type="text", text=result.build())]
 
     elif status == 403:
-        result = "# Approval Failed: Forbidden\n\n"
-        result += f"**MR**: !{mr_iid}\n"
+        result = MarkdownBuilder()
+        result.heading("Approval Failed: Forbidden")
+        result.field("MR", f"!{mr_iid}")
         result += "You cannot approve this merge request.\n\n"
-        result += "**Possible reasons**:\n"
-        result += "- You are the author (can't self-approve)\n"
-        result += "- You already approved\n"
-        result += "- You don't have permission to approve\n"
-        return [TextContent(type="text", text=result)]
+        result.line("**Possible reasons**:")
+        result.bullet("You are the author (can't self-approve)")
+        result.bullet("You already approved")
+        result.bullet("You don't have permission to approve")
+        return [TextContent(type="text", text=result.build())]
 
     elif status == 404:
-        result = "# Approval Failed: Not Found\n\n"
-        result += f"Merge request !{mr_iid} not found.\n"
-        return [TextContent(type="text", text=result)]
+        result = MarkdownBuilder()
+        result.heading("Approval Failed: Not Found")
+        result.line(f"Merge request !{mr_iid} not found.")
+        return [TextContent(type="text", text=result.build())]
 
     else:
         error_msg = data.get("message", error) if isinstance(data, dict) else error
@@ -77,32 +82,36 @@ async def unapprove_merge_request(gitlab_url, project_id, access_token, args):
     status, data, error = await api_unapprove_merge_request(gitlab_url, project_id, access_token, mr_iid)
 
     if status in (200, 201):
-        result = "# Approval Revoked\n\n"
-        result += f"**MR**: !{mr_iid}\n"
-        result += "Your approval has been removed.\n"
+        result = MarkdownBuilder()
+        result.heading("Approval Revoked")
+        result.field("MR", f"!{mr_iid}")
+        result.line("Your approval has been removed.")
 
         approvals_left = data.get("approvals_left", 0)
         if approvals_left > 0:
-            result += f"**Status**: {approvals_left} approval(s) now needed\n"
+            result.field("Status", f"{approvals_left} approval(s) now needed")
 
-        return [TextContent(type="text", text=result)]
+        return [TextContent(type="text", text=result.build())]
 
     elif status == 401:
-        result = "# Unapproval Failed: Unauthorized\n\n"
-        result += "Your access token doesn't have permission.\n"
-        return [TextContent(type="text", text=result)]
+        result = MarkdownBuilder()
+        result.heading("Unapproval Failed: Unauthorized")
+        result.line("Your access token doesn't have permission.")
+        return [TextContent(type="text", text=result.build())]
 
     elif status == 403:
-        result = "# Unapproval Failed: Forbidden\n\n"
-        result += f"**MR**: !{mr_iid}\n"
-        result += "You cannot unapprove this merge request.\n"
-        result += "You may not have previously approved it.\n"
-        return [TextContent(type="text", text=result)]
+        result = MarkdownBuilder()
+        result.heading("Unapproval Failed: Forbidden")
+        result.field("MR", f"!{mr_iid}")
+        result.line("You cannot unapprove this merge request.")
+        result.line("You may not have previously approved it.")
+        return [TextContent(type="text", text=result.build())]
 
     elif status == 404:
-        result = "# Unapproval Failed: Not Found\n\n"
-        result += f"Merge request !{mr_iid} not found.\n"
-        return [TextContent(type="text", text=result)]
+        result = MarkdownBuilder()
+        result.heading("Unapproval Failed: Not Found")
+        result.line(f"Merge request !{mr_iid} not found.")
+        return [TextContent(type="text", text=result.build())]
 
     else:
         error_msg = data.get("message", error) if isinstance(data, dict) else error
@@ -4,6 +4,7 @@ from mcp.types import TextContent
 
 from gitlab_mr_mcp.gitlab_api import create_merge_request as api_create_merge_request
 from gitlab_mr_mcp.gitlab_api import create_project_label, get_project_labels, get_project_members
+from gitlab_mr_mcp.markdown import MarkdownBuilder
 
 
 async def resolve_labels(gitlab_url, project_id, access_token, requested_labels, create_missing=False):
@@ -158,39 +159,41 @@ async def create_merge_request(gitlab_url, project_id, access_token, args):
         mr_url = data.get("web_url")
         mr_title = data.get("title")
 
-        result = "# Merge Request Created\n\n"
+        result = MarkdownBuilder()
+        result.heading("Merge Request Created")
         result += f"**!{mr_iid}**: {mr_title}\n\n"
         result += f"**Source**: `{source_branch}` -> **Target**: `{target_branch}`\n\n"
 
         if data.get("draft"):
-            result += "**Status**: Draft\n"
+            result.field("Status", "Draft")
 
         if data.get("assignees"):
             assignees = ", ".join(f"@{a['username']}" for a in data["assignees"])
-            result += f"**Assignees**: {assignees}\n"
+            result.field("Assignees", assignees)
 
         if data.get("reviewers"):
             reviewers = ", ".join(f"@{r['username']}" for r in data["reviewers"])
-            result += f"**Reviewers**: {reviewers}\n"
+            result.field("Reviewers", reviewers)
 
         if data.get("labels"):
             labels = ", ".join(f"`{label}`" for label in data["labels"])
-            result += f"**Labels**: {labels}\n"
+            result.field("Labels", labels)
 
         if created_labels:
             created = ", ".join(f"`{label}`" for label in created_labels)
-            result += f"**Created Labels**: {created}\n"
+            result.field("Created Labels", created)
 
         result += f"\n**URL**: {mr_url}\n"
 
-        return [TextContent(type="text", text=result)]
+        return [TextContent(type="text", text=result.build())]
 
     elif status == 409:
         error_msg = data.get("message", error)
-        result = "# Merge Request Already Exists\n\n"
-        result += f"A merge request for `{source_branch}` -> `{target_branch}` already exists.\n"
+        result = MarkdownBuilder()
+        result.heading("Merge Request Already Exists")
+        result.line(f"A merge request for `{source_branch}` -> `{target_branch}` already exists.")
         result += f"\n**Error**: {error_msg}\n"
-        return [TextContent(type="text", text=result)]
+        return [TextContent(type="text", text=result.build())]
 
     else:
         error_msg = data.get("message", error) if isinstance(data, dict) else error
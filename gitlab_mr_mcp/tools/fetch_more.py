@@ -0,0 +1,32 @@
+import logging
+
+from mcp.types import TextContent
+
+from gitlab_mr_mcp.markdown import MarkdownBuilder, configured_output_budget
+from gitlab_mr_mcp.result_store import result_store
+from gitlab_mr_mcp.structured import wants_json
+
+
+async def fetch_more(args):
+    """Return the next part of a tool output that was cut by the output budget, without calling GitLab"""
+    logging.info(f"fetch_more called with args: {args}")
+    cursor = args["cursor"]
+
+    entry = result_store.take(cursor, configured_output_budget())
+    if entry is None:
+        raise ValueError(f"Unknown or expired cursor {cursor!r}; run the original tool again")
+    chunks, noun, next_cursor = entry
+    remaining = result_store.remaining(next_cursor)
+
+    if wants_json(args):
+        return {"text": "".join(chunks), "next_cursor": next_cursor, "remaining": remaining}
+
+    result = MarkdownBuilder()
+    for chunk in chunks:
+        result += chunk
+    if next_cursor:
+        result += "\n"
+        result.omitted(remaining, noun, cursor=next_cursor)
+    else:
+        result.line(f"\n*End of the omitted {noun}.*")
+    return [TextContent(type="text", text=result.build())]
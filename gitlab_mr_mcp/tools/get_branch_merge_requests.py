@@ -5,6 +5,9 @@ from mcp.types import TextContent
 
 from gitlab_mr_mcp.gitlab_api import get_branch_merge_requests as api_get_branch_merge_requests
 from gitlab_mr_mcp.gitlab_api import get_merge_request_changes, get_merge_request_pipeline
+from gitlab_mr_mcp.markdown import MarkdownBuilder
+from gitlab_mr_mcp.structured import wants_json
+from gitlab_mr_mcp.tools.list_merge_requests import merge_request_summary
 from gitlab_mr_mcp.utils import (
     analyze_mr_readiness,
     calculate_change_stats,
@@ -54,12 +57,16 @@ async def get_branch_merge_requests(gitlab_url, project_id, access_token, args):
         logging.error(f"Error fetching branch merge requests: {status} - {error}")
         raise Exception(f"Error fetching branch merge requests: {status} - {error}")
 
-    result = f"# Merge Requests for branch: `{branch_name}`\n\n"
+    if not data and wants_json(args):
+        return {"merge_requests": []}
+
+    result = MarkdownBuilder()
+    result.heading(f"Merge Requests for branch: `{branch_name}`")
     result += f"Found {len(data)} merge request(s)\n\n"
 
     if not data:
-        result += "No merge requests found for this branch.\n"
-        return [TextContent(type="text", text=result)]
+        result.line("No merge requests found for this branch.")
+        return [TextContent(type="text", text=result.build())]
 
     # Fetch enhanced data
     enhanced_data_tasks = [get_enhanced_mr_data(gitlab_url, project_id, access_token, mr["iid"]) for mr in data]
@@ -70,40 +77,43 @@ async def get_branch_merge_requests(gitlab_url, project_id, access_token, args):
         logging.warning(f"Error in parallel enhanced data fetch: {e}")
         enhanced_results = [(None, None)] * len(data)
 
+    if wants_json(args):
+        return {"merge_requests": [merge_request_summary(mr, *extra) for mr, extra in zip(data, enhanced_results)]}
+
     for i, mr in enumerate(data):
         pipeline_data, changes_data = enhanced_results[i]
 
         state_icon = get_state_icon(mr["state"])
-        result += f"## {state_icon} !{mr['iid']}: {mr['title']}\n\n"
+        result.heading(f"{state_icon} !{mr['iid']}: {mr['title']}", level=2)
 
-        result += f"**Author**: {mr['author']['name']} (@{mr['author']['username']})\n"
-        result += f"**State**: {mr['state']}\n"
-        result += f"**Branches**: `{mr['source_branch']}` -> `{mr['target_branch']}`\n"
-        result += f"**Updated**: {format_date(mr['updated_at'])}\n"
+        result.field("Author", f"{mr['author']['name']} (@{mr['author']['username']})")
+        result.field("State", mr["state"])
+        result.field("Branches", f"`{mr['source_branch']}` -> `{mr['target_branch']}`")
+        result.field("Updated", format_date(mr["updated_at"]))
 
         # Pipeline
         if pipeline_data:
             pipeline_stat = pipeline_data.get("status")
             pipeline_icon = get_pipeline_status_icon(pipeline_stat)
-            result += f"**Pipeline**: {pipeline_icon} {pipeline_stat}\n"
+            result.field("Pipeline", f"{pipeline_icon} {pipeline_stat}")
         elif mr.get("pipeline"):
             pipeline_stat = mr["pipeline"].get("status")
             pipeline_icon = get_pipeline_status_icon(pipeline_stat)
-            result += f"**Pipeline**: {pipeline_icon} {pipeline_stat or 'unknown'}\n"
+            result.field("Pipeline", f"{pipeline_icon} {pipeline_stat or 'unknown'}")
 
         # Changes
         if changes_data:
             change_stats = calculate_change_stats(changes_data)
-            result += f"**Changes**: {change_stats}\n"
+            result.field("Changes", change_stats)
 
         # Readiness
         readiness = analyze_mr_readiness(mr, pipeline_data)
-        result += f"**Status**: {readiness}\n"
+        result.field("Status", readiness)
 
         # Labels
         labels_str = format_labels(mr.get("labels"))
         if labels_str:
-            result += f"**Labels**: {labels_str}\n"
+            result.field("Labels", labels_str)
 
         # Flags
         flags = []
@@ -112,7 +122,7 @@ async def get_branch_merge_requests(gitlab_url, project_id, access_token, args):
         if mr.get("has_conflicts"):
             flags.append("Conflicts")
         if flags:
-            result += f"**Flags**: {', '.join(flags)}\n"
+            result.field("Flags", ", ".join(flags))
 
         result += f"**URL**: {mr['web_url']}\n\n"
 
@@ -125,6 +135,6 @@ async def get_branch_merge_requests(gitlab_url, project_id, access_token, args):
         state_counts[s] = state_counts.get(s, 0) + 1
 
     for s, count in state_counts.items():
-        result += f"- {s.title()}: {count}\n"
+        result.bullet(f"{s.title()}: {count}")
 
-    return [TextContent(type="text", text=result)]
+    return [TextContent(type="text", text=result.build())]
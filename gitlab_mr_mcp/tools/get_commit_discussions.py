@@ -1,85 +1,262 @@
+import asyncio
 import logging
 
 from mcp.types import TextContent
 
-from gitlab_mr_mcp.gitlab_api import get_merge_request_commits, get_merge_request_discussions_paginated
-from gitlab_mr_mcp.utils import format_date
+from gitlab_mr_mcp.gitlab_api import (
+    get_commit_comments,
+    get_merge_request_commits,
+    get_merge_request_discussions_paginated,
+)
+from gitlab_mr_mcp.markdown import MarkdownBuilder
+from gitlab_mr_mcp.structured import username, wants_json
+from gitlab_mr_mcp.utils import format_date, format_handle, format_note_time, format_participants
+
+# Maximum number of commit comment requests in flight at once
+COMMIT_COMMENTS_CONCURRENCY = 5
+
+# Shortest abbreviated SHA accepted, as git shows them; shorter ones could match several commits
+MIN_SHA_PREFIX_LENGTH = 7
+
+
+def index_notes_by_commit(discussions_data, commit_shas):
+    """Index line-level notes by the commit SHA they were made on, in a single pass"""
+    notes_by_sha = {}
+    for discussion in discussions_data:
+        for note in discussion.get("notes", []):
+            position = note.get("position")
+            commit_sha = position.get("head_sha") if position else None
+            if commit_sha in commit_shas:
+                notes_by_sha.setdefault(commit_sha, []).append(
+                    {"discussion_id": discussion.get("id"), "note": note, "position": position}
+                )
+    return notes_by_sha
+
+
+def validate_requested_shas(requested_shas):
+    """Raise ValueError for abbreviated SHAs too short to identify a commit"""
+    too_short = [requested for requested in requested_shas if len(requested) < MIN_SHA_PREFIX_LENGTH]
+    if too_short:
+        raise ValueError(f"Commit SHAs must have at least {MIN_SHA_PREFIX_LENGTH} characters: {', '.join(too_short)}")
+
+
+def match_requested_commits(commits_data, requested_shas):
+    """Match requested full or abbreviated SHAs against the MR's commits"""
+    validate_requested_shas(requested_shas)
+    matched = []
+    not_found = []
+    for requested in requested_shas:
+        commit = next((c for c in commits_data if c["id"].startswith(requested)), None)
+        if commit is None:
+            not_found.append(requested)
+        elif commit not in matched:
+            matched.append(commit)
+    return matched, not_found
+
+
+async def fetch_commit_comments(gitlab_url, project_id, access_token, commits):
+    """Fetch simple commit comments for the given commits with bounded concurrency"""
+    semaphore = asyncio.Semaphore(COMMIT_COMMENTS_CONCURRENCY)
+
+    async def fetch(commit):
+        async with semaphore:
+            status, comments, error = await get_commit_comments(gitlab_url, project_id, access_token, commit["id"])
+        if status != 200:
+            logging.warning(f"Could not fetch comments for commit {commit['id']}: {status} - {error}")
+            return None
+        return comments
+
+    results = await asyncio.gather(*(fetch(commit) for commit in commits))
+    return dict(zip((commit["id"] for commit in commits), results))
+
+
+def format_commit_comments(commits, comments_by_sha, compact=False):
+    """Format simple commit comments for the requested commits"""
+    result = MarkdownBuilder()
+    result.heading("Commit Comments", level=2)
+
+    for commit in commits:
+        comments = comments_by_sha.get(commit["id"])
+        result.heading(f"{commit['short_id']}: {commit['title']}", level=3)
+
+        if comments is None:
+            result += "Could not fetch comments for this commit.\n\n"
+            continue
+        if not comments:
+            result += "No comments on this commit.\n\n"
+            continue
+
+        previous_date = None
+        for comment in comments:
+            author = comment.get("author") or {}
+            if compact:
+                result += f"**{format_handle(author)}**"
+                result += f" ({format_note_time(comment.get('created_at'), previous_date)})"
+                previous_date = comment.get("created_at")
+            else:
+                result += f"**{author.get('name', 'Unknown')}** (@{author.get('username', 'unknown')})"
+                result += f" ({format_date(comment.get('created_at'))})"
+            if comment.get("path"):
+                result += f" on `{comment['path']}`"
+                if comment.get("line"):
+                    result += f" line {comment['line']}"
+            result += f"\n\n{comment.get('note', '')}\n\n"
+
+    result += "---\n\n"
+    return result.build()
+
+
+def discussion_participants(notes_by_sha, comments_by_sha):
+    """Participant table for the authors of the line notes and fetched commit comments"""
+    authors = [item["note"].get("author") for notes in notes_by_sha.values() for item in notes]
+    authors += [comment.get("author") for comments in comments_by_sha.values() for comment in comments or []]
+    return format_participants(authors)
+
+
+def structured_commit_comment(comment):
+    return {
+        "discussion_id": None,
+        "author": username(comment.get("author")),
+        "body": comment.get("note", ""),
+        "path": comment.get("path"),
+        "line": comment.get("line"),
+        "created_at": comment.get("created_at"),
+    }
+
+
+def structured_line_note(item):
+    note, position = item["note"], item["position"]
+    return {
+        "discussion_id": item["discussion_id"],
+        "author": username(note.get("author")),
+        "body": note.get("body", ""),
+        "path": position.get("new_path"),
+        "line": position.get("new_line"),
+        "created_at": note.get("created_at"),
+    }
+
+
+def build_structured_discussions(
+    commits_data, discussions_data, notes_by_sha, requested_commits, comments_by_sha, not_found
+):
+    """Structured counterpart of the commit discussions report"""
+    commit_comments = []
+    for commit in requested_commits:
+        comments = comments_by_sha.get(commit["id"])
+        commit_comments.append(
+            {
+                "sha": commit["id"],
+                "title": commit["title"],
+                "comments": None if comments is None else [structured_commit_comment(c) for c in comments],
+            }
+        )
+    return {
+        "commit_count": len(commits_data),
+        "discussion_count": len(discussions_data),
+        "not_found": not_found,
+        "commit_comments": commit_comments,
+        "commits": [
+            {
+                "sha": commit["id"],
+                "title": commit["title"],
+                "author": commit.get("author_name"),
+                "committed_date": commit.get("committed_date"),
+                "notes": [structured_line_note(item) for item in notes_by_sha[commit["id"]]],
+            }
+            for commit in commits_data
+            if notes_by_sha.get(commit["id"])
+        ],
+    }
 
 
 async def get_commit_discussions(gitlab_url, project_id, access_token, args):
     """Get discussions/comments on commits within a merge request"""
     logging.info(f"get_commit_discussions called with args: {args}")
     mr_iid = args["merge_request_iid"]
+    requested_shas = args.get("commit_shas") or []
+    validate_requested_shas(requested_shas)
 
     try:
-        commits_result = await get_merge_request_commits(gitlab_url, project_id, access_token, mr_iid)
+        commits_result, discussions_result = await asyncio.gather(
+            get_merge_request_commits(gitlab_url, project_id, access_token, mr_iid),
+            get_merge_request_discussions_paginated(gitlab_url, project_id, access_token, mr_iid),
+        )
         commits_status, commits_data, commits_error = commits_result
+        discussions_status, discussions_data, discussions_error = discussions_result
 
         if commits_status != 200:
             logging.error(f"Error fetching commits: {commits_status} - {commits_error}")
             raise Exception(f"Error fetching commits: {commits_error}")
 
         if not commits_data:
+            if wants_json(args):
+                return build_structured_discussions([], [], {}, [], {}, requested_shas)
             return [TextContent(type="text", text="No commits found in this merge request.")]
 
-        # Get all MR discussions
-        discussions_result = await get_merge_request_discussions_paginated(gitlab_url, project_id, access_token, mr_iid)
-        discussions_status, discussions_data, discussions_error = discussions_result
-
         if discussions_status != 200:
             logging.error(f"Error fetching discussions: {discussions_status} - {discussions_error}")
             discussions_data = []
 
         commit_map = {commit["id"]: commit for commit in commits_data}
+        notes_by_sha = index_notes_by_commit(discussions_data, commit_map)
+        total_discussions = sum(len(notes) for notes in notes_by_sha.values())
 
-        # Find discussions linked to commits
-        commits_with_discussions = {}
-        total_discussions = 0
-
-        for discussion in discussions_data:
-            notes = discussion.get("notes", [])
-            for note in notes:
-                position = note.get("position")
-                if position and position.get("head_sha"):
-                    commit_sha = position["head_sha"]
-                    if commit_sha in commit_map:
-                        if commit_sha not in commits_with_discussions:
-                            commits_with_discussions[commit_sha] = {"commit": commit_map[commit_sha], "discussions": []}
-                        commits_with_discussions[commit_sha]["discussions"].append(
-                            {"discussion_id": discussion.get("id"), "note": note, "position": position}
-                        )
-                        total_discussions += 1
+        requested_commits, not_found = match_requested_commits(commits_data, requested_shas)
+        comments_by_sha = {}
+        if requested_commits:
+            comments_by_sha = await fetch_commit_comments(gitlab_url, project_id, access_token, requested_commits)
+
+        if wants_json(args):
+            return build_structured_discussions(
+                commits_data, discussions_data, notes_by_sha, requested_commits, comments_by_sha, not_found
+            )
 
         # Format output
-        result = f"# Commit Discussions for MR !{mr_iid}\n\n"
-        result += "## Summary\n\n"
-        result += f"- Total commits: {len(commits_data)}\n"
-        result += f"- Commits with discussions: {len(commits_with_discussions)}\n"
-        result += f"- Line-level discussions: {total_discussions}\n"
+        result = MarkdownBuilder()
+        result.heading(f"Commit Discussions for MR !{mr_iid}")
+        result.heading("Summary", level=2)
+        result.bullet(f"Total commits: {len(commits_data)}")
+        result.bullet(f"Commits with discussions: {len(notes_by_sha)}")
+        result.bullet(f"Line-level discussions: {total_discussions}")
         result += f"- Total MR discussions: {len(discussions_data)}\n\n"
 
-        if not commits_with_discussions:
-            result += "No line-level discussions found on any commits.\n"
-            return [TextContent(type="text", text=result)]
+        if not_found:
+            result += f"**Commits not in this MR**: {', '.join(f'`{sha}`' for sha in not_found)}\n\n"
+
+        compact = args.get("compact", False)
+        if compact:
+            result += discussion_participants(notes_by_sha, comments_by_sha)
+
+        if requested_commits:
+            result += format_commit_comments(requested_commits, comments_by_sha, compact)
+
+        if not notes_by_sha:
+            result.line("No line-level discussions found on any commits.")
+            return [TextContent(type="text", text=result.build())]
 
-        # Show discussions by commit
-        for _commit_sha, item in commits_with_discussions.items():
-            commit = item["commit"]
-            discussions = item["discussions"]
+        # Show discussions by commit, in commit order
+        for commit in commits_data:
+            discussions = notes_by_sha.get(commit["id"])
+            if not discussions:
+                continue
 
-            result += f"## Commit: {commit['short_id']}\n\n"
-            result += f"**Title**: {commit['title']}\n"
-            result += f"**Author**: {commit['author_name']}\n"
-            result += f"**Date**: {format_date(commit['committed_date'])}\n"
+            result.heading(f"Commit: {commit['short_id']}", level=2)
+            result.field("Title", commit["title"])
+            result.field("Author", commit["author_name"])
+            result.field("Date", format_date(commit["committed_date"]))
             result += f"**SHA**: `{commit['id']}`\n\n"
 
+            previous_date = None
             for disc_item in discussions:
                 discussion_id = disc_item["discussion_id"]
                 note = disc_item["note"]
                 position = disc_item["position"]
 
                 author = note["author"]
-                result += f"### Comment by {author['name']} (@{author['username']})\n\n"
+                if compact:
+                    result.heading(f"Comment by {format_handle(author)}", level=3)
+                else:
+                    result.heading(f"Comment by {author['name']} (@{author['username']})", level=3)
                 result += f"{note['body']}\n\n"
 
                 if position.get("new_path"):
@@ -88,12 +265,16 @@ async def get_commit_discussions(gitlab_url, project_id, access_token, args):
                         result += f" line {position['new_line']}"
                     result += "\n"
 
-                result += f"**Posted**: {format_date(note['created_at'])}\n"
+                if compact:
+                    result.field("Posted", format_note_time(note["created_at"], previous_date))
+                    previous_date = note["created_at"]
+                else:
+                    result.field("Posted", format_date(note["created_at"]))
                 result += f"**Discussion ID**: `{discussion_id}`\n\n"
 
             result += "---\n\n"
 
-        return [TextContent(type="text", text=result)]
+        return [TextContent(type="text", text=result.build())]
 
     except Exception as e:
         logging.error(f"Error in get_commit_discussions: {str(e)}")
@@ -2,16 +2,261 @@ import logging
 
 from mcp.types import TextContent
 
-from gitlab_mr_mcp.gitlab_api import get_job_trace
+from gitlab_mr_mcp.cache import TTLCache
+from gitlab_mr_mcp.gitlab_api import (
+    FINISHED_JOB_STATUSES,
+    get_job,
+    get_job_trace,
+    get_job_trace_analysis,
+    get_job_trace_sections,
+)
+from gitlab_mr_mcp.log_analysis import DEFAULT_CONTEXT_LINES, compile_failure_patterns, configured_patterns
+from gitlab_mr_mcp.log_stream import CompactTail, clean_trace_text, compact_trace_text, find_section
+from gitlab_mr_mcp.markdown import MarkdownBuilder
+from gitlab_mr_mcp.structured import pick, wants_json
+from gitlab_mr_mcp.utils import format_duration, get_pipeline_status_icon
+
+# Bytes of log returned per call, counted back from the end unless an offset is given
+DEFAULT_LOG_LENGTH = 15000
+
+# The compacted tail is cut from a larger window, as collapsing progress output leaves room for earlier lines
+COMPACT_READ_FACTOR = 4
+MAX_COMPACT_READ_BYTES = 1024 * 1024
+
+LOG_MODES = ("errors", "tail", "follow")
+
+# Byte offset up to which each followed job's log has been returned
+_follow_offsets = TTLCache(max_entries=256, ttl=1800)
+
+SECTION_FIELDS = ("name", "depth", "start_line", "end_line", "duration")
+
+
+def no_log_output(job_id):
+    result = MarkdownBuilder()
+    result.heading(f"Job Log (ID: {job_id})")
+    result += "No log output available.\n\n"
+    result.line("Possible reasons:")
+    result.bullet("Job hasn't started yet")
+    result.bullet("Job was skipped")
+    result.bullet("Log has been archived or deleted")
+    return result.build()
+
+
+def clean_log_output(log_data, compact, collapsed=None):
+    """Clean log text and collapse runs of near-identical lines if compact; returns (text, collapsed_lines).
+
+    A collapsed count given means log_data was cleaned and compacted already.
+    """
+    if collapsed is not None:
+        return log_data, collapsed
+    text = clean_trace_text(log_data)
+    if compact:
+        return compact_trace_text(text)
+    return text, 0
+
+
+def compact_log_tail(log_data, window, length):
+    """Compact a raw window of the log and keep about its last length bytes; returns (text, window, collapsed)"""
+    tail = CompactTail(length, offset=window["start"])
+    tail.feed(log_data)
+    text = tail.close()
+    return text, {**window, "start": tail.start}, tail.collapsed_lines
+
+
+def structured_log_window(job_id, mode, log_data, window, compact, collapsed=None):
+    """Structured counterpart of format_log_window"""
+    text, collapsed = clean_log_output(log_data, compact, collapsed)
+    return {
+        "job_id": job_id,
+        "mode": mode,
+        "text": text,
+        "collapsed_lines": collapsed,
+        "window": {
+            "start": window["start"],
+            "end": window["end"],
+            "total_size": window["total_size"],
+            "line_count": window.get("line_count"),
+        },
+    }
+
+
+def structured_sections(sections):
+    return [pick(section, *SECTION_FIELDS) for section in sections if section["depth"] == 0]
+
+
+def format_section_duration(section):
+    if section["duration"] is None:
+        return "running"
+    return format_duration(section["duration"]) if section["duration"] else "<1s"
+
+
+def format_sections(sections):
+    """Format the top-level sections of the log with their durations"""
+    top_level = [section for section in sections if section["depth"] == 0]
+    if not top_level:
+        return ""
+    slowest = max(top_level, key=lambda section: section["duration"] or 0)
+
+    result = MarkdownBuilder()
+    result.heading("Sections", level=2)
+    result.line("| Section | Duration | Lines |")
+    result.line("| ------- | -------- | ----- |")
+    for section in top_level:
+        marker = " (slowest)" if section is slowest and section["duration"] else ""
+        end_line = f"{section['end_line']:,}" if section["end_line"] else "..."
+        result += f"| `{section['name']}` | {format_section_duration(section)}{marker} | "
+        result += f"{section['start_line']:,}-{end_line} |\n"
+    result += '\n*Read one section with section="<name>".*\n\n'
+    return result.build()
+
+
+def format_log_output(log_data, compact, collapsed=None):
+    """Format log text as a code block, collapsing runs of near-identical lines if compact"""
+    text, collapsed = clean_log_output(log_data, compact, collapsed)
+    result = MarkdownBuilder().code_block(text)
+    if collapsed:
+        result += f"\n*{collapsed:,} repeated or progress lines collapsed; pass compact=false for raw output.*\n"
+    return result.build()
+
+
+def format_log_window(job_id, log_data, window, length, heading=None, compact=True, collapsed=None):
+    """Format a raw byte window of the log with paging hints"""
+    result = MarkdownBuilder()
+    result.heading(f"Job Log (ID: {job_id})")
+
+    start, end, total_size = window["start"], window["end"], window["total_size"]
+    if total_size is not None:
+        result += f"**Size**: {total_size / 1024:.1f} KB | "
+    if window.get("line_count") is not None:
+        result += f"**Lines**: {window['line_count']:,}\n\n"
+    else:
+        result += f"**Lines shown**: {log_data.count(chr(10)) + 1}\n\n"
+
+    if heading:
+        result.heading(heading, level=2)
+    elif start == 0 and end == total_size:
+        result.heading("Output", level=2)
+    else:
+        of_total = f" of {total_size:,}" if total_size is not None else ""
+        result.heading(f"Output (bytes {start:,}-{end:,}{of_total})", level=2)
+    result += format_log_output(log_data, compact, collapsed)
+
+    if start > 0:
+        previous_offset = max(start - length, 0)
+        result += f"\n*Earlier output: call again with offset={previous_offset}"
+        result += f", length={start - previous_offset}*\n"
+    if total_size is None or end < total_size:
+        result += f"\n*Later output: call again with offset={end}*\n"
+
+    return result.build()
+
+
+def format_failure_windows(job_id, analysis):
+    """Format the deduplicated failure signatures found in the log"""
+    result = MarkdownBuilder()
+    result.heading(f"Job Log (ID: {job_id})")
+    result += f"**Size**: {analysis['byte_count'] / 1024:.1f} KB | **Lines**: {analysis['line_count']:,} | "
+    result += f"**Failure signatures**: {analysis['signature_count']}\n\n"
+
+    for window in analysis["windows"]:
+        hits = ", ".join(
+            f"{signature['pattern']} at line {signature['line_number']:,}"
+            + (f" (x{signature['count']})" if signature["count"] > 1 else "")
+            for signature in window["signatures"]
+        )
+        in_section = f" in `{window['section']}`" if window.get("section") else ""
+        result.heading(f"{hits}{in_section}", level=2)
+        result += "```\n"
+        for number, line in enumerate(window["lines"], start=window["first_line"]):
+            result.line(f"{number:>7} | {line}")
+        result += "```\n\n"
+
+    result += format_sections(analysis["sections"])
+    if analysis["dropped_hits"]:
+        result += f"*{analysis['dropped_hits']} further matching lines not shown (signature limit reached)*\n\n"
+    result += '*Read the raw log with mode="tail" or offset/length.*\n'
+    return result.build()
 
 
 async def get_job_log(gitlab_url, project_id, access_token, args):
     """Get the trace/log output for a specific pipeline job"""
     logging.info(f"get_job_log called with args: {args}")
     job_id = args["job_id"]
+    offset = args.get("offset")
+    length = args.get("length", DEFAULT_LOG_LENGTH)
+    mode = args.get("mode", "tail")
+    if mode not in LOG_MODES:
+        raise ValueError(f"mode must be one of: {', '.join(LOG_MODES)}")
+
+    if mode == "follow":
+        return await get_job_log_follow(gitlab_url, project_id, access_token, args, length)
+
+    if args.get("section"):
+        return await get_job_log_section(gitlab_url, project_id, access_token, args, length)
+
+    # Reading from an offset always returns raw output
+    if mode == "errors" and offset is None:
+        return await get_job_log_failures(gitlab_url, project_id, access_token, args, length)
+
+    compact = args.get("compact", True)
+    # The tail is compacted before it is cut, so collapsed lines do not count against the length
+    compact_tail = compact and offset is None
+    read_length = max(length, min(length * COMPACT_READ_FACTOR, MAX_COMPACT_READ_BYTES)) if compact_tail else length
+    try:
+        status, log_data, window = await get_job_trace(
+            gitlab_url, project_id, access_token, job_id, offset=offset, length=read_length
+        )
+    except Exception as e:
+        logging.error(f"Error fetching job log: {e}")
+        raise Exception(f"Error fetching job log: {e}")
+
+    if status != 200:
+        logging.error(f"Error fetching job log: {status} - {window}")
+        raise Exception(f"Error fetching job log: {status} - {window}")
+
+    collapsed = None
+    if compact_tail and log_data:
+        log_data, window, collapsed = compact_log_tail(log_data, window, length)
+
+    if wants_json(args):
+        return structured_log_window(job_id, mode, log_data or "", window, compact, collapsed)
+
+    total_size = window["total_size"]
+    if offset and not log_data:
+        result = MarkdownBuilder()
+        result.heading(f"Job Log (ID: {job_id})")
+        size = f"{total_size:,} bytes" if total_size is not None else "unknown size"
+        result.line(f"Offset {offset:,} is past the end of the log ({size}).")
+        return [TextContent(type="text", text=result.build())]
+
+    if not log_data or len(log_data.strip()) == 0:
+        return [TextContent(type="text", text=no_log_output(job_id))]
+
+    return [
+        TextContent(
+            type="text", text=format_log_window(job_id, log_data, window, length, compact=compact, collapsed=collapsed)
+        )
+    ]
+
+
+async def get_job_log_failures(gitlab_url, project_id, access_token, args, length):
+    """Scan the whole log for failure signatures, falling back to its tail"""
+    job_id = args["job_id"]
+    extra_patterns = configured_patterns() + list(args.get("patterns") or [])
+    # Reject invalid patterns before downloading the log
+    compile_failure_patterns(extra_patterns)
 
     try:
-        status, log_data, error = await get_job_trace(gitlab_url, project_id, access_token, job_id)
+        status, analysis, error = await get_job_trace_analysis(
+            gitlab_url,
+            project_id,
+            access_token,
+            job_id,
+            extra_patterns=extra_patterns,
+            context_lines=args.get("context_lines", DEFAULT_CONTEXT_LINES),
+            tail_bytes=length,
+            compact_tail=args.get("compact", True),
+        )
     except Exception as e:
         logging.error(f"Error fetching job log: {e}")
         raise Exception(f"Error fetching job log: {e}")
@@ -20,34 +265,179 @@ async def get_job_log(gitlab_url, project_id, access_token, args):
         logging.error(f"Error fetching job log: {status} - {error}")
         raise Exception(f"Error fetching job log: {status} - {error}")
 
-    if not log_data or len(log_data.strip()) == 0:
-        result = f"# Job Log (ID: {job_id})\n\n"
-        result += "No log output available.\n\n"
-        result += "Possible reasons:\n"
-        result += "- Job hasn't started yet\n"
-        result += "- Job was skipped\n"
-        result += "- Log has been archived or deleted\n"
-        return [TextContent(type="text", text=result)]
-
-    # Format output
-    result = f"# Job Log (ID: {job_id})\n\n"
-
-    log_size_kb = len(log_data) / 1024
-    line_count = log_data.count(chr(10)) + 1
-    result += f"**Size**: {log_size_kb:.1f} KB | **Lines**: {line_count}\n\n"
-
-    # Truncate if needed
-    max_chars = 15000
-    if len(log_data) > max_chars:
-        result += "## Output (last 15,000 characters)\n\n"
-        result += "```\n"
-        result += log_data[-max_chars:]
-        result += "\n```\n\n"
-        result += f"*Truncated from {len(log_data):,} characters*\n"
+    if wants_json(args):
+        return build_structured_failures(job_id, analysis, args.get("compact", True))
+
+    if not analysis["tail"].strip():
+        return [TextContent(type="text", text=no_log_output(job_id))]
+
+    if analysis["windows"]:
+        return [TextContent(type="text", text=format_failure_windows(job_id, analysis))]
+
+    window = {
+        "start": analysis["tail_start"],
+        "end": analysis["byte_count"],
+        "total_size": analysis["byte_count"],
+        "line_count": analysis["line_count"],
+    }
+    result = MarkdownBuilder(
+        format_log_window(
+            job_id,
+            analysis["tail"],
+            window,
+            length,
+            compact=args.get("compact", True),
+            collapsed=analysis.get("collapsed_lines"),
+        )
+    )
+    result += "\n*No failure patterns matched; showing the end of the log.*\n"
+    return [TextContent(type="text", text=result.build())]
+
+
+def build_structured_failures(job_id, analysis, compact):
+    """Structured counterpart of the errors mode, with the log tail when no pattern matched"""
+    result = {
+        "job_id": job_id,
+        "mode": "errors",
+        "byte_count": analysis["byte_count"],
+        "line_count": analysis["line_count"],
+        "failures": [
+            {
+                "signatures": [
+                    pick(signature, "pattern", "line_number", "count") for signature in window["signatures"]
+                ],
+                "section": window.get("section"),
+                "first_line": window["first_line"],
+                "lines": window["lines"],
+            }
+            for window in analysis["windows"]
+        ],
+        "sections": structured_sections(analysis["sections"]),
+        "dropped_hits": analysis["dropped_hits"],
+    }
+    if not analysis["windows"]:
+        window = {
+            "start": analysis["tail_start"],
+            "end": analysis["byte_count"],
+            "total_size": analysis["byte_count"],
+            "line_count": analysis["line_count"],
+        }
+        result |= structured_log_window(
+            job_id, "errors", analysis["tail"], window, compact, analysis.get("collapsed_lines")
+        )
+    return result
+
+
+async def get_job_log_section(gitlab_url, project_id, access_token, args, length):
+    """Get the output of one section of the log, e.g. step_script"""
+    job_id = args["job_id"]
+    section_name = args["section"]
+
+    try:
+        status, sections, error = await get_job_trace_sections(gitlab_url, project_id, access_token, job_id)
+    except Exception as e:
+        logging.error(f"Error fetching job log sections: {e}")
+        raise Exception(f"Error fetching job log sections: {e}")
+
+    if status != 200:
+        logging.error(f"Error fetching job log sections: {status} - {error}")
+        raise Exception(f"Error fetching job log sections: {status} - {error}")
+
+    section = find_section(sections, section_name)
+    if section is None:
+        if wants_json(args):
+            return {"job_id": job_id, "mode": "section", "section": None, "sections": structured_sections(sections)}
+        result = MarkdownBuilder()
+        result.heading(f"Job Log (ID: {job_id})")
+        result += f"Section `{section_name}` not found in this log.\n\n"
+        result += format_sections(sections) if sections else "The log has no sections.\n"
+        return [TextContent(type="text", text=result.build())]
+
+    # Show the end of long sections, where a failing step usually reports its error
+    if section["end"] is None:
+        offset, read_length = None, length
     else:
-        result += "## Output\n\n"
-        result += "```\n"
-        result += log_data
-        result += "\n```\n"
+        offset = max(section["start"], section["end"] - length)
+        read_length = section["end"] - offset
+
+    status, log_data, window = await get_job_trace(
+        gitlab_url, project_id, access_token, job_id, offset=offset, length=read_length
+    )
+    if status != 200:
+        logging.error(f"Error fetching job log: {status} - {window}")
+        raise Exception(f"Error fetching job log: {status} - {window}")
 
+    if wants_json(args):
+        result = structured_log_window(job_id, "section", log_data, window, args.get("compact", True))
+        return result | {"section": pick(section, *SECTION_FIELDS)}
+
+    heading = f"Section `{section['name']}` ({format_section_duration(section)}"
+    if offset is None:
+        heading += ", still running: end of the log"
+    elif offset > section["start"]:
+        heading += f", last {window['end'] - window['start']:,} of {section['end'] - section['start']:,} bytes"
+    heading += ")"
+    result = format_log_window(job_id, log_data, window, length, heading=heading, compact=args.get("compact", True))
     return [TextContent(type="text", text=result)]
+
+
+async def get_job_log_follow(gitlab_url, project_id, access_token, args, length):
+    """Return only the log output added since the previous follow call for this job"""
+    job_id = args["job_id"]
+    follow_key = (gitlab_url, str(project_id), job_id)
+    offset = args.get("offset")
+    if offset is None:
+        offset = _follow_offsets.get(follow_key)
+
+    try:
+        # Read the status first: once it is final, the log read after it is complete
+        job_status, job, job_error = await get_job(gitlab_url, project_id, access_token, job_id)
+        if job_status != 200:
+            raise Exception(f"{job_status} - {job_error}")
+        status, log_data, window = await get_job_trace(
+            gitlab_url, project_id, access_token, job_id, offset=offset, length=length
+        )
+    except Exception as e:
+        logging.error(f"Error following job log: {e}")
+        raise Exception(f"Error following job log: {e}")
+
+    if status != 200:
+        logging.error(f"Error following job log: {status} - {window}")
+        raise Exception(f"Error following job log: {status} - {window}")
+
+    state = job.get("status", "unknown")
+    start, end, total_size = window["start"], window["end"], window["total_size"]
+    caught_up = total_size is not None and end >= total_size
+    finished = state in FINISHED_JOB_STATUSES and caught_up
+    if finished:
+        _follow_offsets.pop(follow_key)
+    else:
+        _follow_offsets.set(follow_key, end)
+
+    if wants_json(args):
+        result = structured_log_window(job_id, "follow", log_data or "", window, args.get("compact", True))
+        return result | {"job_status": state, "finished": finished}
+
+    result = MarkdownBuilder()
+    result.heading(f"Job Log (ID: {job_id}, following)")
+    result += f"**Status**: {get_pipeline_status_icon(state)} {state}"
+    if total_size is not None:
+        result += f" | **Size**: {total_size / 1024:.1f} KB"
+    result += "\n\n"
+
+    if log_data:
+        if offset is None and start > 0:
+            result.heading(f"Output (last {end - start:,} bytes)", level=2)
+        else:
+            result.heading(f"New output (bytes {start:,}-{end:,})", level=2)
+        result += format_log_output(log_data, args.get("compact", True))
+    else:
+        result.line(f"No new output since byte {end:,}.")
+
+    if finished:
+        result += f"\n*Job finished ({state}); the log is complete and following has stopped.*\n"
+    elif not caught_up:
+        result += f'\n*More output is waiting: call again with mode="follow" to continue from byte {end:,}.*\n'
+    else:
+        result += '\n*Call again with mode="follow" to get output added after this point.*\n'
+    return [TextContent(type="text", text=result.build())]
@@ -6,6 +6,8 @@ from mcp.types import TextContent
 from gitlab_mr_mcp.gitlab_api import get_merge_request_changes
 from gitlab_mr_mcp.gitlab_api import get_merge_request_details as api_get_merge_request_details
 from gitlab_mr_mcp.gitlab_api import get_merge_request_pipeline, get_merge_request_reviews
+from gitlab_mr_mcp.markdown import MarkdownBuilder
+from gitlab_mr_mcp.structured import username, wants_json
 from gitlab_mr_mcp.utils import (
     analyze_mr_readiness,
     calculate_change_stats,
@@ -17,6 +19,45 @@ from gitlab_mr_mcp.utils import (
 )
 
 
+def build_structured_details(mr_data, pipeline_data, changes_data, reviews_result):
+    """Structured counterpart of the details report"""
+    pipeline = pipeline_data or mr_data.get("pipeline") or {}
+    approved_by, approvals_left = [], None
+    discussions = []
+    if reviews_result and "discussions" in reviews_result:
+        discussions_status, discussions_data, _ = reviews_result["discussions"]
+        approvals_status, approvals, _ = reviews_result["approvals"]
+        if approvals_status == 200 and approvals:
+            approved_by = [a["user"]["username"] for a in approvals.get("approved_by", [])]
+            approvals_left = approvals.get("approvals_left", 0)
+        if discussions_status == 200 and discussions_data:
+            discussions = discussions_data
+    resolved = sum(1 for d in discussions if d.get("resolved"))
+    return {
+        "iid": mr_data["iid"],
+        "title": mr_data["title"],
+        "state": mr_data["state"],
+        "author": username(mr_data.get("author")),
+        "source_branch": mr_data["source_branch"],
+        "target_branch": mr_data["target_branch"],
+        "created_at": mr_data.get("created_at"),
+        "updated_at": mr_data.get("updated_at"),
+        "pipeline_status": pipeline.get("status"),
+        "changes": calculate_change_stats(changes_data) if changes_data else None,
+        "readiness": analyze_mr_readiness(mr_data, pipeline_data),
+        "labels": mr_data.get("labels") or [],
+        "draft": bool(mr_data.get("draft") or mr_data.get("work_in_progress")),
+        "has_conflicts": bool(mr_data.get("has_conflicts")),
+        "assignees": [user["username"] for user in mr_data.get("assignees") or []],
+        "reviewers": [user["username"] for user in mr_data.get("reviewers") or []],
+        "approved_by": approved_by,
+        "approvals_left": approvals_left,
+        "discussions": {"total": len(discussions), "resolved": resolved, "unresolved": len(discussions) - resolved},
+        "description": mr_data.get("description"),
+        "web_url": mr_data["web_url"],
+    }
+
+
 async def get_merge_request_details(gitlab_url, project_id, access_token, args):
     logging.info(f"get_merge_request_details called with args: {args}")
     mr_iid = args["merge_request_iid"]
@@ -42,58 +83,66 @@ async def get_merge_request_details(gitlab_url, project_id, access_token, args):
         logging.error(f"Error fetching merge request details: {mr_status} - {mr_error}")
         raise Exception(f"Error fetching merge request details: {mr_status} - {mr_error}")
 
+    if wants_json(args):
+        if pipeline_status != 200:
+            pipeline_data = None
+        return build_structured_details(
+            mr_data, pipeline_data, changes_data if changes_status == 200 else None, reviews_result
+        )
+
     # Header
     state_icon = get_state_icon(mr_data["state"])
-    result = f"# {state_icon} MR !{mr_data['iid']}: {mr_data['title']}\n\n"
+    result = MarkdownBuilder()
+    result.heading(f"{state_icon} MR !{mr_data['iid']}: {mr_data['title']}")
 
     # Core info
-    result += f"**Author**: {format_user(mr_data.get('author'))}\n"
-    result += f"**State**: {mr_data['state']}\n"
-    result += f"**Branches**: `{mr_data['source_branch']}` -> `{mr_data['target_branch']}`\n"
-    result += f"**Created**: {format_date(mr_data['created_at'])}\n"
-    result += f"**Updated**: {format_date(mr_data['updated_at'])}\n"
+    result.field("Author", format_user(mr_data.get("author")))
+    result.field("State", mr_data["state"])
+    result.field("Branches", f"`{mr_data['source_branch']}` -> `{mr_data['target_branch']}`")
+    result.field("Created", format_date(mr_data["created_at"]))
+    result.field("Updated", format_date(mr_data["updated_at"]))
 
     # Pipeline
     if pipeline_status == 200 and pipeline_data:
         pipeline_icon = get_pipeline_status_icon(pipeline_data.get("status"))
-        result += f"**Pipeline**: {pipeline_icon} {pipeline_data.get('status', 'unknown')}\n"
+        result.field("Pipeline", f"{pipeline_icon} {pipeline_data.get('status', 'unknown')}")
     elif mr_data.get("pipeline"):
         pipeline_stat = mr_data["pipeline"].get("status")
         pipeline_icon = get_pipeline_status_icon(pipeline_stat)
-        result += f"**Pipeline**: {pipeline_icon} {pipeline_stat or 'unknown'}\n"
+        result.field("Pipeline", f"{pipeline_icon} {pipeline_stat or 'unknown'}")
 
     # Changes
     if changes_status == 200:
         change_stats = calculate_change_stats(changes_data)
-        result += f"**Changes**: {change_stats}\n"
+        result.field("Changes", change_stats)
 
     # Readiness
     readiness = analyze_mr_readiness(mr_data, pipeline_data)
-    result += f"**Merge Status**: {readiness}\n"
+    result.field("Merge Status", readiness)
 
     # Labels
     labels_str = format_labels(mr_data.get("labels"))
     if labels_str:
-        result += f"**Labels**: {labels_str}\n"
+        result.field("Labels", labels_str)
 
     # Flags
     if mr_data.get("draft") or mr_data.get("work_in_progress"):
-        result += "**Draft**: Yes\n"
+        result.field("Draft", "Yes")
 
     if mr_data.get("has_conflicts"):
-        result += "**Conflicts**: Yes - needs resolution\n"
+        result.field("Conflicts", "Yes - needs resolution")
 
     # Assignees/Reviewers
     if mr_data.get("assignees"):
         assignees = ", ".join(f"@{user['username']}" for user in mr_data["assignees"])
-        result += f"**Assignees**: {assignees}\n"
+        result.field("Assignees", assignees)
 
     if mr_data.get("reviewers"):
         reviewers = ", ".join(f"@{user['username']}" for user in mr_data["reviewers"])
-        result += f"**Reviewers**: {reviewers}\n"
+        result.field("Reviewers", reviewers)
 
     # URL
-    result += f"**URL**: {mr_data['web_url']}\n"
+    result.field("URL", mr_data["web_url"])
 
     # Description
     if mr_data.get("description"):
@@ -112,10 +161,10 @@ async def get_merge_request_details(gitlab_url, project_id, access_token, args):
 
             if approved_by:
                 approvers = ", ".join(f"@{a['user']['username']}" for a in approved_by)
-                result += f"**Approved by**: {approvers}\n"
+                result.field("Approved by", approvers)
 
             if approvals_left > 0:
-                result += f"**Approvals needed**: {approvals_left}\n"
+                result.field("Approvals needed", approvals_left)
 
         if discussions_status == 200 and discussions:
             total = len(discussions)
@@ -161,6 +210,6 @@ async def get_merge_request_details(gitlab_url, project_id, access_token, args):
     if action_items:
         result += "\n".join(action_items) + "\n"
     else:
-        result += "None identified\n"
+        result.line("None identified")
 
-    return [TextContent(type="text", text=result)]
+    return [TextContent(type="text", text=result.build())]
@@ -3,19 +3,107 @@ import logging
 from mcp.types import TextContent
 
 from gitlab_mr_mcp.gitlab_api import get_merge_request_pipeline as api_get_merge_request_pipeline
-from gitlab_mr_mcp.gitlab_api import get_pipeline_jobs
-from gitlab_mr_mcp.utils import format_date, get_pipeline_status_icon
+from gitlab_mr_mcp.gitlab_api import get_pipeline_job_graph
+from gitlab_mr_mcp.markdown import MarkdownBuilder, configured_output_budget
+from gitlab_mr_mcp.result_store import result_store
+from gitlab_mr_mcp.structured import pick, wants_json
+from gitlab_mr_mcp.utils import format_date, format_duration, get_pipeline_status_icon
 
+DEFAULT_DOWNSTREAM_DEPTH = 2
 
-def format_duration(seconds):
-    """Format duration in human readable form"""
-    if not seconds:
-        return "N/A"
-    mins = int(seconds) // 60
-    secs = int(seconds) % 60
-    if mins > 0:
-        return f"{mins}m {secs}s"
-    return f"{secs}s"
+PIPELINE_FIELDS = ("id", "status", "sha", "ref", "source", "created_at", "duration", "coverage", "web_url")
+
+
+def flatten_job_graph(graph):
+    """Return (job, origin) pairs for every job in the graph, origin naming its downstream pipeline"""
+    root_project_id = str(graph["pipelines"][0]["project_id"])
+    flattened = []
+    for pipeline in graph["pipelines"]:
+        origin = ""
+        if pipeline["depth"] > 0:
+            origin = f", Pipeline: #{pipeline['id']}"
+            if str(pipeline["project_id"]) != root_project_id:
+                origin += f", Project: `{pipeline['project_id']}`"
+        flattened.extend((job, origin) for job in pipeline["jobs"])
+    return flattened
+
+
+def format_downstream_pipelines(graph):
+    """Format the tree of downstream pipelines triggered by bridge jobs"""
+    result = MarkdownBuilder()
+    for pipeline in graph["pipelines"][1:]:
+        indent = "  " * (pipeline["depth"] - 1)
+        icon = get_pipeline_status_icon(pipeline.get("status"))
+        result += f"{indent}- {icon} **{pipeline.get('triggered_by') or 'trigger'}** -> Pipeline #{pipeline['id']}"
+        result += f" (Project: `{pipeline['project_id']}`)"
+        if "error" in pipeline:
+            error_status, _error_data, _error_text = pipeline["error"]
+            result += f": jobs unavailable ({error_status})\n"
+            continue
+        failed = sum(1 for job in pipeline["jobs"] if job.get("status") == "failed")
+        result += f": {len(pipeline['jobs'])} jobs"
+        if failed:
+            result += f", {failed} failed"
+        result += "\n"
+    return result.build()
+
+
+def build_structured_pipeline(pipeline_data, graph):
+    """Structured counterpart of the pipeline report, jobs tagged with the pipeline they ran in"""
+    pipelines = graph["pipelines"] if graph else []
+    jobs = [
+        pick(job, "id", "name", "stage", "status", "duration")
+        | {"pipeline_id": pipeline["id"], "project_id": pipeline["project_id"]}
+        for pipeline in pipelines
+        for job in pipeline["jobs"]
+    ]
+    downstream = []
+    for pipeline in pipelines[1:]:
+        entry = pick(pipeline, "id", "project_id", "status", "depth", "triggered_by")
+        if "error" in pipeline:
+            entry["error"] = f"jobs unavailable ({pipeline['error'][0]})"
+        downstream.append(entry)
+    return {"pipeline": pick(pipeline_data, *PIPELINE_FIELDS), "jobs": jobs, "downstream_pipelines": downstream}
+
+
+def format_failed_job(job, origin):
+    job_icon = get_pipeline_status_icon(job.get("status"))
+    duration = format_duration(job.get("duration"))
+    return (
+        f"- {job_icon} **{job.get('name', 'Unknown')}** "
+        f"(ID: `{job.get('id')}`, Stage: {job.get('stage', 'N/A')}, {duration}{origin})\n"
+    )
+
+
+def format_running_job(job, origin):
+    job_icon = get_pipeline_status_icon(job.get("status"))
+    return (
+        f"- {job_icon} **{job.get('name', 'Unknown')}** "
+        f"(ID: `{job.get('id')}`, Stage: {job.get('stage', 'N/A')}{origin})\n"
+    )
+
+
+def format_passed_job(job, origin):
+    duration = format_duration(job.get("duration"))
+    return f"- [pass] **{job.get('name', 'Unknown')}** (ID: `{job.get('id')}`, {duration}{origin})\n"
+
+
+def format_other_job(job, origin):
+    job_icon = get_pipeline_status_icon(job.get("status"))
+    return (
+        f"- {job_icon} **{job.get('name', 'Unknown')}** "
+        f"(ID: `{job.get('id')}`, Status: {job.get('status', 'N/A')}{origin})\n"
+    )
+
+
+def job_section_renderer(title, render):
+    """Render (index, (job, origin)) items, opening the section with its first job"""
+
+    def render_item(item):
+        index, (job, origin) = item
+        return (f"### {title}\n\n" if index == 0 else "") + render(job, origin)
+
+    return render_item
 
 
 async def get_merge_request_pipeline(gitlab_url, project_id, access_token, args):
@@ -36,112 +124,75 @@ async def get_merge_request_pipeline(gitlab_url, project_id, access_token, args)
         raise Exception(f"Error fetching merge request pipeline: {status} - {error}")
 
     if not pipeline_data:
-        result = f"# Pipeline for MR !{mr_iid}\n\n"
+        if wants_json(args):
+            return {"pipeline": None, "jobs": [], "downstream_pipelines": []}
+        result = MarkdownBuilder()
+        result.heading(f"Pipeline for MR !{mr_iid}")
         result += "No pipeline found for this merge request.\n\n"
-        result += "Possible reasons:\n"
-        result += "- No CI/CD configured for this project\n"
-        result += "- Pipeline hasn't been triggered yet\n"
-        result += "- Branch has no commits\n"
-        return [TextContent(type="text", text=result)]
+        result.line("Possible reasons:")
+        result.bullet("No CI/CD configured for this project")
+        result.bullet("Pipeline hasn't been triggered yet")
+        result.bullet("Branch has no commits")
+        return [TextContent(type="text", text=result.build())]
 
-    # Get jobs for the pipeline
+    # Get jobs for the pipeline and its downstream pipelines
     pipeline_id = pipeline_data.get("id")
-    jobs_data = []
+    downstream_depth = args.get("downstream_depth", DEFAULT_DOWNSTREAM_DEPTH)
+    graph = None
     if pipeline_id:
         try:
-            jobs_status, jobs_data, jobs_error = await get_pipeline_jobs(
-                gitlab_url, project_id, access_token, pipeline_id
+            graph_status, graph, graph_error = await get_pipeline_job_graph(
+                gitlab_url, project_id, access_token, pipeline_id, max_depth=downstream_depth
             )
-            if jobs_status != 200:
-                logging.warning(f"Could not fetch jobs: {jobs_status} - {jobs_error}")
-                jobs_data = []
+            if graph_status != 200:
+                logging.warning(f"Could not fetch jobs: {graph_status} - {graph_error}")
+                graph = None
         except Exception as e:
             logging.warning(f"Error fetching jobs: {e}")
-            jobs_data = []
+            graph = None
+    if wants_json(args):
+        return build_structured_pipeline(pipeline_data, graph)
+
+    jobs_data = flatten_job_graph(graph) if graph else []
 
     # Format output
     pipeline_status = pipeline_data.get("status", "unknown")
     pipeline_icon = get_pipeline_status_icon(pipeline_status)
 
-    result = f"# {pipeline_icon} Pipeline for MR !{mr_iid}\n\n"
+    result = MarkdownBuilder()
+    result.heading(f"{pipeline_icon} Pipeline for MR !{mr_iid}")
 
     # Overview
-    result += "## Overview\n\n"
-    result += f"**Pipeline ID**: {pipeline_data.get('id', 'N/A')}\n"
-    result += f"**Status**: {pipeline_icon} {pipeline_status}\n"
-    result += f"**SHA**: `{pipeline_data.get('sha', 'N/A')[:8]}`\n"
-    result += f"**Ref**: `{pipeline_data.get('ref', 'N/A')}`\n"
+    result.heading("Overview", level=2)
+    result.field("Pipeline ID", pipeline_data.get("id", "N/A"))
+    result.field("Status", f"{pipeline_icon} {pipeline_status}")
+    result.field("SHA", f"`{pipeline_data.get('sha', 'N/A')[:8]}`")
+    result.field("Ref", f"`{pipeline_data.get('ref', 'N/A')}`")
 
     if pipeline_data.get("source"):
-        result += f"**Source**: {pipeline_data['source']}\n"
+        result.field("Source", pipeline_data["source"])
 
     if pipeline_data.get("created_at"):
-        result += f"**Created**: {format_date(pipeline_data['created_at'])}\n"
+        result.field("Created", format_date(pipeline_data["created_at"]))
 
     if pipeline_data.get("duration"):
-        result += f"**Duration**: {format_duration(pipeline_data['duration'])}\n"
+        result.field("Duration", format_duration(pipeline_data["duration"]))
 
     if pipeline_data.get("coverage"):
-        result += f"**Coverage**: {pipeline_data['coverage']}%\n"
+        result.field("Coverage", f"{pipeline_data['coverage']}%")
 
     if pipeline_data.get("web_url"):
-        result += f"**URL**: {pipeline_data['web_url']}\n"
-
-    result += "\n"
-
-    # Jobs
-    if jobs_data:
-        result += "## Jobs\n\n"
+        result.field("URL", pipeline_data["web_url"])
 
-        # Group by status
-        failed_jobs = [j for j in jobs_data if j.get("status") == "failed"]
-        running_jobs = [j for j in jobs_data if j.get("status") == "running"]
-        success_jobs = [j for j in jobs_data if j.get("status") == "success"]
-        other_jobs = [j for j in jobs_data if j.get("status") not in ["failed", "success", "running"]]
+    result.line()
 
-        result += f"**Total**: {len(jobs_data)} | "
-        result += f"**Passed**: {len(success_jobs)} | "
-        result += f"**Failed**: {len(failed_jobs)} | "
-        result += f"**Running**: {len(running_jobs)} | "
-        result += f"**Other**: {len(other_jobs)}\n\n"
-
-        # Failed jobs first (most important)
-        if failed_jobs:
-            result += "### Failed Jobs\n\n"
-            for job in failed_jobs:
-                job_icon = get_pipeline_status_icon(job.get("status"))
-                duration = format_duration(job.get("duration"))
-                result += f"- {job_icon} **{job.get('name', 'Unknown')}** "
-                result += f"(ID: `{job.get('id')}`, Stage: {job.get('stage', 'N/A')}, {duration})\n"
-
-            result += "\nUse `get_job_log` with Job ID to see error details.\n\n"
-
-        # Running jobs
-        if running_jobs:
-            result += "### Running Jobs\n\n"
-            for job in running_jobs:
-                job_icon = get_pipeline_status_icon(job.get("status"))
-                result += f"- {job_icon} **{job.get('name', 'Unknown')}** "
-                result += f"(ID: `{job.get('id')}`, Stage: {job.get('stage', 'N/A')})\n"
-            result += "\n"
-
-        # Successful jobs (compact)
-        if success_jobs:
-            result += "### Passed Jobs\n\n"
-            for job in success_jobs:
-                duration = format_duration(job.get("duration"))
-                result += f"- [pass] **{job.get('name', 'Unknown')}** "
-                result += f"(ID: `{job.get('id')}`, {duration})\n"
-            result += "\n"
-
-        # Other jobs
-        if other_jobs:
-            result += "### Other Jobs\n\n"
-            for job in other_jobs:
-                job_icon = get_pipeline_status_icon(job.get("status"))
-                result += f"- {job_icon} **{job.get('name', 'Unknown')}** "
-                result += f"(ID: `{job.get('id')}`, Status: {job.get('status', 'N/A')})\n"
-            result += "\n"
+    # Downstream pipelines and the status explanation go last but are rendered first,
+    # so the job list leaves room for them
+    footer = MarkdownBuilder()
+    if graph and len(graph["pipelines"]) > 1:
+        footer.heading("Downstream Pipelines", level=2)
+        footer += format_downstream_pipelines(graph)
+        footer += "\nJobs from downstream pipelines are included above; pass their Project to `get_job_log`.\n\n"
 
     # Status explanation
     status_explanations = {
@@ -155,6 +206,60 @@ async def get_merge_request_pipeline(gitlab_url, project_id, access_token, args)
     }
 
     explanation = status_explanations.get(pipeline_status, f"Status: {pipeline_status}")
-    result += f"**Status explanation**: {explanation}\n"
+    footer.field("Status explanation", explanation)
+
+    # Jobs
+    if jobs_data:
+        result.heading("Jobs", level=2)
+
+        # Group by status
+        failed_jobs = [(j, o) for j, o in jobs_data if j.get("status") == "failed"]
+        running_jobs = [(j, o) for j, o in jobs_data if j.get("status") == "running"]
+        success_jobs = [(j, o) for j, o in jobs_data if j.get("status") == "success"]
+        other_jobs = [(j, o) for j, o in jobs_data if j.get("status") not in ["failed", "success", "running"]]
+
+        result += f"**Total**: {len(jobs_data)} | "
+        result += f"**Passed**: {len(success_jobs)} | "
+        result += f"**Failed**: {len(failed_jobs)} | "
+        result += f"**Running**: {len(running_jobs)} | "
+        result += f"**Other**: {len(other_jobs)}\n\n"
+
+        # Most important first: passed jobs are the first to go when the output budget runs out
+        sections = [
+            ("Failed Jobs", "failed", failed_jobs, format_failed_job),
+            ("Running Jobs", "running", running_jobs, format_running_job),
+            ("Other Jobs", "other", other_jobs, format_other_job),
+            ("Passed Jobs", "passed", success_jobs, format_passed_job),
+        ]
+        budget = configured_output_budget()
+        omitted = []
+        # Rendered jobs left out by the budget, kept for fetch_more
+        remainder = []
+        for title, label, jobs, render in sections:
+            if not jobs:
+                continue
+            renderer = job_section_renderer(title, render)
+            trailer = (
+                '\nUse `get_job_log` with Job ID and mode="errors" to see error details.\n\n'
+                if label == "failed"
+                else "\n"
+            )
+            if omitted:
+                left_out = list(enumerate(jobs))
+            else:
+                left_out = result.add_items(enumerate(jobs), renderer, budget, reserve=len(footer) + 250)
+            if not left_out:
+                result += trailer
+                continue
+            omitted.append((label, len(left_out)))
+            chunks = [renderer(item) for item in left_out]
+            chunks[-1] += trailer
+            remainder.extend(chunks)
+
+        if omitted:
+            counts = ", ".join(f"{count} {label}" for label, count in omitted)
+            cursor = result_store.add(remainder, "jobs")
+            result.omitted(len(remainder), "jobs", f" ({counts})", cursor)
 
-    return [TextContent(type="text", text=result)]
+    result += footer.build()
+    return [TextContent(type="text", text=result.build())]
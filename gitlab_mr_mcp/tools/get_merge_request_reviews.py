@@ -5,39 +5,47 @@ from mcp.types import TextContent
 
 from gitlab_mr_mcp.gitlab_api import get_merge_request_changes, get_merge_request_details, get_merge_request_pipeline
 from gitlab_mr_mcp.gitlab_api import get_merge_request_reviews as api_get_merge_request_reviews
+from gitlab_mr_mcp.markdown import MarkdownBuilder, configured_output_budget
+from gitlab_mr_mcp.structured import username, wants_json
 from gitlab_mr_mcp.utils import (
     analyze_mr_readiness,
     calculate_change_stats,
     format_date,
+    format_handle,
+    format_note_time,
+    format_participants,
     format_user,
     get_pipeline_status_icon,
+    parse_date,
 )
 
+DEFAULT_THREAD_LIMIT = 50
+
 
 def format_approval_summary(approvals):
     """Generate approval summary"""
     if not approvals:
         return "No approval information available\n"
 
-    result = ""
+    result = MarkdownBuilder()
     approved_by = approvals.get("approved_by", [])
     approvals_required = approvals.get("approvals_required", 0)
     approvals_left = approvals.get("approvals_left", 0)
 
     if approved_by:
         approvers = ", ".join(f"@{a['user']['username']}" for a in approved_by)
-        result += f"**Approved by**: {approvers}\n"
+        result.field("Approved by", approvers)
 
     if approvals_required > 0:
         if approvals_left == 0:
-            result += "**Status**: All required approvals received\n"
+            result.field("Status", "All required approvals received")
         else:
-            result += f"**Status**: {approvals_left} more approval(s) needed\n"
-        result += f"**Required**: {approvals_required} | **Received**: {len(approved_by)}\n"
+            result.field("Status", f"{approvals_left} more approval(s) needed")
+        result.line(f"**Required**: {approvals_required} | **Received**: {len(approved_by)}")
     elif not approved_by:
-        result += "No approvals yet\n"
+        result.line("No approvals yet")
 
-    return result
+    return result.build()
 
 
 def format_discussion_summary(discussions):
@@ -49,35 +57,88 @@ def format_discussion_summary(discussions):
     resolved = sum(1 for d in discussions if d.get("resolved"))
     unresolved = total - resolved
 
-    result = f"**Total**: {total} | **Resolved**: {resolved} | **Unresolved**: {unresolved}\n"
+    result = MarkdownBuilder(f"**Total**: {total} | **Resolved**: {resolved} | **Unresolved**: {unresolved}\n")
 
     if unresolved > 0:
         result += f"\n**{unresolved} unresolved discussion(s)** require attention\n"
 
-    return result
+    return result.build()
+
+
+def user_notes(discussion):
+    """Return the non-system notes of a discussion"""
+    return [note for note in discussion.get("notes") or [] if not note.get("system")]
+
+
+def note_paths(note):
+    """Return the file paths an inline note is attached to"""
+    position = note.get("position") or {}
+    return [path for path in (position.get("new_path"), position.get("old_path")) if path]
+
 
+def build_thread_filter(args):
+    """Build a predicate selecting discussion threads from the tool arguments"""
+    unresolved_only = args.get("unresolved_only", False)
+    file_path = args.get("file_path")
+    author = (args.get("author") or "").lstrip("@").lower()
+    since = None
+    if args.get("since"):
+        since = parse_date(args["since"])
+        if since is None:
+            raise ValueError(f"Invalid since date: {args['since']!r}. Use ISO 8601, e.g. 2024-01-31")
 
-def format_discussion_thread(discussion):
-    """Format a single discussion thread"""
+    def matches(discussion):
+        notes = user_notes(discussion)
+        if not notes:
+            return False
+        if unresolved_only and discussion.get("resolved"):
+            return False
+        if file_path and not any(file_path in path for note in notes for path in note_paths(note)):
+            return False
+        if author and not any((note.get("author") or {}).get("username", "").lower() == author for note in notes):
+            return False
+        if since:
+            timestamps = (parse_date(note.get("updated_at") or note.get("created_at")) for note in notes)
+            if not any(ts and ts >= since for ts in timestamps):
+                return False
+        return True
+
+    return matches
+
+
+def select_threads(discussions, matches):
+    """Return the matching threads, unresolved ones first"""
+    return sorted((d for d in discussions or [] if matches(d)), key=lambda d: bool(d.get("resolved")))
+
+
+def format_discussion_thread(discussion, compact=False):
+    """Format a single discussion thread; compact refers to authors by handle and elides repeated dates"""
     if not discussion.get("notes"):
         return ""
 
-    result = ""
     is_resolved = discussion.get("resolved", False)
     discussion_id = discussion.get("id", "unknown")
     status = "Resolved" if is_resolved else "Unresolved"
 
-    result += f"### Discussion `{discussion_id}` [{status}]\n\n"
+    result = MarkdownBuilder()
+    result.heading(f"Discussion `{discussion_id}` [{status}]", level=3)
 
+    previous_date = None
     for note in discussion["notes"]:
         if note.get("system"):
             continue
 
-        author = format_user(note.get("author"))
         note_id = note.get("id", "unknown")
-        timestamp = format_date(note.get("created_at"))
-
-        result += f"**{author}** ({timestamp}) [note: `{note_id}`]\n"
+        if compact:
+            result.line(
+                f"**{format_handle(note.get('author'))}** "
+                f"({format_note_time(note.get('created_at'), previous_date)}) [note: `{note_id}`]"
+            )
+            previous_date = note.get("created_at")
+        else:
+            author = format_user(note.get("author"))
+            timestamp = format_date(note.get("created_at"))
+            result.line(f"**{author}** ({timestamp}) [note: `{note_id}`]")
 
         # Position info for inline comments
         if note.get("position"):
@@ -86,20 +147,68 @@ def format_discussion_thread(discussion):
                 result += f"File: `{pos['new_path']}`"
                 if pos.get("new_line"):
                     result += f" line {pos['new_line']}"
-                result += "\n"
+                result.line()
 
-        body = note.get("body", "").strip()
+        body = (note.get("body") or "").strip()
         if body:
-            result += f"\n{body}\n"
+            result.line(f"\n{body}")
+
+        result.line()
+
+    return result.build()
+
+
+def structured_thread(discussion):
+    notes = []
+    for note in user_notes(discussion):
+        position = note.get("position") or {}
+        notes.append(
+            {
+                "id": note.get("id"),
+                "author": username(note.get("author")),
+                "created_at": note.get("created_at"),
+                "body": (note.get("body") or "").strip(),
+                "path": position.get("new_path"),
+                "line": position.get("new_line"),
+            }
+        )
+    return {"id": discussion.get("id", "unknown"), "resolved": bool(discussion.get("resolved")), "notes": notes}
+
+
+def action_items(discussions, approvals, details_status, mr_details, pipeline_data):
+    """List what still blocks the merge request, as Markdown bullets"""
+    items = []
+
+    if discussions:
+        unresolved = sum(1 for d in discussions if not d.get("resolved"))
+        if unresolved > 0:
+            items.append(f"- Resolve {unresolved} pending discussion(s)")
+
+    if approvals and approvals.get("approvals_left", 0) > 0:
+        items.append(f"- Get {approvals['approvals_left']} more approval(s)")
+
+    if pipeline_data and pipeline_data.get("status") == "failed":
+        items.append("- Fix failing pipeline")
+
+    if details_status == 200 and mr_details.get("has_conflicts"):
+        items.append("- Resolve merge conflicts")
+
+    return items
 
-        result += "\n"
 
-    return result
+def format_thread_entry(discussion, compact=False):
+    return format_discussion_thread(discussion, compact) + "---\n\n"
+
+
+def thread_participants(threads):
+    """Participant table for the authors of the user notes in threads"""
+    return format_participants(note.get("author") for thread in threads for note in user_notes(thread))
 
 
 async def get_merge_request_reviews(gitlab_url, project_id, access_token, args):
     logging.info(f"get_merge_request_reviews called with args: {args}")
     mr_iid = args["merge_request_iid"]
+    matches = build_thread_filter(args)
 
     tasks = [
         api_get_merge_request_reviews(gitlab_url, project_id, access_token, mr_iid),
@@ -125,67 +234,120 @@ async def get_merge_request_reviews(gitlab_url, project_id, access_token, args):
         logging.error(f"Error fetching discussions {discussions_status}: {discussions_text}")
         raise Exception(f"Error fetching discussions: {discussions_status} - {discussions_text}")
 
-    result = f"# Reviews for MR !{mr_iid}\n\n"
+    current_pipeline = pipeline_data if pipeline_status == 200 else None
+
+    if wants_json(args):
+        threads = select_threads(discussions, matches)
+        offset = args.get("offset", 0)
+        page = threads[offset : offset + args.get("limit", DEFAULT_THREAD_LIMIT)]
+        overview = None
+        if details_status == 200:
+            pipeline = current_pipeline or {}
+            overview = {
+                "title": mr_details.get("title", ""),
+                "author": username(mr_details.get("author")),
+                "state": mr_details.get("state", "unknown"),
+                "pipeline_status": pipeline.get("status"),
+                "changes": calculate_change_stats(changes_data) if changes_status == 200 else None,
+                "readiness": analyze_mr_readiness(mr_details, pipeline_data, approvals),
+                "has_conflicts": bool(mr_details.get("has_conflicts")),
+            }
+        resolved = sum(1 for d in discussions or [] if d.get("resolved"))
+        return {
+            "overview": overview,
+            "approvals": {
+                "approved_by": [a["user"]["username"] for a in (approvals or {}).get("approved_by", [])],
+                "required": (approvals or {}).get("approvals_required", 0),
+                "left": (approvals or {}).get("approvals_left", 0),
+            },
+            "discussions": {
+                "total": len(discussions or []),
+                "resolved": resolved,
+                "unresolved": len(discussions or []) - resolved,
+            },
+            "matching_threads": len(threads),
+            "offset": offset,
+            "threads": [structured_thread(discussion) for discussion in page],
+            "action_items": [
+                item[2:] for item in action_items(discussions, approvals, details_status, mr_details, current_pipeline)
+            ],
+        }
+
+    result = MarkdownBuilder()
+    result.heading(f"Reviews for MR !{mr_iid}")
 
     # MR Overview
     if details_status == 200:
-        result += "## Overview\n\n"
-        result += f"**Title**: {mr_details.get('title', 'N/A')}\n"
-        result += f"**Author**: {format_user(mr_details.get('author'))}\n"
-        result += f"**State**: {mr_details.get('state', 'N/A')}\n"
+        result.heading("Overview", level=2)
+        result.field("Title", mr_details.get("title", "N/A"))
+        result.field("Author", format_user(mr_details.get("author")))
+        result.field("State", mr_details.get("state", "N/A"))
 
         if pipeline_status == 200 and pipeline_data:
             pipeline_icon = get_pipeline_status_icon(pipeline_data.get("status"))
-            result += f"**Pipeline**: {pipeline_icon} {pipeline_data.get('status', 'unknown')}\n"
+            result.field("Pipeline", f"{pipeline_icon} {pipeline_data.get('status', 'unknown')}")
 
         if changes_status == 200:
-            change_stats = calculate_change_stats(changes_data)
-            result += f"**Changes**: {change_stats}\n"
+            result.field("Changes", calculate_change_stats(changes_data))
 
-        readiness = analyze_mr_readiness(mr_details, pipeline_data, approvals)
-        result += f"**Merge Status**: {readiness}\n"
-        result += "\n"
+        result.field("Merge Status", analyze_mr_readiness(mr_details, pipeline_data, approvals))
+        result.line()
 
     # Approvals
-    result += "## Approvals\n\n"
+    result.heading("Approvals", level=2)
     result += format_approval_summary(approvals)
-    result += "\n"
+    result.line()
 
     # Discussions summary
-    result += "## Discussions\n\n"
+    result.heading("Discussions", level=2)
     result += format_discussion_summary(discussions)
-    result += "\n"
+    result.line()
+
+    # Action items go last but are rendered first so the threads leave room for them
+    actions = MarkdownBuilder()
+    actions.heading("Action Items", level=2)
+    items = action_items(discussions, approvals, details_status, mr_details, current_pipeline)
+    if items:
+        actions += "\n".join(items) + "\n"
+    else:
+        actions.line("No action items - ready for next steps")
 
     # Detailed discussions
     if discussions:
-        result += "## Discussion Details\n\n"
-        for discussion in discussions:
-            thread_content = format_discussion_thread(discussion)
-            if thread_content:
-                result += thread_content
-                result += "---\n\n"
-
-    # Action items
-    result += "## Action Items\n\n"
-    action_items = []
-
-    if discussions:
-        unresolved = sum(1 for d in discussions if not d.get("resolved"))
-        if unresolved > 0:
-            action_items.append(f"- Resolve {unresolved} pending discussion(s)")
-
-    if approvals and approvals.get("approvals_left", 0) > 0:
-        action_items.append(f"- Get {approvals['approvals_left']} more approval(s)")
-
-    if pipeline_status == 200 and pipeline_data and pipeline_data.get("status") == "failed":
-        action_items.append("- Fix failing pipeline")
-
-    if details_status == 200 and mr_details.get("has_conflicts"):
-        action_items.append("- Resolve merge conflicts")
-
-    if action_items:
-        result += "\n".join(action_items) + "\n"
-    else:
-        result += "No action items - ready for next steps\n"
-
-    return [TextContent(type="text", text=result)]
+        threads = select_threads(discussions, matches)
+        offset = args.get("offset", 0)
+        limit = args.get("limit", DEFAULT_THREAD_LIMIT)
+        page = threads[offset : offset + limit]
+
+        result.heading("Discussion Details", level=2)
+        if page:
+            result += f"Showing threads {offset + 1}-{offset + len(page)} of {len(threads)} matching"
+            result += " (unresolved first)\n\n"
+        else:
+            result += f"No threads to show ({len(threads)} matching, offset {offset})\n\n"
+
+        compact = args.get("compact", False)
+
+        def render(discussion):
+            return format_thread_entry(discussion, compact)
+
+        # The participant table goes above the threads but lists only the authors of those that fit,
+        # so the threads are rendered first; the table for the whole page bounds its length
+        table_reserve = len(thread_participants(page)) if compact and page else 0
+        budget = configured_output_budget()
+        if budget is not None:
+            budget -= len(result) + table_reserve
+        rendered = MarkdownBuilder()
+        left_out = rendered.add_items(page, render, budget, reserve=len(actions) + 150)
+        shown = page[: len(page) - len(left_out)]
+        if compact and shown:
+            result += thread_participants(shown)
+        result += rendered.build()
+        next_offset = offset + len(shown)
+        result.omit_items(left_out, render, "threads", f"; call again with offset={next_offset}")
+
+        if not left_out and next_offset < len(threads):
+            result += f"*More threads available: call again with offset={next_offset}*\n\n"
+
+    result += actions.build()
+    return [TextContent(type="text", text=result.build())]
@@ -3,6 +3,125 @@ import logging
 from mcp.types import TextContent
 
 from gitlab_mr_mcp.gitlab_api import get_merge_request_pipeline, get_pipeline_test_report
+from gitlab_mr_mcp.markdown import MarkdownBuilder, configured_output_budget
+from gitlab_mr_mcp.result_store import result_store
+from gitlab_mr_mcp.structured import wants_json
+from gitlab_mr_mcp.tools.get_pipeline_test_summary import structured_suites, unavailable_summary
+
+# Longest system output kept per failed test case
+MAX_CASE_OUTPUT = 2000
+
+
+def build_structured_report(pipeline_data, report_data):
+    """Structured counterpart of the test report"""
+    failed, skipped = [], []
+    for suite in report_data.get("test_suites", []):
+        suite_name = suite.get("name", "Unknown")
+        for tc in suite.get("test_cases", []):
+            status = tc.get("status")
+            if status in ("failed", "error"):
+                output = tc.get("system_output")
+                failed.append(
+                    {
+                        "suite": suite_name,
+                        "name": tc.get("name", "Unknown"),
+                        "status": status,
+                        "classname": tc.get("classname"),
+                        "file": tc.get("file"),
+                        "execution_time": tc.get("execution_time"),
+                        "output": output[:MAX_CASE_OUTPUT] if output else None,
+                    }
+                )
+            elif status == "skipped":
+                skipped.append({"suite": suite_name, "name": tc.get("name", "Unknown")})
+    return {
+        "pipeline": {"id": pipeline_data.get("id"), "web_url": pipeline_data.get("web_url")},
+        "available": True,
+        "counts": {
+            "total": report_data.get("total_count", 0),
+            "success": report_data.get("success_count", 0),
+            "failed": report_data.get("failed_count", 0),
+            "error": report_data.get("error_count", 0),
+            "skipped": report_data.get("skipped_count", 0),
+            "time": report_data.get("total_time", 0),
+        },
+        "suites": structured_suites(report_data.get("test_suites", [])),
+        "failed": failed,
+        "skipped": skipped,
+    }
+
+
+def suite_cases(test_suites, statuses):
+    """Return (suite name, test case, first of its suite, last of its suite) for the cases with the given statuses"""
+    entries = []
+    for suite in test_suites:
+        cases = [tc for tc in suite.get("test_cases", []) if tc.get("status") in statuses]
+        for index, tc in enumerate(cases):
+            entries.append((suite.get("name", "Unknown"), tc, index == 0, index == len(cases) - 1))
+    return entries
+
+
+def format_failed_case(entry):
+    suite_name, tc, first, _last = entry
+    result = MarkdownBuilder()
+    if first:
+        result.heading(suite_name, level=3)
+
+    status = tc.get("status", "unknown")
+    status_marker = "[FAIL]" if status == "failed" else "[ERROR]"
+    result.heading(f"{status_marker} {tc.get('name', 'Unknown')}", level=4)
+    result.field("Duration", f"{tc.get('execution_time', 0):.3f}s")
+
+    if tc.get("classname"):
+        result.field("Class", f"`{tc['classname']}`")
+
+    if tc.get("file"):
+        result.field("File", f"`{tc['file']}`")
+
+    # Error output
+    if tc.get("system_output"):
+        result += "\n**Error Output**:\n\n```\n"
+        error_output = tc["system_output"]
+        if len(error_output) > MAX_CASE_OUTPUT:
+            result += error_output[:MAX_CASE_OUTPUT] + "\n... (truncated)\n"
+        else:
+            result += error_output
+        result += "\n```\n\n"
+    return result.build()
+
+
+def format_skipped_case(entry):
+    index, (suite_name, tc, first, last) = entry
+    result = MarkdownBuilder()
+    if index == 0:
+        result.heading("Skipped Tests", level=2)
+    if first:
+        result.heading(suite_name, level=3)
+    result.bullet(tc.get("name", "Unknown"))
+    if last:
+        result.line()
+    return result.build()
+
+
+def format_suite_overview(entry):
+    index, suite = entry
+    name = suite.get("name", "Unknown")
+    total = suite.get("total_count", 0)
+    success = suite.get("success_count", 0)
+    failed = suite.get("failed_count", 0)
+    errors = suite.get("error_count", 0)
+
+    result = MarkdownBuilder()
+    if index == 0:
+        result.heading("Suites Overview", level=2)
+    status_marker = "[pass]" if (failed == 0 and errors == 0) else "[FAIL]"
+    result += f"- {status_marker} **{name}**: {success}/{total} passed"
+    if failed > 0:
+        result += f", {failed} failed"
+    if errors > 0:
+        result += f", {errors} errors"
+    result += "\n"
+    return result.build()
 
 
 async def get_merge_request_test_report(gitlab_url, project_id, access_token, args):
@@ -20,9 +139,12 @@ async def get_merge_request_test_report(gitlab_url, project_id, access_token, ar
         raise Exception(f"Error fetching pipeline for MR: {e}")
 
     if pipeline_status != 200 or not pipeline_data:
-        result = f"# Test Report for MR !{mr_iid}\n\n"
-        result += "No pipeline found for this merge request.\n"
-        return [TextContent(type="text", text=result)]
+        if wants_json(args):
+            return unavailable_summary() | {"failed": [], "skipped": []}
+        result = MarkdownBuilder()
+        result.heading(f"Test Report for MR !{mr_iid}")
+        result.line("No pipeline found for this merge request.")
+        return [TextContent(type="text", text=result.build())]
 
     pipeline_id = pipeline_data.get("id")
     logging.info(f"Fetching test report for pipeline {pipeline_id}")
@@ -37,16 +159,23 @@ async def get_merge_request_test_report(gitlab_url, project_id, access_token, ar
     if status != 200:
         logging.error(f"Error fetching test report: {status} - {error}")
         if status == 404:
-            result = f"# Test Report for MR !{mr_iid}\n\n"
+            if wants_json(args):
+                return unavailable_summary(pipeline_data) | {"failed": [], "skipped": []}
+            result = MarkdownBuilder()
+            result.heading(f"Test Report for MR !{mr_iid}")
             result += "No test report available.\n\n"
-            result += "To generate test reports:\n"
-            result += "1. Run tests that output JUnit XML format\n"
-            result += "2. Use `artifacts:reports:junit` in .gitlab-ci.yml\n"
-            return [TextContent(type="text", text=result)]
+            result.line("To generate test reports:")
+            result.line("1. Run tests that output JUnit XML format")
+            result.line("2. Use `artifacts:reports:junit` in .gitlab-ci.yml")
+            return [TextContent(type="text", text=result.build())]
         raise Exception(f"Error fetching test report: {status} - {error}")
 
+    if wants_json(args):
+        return build_structured_report(pipeline_data, report_data)
+
     # Format output
-    result = f"# Test Report for MR !{mr_iid}\n\n"
+    result = MarkdownBuilder()
+    result.heading(f"Test Report for MR !{mr_iid}")
     result += f"**Pipeline**: #{pipeline_id}"
     if pipeline_data.get("web_url"):
         result += f" - {pipeline_data['web_url']}"
@@ -60,7 +189,7 @@ async def get_merge_request_test_report(gitlab_url, project_id, access_token, ar
     error_count = report_data.get("error_count", 0)
     total_time = report_data.get("total_time", 0)
 
-    result += "## Summary\n\n"
+    result.heading("Summary", level=2)
     result += f"**Total**: {total_count} | "
     result += f"**Passed**: {success_count} | "
     result += f"**Failed**: {failed_count} | "
@@ -69,90 +198,48 @@ async def get_merge_request_test_report(gitlab_url, project_id, access_token, ar
     result += f"**Duration**: {total_time:.2f}s\n\n"
 
     if total_count == 0:
-        result += "No tests found in the report.\n"
-        return [TextContent(type="text", text=result)]
+        result.line("No tests found in the report.")
+        return [TextContent(type="text", text=result.build())]
 
     # Pass rate
     pass_rate = (success_count / total_count) * 100
     result += f"**Pass Rate**: {pass_rate:.1f}%\n\n"
 
-    # Failed tests (most important)
+    # Next steps go last but are rendered first so the test lists leave room for them
+    next_steps = MarkdownBuilder()
+    if failed_count > 0 or error_count > 0:
+        next_steps += "\n## Next Steps\n\n"
+        next_steps.line("1. Review error messages above")
+        next_steps.line("2. Check the specific test files")
+        next_steps.line("3. Use `get_job_log` for full CI output")
+        next_steps.line("4. Run tests locally to reproduce")
+
     test_suites = report_data.get("test_suites", [])
 
+    # Failed tests (most important), then skipped tests, then the per-suite overview
+    sections = []
     if failed_count > 0 or error_count > 0:
-        result += "## Failed Tests\n\n"
-
-        for suite in test_suites:
-            suite_name = suite.get("name", "Unknown")
-            test_cases = suite.get("test_cases", [])
-            failed_cases = [tc for tc in test_cases if tc.get("status") in ["failed", "error"]]
-
-            if failed_cases:
-                result += f"### {suite_name}\n\n"
-
-                for tc in failed_cases:
-                    test_name = tc.get("name", "Unknown")
-                    status = tc.get("status", "unknown")
-                    exec_time = tc.get("execution_time", 0)
-
-                    status_marker = "[FAIL]" if status == "failed" else "[ERROR]"
-                    result += f"#### {status_marker} {test_name}\n\n"
-                    result += f"**Duration**: {exec_time:.3f}s\n"
-
-                    if tc.get("classname"):
-                        result += f"**Class**: `{tc['classname']}`\n"
-
-                    if tc.get("file"):
-                        result += f"**File**: `{tc['file']}`\n"
-
-                    # Error output
-                    if tc.get("system_output"):
-                        result += "\n**Error Output**:\n\n```\n"
-                        error_output = tc["system_output"]
-                        if len(error_output) > 2000:
-                            result += error_output[:2000] + "\n... (truncated)\n"
-                        else:
-                            result += error_output
-                        result += "\n```\n\n"
-
-    # Skipped tests
+        result.heading("Failed Tests", level=2)
+        sections.append(("failed tests", suite_cases(test_suites, ("failed", "error")), format_failed_case))
     if skipped_count > 0:
-        result += "## Skipped Tests\n\n"
-        for suite in test_suites:
-            suite_name = suite.get("name", "Unknown")
-            test_cases = suite.get("test_cases", [])
-            skipped_cases = [tc for tc in test_cases if tc.get("status") == "skipped"]
-
-            if skipped_cases:
-                result += f"### {suite_name}\n\n"
-                for tc in skipped_cases:
-                    result += f"- {tc.get('name', 'Unknown')}\n"
-                result += "\n"
-
-    # Suite overview
+        sections.append(("skipped tests", list(enumerate(suite_cases(test_suites, ("skipped",)))), format_skipped_case))
     if len(test_suites) > 0:
-        result += "## Suites Overview\n\n"
-        for suite in test_suites:
-            name = suite.get("name", "Unknown")
-            total = suite.get("total_count", 0)
-            success = suite.get("success_count", 0)
-            failed = suite.get("failed_count", 0)
-            errors = suite.get("error_count", 0)
-
-            status_marker = "[pass]" if (failed == 0 and errors == 0) else "[FAIL]"
-            result += f"- {status_marker} **{name}**: {success}/{total} passed"
-            if failed > 0:
-                result += f", {failed} failed"
-            if errors > 0:
-                result += f", {errors} errors"
-            result += "\n"
-
-    # Next steps
-    if failed_count > 0 or error_count > 0:
-        result += "\n## Next Steps\n\n"
-        result += "1. Review error messages above\n"
-        result += "2. Check the specific test files\n"
-        result += "3. Use `get_job_log` for full CI output\n"
-        result += "4. Run tests locally to reproduce\n"
-
-    return [TextContent(type="text", text=result)]
+        sections.append(("suites", list(enumerate(test_suites)), format_suite_overview))
+
+    budget = configured_output_budget()
+    omitted = []
+    # Rendered entries left out by the budget, kept for fetch_more
+    remainder = []
+    for label, items, render in sections:
+        left_out = items if omitted else result.add_items(items, render, budget, reserve=len(next_steps) + 250)
+        if left_out:
+            omitted.append((label, len(left_out)))
+            remainder.extend(render(item) for item in left_out)
+
+    if omitted:
+        counts = ", ".join(f"{count} {label}" for label, count in omitted)
+        cursor = result_store.add(remainder, "entries")
+        result.omitted(len(remainder), "entries", f" ({counts})", cursor)
+
+    result += next_steps.build()
+    return [TextContent(type="text", text=result.build())]
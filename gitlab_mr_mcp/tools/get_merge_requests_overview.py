@@ -0,0 +1,172 @@
+import asyncio
+import contextlib
+import logging
+
+from mcp.types import TextContent
+
+from gitlab_mr_mcp.gitlab_api import get_merge_request_approvals, get_merge_request_details, shared_session
+from gitlab_mr_mcp.instances import select_instance
+from gitlab_mr_mcp.markdown import MarkdownBuilder
+from gitlab_mr_mcp.structured import wants_json
+from gitlab_mr_mcp.utils import analyze_mr_readiness, get_pipeline_status_icon, get_state_icon
+
+# Maximum number of merge requests fetched at once
+MR_OVERVIEW_CONCURRENCY = 8
+
+MAX_OVERVIEW_MERGE_REQUESTS = 50
+
+
+def parse_merge_request_refs(refs, default_project_id):
+    """Turn IIDs and 'project!iid' references into (project_id, iid) pairs"""
+    if not refs:
+        raise ValueError("merge_request_iids must list at least one merge request")
+    if len(refs) > MAX_OVERVIEW_MERGE_REQUESTS:
+        raise ValueError(f"At most {MAX_OVERVIEW_MERGE_REQUESTS} merge requests can be fetched at once")
+
+    parsed = []
+    for ref in refs:
+        project_id, separator, iid = str(ref).strip().rpartition("!")
+        if not separator:
+            project_id = default_project_id
+        if not iid.isdigit() or (separator and not project_id):
+            raise ValueError(f"Invalid merge request reference: {ref!r} (use an IID or 'group/project!iid')")
+        if not project_id:
+            raise ValueError(f"project_id is required for merge request {ref!r} (or use 'group/project!iid')")
+        if (project_id, int(iid)) not in parsed:
+            parsed.append((project_id, int(iid)))
+    return parsed
+
+
+def route_merge_request_refs(instances, args):
+    """Pair each merge request with its instance: IIDs go where the call is routed, references by their project.
+
+    Returns the project bare IIDs belong to and (instance, project_id, iid) triples.
+    """
+    default_instance = select_instance(instances, args)
+    default_project_id = args.get("project_id") or default_instance["project_id"]
+    routed = []
+    for project_id, iid in parse_merge_request_refs(args.get("merge_request_iids"), default_project_id):
+        if str(project_id) == str(default_project_id):
+            instance = default_instance
+        else:
+            instance = select_instance(instances, {"project_id": project_id})
+        routed.append((instance, project_id, iid))
+    return default_project_id, routed
+
+
+async def fetch_merge_request_overview(gitlab_url, access_token, project_id, mr_iid, semaphore):
+    """Fetch the details and approvals needed for one overview row"""
+    async with semaphore:
+        details_result, approvals_result = await asyncio.gather(
+            get_merge_request_details(gitlab_url, project_id, access_token, mr_iid),
+            get_merge_request_approvals(gitlab_url, project_id, access_token, mr_iid),
+        )
+    mr_status, mr_data, mr_error = details_result
+    if mr_status != 200:
+        logging.warning(f"Could not fetch MR {project_id}!{mr_iid}: {mr_status} - {mr_error}")
+        return {"project_id": project_id, "iid": mr_iid, "error": f"{mr_status} - {mr_error}"}
+
+    approvals_status, approvals, _approvals_error = approvals_result
+    approvals = approvals if approvals_status == 200 else None
+    # head_pipeline is the MR's latest pipeline; the list endpoints only expose "pipeline"
+    pipeline_data = mr_data.get("head_pipeline") or mr_data.get("pipeline")
+    if mr_data.get("state") == "opened":
+        readiness = analyze_mr_readiness(mr_data, pipeline_data, approvals)
+    else:
+        readiness = mr_data.get("state", "unknown").capitalize()
+    return {
+        "project_id": project_id,
+        "iid": mr_iid,
+        "mr": mr_data,
+        "pipeline": pipeline_data,
+        "approvals": approvals,
+        "readiness": readiness,
+    }
+
+
+def format_approvals(approvals):
+    if not approvals:
+        return "N/A"
+    approved = len(approvals.get("approved_by", []))
+    if "approvals_required" in approvals:
+        return f"{approved}/{approvals['approvals_required']}"
+    return str(approved)
+
+
+def format_overview_row(entry, show_project):
+    ref = f"{entry['project_id']}!{entry['iid']}" if show_project else f"!{entry['iid']}"
+    if "error" in entry:
+        return f"| {ref} | Could not fetch: {entry['error']} | | | | | |\n"
+
+    mr_data = entry["mr"]
+    pipeline_data = entry["pipeline"]
+    pipeline = "none"
+    if pipeline_data:
+        pipeline = f"{get_pipeline_status_icon(pipeline_data.get('status'))} {pipeline_data.get('status', 'unknown')}"
+
+    title = mr_data.get("title", "").replace("|", "\\|")
+    state = f"{get_state_icon(mr_data.get('state'))} {mr_data.get('state', 'unknown')}"
+    conflicts = "Yes" if mr_data.get("has_conflicts") else "No"
+    return (
+        f"| {ref} | {title} | {state} | {pipeline} | {format_approvals(entry['approvals'])} | "
+        f"{conflicts} | {entry['readiness']} |\n"
+    )
+
+
+def structured_overview_entry(entry):
+    if "error" in entry:
+        return {"project_id": entry["project_id"], "iid": entry["iid"], "error": entry["error"]}
+    mr_data, approvals = entry["mr"], entry["approvals"]
+    return {
+        "project_id": entry["project_id"],
+        "iid": entry["iid"],
+        "title": mr_data.get("title", ""),
+        "state": mr_data.get("state", "unknown"),
+        "pipeline_status": (entry["pipeline"] or {}).get("status"),
+        "approved": len(approvals.get("approved_by", [])) if approvals else None,
+        "approvals_required": approvals.get("approvals_required") if approvals else None,
+        "has_conflicts": bool(mr_data.get("has_conflicts")),
+        "readiness": entry["readiness"],
+        "web_url": mr_data.get("web_url"),
+    }
+
+
+async def get_merge_requests_overview(instances, args):
+    """Get a compact status overview of several merge requests at once"""
+    logging.info(f"get_merge_requests_overview called with args: {args}")
+    project_id, refs = route_merge_request_refs(instances, args)
+
+    semaphore = asyncio.Semaphore(MR_OVERVIEW_CONCURRENCY)
+    async with contextlib.AsyncExitStack() as stack:
+        for gitlab_url in dict.fromkeys(instance["gitlab_url"] for instance, _, _ in refs):
+            await stack.enter_async_context(shared_session(gitlab_url))
+        entries = await asyncio.gather(
+            *(
+                fetch_merge_request_overview(
+                    instance["gitlab_url"], instance["access_token"], mr_project_id, mr_iid, semaphore
+                )
+                for instance, mr_project_id, mr_iid in refs
+            )
+        )
+
+    if wants_json(args):
+        return {"merge_requests": [structured_overview_entry(entry) for entry in entries]}
+
+    show_project = len({mr_project_id for _, mr_project_id, _ in refs}) > 1 or str(refs[0][1]) != str(project_id)
+    ready = sum(1 for entry in entries if entry.get("readiness") == "Ready to merge")
+    blocked = sum(1 for entry in entries if entry.get("readiness", "").startswith("Blocked"))
+    failed = sum(1 for entry in entries if "error" in entry)
+
+    result = MarkdownBuilder()
+    result.heading(f"Merge Requests Overview ({len(entries)} MRs)")
+    result += f"**Ready to merge**: {ready} | **Blocked**: {blocked}"
+    if failed:
+        result += f" | **Unavailable**: {failed}"
+    result += "\n\n"
+    result.line("| MR | Title | State | Pipeline | Approvals | Conflicts | Readiness |")
+    result.line("| -- | ----- | ----- | -------- | --------- | --------- | --------- |")
+    for entry in entries:
+        result += format_overview_row(entry, show_project)
+
+    result += "\nUse `get_merge_request_details` for the full picture of a single MR.\n"
+    return [TextContent(type="text", text=result.build())]
@@ -0,0 +1,233 @@
+import asyncio
+import logging
+
+from mcp.types import TextContent
+
+from gitlab_mr_mcp.gitlab_api import get_job_trace
+from gitlab_mr_mcp.gitlab_api import get_merge_request_pipeline as api_get_merge_request_pipeline
+from gitlab_mr_mcp.gitlab_api import get_pipeline_job_graph, shared_session
+from gitlab_mr_mcp.log_analysis import FailureScanner, compile_failure_patterns, configured_patterns, signature_key
+from gitlab_mr_mcp.log_stream import clean_trace_text
+from gitlab_mr_mcp.markdown import MarkdownBuilder
+from gitlab_mr_mcp.structured import wants_json
+from gitlab_mr_mcp.tools.get_merge_request_pipeline import DEFAULT_DOWNSTREAM_DEPTH
+
+# Maximum number of job logs fetched at once
+DIGEST_CONCURRENCY = 8
+
+MAX_DIGEST_JOBS = 50
+
+# Bytes read from the end of each failed job's log
+DEFAULT_DIGEST_TAIL_BYTES = 64 * 1024
+
+# Lines shown for jobs whose log tail matched no failure pattern
+FALLBACK_TAIL_LINES = 5
+
+
+def failed_jobs_in_graph(graph):
+    """Return (project_id, job) pairs for the failed jobs of a pipeline and its downstream pipelines"""
+    return [
+        (pipeline["project_id"], job)
+        for pipeline in graph["pipelines"]
+        for job in pipeline["jobs"]
+        if job.get("status") == "failed"
+    ]
+
+
+def scan_log_tail(text, cut_start, extra_patterns, context_lines):
+    """Find the failure windows in the tail of a log; the scanner cleans the text as it goes"""
+    if cut_start:
+        # The first line was cut by the Range request
+        text = text.partition("\n")[2]
+    scanner = FailureScanner(extra_patterns, context_lines=context_lines)
+    scanner.feed(text)
+    return scanner.close(), text
+
+
+def last_log_lines(text, count):
+    """The last count non-blank lines of raw log text, cleaned of ANSI codes and overwritten text"""
+    lines = []
+    for line in reversed(text.split("\n")):
+        line = clean_trace_text(line).rstrip("\r")
+        if line.strip():
+            lines.append(line)
+            if len(lines) == count:
+                break
+    return lines[::-1]
+
+
+async def fetch_job_failures(gitlab_url, access_token, project_id, job, tail_bytes, extra_patterns, semaphore):
+    """Fetch the end of one failed job's log and extract its failure windows"""
+    async with semaphore:
+        try:
+            status, text, window = await get_job_trace(
+                gitlab_url, project_id, access_token, job["id"], length=tail_bytes
+            )
+        except Exception as e:
+            status, window = None, str(e)
+    if status != 200:
+        logging.warning(f"Could not fetch log of job {job['id']}: {status} - {window}")
+        return {"job": job, "project_id": project_id, "error": f"{status} - {window}"}
+
+    windows, text = scan_log_tail(text, window["start"] > 0, extra_patterns, context_lines=3)
+    last_lines = last_log_lines(text, FALLBACK_TAIL_LINES)
+    return {"job": job, "project_id": project_id, "windows": windows, "last_lines": last_lines}
+
+
+def group_failures(results):
+    """Group failure windows with the same leading signature across jobs, most widespread first"""
+    groups = {}
+    for result in results:
+        for window in result.get("windows", []):
+            lead = window["signatures"][0]
+            group = groups.setdefault(
+                signature_key(lead["pattern"], lead["line"]), {"signature": lead, "window": window, "jobs": []}
+            )
+            if result not in group["jobs"]:
+                group["jobs"].append(result)
+    return sorted(groups.values(), key=lambda group: len(group["jobs"]), reverse=True)
+
+
+def format_job_ref(result, root_project_id):
+    job = result["job"]
+    ref = f"`{job.get('name', 'Unknown')}` ({job['id']}"
+    if str(result["project_id"]) != str(root_project_id):
+        ref += f", Project: `{result['project_id']}`"
+    return ref + ")"
+
+
+def format_job_refs(results, root_project_id, limit=10):
+    refs = ", ".join(format_job_ref(result, root_project_id) for result in results[:limit])
+    if len(results) > limit:
+        refs += f" and {len(results) - limit} more"
+    return refs
+
+
+def structured_job_ref(result):
+    job = result["job"]
+    return {"id": job["id"], "name": job.get("name"), "project_id": result["project_id"]}
+
+
+def build_structured_digest(pipeline_data, failed_jobs, results, tail_bytes):
+    """Structured counterpart of the failure digest"""
+    return {
+        "pipeline": {"id": pipeline_data["id"], "status": pipeline_data.get("status")},
+        "failed_job_count": len(failed_jobs),
+        "jobs_read": len(results),
+        "tail_bytes": tail_bytes,
+        "groups": [
+            {
+                "pattern": group["signature"]["pattern"],
+                "jobs": [structured_job_ref(entry) for entry in group["jobs"]],
+                "lines": group["window"]["lines"],
+            }
+            for group in group_failures(results)
+        ],
+        "unmatched": [
+            {"job": structured_job_ref(entry), "last_lines": entry["last_lines"]}
+            for entry in results
+            if "windows" in entry and not entry["windows"]
+        ],
+        "unavailable": [
+            {"job": structured_job_ref(entry), "error": entry["error"]} for entry in results if "error" in entry
+        ],
+    }
+
+
+async def get_pipeline_failure_digest(gitlab_url, project_id, access_token, args):
+    """Summarize the failures of all failed jobs in a merge request's latest pipeline"""
+    logging.info(f"get_pipeline_failure_digest called with args: {args}")
+    mr_iid = args["merge_request_iid"]
+    tail_bytes = args.get("tail_bytes", DEFAULT_DIGEST_TAIL_BYTES)
+    extra_patterns = configured_patterns() + list(args.get("patterns") or [])
+    # Reject invalid patterns before downloading any log
+    compile_failure_patterns(extra_patterns)
+
+    async with shared_session(gitlab_url):
+        try:
+            status, pipeline_data, error = await api_get_merge_request_pipeline(
+                gitlab_url, project_id, access_token, mr_iid
+            )
+        except Exception as e:
+            logging.error(f"Error fetching pipeline: {e}")
+            raise Exception(f"Error fetching merge request pipeline: {e}")
+
+        if status != 200:
+            logging.error(f"Error fetching pipeline: {status} - {error}")
+            raise Exception(f"Error fetching merge request pipeline: {status} - {error}")
+
+        if not pipeline_data:
+            if wants_json(args):
+                return {
+                    "pipeline": None,
+                    "failed_job_count": 0,
+                    "jobs_read": 0,
+                    "tail_bytes": tail_bytes,
+                    "groups": [],
+                    "unmatched": [],
+                    "unavailable": [],
+                }
+            result = MarkdownBuilder()
+            result.heading(f"Failure Digest for MR !{mr_iid}")
+            result += "No pipeline found for this merge request.\n"
+            return [TextContent(type="text", text=result.build())]
+
+        graph_status, graph, graph_error = await get_pipeline_job_graph(
+            gitlab_url,
+            project_id,
+            access_token,
+            pipeline_data["id"],
+            max_depth=args.get("downstream_depth", DEFAULT_DOWNSTREAM_DEPTH),
+        )
+        if graph_status != 200:
+            logging.error(f"Error fetching jobs: {graph_status} - {graph_error}")
+            raise Exception(f"Error fetching pipeline jobs: {graph_status} - {graph_error}")
+
+        failed_jobs = failed_jobs_in_graph(graph)
+        semaphore = asyncio.Semaphore(DIGEST_CONCURRENCY)
+        results = await asyncio.gather(
+            *(
+                fetch_job_failures(gitlab_url, access_token, job_project_id, job, tail_bytes, extra_patterns, semaphore)
+                for job_project_id, job in failed_jobs[:MAX_DIGEST_JOBS]
+            )
+        )
+
+    if wants_json(args):
+        return build_structured_digest(pipeline_data, failed_jobs, results, tail_bytes)
+
+    result = MarkdownBuilder()
+    result.heading(f"Failure Digest for MR !{mr_iid}")
+    result += f"**Pipeline**: #{pipeline_data['id']} ({pipeline_data.get('status', 'unknown')}) | "
+    result += f"**Failed jobs**: {len(failed_jobs)}\n\n"
+    if not failed_jobs:
+        result.line("No failed jobs in this pipeline.")
+        return [TextContent(type="text", text=result.build())]
+
+    root_project_id = graph["pipelines"][0]["project_id"]
+    for group in group_failures(results):
+        job_count = len(group["jobs"])
+        result.heading(f"{group['signature']['pattern']} in {job_count} job{'s' if job_count > 1 else ''}", level=2)
+        result += f"**Jobs**: {format_job_refs(group['jobs'], root_project_id)}\n\n"
+        result += "```\n" + "\n".join(group["window"]["lines"]) + "\n```\n\n"
+
+    unmatched = [entry for entry in results if "windows" in entry and not entry["windows"]]
+    if unmatched:
+        result.heading("No known failure pattern", level=2)
+        for entry in unmatched:
+            result += f"{format_job_ref(entry, root_project_id)}, last lines:\n\n"
+            result += "```\n" + "\n".join(entry["last_lines"]) + "\n```\n\n"
+
+    unavailable = [entry for entry in results if "error" in entry]
+    if unavailable:
+        result.heading("Logs unavailable", level=2)
+        for entry in unavailable:
+            result.bullet(f"{format_job_ref(entry, root_project_id)}: {entry['error']}")
+        result.line()
+
+    if len(failed_jobs) > MAX_DIGEST_JOBS:
+        result.line(f"*Only the first {MAX_DIGEST_JOBS} of {len(failed_jobs)} failed jobs were read.*")
+    result.line(
+        f"*Each job's last {tail_bytes / 1024:.0f} KB was scanned; "
+        'use get_job_log(job_id=..., mode="errors") to scan the full log.*'
+    )
+    return [TextContent(type="text", text=result.build())]
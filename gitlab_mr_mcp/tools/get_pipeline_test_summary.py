@@ -3,6 +3,29 @@ import logging
 from mcp.types import TextContent
 
 from gitlab_mr_mcp.gitlab_api import get_merge_request_pipeline, get_pipeline_test_report_summary
+from gitlab_mr_mcp.markdown import MarkdownBuilder
+from gitlab_mr_mcp.structured import wants_json
+
+
+def structured_suites(test_suites):
+    """Per-suite counts; summary and full reports share the suite fields"""
+    return [
+        {
+            "name": suite.get("name", "Unknown"),
+            "total": suite.get("total_count", 0),
+            "success": suite.get("success_count", 0),
+            "failed": suite.get("failed_count", 0),
+            "error": suite.get("error_count", 0),
+            "time": suite.get("total_time", 0),
+        }
+        for suite in test_suites
+    ]
+
+
+def unavailable_summary(pipeline_data=None):
+    """Structured result when there is no pipeline or no test report"""
+    pipeline = {"id": pipeline_data.get("id"), "web_url": pipeline_data.get("web_url")} if pipeline_data else None
+    return {"pipeline": pipeline, "available": False, "counts": None, "suites": []}
 
 
 async def get_pipeline_test_summary(gitlab_url, project_id, access_token, args):
@@ -20,9 +43,12 @@ async def get_pipeline_test_summary(gitlab_url, project_id, access_token, args):
         raise Exception(f"Error fetching pipeline for MR: {e}")
 
     if pipeline_status != 200 or not pipeline_data:
-        result = f"# Test Summary for MR !{mr_iid}\n\n"
-        result += "No pipeline found for this merge request.\n"
-        return [TextContent(type="text", text=result)]
+        if wants_json(args):
+            return unavailable_summary()
+        result = MarkdownBuilder()
+        result.heading(f"Test Summary for MR !{mr_iid}")
+        result.line("No pipeline found for this merge request.")
+        return [TextContent(type="text", text=result.build())]
 
     pipeline_id = pipeline_data.get("id")
     logging.info(f"Fetching test summary for pipeline {pipeline_id}")
@@ -39,16 +65,36 @@ async def get_pipeline_test_summary(gitlab_url, project_id, access_token, args):
     if status != 200:
         logging.error(f"Error fetching test summary: {status} - {error}")
         if status == 404:
-            result = f"# Test Summary for MR !{mr_iid}\n\n"
+            if wants_json(args):
+                return unavailable_summary(pipeline_data)
+            result = MarkdownBuilder()
+            result.heading(f"Test Summary for MR !{mr_iid}")
             result += "No test summary available.\n\n"
-            result += "To generate test reports:\n"
-            result += "1. Run tests that output JUnit XML format\n"
-            result += "2. Use `artifacts:reports:junit` in .gitlab-ci.yml\n"
-            return [TextContent(type="text", text=result)]
+            result.line("To generate test reports:")
+            result.line("1. Run tests that output JUnit XML format")
+            result.line("2. Use `artifacts:reports:junit` in .gitlab-ci.yml")
+            return [TextContent(type="text", text=result.build())]
         raise Exception(f"Error fetching test summary: {status} - {error}")
 
+    if wants_json(args):
+        total = summary_data.get("total", {})
+        return {
+            "pipeline": {"id": pipeline_id, "web_url": pipeline_data.get("web_url")},
+            "available": True,
+            "counts": {
+                "total": total.get("count", 0),
+                "success": total.get("success", 0),
+                "failed": total.get("failed", 0),
+                "error": total.get("error", 0),
+                "skipped": total.get("skipped", 0),
+                "time": total.get("time", 0),
+            },
+            "suites": structured_suites(summary_data.get("test_suites", [])),
+        }
+
     # Format output
-    result = f"# Test Summary for MR !{mr_iid}\n\n"
+    result = MarkdownBuilder()
+    result.heading(f"Test Summary for MR !{mr_iid}")
     result += f"**Pipeline**: #{pipeline_id}"
     if pipeline_data.get("web_url"):
         result += f" - {pipeline_data['web_url']}"
@@ -63,7 +109,7 @@ async def get_pipeline_test_summary(gitlab_url, project_id, access_token, args):
     error_count = total.get("error", 0)
     total_time = total.get("time", 0)
 
-    result += "## Summary\n\n"
+    result.heading("Summary", level=2)
     result += f"**Total**: {total_count} | "
     result += f"**Passed**: {success_count} | "
     result += f"**Failed**: {failed_count} | "
@@ -72,8 +118,8 @@ async def get_pipeline_test_summary(gitlab_url, project_id, access_token, args):
     result += f"**Duration**: {total_time:.2f}s\n\n"
 
     if total_count == 0:
-        result += "No tests found in the summary.\n"
-        return [TextContent(type="text", text=result)]
+        result.line("No tests found in the summary.")
+        return [TextContent(type="text", text=result.build())]
 
     # Pass rate
     pass_rate = (success_count / total_count) * 100
@@ -85,7 +131,7 @@ async def get_pipeline_test_summary(gitlab_url, project_id, access_token, args):
     # Test suites
     test_suites = summary_data.get("test_suites", [])
     if test_suites:
-        result += "## Test Suites\n\n"
+        result.heading("Test Suites", level=2)
         for suite in test_suites:
             name = suite.get("name", "Unknown")
             suite_total = suite.get("total_count", 0)
@@ -95,19 +141,19 @@ async def get_pipeline_test_summary(gitlab_url, project_id, access_token, args):
             suite_time = suite.get("total_time", 0)
 
             status_marker = "[FAIL]" if (suite_failed > 0 or suite_error > 0) else "[pass]"
-            result += f"### {status_marker} {name}\n\n"
-            result += f"- Total: {suite_total}\n"
-            result += f"- Passed: {suite_success}\n"
+            result.heading(f"{status_marker} {name}", level=3)
+            result.bullet(f"Total: {suite_total}")
+            result.bullet(f"Passed: {suite_success}")
             if suite_failed > 0:
-                result += f"- Failed: {suite_failed}\n"
+                result.bullet(f"Failed: {suite_failed}")
             if suite_error > 0:
-                result += f"- Errors: {suite_error}\n"
+                result.bullet(f"Errors: {suite_error}")
             result += f"- Duration: {suite_time:.2f}s\n\n"
 
     # Next steps for failures
     if failed_count > 0 or error_count > 0:
-        result += "## Next Steps\n\n"
-        result += "1. Use `get_merge_request_test_report` for detailed error messages\n"
-        result += "2. Use `get_job_log` to see full CI output\n"
+        result.heading("Next Steps", level=2)
+        result.line("1. Use `get_merge_request_test_report` for detailed error messages")
+        result.line("2. Use `get_job_log` to see full CI output")
 
-    return [TextContent(type="text", text=result)]
+    return [TextContent(type="text", text=result.build())]
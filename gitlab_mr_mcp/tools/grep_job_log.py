@@ -0,0 +1,93 @@
+import logging
+
+from mcp.types import TextContent
+
+from gitlab_mr_mcp.gitlab_api import grep_job_trace
+from gitlab_mr_mcp.log_analysis import DEFAULT_GREP_CONTEXT_LINES, DEFAULT_GREP_MAX_MATCHES, compile_grep_pattern
+from gitlab_mr_mcp.markdown import MarkdownBuilder
+from gitlab_mr_mcp.structured import wants_json
+
+
+def format_region(region):
+    """Format one matching region, marking the matched lines"""
+    first_line, first_offset = region["lines"][0][0], region["lines"][0][1]
+    result = MarkdownBuilder()
+    result.heading(f"Line {first_line:,} (byte offset {first_offset:,})", level=2)
+    result += "```\n"
+    for line_number, _offset, text, matched in region["lines"]:
+        marker = ">" if matched else " "
+        result.line(f"{marker}{line_number:>7} | {text}")
+    result += "```\n\n"
+    return result.build()
+
+
+async def grep_job_log(gitlab_url, project_id, access_token, args):
+    """Search a job log for a regex and return only the matching lines with context"""
+    logging.info(f"grep_job_log called with args: {args}")
+    job_id = args["job_id"]
+    pattern = args["pattern"]
+    ignore_case = args.get("ignore_case", False)
+    max_matches = args.get("max_matches", DEFAULT_GREP_MAX_MATCHES)
+
+    # Reject invalid patterns before downloading the log
+    compile_grep_pattern(pattern, ignore_case)
+
+    try:
+        status, search, error = await grep_job_trace(
+            gitlab_url,
+            project_id,
+            access_token,
+            job_id,
+            pattern,
+            before=args.get("before", DEFAULT_GREP_CONTEXT_LINES),
+            after=args.get("after", DEFAULT_GREP_CONTEXT_LINES),
+            max_matches=max_matches,
+            ignore_case=ignore_case,
+        )
+    except Exception as e:
+        logging.error(f"Error searching job log: {e}")
+        raise Exception(f"Error searching job log: {e}")
+
+    if status != 200:
+        logging.error(f"Error searching job log: {status} - {error}")
+        raise Exception(f"Error searching job log: {status} - {error}")
+
+    if wants_json(args):
+        return {
+            "job_id": job_id,
+            "pattern": pattern,
+            "ignore_case": ignore_case,
+            "match_count": search["match_count"],
+            "limit_reached": search["limit_reached"],
+            "byte_count": search["byte_count"],
+            "line_count": search["line_count"],
+            "regions": [
+                [
+                    {"line": line_number, "offset": offset, "text": text, "matched": matched}
+                    for line_number, offset, text, matched in region["lines"]
+                ]
+                for region in search["regions"]
+            ],
+        }
+
+    result = MarkdownBuilder()
+    result.heading(f"Search in Job Log (ID: {job_id})")
+    result.field("Pattern", f"`{pattern}`{' (ignoring case)' if ignore_case else ''}")
+    searched = f"{search['byte_count'] / 1024:.1f} KB, {search['line_count']:,} lines"
+    if search["limit_reached"]:
+        result += f"**Matches**: first {search['match_count']} (limit reached, searched {searched})\n\n"
+    else:
+        result += f"**Matches**: {search['match_count']} (searched {searched})\n\n"
+
+    if not search["regions"]:
+        result.line("No lines matched.")
+        return [TextContent(type="text", text=result.build())]
+
+    for region in search["regions"]:
+        result += format_region(region)
+
+    if search["limit_reached"]:
+        last_offset = search["regions"][-1]["lines"][-1][1]
+        result.line(f"*More matches may follow byte offset {last_offset:,}; narrow the pattern or raise max_matches.*")
+    result.line("*Read around a match with get_job_log(offset=<byte offset>).*")
+    return [TextContent(type="text", text=result.build())]
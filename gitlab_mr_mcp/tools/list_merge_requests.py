@@ -4,6 +4,8 @@ import logging
 from mcp.types import TextContent
 
 from gitlab_mr_mcp.gitlab_api import get_merge_request_changes, get_merge_request_pipeline, get_merge_requests
+from gitlab_mr_mcp.markdown import MarkdownBuilder
+from gitlab_mr_mcp.structured import username, wants_json
 from gitlab_mr_mcp.utils import (
     analyze_mr_readiness,
     calculate_change_stats,
@@ -14,6 +16,27 @@ from gitlab_mr_mcp.utils import (
 )
 
 
+def merge_request_summary(mr, pipeline_data, changes_data):
+    """Structured counterpart of one merge request section"""
+    pipeline = pipeline_data or mr.get("pipeline") or {}
+    return {
+        "iid": mr["iid"],
+        "title": mr["title"],
+        "state": mr["state"],
+        "author": username(mr.get("author")),
+        "source_branch": mr["source_branch"],
+        "target_branch": mr["target_branch"],
+        "updated_at": mr.get("updated_at"),
+        "pipeline_status": pipeline.get("status"),
+        "changes": calculate_change_stats(changes_data) if changes_data else None,
+        "readiness": analyze_mr_readiness(mr, pipeline_data),
+        "labels": mr.get("labels") or [],
+        "draft": bool(mr.get("draft") or mr.get("work_in_progress")),
+        "has_conflicts": bool(mr.get("has_conflicts")),
+        "web_url": mr["web_url"],
+    }
+
+
 async def get_enhanced_mr_data(gitlab_url, project_id, access_token, mr_iid):
     """Get enhanced data for a single MR using parallel API calls"""
     try:
@@ -45,17 +68,24 @@ async def get_enhanced_mr_data(gitlab_url, project_id, access_token, mr_iid):
         return None, None
 
 
+def merge_request_params(args):
+    """Query parameters of the merge requests listed for the tool arguments, most recently updated first"""
+    params = {
+        "state": args.get("state", "opened"),
+        "per_page": args.get("limit", 10),
+        "order_by": "updated_at",
+        "sort": "desc",
+    }
+    if args.get("target_branch"):
+        params["target_branch"] = args["target_branch"]
+    return params
+
+
 async def list_merge_requests(gitlab_url, project_id, access_token, args):
     logging.info(f"list_merge_requests called with args: {args}")
 
     state = args.get("state", "opened")
-    target_branch = args.get("target_branch")
-    limit = args.get("limit", 10)
-
-    params = {"state": state, "per_page": limit, "order_by": "updated_at", "sort": "desc"}
-
-    if target_branch:
-        params["target_branch"] = target_branch
+    params = merge_request_params(args)
 
     status, data, error = await get_merge_requests(gitlab_url, project_id, access_token, params)
 
@@ -63,13 +93,17 @@ async def list_merge_requests(gitlab_url, project_id, access_token, args):
         logging.error(f"Error listing merge requests: {status} - {error}")
         raise Exception(f"Error listing merge requests: {status} - {error}")
 
+    structured = wants_json(args)
     state_filter = f" ({state})" if state != "all" else ""
-    result = f"# Merge Requests{state_filter}\n\n"
+    result = MarkdownBuilder()
+    result.heading(f"Merge Requests{state_filter}")
     result += f"Found {len(data)} merge request(s)\n\n"
 
     if not data:
-        result += "No merge requests found.\n"
-        return [TextContent(type="text", text=result)]
+        if structured:
+            return {"merge_requests": []}
+        result.line("No merge requests found.")
+        return [TextContent(type="text", text=result.build())]
 
     # Fetch enhanced data for first 5 MRs
     enhanced_data_tasks = []
@@ -83,6 +117,10 @@ async def list_merge_requests(gitlab_url, project_id, access_token, args):
         logging.warning(f"Error in parallel enhanced data fetch: {e}")
         enhanced_results = [(None, None)] * len(data[:5])
 
+    if structured:
+        padded = list(enhanced_results) + [(None, None)] * (len(data) - len(enhanced_results))
+        return {"merge_requests": [merge_request_summary(mr, *extra) for mr, extra in zip(data, padded)]}
+
     for i, mr in enumerate(data):
         if i < len(enhanced_results):
             pipeline_data, changes_data = enhanced_results[i]
@@ -90,35 +128,35 @@ async def list_merge_requests(gitlab_url, project_id, access_token, args):
             pipeline_data, changes_data = None, None
 
         state_icon = get_state_icon(mr["state"])
-        result += f"## {state_icon} !{mr['iid']}: {mr['title']}\n\n"
+        result.heading(f"{state_icon} !{mr['iid']}: {mr['title']}", level=2)
 
-        result += f"**Author**: {mr['author']['name']} (@{mr['author']['username']})\n"
-        result += f"**Branches**: `{mr['source_branch']}` -> `{mr['target_branch']}`\n"
-        result += f"**Updated**: {format_date(mr['updated_at'])}\n"
+        result.field("Author", f"{mr['author']['name']} (@{mr['author']['username']})")
+        result.field("Branches", f"`{mr['source_branch']}` -> `{mr['target_branch']}`")
+        result.field("Updated", format_date(mr["updated_at"]))
 
         # Pipeline
         if pipeline_data:
             pipeline_stat = pipeline_data.get("status")
             pipeline_icon = get_pipeline_status_icon(pipeline_stat)
-            result += f"**Pipeline**: {pipeline_icon} {pipeline_stat}\n"
+            result.field("Pipeline", f"{pipeline_icon} {pipeline_stat}")
         elif mr.get("pipeline"):
             pipeline_stat = mr["pipeline"].get("status")
             pipeline_icon = get_pipeline_status_icon(pipeline_stat)
-            result += f"**Pipeline**: {pipeline_icon} {pipeline_stat or 'unknown'}\n"
+            result.field("Pipeline", f"{pipeline_icon} {pipeline_stat or 'unknown'}")
 
         # Changes
         if changes_data:
             change_stats = calculate_change_stats(changes_data)
-            result += f"**Changes**: {change_stats}\n"
+            result.field("Changes", change_stats)
 
         # Readiness
         readiness = analyze_mr_readiness(mr, pipeline_data)
-        result += f"**Status**: {readiness}\n"
+        result.field("Status", readiness)
 
         # Labels
         labels_str = format_labels(mr.get("labels"))
         if labels_str:
-            result += f"**Labels**: {labels_str}\n"
+            result.field("Labels", labels_str)
 
         # Flags
         flags = []
@@ -127,7 +165,7 @@ async def list_merge_requests(gitlab_url, project_id, access_token, args):
         if mr.get("has_conflicts"):
             flags.append("Conflicts")
         if flags:
-            result += f"**Flags**: {', '.join(flags)}\n"
+            result.field("Flags", ", ".join(flags))
 
         result += f"**URL**: {mr['web_url']}\n\n"
 
@@ -140,7 +178,7 @@ async def list_merge_requests(gitlab_url, project_id, access_token, args):
         state_counts[s] = state_counts.get(s, 0) + 1
 
     for s, count in state_counts.items():
-        result += f"- {s.title()}: {count}\n"
+        result.bullet(f"{s.title()}: {count}")
 
     # Action items for opened MRs
     opened_mrs = [mr for mr in data if mr["state"] == "opened"]
@@ -151,8 +189,8 @@ async def list_merge_requests(gitlab_url, project_id, access_token, args):
         if has_conflicts or drafts:
             result += "\n**Attention needed**:\n"
             if has_conflicts:
-                result += f"- {has_conflicts} MR(s) with merge conflicts\n"
+                result.bullet(f"{has_conflicts} MR(s) with merge conflicts")
             if drafts:
-                result += f"- {drafts} draft MR(s)\n"
+                result.bullet(f"{drafts} draft MR(s)")
 
-    return [TextContent(type="text", text=result)]
+    return [TextContent(type="text", text=result.build())]
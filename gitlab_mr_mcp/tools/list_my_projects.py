@@ -3,32 +3,44 @@ import logging
 from mcp.types import TextContent
 
 from gitlab_mr_mcp.gitlab_api import list_user_projects
+from gitlab_mr_mcp.markdown import MarkdownBuilder
+from gitlab_mr_mcp.structured import wants_json
+from gitlab_mr_mcp.tools.search_projects import find_projects, format_unavailable, structured_project
 
 
-async def list_my_projects(gitlab_url, access_token, args):
+async def list_my_projects(instances, args):
     logging.info(f"list_my_projects called with args: {args}")
 
     owned = args.get("owned", False)
     limit = args.get("limit", 20)
 
-    status, data, error = await list_user_projects(gitlab_url, access_token, owned, True, limit)
+    async def fetch(instance):
+        return await list_user_projects(instance["gitlab_url"], instance["access_token"], owned, True, limit)
 
-    if status != 200:
-        logging.error(f"Error listing projects: {status} - {error}")
-        raise Exception(f"Error listing projects: {status} - {error}")
+    data, errors = await find_projects(instances, fetch, "listing projects", limit)
+
+    if wants_json(args):
+        return {
+            "projects": [structured_project(project, "open_issues_count") for project in data],
+            "unavailable": errors,
+        }
 
     filter_info = " (owned only)" if owned else ""
-    result = f"# My GitLab Projects{filter_info}\n\n"
+    result = MarkdownBuilder()
+    result.heading(f"My GitLab Projects{filter_info}")
     result += f"Found {len(data)} project(s)\n\n"
+    format_unavailable(result, errors)
 
     if not data:
-        result += "No projects found.\n"
-        return [TextContent(type="text", text=result)]
+        result.line("No projects found.")
+        return [TextContent(type="text", text=result.build())]
 
     for project in data:
-        result += f"## {project['name']}\n\n"
-        result += f"**ID**: `{project['id']}`\n"
-        result += f"**Path**: `{project['path_with_namespace']}`\n"
+        result.heading(project["name"], level=2)
+        if "instance" in project:
+            result.field("Instance", f"`{project['instance']}`")
+        result.field("ID", f"`{project['id']}`")
+        result.field("Path", f"`{project['path_with_namespace']}`")
 
         if project.get("description"):
             desc = project["description"][:100]
@@ -36,16 +48,18 @@ async def list_my_projects(gitlab_url, access_token, args):
                 desc += "..."
             result += f"**Description**: {desc}\n"
 
-        result += f"**Visibility**: {project.get('visibility', 'unknown')}\n"
-        result += f"**Default Branch**: `{project.get('default_branch', 'main')}`\n"
+        result.field("Visibility", project.get("visibility", "unknown"))
+        result.field("Default Branch", f"`{project.get('default_branch', 'main')}`")
 
         if project.get("open_issues_count") is not None:
-            result += f"**Open Issues**: {project['open_issues_count']}\n"
+            result.field("Open Issues", project["open_issues_count"])
 
         result += f"**URL**: {project['web_url']}\n\n"
 
     result += "---\n\n"
-    result += "**Tip**: Use the project `ID` or `path` in other tools.\n"
-    result += "Example: `list_merge_requests` with `project_id: 12345`\n"
+    result.field("Tip", "Use the project `ID` or `path` in other tools.")
+    result.line("Example: `list_merge_requests` with `project_id: 12345`")
+    if len(instances) > 1:
+        result.line("Project IDs are per instance: pass the project's `instance` along with its ID.")
 
-    return [TextContent(type="text", text=result)]
+    return [TextContent(type="text", text=result.build())]
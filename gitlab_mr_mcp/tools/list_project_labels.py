@@ -3,6 +3,10 @@ import logging
 from mcp.types import TextContent
 
 from gitlab_mr_mcp.gitlab_api import get_project_labels as api_get_project_labels
+from gitlab_mr_mcp.markdown import MarkdownBuilder
+from gitlab_mr_mcp.structured import pick, wants_json
+
+LABEL_FIELDS = ("name", "description", "color", "is_project_label")
 
 
 async def list_project_labels(gitlab_url, project_id, access_token, args):
@@ -15,12 +19,21 @@ async def list_project_labels(gitlab_url, project_id, access_token, args):
         logging.error(f"Error fetching project labels: {status} - {error}")
         raise Exception(f"Error fetching project labels: {status} - {error}")
 
-    result = "# Project Labels\n\n"
+    if wants_json(args):
+        # Labels without is_project_label are listed as project labels, as in the Markdown output
+        return {
+            "labels": [
+                pick(label, *LABEL_FIELDS) | {"is_project_label": label.get("is_project_label", True)} for label in data
+            ]
+        }
+
+    result = MarkdownBuilder()
+    result.heading("Project Labels")
     result += f"Found {len(data)} label(s)\n\n"
 
     if not data:
-        result += "No labels found.\n"
-        return [TextContent(type="text", text=result)]
+        result.line("No labels found.")
+        return [TextContent(type="text", text=result.build())]
 
     # Separate scoped vs regular labels
     scoped_labels = []
@@ -34,7 +47,7 @@ async def list_project_labels(gitlab_url, project_id, access_token, args):
             regular_labels.append(label)
 
     if regular_labels:
-        result += "## Regular Labels\n\n"
+        result.heading("Regular Labels", level=2)
         for label in sorted(regular_labels, key=lambda x: x.get("name", "").lower()):
             name = label.get("name", "unknown")
             description = label.get("description", "")
@@ -45,10 +58,10 @@ async def list_project_labels(gitlab_url, project_id, access_token, args):
             if description:
                 result += f" - {description}"
             result += f" ({source})\n"
-        result += "\n"
+        result.line()
 
     if scoped_labels:
-        result += "## Scoped Labels\n\n"
+        result.heading("Scoped Labels", level=2)
 
         # Group by scope
         scopes = {}
@@ -60,7 +73,7 @@ async def list_project_labels(gitlab_url, project_id, access_token, args):
             scopes[scope].append(label)
 
         for scope in sorted(scopes.keys()):
-            result += f"### {scope}\n\n"
+            result.heading(scope, level=3)
             for label in sorted(scopes[scope], key=lambda x: x.get("name", "")):
                 name = label.get("name", "unknown")
                 description = label.get("description", "")
@@ -69,9 +82,9 @@ async def list_project_labels(gitlab_url, project_id, access_token, args):
                 if description:
                     result += f" - {description}"
                 result += "\n"
-            result += "\n"
+            result.line()
 
     result += "---\n\n"
-    result += "Use exact label names when creating merge requests.\n"
+    result.line("Use exact label names when creating merge requests.")
 
-    return [TextContent(type="text", text=result)]
+    return [TextContent(type="text", text=result.build())]
@@ -3,6 +3,8 @@ import logging
 from mcp.types import TextContent
 
 from gitlab_mr_mcp.gitlab_api import get_project_members as api_get_project_members
+from gitlab_mr_mcp.markdown import MarkdownBuilder
+from gitlab_mr_mcp.structured import wants_json
 
 ACCESS_LEVEL_MAP = {
     10: "Guest",
@@ -23,12 +25,27 @@ async def list_project_members(gitlab_url, project_id, access_token, args):
         logging.error(f"Error fetching project members: {status} - {error}")
         raise Exception(f"Error fetching project members: {status} - {error}")
 
-    result = "# Project Members\n\n"
+    if wants_json(args):
+        members = [
+            {
+                "id": member.get("id"),
+                "username": member.get("username"),
+                "name": member.get("name"),
+                "state": member.get("state"),
+                "access_level": member.get("access_level", 0),
+                "role": ACCESS_LEVEL_MAP.get(member.get("access_level", 0), "Unknown"),
+            }
+            for member in data
+        ]
+        return {"members": members}
+
+    result = MarkdownBuilder()
+    result.heading("Project Members")
     result += f"Found {len(data)} member(s)\n\n"
 
     if not data:
-        result += "No members found.\n"
-        return [TextContent(type="text", text=result)]
+        result.line("No members found.")
+        return [TextContent(type="text", text=result.build())]
 
     # Group by access level
     by_access = {}
@@ -47,7 +64,7 @@ async def list_project_members(gitlab_url, project_id, access_token, args):
             continue
 
         members = by_access[level_name]
-        result += f"## {level_name}s ({len(members)})\n\n"
+        result.heading(f"{level_name}s ({len(members)})", level=2)
 
         for member in sorted(members, key=lambda m: m.get("username", "")):
             username = member.get("username", "unknown")
@@ -56,23 +73,23 @@ async def list_project_members(gitlab_url, project_id, access_token, args):
             state = member.get("state", "active")
 
             status_marker = "" if state == "active" else " [inactive]"
-            result += f"- @{username} ({name}) - ID: `{user_id}`{status_marker}\n"
+            result.bullet(f"@{username} ({name}) - ID: `{user_id}`{status_marker}")
 
-        result += "\n"
+        result.line()
 
     # Unknown access levels
     for level_name, members in by_access.items():
         if level_name in level_order:
             continue
-        result += f"## {level_name} ({len(members)})\n\n"
+        result.heading(f"{level_name} ({len(members)})", level=2)
         for member in members:
             username = member.get("username", "unknown")
             name = member.get("name", "Unknown")
             user_id = member.get("id", "?")
-            result += f"- @{username} ({name}) - ID: `{user_id}`\n"
-        result += "\n"
+            result.bullet(f"@{username} ({name}) - ID: `{user_id}`")
+        result.line()
 
     result += "---\n\n"
-    result += "Use usernames (e.g., `@john.doe`) when creating merge requests.\n"
+    result.line("Use usernames (e.g., `@john.doe`) when creating merge requests.")
 
-    return [TextContent(type="text", text=result)]
+    return [TextContent(type="text", text=result.build())]
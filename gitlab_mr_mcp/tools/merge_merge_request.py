@@ -4,6 +4,7 @@ from mcp.types import TextContent
 
 from gitlab_mr_mcp.gitlab_api import get_merge_request_details
 from gitlab_mr_mcp.gitlab_api import merge_merge_request as api_merge_merge_request
+from gitlab_mr_mcp.markdown import MarkdownBuilder
 
 
 async def merge_merge_request(gitlab_url, project_id, access_token, args):
@@ -44,37 +45,40 @@ async def merge_merge_request(gitlab_url, project_id, access_token, args):
         source_branch = data.get("source_branch", "")
         target_branch = data.get("target_branch", "")
 
-        result = "# Merge Request Merged\n\n"
+        result = MarkdownBuilder()
+        result.heading("Merge Request Merged")
         result += f"**!{mr_iid}**: {mr_title}\n\n"
-        result += f"**State**: {mr_state}\n"
-        result += f"**Merged**: `{source_branch}` -> `{target_branch}`\n"
+        result.field("State", mr_state)
+        result.field("Merged", f"`{source_branch}` -> `{target_branch}`")
 
         if data.get("merge_commit_sha"):
-            result += f"**Merge Commit**: `{data['merge_commit_sha'][:8]}`\n"
+            result.field("Merge Commit", f"`{data['merge_commit_sha'][:8]}`")
 
         if data.get("squash_commit_sha"):
-            result += f"**Squash Commit**: `{data['squash_commit_sha'][:8]}`\n"
+            result.field("Squash Commit", f"`{data['squash_commit_sha'][:8]}`")
 
         merged_by = data.get("merged_by") or data.get("merge_user")
         if merged_by:
-            result += f"**Merged By**: @{merged_by.get('username', 'unknown')}\n"
+            result.field("Merged By", f"@{merged_by.get('username', 'unknown')}")
 
         result += f"\n**URL**: {mr_url}\n"
 
-        return [TextContent(type="text", text=result)]
+        return [TextContent(type="text", text=result.build())]
 
     elif status == 401:
-        result = "# Merge Failed: Unauthorized\n\n"
-        result += "Your access token doesn't have permission to merge.\n"
-        result += "Ensure your token has `api` scope (not just `read_api`).\n"
-        return [TextContent(type="text", text=result)]
+        result = MarkdownBuilder()
+        result.heading("Merge Failed: Unauthorized")
+        result.line("Your access token doesn't have permission to merge.")
+        result.line("Ensure your token has `api` scope (not just `read_api`).")
+        return [TextContent(type="text", text=result.build())]
 
     elif status == 405:
         # Method not allowed - MR can't be merged
         error_msg = data.get("message", error) if isinstance(data, dict) else error
 
-        result = "# Merge Failed: Not Allowed\n\n"
-        result += f"**MR**: !{mr_iid}\n"
+        result = MarkdownBuilder()
+        result.heading("Merge Failed: Not Allowed")
+        result.field("MR", f"!{mr_iid}")
         result += f"**Error**: {error_msg}\n\n"
 
         # Get MR details to explain why (best effort, don't fail if this errors)
@@ -83,34 +87,36 @@ async def merge_merge_request(gitlab_url, project_id, access_token, args):
                 gitlab_url, project_id, access_token, mr_iid
             )
             if details_status == 200:
-                result += "**Possible reasons**:\n"
+                result.line("**Possible reasons**:")
                 if mr_details.get("has_conflicts"):
-                    result += "- Merge conflicts exist\n"
+                    result.bullet("Merge conflicts exist")
                 if mr_details.get("draft") or mr_details.get("work_in_progress"):
-                    result += "- MR is in draft/WIP status\n"
+                    result.bullet("MR is in draft/WIP status")
                 if mr_details.get("merge_status") == "cannot_be_merged":
-                    result += "- MR cannot be merged (check pipeline/approvals)\n"
+                    result.bullet("MR cannot be merged (check pipeline/approvals)")
                 if mr_details.get("state") != "opened":
-                    result += f"- MR is not open (state: {mr_details.get('state')})\n"
+                    result.bullet(f"MR is not open (state: {mr_details.get('state')})")
         except Exception:
             pass  # nosec B110 - intentional: supplementary info, failure is acceptable
 
-        return [TextContent(type="text", text=result)]
+        return [TextContent(type="text", text=result.build())]
 
     elif status == 406:
         # SHA mismatch
-        result = "# Merge Failed: SHA Mismatch\n\n"
-        result += f"**MR**: !{mr_iid}\n"
-        result += "The SHA provided doesn't match the current HEAD.\n"
-        result += "New commits may have been pushed since you last checked.\n"
-        return [TextContent(type="text", text=result)]
+        result = MarkdownBuilder()
+        result.heading("Merge Failed: SHA Mismatch")
+        result.field("MR", f"!{mr_iid}")
+        result.line("The SHA provided doesn't match the current HEAD.")
+        result.line("New commits may have been pushed since you last checked.")
+        return [TextContent(type="text", text=result.build())]
 
     elif status == 409:
         # Conflict
-        result = "# Merge Failed: Conflict\n\n"
-        result += f"**MR**: !{mr_iid}\n"
-        result += "SHA doesn't match or merge request is in an unmergeable state.\n"
-        return [TextContent(type="text", text=result)]
+        result = MarkdownBuilder()
+        result.heading("Merge Failed: Conflict")
+        result.field("MR", f"!{mr_iid}")
+        result.line("SHA doesn't match or merge request is in an unmergeable state.")
+        return [TextContent(type="text", text=result.build())]
 
     else:
         error_msg = data.get("message", error) if isinstance(data, dict) else error
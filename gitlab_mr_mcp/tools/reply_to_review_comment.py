@@ -7,6 +7,7 @@ from gitlab_mr_mcp.gitlab_api import (
     reply_to_merge_request_discussion,
     resolve_merge_request_discussion,
 )
+from gitlab_mr_mcp.markdown import MarkdownBuilder
 from gitlab_mr_mcp.utils import truncate_text
 
 
@@ -27,31 +28,34 @@ async def reply_to_review_comment(gitlab_url, project_id, access_token, args):
             author = response_data.get("author", {}).get("name", "Unknown")
             note_id = response_data.get("id", "unknown")
 
-            result = "# Reply Posted\n\n"
-            result += f"**MR**: !{mr_iid}\n"
-            result += f"**Discussion**: `{discussion_id}`\n"
-            result += f"**Note ID**: `{note_id}`\n"
-            result += f"**Author**: {author}\n"
-            result += f"**Reply**: {truncate_text(reply_body)}\n"
+            result = MarkdownBuilder()
+            result.heading("Reply Posted")
+            result.field("MR", f"!{mr_iid}")
+            result.field("Discussion", f"`{discussion_id}`")
+            result.field("Note ID", f"`{note_id}`")
+            result.field("Author", author)
+            result.field("Reply", truncate_text(reply_body))
 
-            return [TextContent(type="text", text=result)]
+            return [TextContent(type="text", text=result.build())]
         else:
-            result = "# Error Posting Reply\n\n"
-            result += f"**Status**: {status}\n"
-            result += f"**Error**: {error_text}\n"
-            result += f"**MR**: !{mr_iid}\n"
-            result += f"**Discussion**: `{discussion_id}`\n"
+            result = MarkdownBuilder()
+            result.heading("Error Posting Reply")
+            result.field("Status", status)
+            result.field("Error", error_text)
+            result.field("MR", f"!{mr_iid}")
+            result.field("Discussion", f"`{discussion_id}`")
 
-            return [TextContent(type="text", text=result)]
+            return [TextContent(type="text", text=result.build())]
 
     except Exception as e:
         logging.error(f"Unexpected error in reply_to_review_comment: {e}")
-        result = "# Unexpected Error\n\n"
-        result += f"**Error**: {str(e)}\n"
-        result += f"**MR**: !{mr_iid}\n"
-        result += f"**Discussion**: `{discussion_id}`\n"
+        result = MarkdownBuilder()
+        result.heading("Unexpected Error")
+        result.field("Error", str(e))
+        result.field("MR", f"!{mr_iid}")
+        result.field("Discussion", f"`{discussion_id}`")
 
-        return [TextContent(type="text", text=result)]
+        return [TextContent(type="text", text=result.build())]
 
 
 async def create_review_comment(gitlab_url, project_id, access_token, args):
@@ -69,27 +73,30 @@ async def create_review_comment(gitlab_url, project_id, access_token, args):
         if status == 201:
             discussion_id = response_data.get("id", "unknown")
 
-            result = "# Discussion Created\n\n"
-            result += f"**MR**: !{mr_iid}\n"
-            result += f"**Discussion ID**: `{discussion_id}`\n"
-            result += f"**Comment**: {truncate_text(comment_body)}\n"
+            result = MarkdownBuilder()
+            result.heading("Discussion Created")
+            result.field("MR", f"!{mr_iid}")
+            result.field("Discussion ID", f"`{discussion_id}`")
+            result.field("Comment", truncate_text(comment_body))
 
-            return [TextContent(type="text", text=result)]
+            return [TextContent(type="text", text=result.build())]
         else:
-            result = "# Error Creating Discussion\n\n"
-            result += f"**Status**: {status}\n"
-            result += f"**Error**: {error_text}\n"
-            result += f"**MR**: !{mr_iid}\n"
+            result = MarkdownBuilder()
+            result.heading("Error Creating Discussion")
+            result.field("Status", status)
+            result.field("Error", error_text)
+            result.field("MR", f"!{mr_iid}")
 
-            return [TextContent(type="text", text=result)]
+            return [TextContent(type="text", text=result.build())]
 
     except Exception as e:
         logging.error(f"Unexpected error in create_review_comment: {e}")
-        result = "# Unexpected Error\n\n"
-        result += f"**Error**: {str(e)}\n"
-        result += f"**MR**: !{mr_iid}\n"
+        result = MarkdownBuilder()
+        result.heading("Unexpected Error")
+        result.field("Error", str(e))
+        result.field("MR", f"!{mr_iid}")
 
-        return [TextContent(type="text", text=result)]
+        return [TextContent(type="text", text=result.build())]
 
 
 async def resolve_review_discussion(gitlab_url, project_id, access_token, args):
@@ -108,26 +115,29 @@ async def resolve_review_discussion(gitlab_url, project_id, access_token, args):
         )
 
         if status == 200:
-            result = f"# Discussion {action.title()}\n\n"
-            result += f"**MR**: !{mr_iid}\n"
-            result += f"**Discussion**: `{discussion_id}`\n"
-            result += f"**Status**: {action.title()}\n"
+            result = MarkdownBuilder()
+            result.heading(f"Discussion {action.title()}")
+            result.field("MR", f"!{mr_iid}")
+            result.field("Discussion", f"`{discussion_id}`")
+            result.field("Status", action.title())
 
-            return [TextContent(type="text", text=result)]
+            return [TextContent(type="text", text=result.build())]
         else:
-            result = f"# Error {action.title()} Discussion\n\n"
-            result += f"**Status**: {status}\n"
-            result += f"**Error**: {error_text}\n"
-            result += f"**MR**: !{mr_iid}\n"
-            result += f"**Discussion**: `{discussion_id}`\n"
+            result = MarkdownBuilder()
+            result.heading(f"Error {action.title()} Discussion")
+            result.field("Status", status)
+            result.field("Error", error_text)
+            result.field("MR", f"!{mr_iid}")
+            result.field("Discussion", f"`{discussion_id}`")
 
-            return [TextContent(type="text", text=result)]
+            return [TextContent(type="text", text=result.build())]
 
     except Exception as e:
         logging.error(f"Unexpected error in resolve_review_discussion: {e}")
-        result = "# Unexpected Error\n\n"
-        result += f"**Error**: {str(e)}\n"
-        result += f"**MR**: !{mr_iid}\n"
-        result += f"**Discussion**: `{discussion_id}`\n"
+        result = MarkdownBuilder()
+        result.heading("Unexpected Error")
+        result.field("Error", str(e))
+        result.field("MR", f"!{mr_iid}")
+        result.field("Discussion", f"`{discussion_id}`")
 
-        return [TextContent(type="text", text=result)]
+        return [TextContent(type="text", text=result.build())]
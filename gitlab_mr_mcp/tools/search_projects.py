@@ -3,33 +3,69 @@ import logging
 from mcp.types import TextContent
 
 from gitlab_mr_mcp.gitlab_api import search_projects as api_search_projects
+from gitlab_mr_mcp.instances import gather_from_instances
+from gitlab_mr_mcp.markdown import MarkdownBuilder
+from gitlab_mr_mcp.structured import pick, wants_json
 
+PROJECT_FIELDS = ("id", "name", "path_with_namespace", "description", "visibility", "default_branch", "web_url")
 
-async def search_projects(gitlab_url, access_token, args):
+
+async def find_projects(instances, fetch, action, limit):
+    """Projects from every instance, most recently active first, tagged with their instance when there are several"""
+    answered, errors = await gather_from_instances(instances, fetch, action)
+    projects = []
+    for instance, data in answered:
+        projects.extend(
+            {**project, "instance": instance["name"]} if len(instances) > 1 else project for project in data
+        )
+    if len(answered) > 1:
+        projects.sort(key=lambda project: project.get("last_activity_at") or "", reverse=True)
+        projects = projects[:limit]
+    return projects, errors
+
+
+def structured_project(project, *extra_fields):
+    fields = PROJECT_FIELDS + extra_fields + (("instance",) if "instance" in project else ())
+    return pick(project, *fields)
+
+
+def format_unavailable(result, errors):
+    if errors:
+        result.field("Unavailable instances", "; ".join(errors))
+        result.line()
+
+
+async def search_projects(instances, args):
     logging.info(f"search_projects called with args: {args}")
 
     search = args.get("search")
     membership = args.get("membership", True)
     limit = args.get("limit", 20)
 
-    status, data, error = await api_search_projects(gitlab_url, access_token, search, membership, limit)
+    async def fetch(instance):
+        return await api_search_projects(instance["gitlab_url"], instance["access_token"], search, membership, limit)
+
+    data, errors = await find_projects(instances, fetch, "searching projects", limit)
 
-    if status != 200:
-        logging.error(f"Error searching projects: {status} - {error}")
-        raise Exception(f"Error searching projects: {status} - {error}")
+    if wants_json(args):
+        return {"projects": [structured_project(project) for project in data], "unavailable": errors}
 
     search_info = f' matching "{search}"' if search else ""
-    result = f"# GitLab Projects{search_info}\n\n"
+    result = MarkdownBuilder()
+    result.heading(f"GitLab Projects{search_info}")
     result += f"Found {len(data)} project(s)\n\n"
+    format_unavailable(result, errors)
 
     if not data:
-        result += "No projects found.\n"
-        return [TextContent(type="text", text=result)]
+        result.line("No projects found.")
+        return [TextContent(type="text", text=result.build())]
 
     for project in data:
-        result += f"## {project['name']}\n\n"
-        result += f"**ID**: `{project['id']}`\n"
-        result += f"**Path**: `{project['path_with_namespace']}`\n"
+        result.heading(project["name"], level=2)
+        if "instance" in project:
+            result.field("Instance", f"`{project['instance']}`")
+        result.field("ID", f"`{project['id']}`")
+        result.field("Path", f"`{project['path_with_namespace']}`")
 
         if project.get("description"):
             desc = project["description"][:100]
@@ -37,12 +73,14 @@ async def search_projects(gitlab_url, access_token, args):
                 desc += "..."
             result += f"**Description**: {desc}\n"
 
-        result += f"**Visibility**: {project.get('visibility', 'unknown')}\n"
-        result += f"**Default Branch**: `{project.get('default_branch', 'main')}`\n"
+        result.field("Visibility", project.get("visibility", "unknown"))
+        result.field("Default Branch", f"`{project.get('default_branch', 'main')}`")
         result += f"**URL**: {project['web_url']}\n\n"
 
     result += "---\n\n"
-    result += "**Tip**: Use the project `ID` or `path` in other tools.\n"
-    result += "Example: `list_merge_requests` with `project_id: 12345`\n"
+    result.field("Tip", "Use the project `ID` or `path` in other tools.")
+    result.line("Example: `list_merge_requests` with `project_id: 12345`")
+    if len(instances) > 1:
+        result.line("Project IDs are per instance: pass the project's `instance` along with its ID.")
 
-    return [TextContent(type="text", text=result)]
+    return [TextContent(type="text", text=result.build())]
@@ -4,6 +4,7 @@ from mcp.types import TextContent
 
 from gitlab_mr_mcp.gitlab_api import get_merge_request_details, get_project_labels, get_project_members
 from gitlab_mr_mcp.gitlab_api import update_merge_request as api_update_merge_request
+from gitlab_mr_mcp.markdown import MarkdownBuilder
 
 
 def apply_draft_to_title(title, draft):
@@ -144,29 +145,30 @@ async def update_merge_request(gitlab_url, project_id, access_token, args):
         mr_title = data.get("title")
         mr_url = data.get("web_url")
 
-        result = f"# MR !{mr_iid} Updated\n\n"
-        result += f"**Title**: {mr_title}\n"
+        result = MarkdownBuilder()
+        result.heading(f"MR !{mr_iid} Updated")
+        result.field("Title", mr_title)
 
         if data.get("draft"):
-            result += "**Status**: Draft\n"
+            result.field("Status", "Draft")
         else:
-            result += "**Status**: Ready\n"
+            result.field("Status", "Ready")
 
         if data.get("assignees"):
             assignees = ", ".join(f"@{a['username']}" for a in data["assignees"])
-            result += f"**Assignees**: {assignees}\n"
+            result.field("Assignees", assignees)
 
         if data.get("reviewers"):
             reviewers = ", ".join(f"@{r['username']}" for r in data["reviewers"])
-            result += f"**Reviewers**: {reviewers}\n"
+            result.field("Reviewers", reviewers)
 
         if data.get("labels"):
             labels = ", ".join(f"`{label}`" for label in data["labels"])
-            result += f"**Labels**: {labels}\n"
+            result.field("Labels", labels)
 
         result += f"\n**URL**: {mr_url}\n"
 
-        return [TextContent(type="text", text=result)]
+        return [TextContent(type="text", text=result.build())]
 
     else:
         error_msg = data.get("message", error) if isinstance(data, dict) else error
@@ -0,0 +1,166 @@
+"""Disk-backed store for the traces of finished jobs.
+
+Finished job traces never change, but debugging a failure means scanning,
+grepping and paging the same log many times. Traces of finished jobs are
+spilled to files in a per-process directory while they are downloaded, and later
+reads go through read-only ``mmap`` views, so even a multi-hundred-MB trace is
+never loaded into Python memory. The store is bounded by total bytes and evicts
+the least recently used traces first.
+
+Configured with ``GITLAB_TRACE_STORE_DIR`` (parent directory, the system temp
+directory by default) and ``GITLAB_TRACE_STORE_MAX_MB`` (512 by default, 0
+disables the store).
+"""
+
+import atexit
+import contextlib
+import hashlib
+import logging
+import mmap
+import os
+import shutil
+import tempfile
+from collections import OrderedDict
+
+DEFAULT_MAX_MB = 512
+
+
+class TraceWriter:
+    """Write a trace to a temporary file, adding it to the store only if it was read to the end."""
+
+    def __init__(self, store, key):
+        self._store = store
+        self._key = key
+        self._file = None
+        self._size = 0
+        self._newlines = 0
+        self._last_byte = b""
+        self.complete = False
+
+    async def tee(self, chunks):
+        """Pass chunks through while writing them to the store"""
+        async for chunk in chunks:
+            self._file.write(chunk)
+            self._size += len(chunk)
+            self._newlines += chunk.count(b"\n")
+            self._last_byte = chunk[-1:] or self._last_byte
+            yield chunk
+        self.complete = True
+
+    def __enter__(self):
+        self._file = tempfile.NamedTemporaryFile(dir=self._store.directory, suffix=".part", delete=False)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._file.close()
+        if exc_type is None and self.complete:
+            line_count = self._newlines + (self._last_byte not in (b"", b"\n"))
+            self._store.add(self._key, self._file.name, self._size, line_count)
+        else:
+            _remove(self._file.name)
+        return False
+
+
+class TraceStore:
+    """Size-bounded on-disk store of job traces, evicting least recently used traces."""
+
+    def __init__(self, parent_directory=None, max_bytes=DEFAULT_MAX_MB * 1024 * 1024):
+        self.parent_directory = parent_directory
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self._directory = None
+        self._entries = OrderedDict()
+
+    @classmethod
+    def from_env(cls):
+        max_mb = os.environ.get("GITLAB_TRACE_STORE_MAX_MB", str(DEFAULT_MAX_MB))
+        try:
+            max_bytes = int(float(max_mb) * 1024 * 1024)
+        except ValueError:
+            logging.warning(f"Invalid GITLAB_TRACE_STORE_MAX_MB {max_mb!r}, using {DEFAULT_MAX_MB}")
+            max_bytes = DEFAULT_MAX_MB * 1024 * 1024
+        return cls(os.environ.get("GITLAB_TRACE_STORE_DIR"), max_bytes)
+
+    @property
+    def enabled(self):
+        return self.max_bytes > 0
+
+    @property
+    def directory(self):
+        """Per-process directory holding the traces, created on first use and removed at exit"""
+        if self._directory is None:
+            self._directory = tempfile.mkdtemp(prefix="gitlab-mr-mcp-traces-", dir=self.parent_directory)
+            atexit.register(shutil.rmtree, self._directory, ignore_errors=True)
+        return self._directory
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def writer(self, key):
+        """Return a TraceWriter that adds the trace under key once fully written"""
+        return TraceWriter(self, key)
+
+    def line_count(self, key):
+        """Number of lines of the trace stored under key"""
+        return self._entries[key][1]
+
+    def add(self, key, temp_path, size, line_count):
+        """Move a fully written trace file into the store"""
+        if not self.enabled or size == 0 or size > self.max_bytes:
+            _remove(temp_path)
+            return
+        path = self._path(key)
+        os.replace(temp_path, path)
+        self._discard(key)
+        self._entries[key] = (size, line_count)
+        self.total_bytes += size
+        while self.total_bytes > self.max_bytes:
+            evicted_key, (evicted_size, _) = self._entries.popitem(last=False)
+            self.total_bytes -= evicted_size
+            _remove(self._path(evicted_key))
+
+    @contextlib.contextmanager
+    def open(self, key):
+        """Yield a read-only mmap of the trace stored under key, or None if it is not stored"""
+        if key not in self._entries:
+            yield None
+            return
+        self._entries.move_to_end(key)
+        try:
+            with open(self._path(key), "rb") as trace_file:
+                view = mmap.mmap(trace_file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError) as e:
+            logging.warning(f"Dropping unreadable stored trace: {e}")
+            self._discard(key)
+            yield None
+            return
+        try:
+            yield view
+        finally:
+            view.close()
+
+    def clear(self):
+        for key in list(self._entries):
+            _remove(self._path(key))
+        self._entries.clear()
+        self.total_bytes = 0
+
+    def _discard(self, key):
+        if key in self._entries:
+            self.total_bytes -= self._entries.pop(key)[0]
+
+    def _path(self, key):
+        digest = hashlib.sha256(repr(key).encode()).hexdigest()[:32]
+        return os.path.join(self.directory, f"{digest}.trace")
+
+
+async def iter_view(view, chunk_size):
+    """Iterate over an mmap view in chunks, like a streamed response body"""
+    for start in range(0, len(view), chunk_size):
+        yield view[start : start + chunk_size]
+
+
+def _remove(path):
+    # A trace still mapped by a reader may not be removable on some platforms
+    with contextlib.suppress(OSError):
+        os.remove(path)
@@ -1,6 +1,20 @@
-from datetime import datetime
+from datetime import datetime, timezone
+from functools import lru_cache
 
 
+def parse_date(iso_date_string):
+    """Parse an ISO date into an aware datetime (UTC assumed), or None if invalid"""
+    try:
+        dt = datetime.fromisoformat(iso_date_string.replace("Z", "+00:00"))
+    except (ValueError, AttributeError):
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt
+
+
+# Reports format the same few timestamps for every note, so the results are cached
+@lru_cache(maxsize=4096)
 def format_date(iso_date_string):
     """Convert ISO date to human-readable format"""
     try:
@@ -10,6 +24,17 @@ def format_date(iso_date_string):
         return str(iso_date_string) if iso_date_string else "N/A"
 
 
+def format_duration(seconds):
+    """Format duration in human readable form"""
+    if not seconds:
+        return "N/A"
+    mins = int(seconds) // 60
+    secs = int(seconds) % 60
+    if mins > 0:
+        return f"{mins}m {secs}s"
+    return f"{secs}s"
+
+
 def get_state_explanation(state):
     """Get human-readable explanation of MR state"""
     explanations = {
@@ -125,6 +150,34 @@ def format_user(user_data):
     return f"{name} (@{username})"
 
 
+def format_handle(user_data):
+    """Refer to a user by username only, for output that lists participants once"""
+    if not user_data:
+        return "Unknown"
+    return f"@{user_data.get('username', 'unknown')}"
+
+
+def format_participants(users):
+    """Markdown table of the distinct users, in order of first appearance"""
+    names = {}
+    for user in users:
+        if user:
+            names.setdefault(format_handle(user), user.get("name", "Unknown").replace("|", "\\|"))
+    if not names:
+        return ""
+    rows = "".join(f"| {handle} | {name} |\n" for handle, name in names.items())
+    return "| User | Name |\n| ---- | ---- |\n" + rows + "\n"
+
+
+def format_note_time(iso_date_string, previous_iso_date_string=None):
+    """Date and time of a note, only the time if the previous note was on the same day"""
+    formatted = format_date(iso_date_string)
+    if previous_iso_date_string and parse_date(iso_date_string):
+        if formatted[:10] == format_date(previous_iso_date_string)[:10]:
+            return formatted[11:]
+    return formatted
+
+
 def format_labels(labels):
     """Format labels consistently"""
     if not labels:
@@ -0,0 +1,33 @@
+from unittest.mock import patch
+
+from gitlab_mr_mcp.cache import TTLCache
+
+
+def test_evicts_least_recently_used_entry():
+    cache = TTLCache(max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert "a" in cache
+    assert "b" not in cache
+    assert len(cache) == 2
+
+
+def test_entries_expire_after_ttl():
+    cache = TTLCache(ttl=10)
+    with patch("gitlab_mr_mcp.cache.time.monotonic", return_value=100.0):
+        cache.set("a", 1)
+        cache.set("b", 2, ttl=60)
+    with patch("gitlab_mr_mcp.cache.time.monotonic", return_value=120.0):
+        assert cache.get("a") is None
+        assert cache.get("b") == 2
+
+
+def test_pop_removes_entry():
+    cache = TTLCache()
+    cache.set("a", 1)
+
+    assert cache.pop("a") == 1
+    assert cache.pop("a", "missing") == "missing"
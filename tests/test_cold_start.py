@@ -0,0 +1,40 @@
+"""Test that server startup stays light: tool modules and aiohttp load on the first tool call."""
+
+import subprocess
+import sys
+
+# Self import time in microseconds of the package's own startup modules, far above the ~15 ms they take
+STARTUP_IMPORT_BUDGET_US = 100_000
+
+DEFERRED_MODULES = ("aiohttp", "gitlab_mr_mcp.gitlab_api", "gitlab_mr_mcp.tools")
+
+
+def run_python(*args):
+    return subprocess.run([sys.executable, *args], capture_output=True, text=True, timeout=60, check=True)
+
+
+def test_server_import_defers_tool_modules():
+    code = f"import sys, gitlab_mr_mcp.server; print([m for m in sys.modules if m.startswith({DEFERRED_MODULES})])"
+    result = run_python("-c", code)
+    assert result.stdout.strip() == "[]"
+
+
+def test_listing_tools_with_output_schemas_defers_tool_modules():
+    code = (
+        "import sys; from gitlab_mr_mcp.tool_specs import registry; registry.definitions(True); "
+        f"print([m for m in sys.modules if m.startswith({DEFERRED_MODULES})])"
+    )
+    result = run_python("-c", code)
+    assert result.stdout.strip() == "[]"
+
+
+def test_server_import_time_within_budget():
+    result = run_python("-X", "importtime", "-c", "import gitlab_mr_mcp.server")
+    own_us = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, _cumulative_us, name = line[len("import time:") :].split("|")
+        if name.strip().startswith("gitlab_mr_mcp"):
+            own_us += int(self_us)
+    assert 0 < own_us < STARTUP_IMPORT_BUDGET_US
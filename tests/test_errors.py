@@ -1,5 +1,6 @@
 """Test error handling."""
 
+import json
 import os
 from unittest.mock import patch
 
@@ -69,3 +70,52 @@ def test_config_defaults():
         assert config["gitlab_url"] == "https://gitlab.com"
         assert config["server_name"] == "gitlab-mcp-server"
         assert config["server_version"] == "1.0.0"
+
+
+def test_config_extra_instances():
+    """Test GITLAB_INSTANCES parsing."""
+    instances = {
+        "internal": {
+            "url": "https://gitlab.internal.example.com/",
+            "access_token_env": "INTERNAL_TOKEN",
+            "path_prefixes": ["platform/"],
+            "max_connections": 4,
+        }
+    }
+    with patch.dict(
+        os.environ,
+        {
+            "GITLAB_ACCESS_TOKEN": "test-token",
+            "GITLAB_URL": "https://gitlab.com/",
+            "GITLAB_INSTANCE_NAME": "public",
+            "GITLAB_INSTANCES": json.dumps(instances),
+            "INTERNAL_TOKEN": "internal-token",
+        },
+        clear=True,
+    ):
+        config = get_gitlab_config()
+
+    assert [instance["name"] for instance in config["instances"]] == ["public", "internal"]
+    assert config["instances"][0]["gitlab_url"] == "https://gitlab.com"
+    internal = config["instances"][1]
+    assert internal["gitlab_url"] == "https://gitlab.internal.example.com"
+    assert internal["access_token"] == "internal-token"
+    assert internal["path_prefixes"] == ["platform/"]
+    assert internal["max_connections"] == 4
+
+
+@pytest.mark.parametrize(
+    "value, message",
+    [
+        ("{", "not valid JSON"),
+        ("[]", "JSON object"),
+        ('{"default": {"url": "https://x", "access_token": "t"}}', "name of the default instance"),
+        ('{"other": {"access_token": "t"}}', "needs a url"),
+        ('{"other": {"url": "https://x", "access_token_env": "UNSET_TOKEN"}}', "needs an access_token"),
+    ],
+)
+def test_config_invalid_instances(value, message):
+    """Test that invalid GITLAB_INSTANCES raises error."""
+    with patch.dict(os.environ, {"GITLAB_ACCESS_TOKEN": "test-token", "GITLAB_INSTANCES": value}, clear=True):
+        with pytest.raises(ValueError, match=message):
+            get_gitlab_config()
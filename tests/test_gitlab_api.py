@@ -1,8 +1,13 @@
+import asyncio
+import contextlib
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
-from gitlab_mr_mcp.gitlab_api import _get_connector, get_session
+from gitlab_mr_mcp import gitlab_api
+from gitlab_mr_mcp.gitlab_api import _get_all_pages, _get_connector, get_session
+from gitlab_mr_mcp.governor import GovernedSession
+from gitlab_mr_mcp.trace_store import TraceStore
 
 
 class TestGetConnector:
@@ -31,6 +36,413 @@ async def test_get_session_uses_connector():
             mock_session_class.return_value.__aexit__.return_value = None
 
             async with get_session() as session:
-                assert session is mock_session
+                assert isinstance(session, GovernedSession)
+                assert session._session is mock_session
 
             mock_session_class.assert_called_once_with(connector=mock_connector)
+
+
+class FakeResponse:
+    def __init__(self, data, headers=None, status=200):
+        self.status = status
+        self.headers = headers or {}
+        self._data = data
+
+    async def json(self):
+        return self._data
+
+    async def text(self):
+        return str(self._data)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return None
+
+
+@pytest.mark.asyncio
+async def test_get_all_pages_fetches_remaining_pages_concurrently():
+    session = MagicMock()
+    pages = {1: [1, 2], 2: [3, 4], 3: [5]}
+    session.get.side_effect = lambda url, headers, params: FakeResponse(
+        pages[params["page"]], headers={"X-Total-Pages": "3"}
+    )
+
+    status, items, _ = await _get_all_pages(session, "https://gitlab.example.com/api", {}, per_page=2)
+
+    assert status == 200
+    assert items == [1, 2, 3, 4, 5]
+    assert session.get.call_count == 3
+
+
+@pytest.mark.asyncio
+async def test_get_all_pages_follows_links_without_total():
+    session = MagicMock()
+    responses = [
+        FakeResponse([1], headers={"Link": '<https://x?page=2>; rel="next"'}),
+        FakeResponse([2], headers={}),
+    ]
+    session.get.side_effect = lambda url, headers, params: responses[params["page"] - 1]
+
+    status, items, _ = await _get_all_pages(session, "https://gitlab.example.com/api", {})
+
+    assert status == 200
+    assert items == [1, 2]
+
+
+@pytest.mark.asyncio
+async def test_get_all_pages_returns_error_status():
+    session = MagicMock()
+    response = FakeResponse("<html>403 Forbidden</html>", status=403)
+    # A proxy's HTML error page cannot be read as JSON
+    response.json = AsyncMock(side_effect=ValueError("not JSON"))
+    session.get.return_value = response
+
+    status, data, error = await _get_all_pages(session, "https://gitlab.example.com/api", {})
+
+    assert status == 403
+    assert data is None
+    assert error == "<html>403 Forbidden</html>"
+
+
+def make_jobs(*statuses):
+    return [{"id": index, "name": f"job-{index}", "status": status} for index, status in enumerate(statuses)]
+
+
+@pytest.fixture
+def job_graph_api():
+    gitlab_api._job_graph_cache.clear()
+    jobs = {100: make_jobs("success", "failed"), 200: make_jobs("success"), 300: make_jobs("failed")}
+    bridges = {
+        100: [{"name": "child", "status": "success", "downstream_pipeline": {"id": 200, "project_id": 1}}],
+        200: [{"name": "deploy", "status": "failed", "downstream_pipeline": {"id": 300, "project_id": 2}}],
+        300: [],
+    }
+    with (
+        patch.object(
+            gitlab_api, "get_pipeline_jobs", side_effect=lambda url, project, token, pid: (200, jobs[pid], "")
+        ) as get_jobs,
+        patch.object(
+            gitlab_api, "get_pipeline_bridges", side_effect=lambda url, project, token, pid: (200, bridges[pid], "")
+        ),
+    ):
+        yield jobs, get_jobs
+    gitlab_api._job_graph_cache.clear()
+
+
+@pytest.mark.asyncio
+async def test_pipeline_job_graph_follows_downstream_pipelines(job_graph_api):
+    status, graph, _ = await gitlab_api.get_pipeline_job_graph("https://gitlab.example.com", 1, "token", 100)
+
+    assert status == 200
+    assert [(p["id"], p["project_id"], p["depth"]) for p in graph["pipelines"]] == [
+        (100, 1, 0),
+        (200, 1, 1),
+        (300, 2, 2),
+    ]
+    assert graph["pipelines"][2]["triggered_by"] == "deploy"
+
+
+@pytest.mark.asyncio
+async def test_pipeline_job_graph_respects_max_depth(job_graph_api):
+    _, graph, _ = await gitlab_api.get_pipeline_job_graph("https://gitlab.example.com", 1, "token", 100, max_depth=1)
+
+    assert [p["id"] for p in graph["pipelines"]] == [100, 200]
+
+
+@pytest.mark.asyncio
+async def test_pipeline_job_graph_caches_only_finished_graphs(job_graph_api):
+    jobs, get_jobs = job_graph_api
+    jobs[300] = make_jobs("running")
+
+    await gitlab_api.get_pipeline_job_graph("https://gitlab.example.com", 1, "token", 100)
+    await gitlab_api.get_pipeline_job_graph("https://gitlab.example.com", 1, "token", 100)
+    assert get_jobs.call_count == 6
+
+    jobs[300] = make_jobs("success")
+    await gitlab_api.get_pipeline_job_graph("https://gitlab.example.com", 1, "token", 100)
+    _, _, text = await gitlab_api.get_pipeline_job_graph("https://gitlab.example.com", 1, "token", 100)
+    assert get_jobs.call_count == 9
+    assert text == "Success (cached)"
+
+
+@pytest.mark.asyncio
+async def test_pipeline_job_graph_cache_is_not_changed_by_callers(job_graph_api):
+    jobs, get_jobs = job_graph_api
+    jobs[300] = make_jobs("manual")
+
+    _, graph, _ = await gitlab_api.get_pipeline_job_graph("https://gitlab.example.com", 1, "token", 100)
+    graph["pipelines"].clear()
+    _, cached, text = await gitlab_api.get_pipeline_job_graph("https://gitlab.example.com", 1, "token", 100)
+
+    # Manual jobs wait for someone to start them, so the graph counts as finished
+    assert text == "Success (cached)"
+    assert get_jobs.call_count == 3
+    assert len(cached["pipelines"]) == 3
+
+
+@pytest.mark.asyncio
+async def test_shared_session_is_reused_by_get_session():
+    with patch("gitlab_mr_mcp.gitlab_api.aiohttp.ClientSession") as mock_session_class:
+        mock_session_class.return_value.__aenter__ = AsyncMock(return_value=MagicMock())
+        mock_session_class.return_value.__aexit__ = AsyncMock(return_value=None)
+
+        async with gitlab_api.shared_session() as shared:
+            async with get_session() as first, get_session() as second:
+                assert first is shared
+                assert second is shared
+
+        assert mock_session_class.call_count == 1
+        assert gitlab_api._shared_sessions.get() is None
+
+
+@pytest.mark.asyncio
+async def test_shared_sessions_are_kept_per_instance():
+    with patch("gitlab_mr_mcp.gitlab_api.aiohttp.ClientSession") as mock_session_class:
+        mock_session_class.return_value.__aenter__ = AsyncMock(side_effect=lambda: MagicMock())
+        mock_session_class.return_value.__aexit__ = AsyncMock(return_value=None)
+
+        async with gitlab_api.shared_session("https://a.example.com") as shared_a:
+            async with gitlab_api.shared_session("https://b.example.com") as shared_b:
+                async with get_session("https://a.example.com") as a, get_session("https://b.example.com") as b:
+                    assert a is shared_a
+                    assert b is shared_b
+                    assert shared_a is not shared_b
+                    assert b._gitlab_url == "https://b.example.com"
+
+
+@pytest.mark.asyncio
+async def test_pooled_sessions_are_reused_across_tasks_per_instance():
+    instances = [
+        {"gitlab_url": "https://a.example.com", "max_connections": 4},
+        {"gitlab_url": "https://b.example.com", "max_connections": None},
+    ]
+    with (
+        patch("gitlab_mr_mcp.gitlab_api.aiohttp.ClientSession") as mock_session_class,
+        patch("gitlab_mr_mcp.gitlab_api.aiohttp.TCPConnector") as mock_connector_class,
+    ):
+        mock_session_class.side_effect = lambda connector=None: MagicMock(close=AsyncMock())
+
+        async def session_in_task(gitlab_url):
+            async with gitlab_api.shared_session(gitlab_url) as session:
+                return session
+
+        async with gitlab_api.pooled_sessions(instances):
+            first_a, second_a, first_b = await asyncio.gather(
+                session_in_task("https://a.example.com"),
+                session_in_task("https://a.example.com"),
+                session_in_task("https://b.example.com"),
+            )
+            assert first_a is second_a
+            assert first_a is not first_b
+
+        assert mock_session_class.call_count == 2
+        mock_connector_class.assert_called_once_with(limit=4)
+        first_a.close.assert_awaited_once()
+        first_b.close.assert_awaited_once()
+        assert gitlab_api._pooled_sessions is None
+
+
+class FakeTraceResponse(FakeResponse):
+    """Serve a trace body, honouring Range headers unless ignore_range is set."""
+
+    def __init__(self, body, range_header=None, ignore_range=False):
+        super().__init__(body.decode("utf-8", errors="replace"))
+        self._body = body
+        self.content_length = len(body)
+        self.content = MagicMock()
+        self.content.iter_chunked = lambda size: self._iter_chunks(self._body, 4)
+        if range_header and not ignore_range:
+            first, _, last = range_header.removeprefix("bytes=").partition("-")
+            if first == "":
+                start, end = max(len(body) - int(last), 0), len(body)
+            else:
+                start, end = int(first), min(int(last) + 1 if last else len(body), len(body))
+            if start >= len(body):
+                self.status = 416
+                self.headers = {"Content-Range": f"bytes */{len(body)}"}
+            else:
+                self.status = 206
+                self.headers = {"Content-Range": f"bytes {start}-{end - 1}/{len(body)}"}
+                self._body = body[start:end]
+
+    @staticmethod
+    async def _iter_chunks(body, size):
+        for index in range(0, len(body), size):
+            yield body[index : index + size]
+
+    async def read(self):
+        return self._body
+
+
+@pytest.fixture
+def trace_session():
+    body = ("line one\nline two\nstatus: ✔ done\n" * 3).encode()
+    session = MagicMock()
+    session.ignore_range = False
+    session.get.side_effect = lambda url, headers: FakeTraceResponse(
+        body, headers.get("Range"), ignore_range=session.ignore_range
+    )
+
+    @contextlib.asynccontextmanager
+    async def fake_get_session(gitlab_url=None):
+        yield session
+
+    with patch.object(gitlab_api, "get_session", fake_get_session):
+        yield body, session
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("ignore_range", [False, True])
+async def test_job_trace_tail(trace_session, ignore_range):
+    body, session = trace_session
+    session.ignore_range = ignore_range
+
+    status, text, window = await gitlab_api.get_job_trace("https://gitlab.example.com", 1, "token", 7, length=20)
+
+    assert status == 200
+    assert session.get.call_args.kwargs["headers"]["Range"] == "bytes=-20"
+    assert (window["start"], window["end"], window["total_size"]) == (len(body) - 20, len(body), len(body))
+    # Lines can only be counted when the server ignored Range and sent the whole trace
+    assert window["line_count"] == (9 if ignore_range else None)
+    assert text == body[-20:].decode()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("ignore_range", [False, True])
+async def test_job_trace_range_drops_split_characters(trace_session, ignore_range):
+    body, session = trace_session
+    session.ignore_range = ignore_range
+    check = body.index("✔".encode())
+
+    _, text, window = await gitlab_api.get_job_trace(
+        "https://gitlab.example.com", 1, "token", 7, offset=check + 1, length=10
+    )
+
+    assert window["start"] == check + 1
+    assert window["end"] == check + 11
+    assert text == body[check + 3 : check + 11].decode()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("ignore_range", [False, True])
+async def test_job_trace_window_ends_before_a_split_character(trace_session, ignore_range):
+    body, session = trace_session
+    session.ignore_range = ignore_range
+    check = body.index("✔".encode())
+
+    _, text, window = await gitlab_api.get_job_trace(
+        "https://gitlab.example.com", 1, "token", 7, offset=check - 2, length=4
+    )
+
+    # Reading on from the end of the window must not skip the character cut in half
+    assert text == ": "
+    assert window["end"] == check
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("offset", [None, 0])
+async def test_empty_job_trace_has_no_lines(trace_session, offset):
+    _, session = trace_session
+    session.get.side_effect = lambda url, headers: FakeTraceResponse(b"", headers.get("Range"), ignore_range=True)
+
+    _, text, window = await gitlab_api.get_job_trace("https://gitlab.example.com", 1, "token", 7, offset=offset)
+
+    assert text == ""
+    assert window == {"start": 0, "end": 0, "total_size": 0, "line_count": 0}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("project_id", ["group/sub/project", "group%2Fsub%2Fproject"])
+async def test_project_paths_are_url_encoded(trace_session, project_id):
+    _, session = trace_session
+
+    await gitlab_api.get_job_trace("https://gitlab.example.com", project_id, "token", 7, length=20)
+
+    url = session.get.call_args.args[0]
+    assert url == "https://gitlab.example.com/api/v4/projects/group%2Fsub%2Fproject/jobs/7/trace"
+
+
+@pytest.mark.asyncio
+async def test_job_trace_offset_past_end(trace_session):
+    body, _ = trace_session
+
+    status, text, window = await gitlab_api.get_job_trace(
+        "https://gitlab.example.com", 1, "token", 7, offset=len(body) + 5, length=10
+    )
+
+    assert status == 200
+    assert text == ""
+    assert window["total_size"] == len(body)
+
+
+@pytest.fixture
+def stored_trace_session(trace_session, tmp_path):
+    body, session = trace_session
+    session.job_status = "failed"
+    trace_get = session.get.side_effect
+
+    def get(url, headers):
+        if url.endswith("/trace"):
+            return trace_get(url, headers)
+        return FakeResponse({"id": 7, "status": session.job_status})
+
+    session.get.side_effect = get
+    with patch.object(gitlab_api, "trace_store", TraceStore(tmp_path, max_bytes=1024 * 1024)):
+        yield body, session
+
+
+def trace_requests(session):
+    return [call for call in session.get.call_args_list if call.args[0].endswith("/trace")]
+
+
+@pytest.mark.asyncio
+async def test_finished_job_trace_is_served_from_the_store(stored_trace_session):
+    body, session = stored_trace_session
+
+    status, result, _ = await gitlab_api.grep_job_trace("https://gitlab.example.com", 1, "token", 7, "two")
+    assert status == 200
+    assert result["match_count"] == 3
+
+    status, sections, text = await gitlab_api.get_job_trace_sections(
+        "https://gitlab.example.com", 1, "token", 7, use_cache=False
+    )
+    assert (status, sections, text) == (200, [], "Success (stored)")
+
+    _, text, window = await gitlab_api.get_job_trace("https://gitlab.example.com", 1, "token", 7, length=20)
+    assert text == body[-20:].decode()
+    assert window == {"start": len(body) - 20, "end": len(body), "total_size": len(body), "line_count": 9}
+    assert len(trace_requests(session)) == 1
+
+
+@pytest.mark.asyncio
+async def test_running_job_trace_bypasses_the_store(stored_trace_session):
+    _, session = stored_trace_session
+    session.job_status = "running"
+
+    for _ in range(2):
+        status, _, _ = await gitlab_api.grep_job_trace("https://gitlab.example.com", 1, "token", 7, "two")
+        assert status == 200
+
+    assert len(trace_requests(session)) == 2
+    assert ("https://gitlab.example.com", "1", 7) not in gitlab_api.trace_store
+    assert gitlab_api.trace_store.total_bytes == 0
+
+
+@pytest.mark.asyncio
+async def test_section_index_of_running_job_is_not_cached(stored_trace_session):
+    _, session = stored_trace_session
+    session.job_status = "running"
+    key = ("https://gitlab.example.com", "1", 7)
+    gitlab_api._section_index_cache.pop(key)
+
+    # Every section seen so far has ended, but the job may still start new ones
+    status, sections, _ = await gitlab_api.get_job_trace_sections("https://gitlab.example.com", 1, "token", 7)
+    assert (status, sections) == (200, [])
+    assert key not in gitlab_api._section_index_cache
+
+    session.job_status = "success"
+    await gitlab_api.get_job_trace_sections("https://gitlab.example.com", 1, "token", 7)
+    assert key in gitlab_api._section_index_cache
+    gitlab_api._section_index_cache.pop(key)
@@ -0,0 +1,222 @@
+"""Tests for the GitLab request governor."""
+
+import asyncio
+
+import pytest
+
+from gitlab_mr_mcp.governor import (
+    BULK,
+    INTERACTIVE,
+    PREFETCH,
+    GovernedSession,
+    RequestBudget,
+    RequestBudgetExceeded,
+    RequestGovernor,
+    RequestGroup,
+    request_budget,
+    request_group,
+    request_priority,
+)
+
+
+async def hold(governor, priority, admitted, release):
+    async with governor.slot(priority):
+        admitted.append(priority)
+        await release.wait()
+
+
+@pytest.mark.asyncio
+async def test_caps_requests_in_flight():
+    governor = RequestGovernor(max_in_flight=2)
+    peak = 0
+
+    async def request():
+        nonlocal peak
+        async with governor.slot():
+            peak = max(peak, governor.in_flight)
+            await asyncio.sleep(0.01)
+
+    await asyncio.gather(*(request() for _ in range(6)))
+    assert peak == 2
+    assert governor.in_flight == 0
+    assert governor.stats()[INTERACTIVE]["requests"] == 6
+    assert governor.stats()[INTERACTIVE]["queued"] == 4
+
+
+@pytest.mark.asyncio
+async def test_admits_waiting_requests_by_priority_then_arrival():
+    governor = RequestGovernor(max_in_flight=1)
+    admitted = []
+    release = asyncio.Event()
+    holder = asyncio.create_task(hold(governor, BULK, admitted, release))
+    await asyncio.sleep(0)
+
+    waiters = []
+    for priority in (PREFETCH, BULK, INTERACTIVE, BULK):
+        waiters.append(asyncio.create_task(hold(governor, priority, admitted, release)))
+        await asyncio.sleep(0)
+    assert governor.waiting == 4
+
+    release.set()
+    await asyncio.gather(holder, *waiters)
+    assert admitted == [BULK, INTERACTIVE, BULK, BULK, PREFETCH]
+    assert governor.stats()[PREFETCH]["max_wait_ms"] >= governor.stats()[INTERACTIVE]["max_wait_ms"]
+
+
+@pytest.mark.asyncio
+async def test_promoted_group_overtakes_waiting_requests():
+    governor = RequestGovernor(max_in_flight=1)
+    admitted = []
+    release = asyncio.Event()
+    holder = asyncio.create_task(hold(governor, INTERACTIVE, admitted, release))
+    await asyncio.sleep(0)
+
+    group = RequestGroup(PREFETCH)
+
+    async def grouped():
+        request_group.set(group)
+        async with governor.slot():
+            admitted.append("grouped")
+
+    waiters = [asyncio.create_task(grouped())]
+    await asyncio.sleep(0)
+    waiters.append(asyncio.create_task(hold(governor, BULK, admitted, release)))
+    await asyncio.sleep(0)
+
+    governor.promote(group, INTERACTIVE)
+    governor.promote(group, PREFETCH)
+    assert group.priority == INTERACTIVE
+
+    release.set()
+    await asyncio.gather(holder, *waiters)
+    assert admitted == [INTERACTIVE, "grouped", BULK]
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_does_not_leak_a_slot():
+    governor = RequestGovernor(max_in_flight=1)
+    admitted = []
+    release = asyncio.Event()
+    holder = asyncio.create_task(hold(governor, INTERACTIVE, admitted, release))
+    await asyncio.sleep(0)
+    waiter = asyncio.create_task(hold(governor, BULK, admitted, release))
+    await asyncio.sleep(0)
+
+    waiter.cancel()
+    release.set()
+    await holder
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    assert governor.in_flight == 0
+    async with governor.slot():
+        assert governor.in_flight == 1
+
+
+@pytest.mark.asyncio
+async def test_requests_take_the_priority_of_their_tool_call():
+    governor = RequestGovernor(max_in_flight=4)
+    token = request_priority.set(BULK)
+    try:
+        async with governor.slot():
+            pass
+    finally:
+        request_priority.reset(token)
+    assert governor.stats()[BULK]["requests"] == 1
+    assert governor.stats()[INTERACTIVE]["requests"] == 0
+
+
+class FakeResponse:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return None
+
+
+class FakeSession:
+    def __init__(self, governor):
+        self.governor = governor
+        self.in_flight = []
+        self.closed = False
+
+    def get(self, url, **kwargs):
+        self.in_flight.append(self.governor.in_flight)
+        return FakeResponse()
+
+    async def close(self):
+        self.closed = True
+
+
+@pytest.mark.asyncio
+async def test_governed_session_holds_a_slot_per_request():
+    governor = RequestGovernor(max_in_flight=1)
+    raw = FakeSession(governor)
+    session = GovernedSession(raw, governor)
+
+    async with session.get("https://gitlab.example.com/api/v4/projects") as response:
+        assert isinstance(response, FakeResponse)
+        assert governor.in_flight == 1
+    assert governor.in_flight == 0
+    assert raw.in_flight == [1]
+
+    await session.close()
+    assert raw.closed
+
+
+@pytest.mark.asyncio
+async def test_instance_cap_is_taken_before_a_global_slot():
+    governor = RequestGovernor(max_in_flight=4)
+    governor.limit_instances(
+        [
+            {"gitlab_url": "https://a.example.com", "max_connections": 1},
+            {"gitlab_url": "https://b.example.com", "max_connections": None},
+        ]
+    )
+    release = asyncio.Event()
+    order = []
+
+    async def request(gitlab_url, name):
+        async with governor.slot(gitlab_url=gitlab_url):
+            order.append(name)
+            await release.wait()
+
+    tasks = [
+        asyncio.create_task(request("https://a.example.com", "a1")),
+        asyncio.create_task(request("https://a.example.com", "a2")),
+        asyncio.create_task(request("https://b.example.com", "b1")),
+    ]
+    await asyncio.sleep(0)
+    # The second request to a waits for a's only slot without taking a global one
+    assert order == ["a1", "b1"]
+    assert governor.in_flight == 2
+
+    release.set()
+    await asyncio.gather(*tasks)
+    assert order == ["a1", "b1", "a2"]
+    assert governor.in_flight == 0
+
+
+def test_from_env_falls_back_on_invalid_values(monkeypatch):
+    monkeypatch.setenv("GITLAB_MAX_CONCURRENT_REQUESTS", "0")
+    assert RequestGovernor.from_env().max_in_flight == 16
+    monkeypatch.setenv("GITLAB_MAX_CONCURRENT_REQUESTS", "4")
+    assert RequestGovernor.from_env().max_in_flight == 4
+
+
+@pytest.mark.asyncio
+async def test_request_budget_is_shared_by_a_call_and_its_tasks():
+    governor = RequestGovernor(max_in_flight=4)
+
+    async def request():
+        async with governor.slot():
+            pass
+
+    async def budgeted_call():
+        request_budget.set(RequestBudget(2))
+        await asyncio.gather(request(), request())
+        await request()
+
+    with pytest.raises(RequestBudgetExceeded):
+        await asyncio.create_task(budgeted_call())
+    assert request_budget.get() is None
+    assert governor.in_flight == 0
@@ -0,0 +1,106 @@
+"""Tests for the Streamable HTTP transport."""
+
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+
+import httpx
+import pytest
+
+from gitlab_mr_mcp.config import get_transport_config
+
+HEADERS = {"Accept": "application/json, text/event-stream", "Content-Type": "application/json"}
+
+INITIALIZE = {
+    "jsonrpc": "2.0",
+    "id": 1,
+    "method": "initialize",
+    "params": {"protocolVersion": "2025-03-26", "capabilities": {}, "clientInfo": {"name": "test", "version": "1.0"}},
+}
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def read_message(response):
+    """The JSON-RPC message of a JSON or single-event SSE response"""
+    if response.headers["content-type"].startswith("text/event-stream"):
+        data = [line[len("data:") :] for line in response.text.splitlines() if line.startswith("data:")]
+        return json.loads(data[0])
+    return response.json()
+
+
+@pytest.fixture
+def http_server():
+    port = free_port()
+    env = {
+        **os.environ,
+        "GITLAB_URL": "https://gitlab.example.com",
+        "GITLAB_ACCESS_TOKEN": "test-token",
+        "GITLAB_MCP_TRANSPORT": "http",
+        "GITLAB_MCP_PORT": str(port),
+        "GITLAB_MCP_MAX_SESSIONS": "1",
+    }
+    process = subprocess.Popen(
+        [sys.executable, "-m", "gitlab_mr_mcp"], env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    url = f"http://127.0.0.1:{port}/mcp"
+    try:
+        deadline = time.monotonic() + 15
+        while True:
+            try:
+                socket.create_connection(("127.0.0.1", port), timeout=1).close()
+                break
+            except OSError:
+                if time.monotonic() > deadline or process.poll() is not None:
+                    raise
+                time.sleep(0.1)
+        yield url
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+
+
+def test_transport_config_defaults(monkeypatch):
+    for name in ("GITLAB_MCP_TRANSPORT", "GITLAB_MCP_PORT", "GITLAB_MCP_MAX_SESSIONS"):
+        monkeypatch.delenv(name, raising=False)
+    config = get_transport_config()
+    assert config["transport"] == "stdio"
+    assert (config["host"], config["port"], config["path"]) == ("127.0.0.1", 8000, "/mcp")
+    assert config["max_sessions"] == 100
+
+
+@pytest.mark.parametrize(
+    "name, value", [("GITLAB_MCP_TRANSPORT", "sse"), ("GITLAB_MCP_PORT", "http"), ("GITLAB_MCP_MAX_SESSIONS", "0")]
+)
+def test_transport_config_rejects_invalid_values(monkeypatch, name, value):
+    monkeypatch.setenv(name, value)
+    with pytest.raises(ValueError, match=name):
+        get_transport_config()
+
+
+def test_http_sessions_share_one_server_up_to_the_limit(http_server):
+    with httpx.Client(timeout=10) as client:
+        response = client.post(http_server, json=INITIALIZE, headers=HEADERS)
+        assert response.status_code == 200
+        session_id = response.headers["mcp-session-id"]
+        assert read_message(response)["result"]["serverInfo"]["name"] == "gitlab-mcp-server"
+
+        session_headers = {**HEADERS, "mcp-session-id": session_id, "mcp-protocol-version": "2025-03-26"}
+        client.post(
+            http_server, json={"jsonrpc": "2.0", "method": "notifications/initialized"}, headers=session_headers
+        )
+        response = client.post(
+            http_server, json={"jsonrpc": "2.0", "id": 2, "method": "tools/list"}, headers=session_headers
+        )
+        tools = read_message(response)["result"]["tools"]
+        assert "get_merge_request_details" in [tool["name"] for tool in tools]
+
+        # GITLAB_MCP_MAX_SESSIONS=1: a second client is turned away while the first is open
+        assert client.post(http_server, json=INITIALIZE, headers=HEADERS).status_code >= 400
@@ -34,14 +34,18 @@ def test_tools_import():
     expected_tools = [
         "create_merge_request",
         "create_review_comment",
+        "fetch_more",
         "get_branch_merge_requests",
         "get_commit_discussions",
         "get_job_log",
         "get_merge_request_details",
+        "get_merge_requests_overview",
         "get_merge_request_pipeline",
+        "get_pipeline_failure_digest",
         "get_merge_request_reviews",
         "get_merge_request_test_report",
         "get_pipeline_test_summary",
+        "grep_job_log",
         "list_merge_requests",
         "list_project_labels",
         "list_project_members",
@@ -0,0 +1,146 @@
+import pytest
+
+from gitlab_mr_mcp.log_analysis import FailureScanner, TraceGrep, compile_failure_patterns, configured_patterns
+
+
+def scan(text, chunk_size=None, **kwargs):
+    scanner = FailureScanner(**kwargs)
+    chunk_size = chunk_size or len(text) or 1
+    for index in range(0, len(text), chunk_size):
+        scanner.feed(text[index : index + chunk_size])
+    return scanner, scanner.close()
+
+
+@pytest.mark.parametrize(
+    "line, pattern",
+    [
+        ("Traceback (most recent call last):", "traceback"),
+        ("2024-01-01 12:00:00 ERROR database unavailable", "error"),
+        ("FAILED tests/test_api.py::test_login - AssertionError", "failed"),
+        ("src/main.c:12:5: error: expected ';'", "compiler"),
+        ("ERROR: Job failed: exit code 137", "error"),
+        ("Process exited with code 2", "exit_code"),
+        ("/bin/bash: line 1:   42 Killed", "oom"),
+        ("panic: runtime error: index out of range", "crash"),
+    ],
+)
+def test_default_patterns(line, pattern):
+    _, windows = scan(f"before\n{line}\nafter\n")
+
+    assert [signature["pattern"] for signature in windows[0]["signatures"]] == [pattern]
+
+
+def test_repeated_errors_are_deduplicated_with_count():
+    text = "".join(f"worker {index}: ERROR timeout after {index}s\n" + "ok\n" * 10 for index in range(5))
+    scanner, windows = scan(text, chunk_size=16)
+
+    assert len(windows) == 1
+    assert windows[0]["signatures"][0]["count"] == 5
+    assert scanner.line_count == 55
+
+
+def test_context_window_spans_chunks():
+    text = "".join(f"line {index}\n" for index in range(1, 101)).replace("line 50\n", "FAILED test_x\n")
+    _, windows = scan(text, chunk_size=5, context_lines=2)
+
+    assert windows[0]["first_line"] == 48
+    assert windows[0]["lines"] == ["line 48", "line 49", "FAILED test_x", "line 51", "line 52"]
+
+
+def test_nearby_hits_share_a_window():
+    _, windows = scan("a\nERROR one\nb\nFAILED two\nc\nd\ne\nf\n", context_lines=2)
+
+    assert len(windows) == 1
+    assert [signature["pattern"] for signature in windows[0]["signatures"]] == ["error", "failed"]
+    assert windows[0]["lines"] == ["a", "ERROR one", "b", "FAILED two", "c", "d"]
+
+
+def test_traceback_keeps_longer_context():
+    frames = "".join(f'  File "app.py", line {index}, in f\n' for index in range(6))
+    _, windows = scan(f"Traceback (most recent call last):\n{frames}ValueError: bad value\nnext\n")
+
+    assert "ValueError: bad value" in windows[0]["lines"]
+
+
+def test_signature_limit_counts_dropped_hits():
+    scanner, windows = scan("".join(f"ERROR kind {chr(97 + index)}\n" for index in range(5)), max_signatures=2)
+
+    assert len(scanner.signatures) == 2
+    assert scanner.dropped_hits == 3
+
+
+def test_extra_patterns(monkeypatch):
+    monkeypatch.setenv("GITLAB_LOG_PATTERNS", '["deadlock detected"]')
+    _, windows = scan("query\ndeadlock detected on table x\n", extra_patterns=configured_patterns())
+
+    assert windows[0]["signatures"][0]["pattern"] == "custom_0"
+
+
+def test_extra_patterns_with_inline_flags_and_backreferences():
+    _, windows = scan("ok\nFatal: disk full\nabab\n", extra_patterns=["(?i)^fatal:", r"^(ab)\1$"])
+
+    assert [signature["pattern"] for signature in windows[0]["signatures"]] == ["custom_0", "custom_1"]
+
+
+def test_invalid_patterns_raise_value_error(monkeypatch):
+    with pytest.raises(ValueError):
+        compile_failure_patterns(["(unclosed"])
+
+    monkeypatch.setenv("GITLAB_LOG_PATTERNS", "not json")
+    with pytest.raises(ValueError):
+        configured_patterns()
+
+
+def test_lines_changing_length_when_lowercased_are_scanned():
+    # "İ" lowercases to two characters, so trigger offsets cannot be reused on the original text
+    scanner, windows = scan("İstanbul\nok\nERROR here\nok\n")
+
+    assert windows[0]["first_line"] == 1
+    assert windows[0]["signatures"][0]["line_number"] == 3
+    assert scanner.line_count == 4
+
+
+def grep(data, pattern, chunk_size=5, **options):
+    searcher = TraceGrep(pattern, **options)
+    for start in range(0, len(data), chunk_size):
+        searcher.feed(data[start : start + chunk_size])
+    return searcher, searcher.close()
+
+
+def test_grep_returns_regions_with_byte_offsets():
+    data = b"".join(f"line {index}\n".encode() for index in range(1, 31)).replace(b"line 20", b"\x1b[31mboom\x1b[0m")
+    searcher, regions = grep(data, r"^boom$", before=1, after=1)
+
+    assert searcher.match_count == 1
+    lines = regions[0]["lines"]
+    assert [(number, text, matched) for number, _, text, matched in lines] == [
+        (19, "line 19", False),
+        (20, "boom", True),
+        (21, "line 21", False),
+    ]
+    for _, offset, _, _ in lines:
+        assert data[offset - 1 : offset] == b"\n"
+    assert data[lines[1][1] :].startswith(b"\x1b[31mboom")
+
+
+def test_grep_merges_nearby_matches_and_stops_at_limit():
+    data = b"a\nerr 1\nb\nerr 2\nc\nd\ne\nerr 3\nf\n"
+    searcher, regions = grep(data, "ERR", ignore_case=True, before=0, after=2, max_matches=2)
+
+    assert searcher.match_count == 2
+    assert len(regions) == 1
+    assert [text for _, _, text, _ in regions[0]["lines"]] == ["err 1", "b", "err 2", "c", "d"]
+    assert searcher.done
+    assert searcher.limit_reached
+
+
+def test_grep_limit_needs_a_further_match():
+    searcher, _ = grep(b"err 1\nok\nerr 2\nok\n", "err", before=0, after=0, max_matches=2)
+
+    assert searcher.match_count == 2
+    assert not searcher.limit_reached
+
+
+def test_grep_invalid_pattern():
+    with pytest.raises(ValueError):
+        TraceGrep("(")
@@ -0,0 +1,176 @@
+import pytest
+
+from gitlab_mr_mcp.log_stream import (
+    CompactTail,
+    LineCompactor,
+    LogStream,
+    RingBuffer,
+    SectionIndex,
+    clean_trace_text,
+    compact_trace_text,
+    find_section,
+    section_at_line,
+)
+
+
+def test_ring_buffer_keeps_most_recent_bytes():
+    buffer = RingBuffer(5)
+    buffer.write(b"abc")
+    assert buffer.getvalue() == b"abc"
+
+    buffer.write(b"defg")
+    assert buffer.getvalue() == b"cdefg"
+
+    buffer.write(b"h")
+    assert buffer.getvalue() == b"defgh"
+    assert len(buffer) == 5
+
+
+def test_ring_buffer_write_larger_than_capacity():
+    buffer = RingBuffer(4)
+    buffer.write(b"ab")
+    buffer.write(b"0123456789")
+
+    assert buffer.getvalue() == b"6789"
+
+
+def test_ring_buffer_rejects_empty_capacity():
+    with pytest.raises(ValueError):
+        RingBuffer(0)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 64])
+def test_log_stream_counts_and_keeps_tail(chunk_size):
+    body = b"first\nsecond\nthird line without newline"
+    stream = LogStream(tail_bytes=10)
+    for index in range(0, len(body), chunk_size):
+        stream.feed(body[index : index + chunk_size])
+
+    assert stream.byte_count == len(body)
+    assert stream.line_count == 3
+    assert stream.tail == body[-10:]
+    assert stream.tail_start == len(body) - 10
+
+
+def test_log_stream_unbounded_keeps_everything():
+    stream = LogStream()
+    stream.feed(b"a\n")
+    stream.feed(b"b\n")
+
+    assert stream.tail == b"a\nb\n"
+    assert stream.tail_start == 0
+    assert stream.line_count == 2
+
+
+TRACE = (
+    b"\x1b[0KRunning with gitlab-runner 16.0\n"
+    b"\x1b[0Ksection_start:1700000000:prepare_script\r\x1b[0K\x1b[36;1mPreparing environment\x1b[0;m\n"
+    b"Running on runner-1\n"
+    b"\x1b[0Ksection_end:1700000002:prepare_script\r\x1b[0K\n"
+    b"\x1b[0Ksection_start:1700000002:step_script[collapsed=false]\r\x1b[0K\x1b[32;1m$ pytest\x1b[0;m\n"
+    b"Downloading  10%\rDownloading  50%\rDownloading 100%\n"
+    b"\x1b[0Ksection_start:1700000010:cleanup\r\x1b[0Kcleanup\n"
+    b"\x1b[31;1mERROR: tests failed\x1b[0;m\n"
+    b"\x1b[0Ksection_end:1700000011:cleanup\r\x1b[0K\n"
+    b"\x1b[0Ksection_end:1700000095:step_script\r\x1b[0K\n"
+)
+
+
+def test_clean_trace_text_strips_ansi_and_overwritten_text():
+    text = clean_trace_text(TRACE.decode())
+
+    assert "\x1b" not in text
+    assert "\r" not in text.replace("\r\n", "\n")
+    assert "Preparing environment\n" in text
+    assert "\nDownloading 100%\n" in text
+    assert text.count("\n") == TRACE.count(b"\n")
+
+
+def test_clean_trace_text_keeps_crlf_line_endings():
+    assert clean_trace_text("one\r\ntwo\r\n") == "one\r\ntwo\r\n"
+
+
+def test_compact_trace_text_collapses_runs_of_similar_lines():
+    progress = "".join(f"Downloading layer {i}/120 ({i * 3} MB)\n" for i in range(1, 121))
+    text = "Pulling image\n" + progress + "WARN retry\n" * 5 + "x\nx\nx\nDone"
+
+    compacted, collapsed = compact_trace_text(text)
+
+    assert compacted == (
+        "Pulling image\n"
+        "Downloading layer 1/120 (3 MB)\n… 118 similar lines …\nDownloading layer 120/120 (360 MB)\n"
+        "WARN retry\n… 3 similar lines …\nWARN retry\n"
+        "x\nx\nx\nDone"
+    )
+    assert collapsed == 121
+
+
+@pytest.mark.parametrize("chunk_size", [1, 5, 4096])
+def test_line_compactor_chunked_matches_whole_text(chunk_size):
+    text = clean_trace_text(TRACE.decode()) + "step 1\n" * 10
+    compactor = LineCompactor()
+    compacted = "".join(compactor.feed(text[i : i + chunk_size]) for i in range(0, len(text), chunk_size))
+
+    assert compacted + compactor.close() == compact_trace_text(text)[0]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 5, 4096])
+def test_compact_tail_unbounded_matches_whole_text(chunk_size):
+    text = TRACE.decode() + "step 1\n" * 10
+    tail = CompactTail(len(text))
+    for i in range(0, len(text), chunk_size):
+        tail.feed(text[i : i + chunk_size])
+
+    assert tail.close() == compact_trace_text(clean_trace_text(text))[0]
+    assert tail.start == 0
+
+
+def test_compact_tail_cuts_after_compacting():
+    text = "build\n" + "".join(f"progress {i}%\n" for i in range(1000)) + "error: boom\n"
+    tail = CompactTail(70)
+    tail.feed(text)
+
+    assert tail.close() == "build\nprogress 0%\n… 998 similar lines …\nprogress 999%\nerror: boom\n"
+    assert tail.start == 0
+    assert tail.collapsed_lines == 998
+
+
+def test_compact_tail_start_is_offset_of_first_kept_line():
+    text = "é\n" * 3 + "first\n" + "last\n"
+    tail = CompactTail(11, offset=100)
+    tail.feed(text)
+
+    assert tail.close() == "first\nlast\n"
+    assert tail.start == 100 + len("é\n".encode()) * 3
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 4096])
+def test_section_index(chunk_size):
+    index = SectionIndex()
+    for start in range(0, len(TRACE), chunk_size):
+        index.feed(TRACE[start : start + chunk_size])
+    sections = index.close()
+
+    assert [(s["name"], s["depth"], s["duration"]) for s in sections] == [
+        ("prepare_script", 0, 2),
+        ("step_script", 0, 93),
+        ("cleanup", 1, 1),
+    ]
+    step = find_section(sections, "step_script")
+    assert TRACE[step["start"] : step["end"]].startswith(b"\x1b[0Ksection_start:1700000002:step_script")
+    assert TRACE[step["start"] : step["end"]].endswith(b"section_end:1700000095:step_script\r\x1b[0K\n")
+    assert (step["start_line"], step["end_line"]) == (5, 10)
+    assert index.complete
+    assert section_at_line(sections, 8)["name"] == "cleanup"
+    assert section_at_line(sections, 6)["name"] == "step_script"
+    assert section_at_line(sections, 1) is None
+
+
+def test_section_index_open_section():
+    index = SectionIndex()
+    index.feed(b"section_start:1700000000:step_script\r\x1b[0K\nrunning\n")
+    sections = index.close()
+
+    assert sections[0]["end"] is None
+    assert sections[0]["duration"] is None
+    assert not index.complete
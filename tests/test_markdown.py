@@ -0,0 +1,64 @@
+from gitlab_mr_mcp.markdown import MarkdownBuilder, configured_output_budget
+
+
+def test_markdown_builder_helpers():
+    result = MarkdownBuilder("intro\n")
+    result.heading("Title")
+    result.heading("Section", level=2)
+    result.field("Status", "ok")
+    result.bullet("item")
+    result.bullet("nested", indent=1)
+    result.code_block("x = 1", language="python")
+    result.line()
+    result.line("done")
+
+    assert result.build() == (
+        "intro\n# Title\n\n## Section\n\n**Status**: ok\n- item\n  - nested\n```python\nx = 1\n```\n\ndone\n"
+    )
+
+
+def test_markdown_builder_appends_with_plus_equals():
+    result = MarkdownBuilder()
+    assert not result
+
+    for i in range(3):
+        result += f"{i}|"
+
+    assert result
+    assert str(result) == "0|1|2|"
+
+
+def test_add_items_stops_at_budget():
+    result = MarkdownBuilder("head\n")
+    rendered = []
+
+    def render(item):
+        rendered.append(item)
+        return f"item {item}\n"
+
+    left_out = result.add_items(range(10), render, budget=40, reserve=10)
+    result.omitted(len(left_out), "items")
+
+    assert left_out == [3, 4, 5, 6, 7, 8, 9]
+    # Rendering stops at the first item that does not fit
+    assert rendered == [0, 1, 2, 3]
+    assert result.build().endswith("item 2\n*7 more items omitted (output budget reached).*\n\n")
+
+
+def test_add_items_without_budget_renders_everything():
+    result = MarkdownBuilder()
+
+    assert result.add_items(["a", "b"], str.upper, budget=None) == []
+    assert result.omitted(0, "items").build() == "AB"
+    assert len(result) == 2
+
+
+def test_configured_output_budget(monkeypatch):
+    monkeypatch.delenv("GITLAB_OUTPUT_TOKEN_BUDGET", raising=False)
+    assert configured_output_budget() == 12000 * 4
+
+    monkeypatch.setenv("GITLAB_OUTPUT_TOKEN_BUDGET", "0")
+    assert configured_output_budget() is None
+
+    monkeypatch.setenv("GITLAB_OUTPUT_TOKEN_BUDGET", "lots")
+    assert configured_output_budget() == 12000 * 4
@@ -5,6 +5,30 @@ import os
 import subprocess
 
 
+def exchange(requests, env):
+    """Send newline-separated messages to a server over stdio and return one response line per request.
+
+    Stdin stays open until every request is answered, as the server cancels the
+    requests still in flight when its input ends.
+    """
+    process = subprocess.Popen(
+        ["gitlab-mcp"],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        env=env,
+        text=True,
+    )
+    try:
+        process.stdin.write(requests + "\n")
+        process.stdin.flush()
+        expected = sum(1 for message in requests.splitlines() if "id" in json.loads(message))
+        return [process.stdout.readline().strip() for _ in range(expected)]
+    finally:
+        process.stdin.close()
+        process.wait(timeout=10)
+
+
 def test_mcp_initialize_response():
     """Test that server responds correctly to MCP initialize request."""
     # Set required env vars
@@ -74,17 +98,9 @@ def test_mcp_list_tools_response():
         + json.dumps({"jsonrpc": "2.0", "id": 2, "method": "tools/list", "params": {}})
     )
 
-    result = subprocess.run(
-        ["gitlab-mcp"],
-        input=requests,
-        capture_output=True,
-        text=True,
-        env=env,
-        timeout=10,
-    )
+    lines = exchange(requests, env)
 
     # Parse the second response (tools/list)
-    lines = result.stdout.strip().split("\n")
     assert len(lines) >= 2
 
     tools_response = json.loads(lines[1])
@@ -137,16 +153,8 @@ def test_mcp_tool_has_schema():
         + json.dumps({"jsonrpc": "2.0", "id": 2, "method": "tools/list", "params": {}})
     )
 
-    result = subprocess.run(
-        ["gitlab-mcp"],
-        input=requests,
-        capture_output=True,
-        text=True,
-        env=env,
-        timeout=10,
-    )
+    lines = exchange(requests, env)
 
-    lines = result.stdout.strip().split("\n")
     tools_response = json.loads(lines[1])
     tools = tools_response["result"]["tools"]
 
@@ -0,0 +1,354 @@
+"""Structured output of every read tool validated against its declared output schema."""
+
+import contextlib
+import copy
+import importlib
+import json
+import re
+
+import jsonschema
+import pytest
+
+from gitlab_mr_mcp import gitlab_api
+from gitlab_mr_mcp.result_store import result_store
+from gitlab_mr_mcp.tool_specs import registry
+from gitlab_mr_mcp.trace_store import TraceStore
+
+job_log_module = importlib.import_module("gitlab_mr_mcp.tools.get_job_log")
+
+GITLAB_URL = "https://gitlab.example.com"
+
+CONFIG = {
+    "instances": [
+        {
+            "name": "default",
+            "gitlab_url": GITLAB_URL,
+            "access_token": "test-token",
+            "project_id": "123",
+            "path_prefixes": [],
+            "max_connections": None,
+        }
+    ]
+}
+
+USER = {"id": 1, "username": "alice", "name": "Alice"}
+
+PROJECT = {
+    "id": 123,
+    "name": "api",
+    "path_with_namespace": "group/api",
+    "description": "The API",
+    "visibility": "private",
+    "default_branch": "main",
+    "web_url": f"{GITLAB_URL}/group/api",
+    "open_issues_count": 3,
+}
+
+PIPELINE = {
+    "id": 100,
+    "status": "failed",
+    "sha": "abcdef1234567890",
+    "ref": "feature",
+    "source": "merge_request_event",
+    "created_at": "2024-01-15T10:00:00Z",
+    "duration": 120,
+    "coverage": "81.5",
+    "web_url": f"{GITLAB_URL}/group/api/-/pipelines/100",
+}
+
+MERGE_REQUEST = {
+    "iid": 42,
+    "title": "Add feature",
+    "description": "Adds a feature",
+    "state": "opened",
+    "draft": False,
+    "author": USER,
+    "assignees": [USER],
+    "reviewers": [USER],
+    "source_branch": "feature",
+    "target_branch": "main",
+    "created_at": "2024-01-15T10:00:00Z",
+    "updated_at": "2024-01-16T10:00:00Z",
+    "labels": ["bug"],
+    "has_conflicts": False,
+    "merge_status": "can_be_merged",
+    "head_pipeline": PIPELINE,
+    "web_url": f"{GITLAB_URL}/group/api/-/merge_requests/42",
+}
+
+NOTE = {
+    "id": 501,
+    "body": "Please rename this",
+    "author": USER,
+    "created_at": "2024-01-15T11:00:00Z",
+    "system": False,
+    "position": {"new_path": "app.py", "new_line": 10, "head_sha": "abcdef1234567890"},
+}
+
+DISCUSSIONS = [{"id": "d1", "resolved": False, "notes": [NOTE]}]
+
+COMMITS = [
+    {
+        "id": "abcdef1234567890",
+        "short_id": "abcdef12",
+        "title": "Add feature",
+        "author_name": "Alice",
+        "committed_date": "2024-01-15T09:00:00Z",
+    }
+]
+
+COMMIT_COMMENTS = [{"note": "Nice", "author": USER, "path": "app.py", "line": 3, "created_at": "2024-01-15T12:00:00Z"}]
+
+JOBS = [
+    {"id": 7, "name": "unit", "stage": "test", "status": "failed", "duration": 30.5},
+    {"id": 8, "name": "lint", "stage": "test", "status": "success", "duration": 5.0},
+]
+
+BRIDGES = [{"name": "child", "status": "failed", "downstream_pipeline": {"id": 200, "project_id": 123}}]
+
+TEST_REPORT = {
+    "total_time": 1.5,
+    "total_count": 3,
+    "success_count": 1,
+    "failed_count": 1,
+    "skipped_count": 1,
+    "error_count": 0,
+    "test_suites": [
+        {
+            "name": "unit",
+            "total_time": 1.5,
+            "total_count": 3,
+            "success_count": 1,
+            "failed_count": 1,
+            "skipped_count": 1,
+            "error_count": 0,
+            "test_cases": [
+                {
+                    "name": "test_login",
+                    "status": "failed",
+                    "classname": "tests.test_auth",
+                    "file": "tests/test_auth.py",
+                    "execution_time": 0.5,
+                    "system_output": "AssertionError",
+                },
+                {"name": "test_logout", "status": "skipped"},
+            ],
+        }
+    ],
+}
+
+TEST_SUMMARY = {
+    "total": {"time": 1.5, "count": 3, "success": 1, "failed": 1, "skipped": 1, "error": 0},
+    "test_suites": TEST_REPORT["test_suites"],
+}
+
+TRACE = (
+    b"\x1b[0Ksection_start:1700000000:prepare\r\x1b[0KPreparing\n"
+    b"\x1b[0Ksection_end:1700000005:prepare\r\x1b[0K\n"
+    b"\x1b[0Ksection_start:1700000005:step_script\r\x1b[0K$ pytest\n"
+    b"collected 3 items\n"
+    b"FAILED tests/test_auth.py::test_login - AssertionError\n"
+    b"ERROR: Job failed: exit code 1\n"
+    b"\x1b[0Ksection_end:1700000010:step_script\r\x1b[0K\n"
+)
+
+MEMBERS = [{"id": 1, "username": "alice", "name": "Alice", "state": "active", "access_level": 40}]
+
+LABELS = [{"id": 1, "name": "bug", "color": "#ff0000", "description": "Broken", "is_project_label": True}]
+
+# Fields GitLab leaves out on older instances, other editions or some payloads
+OPTIONAL_FIELDS = {
+    "description",
+    "visibility",
+    "default_branch",
+    "open_issues_count",
+    "draft",
+    "labels",
+    "has_conflicts",
+    "assignees",
+    "reviewers",
+    "created_at",
+    "updated_at",
+    "head_pipeline",
+    "position",
+    "resolved",
+    "sha",
+    "ref",
+    "source",
+    "coverage",
+    "duration",
+    "stage",
+    "classname",
+    "file",
+    "execution_time",
+    "system_output",
+    "total_time",
+    "state",
+    "color",
+    "is_project_label",
+    "approvals_required",
+    "approvals_left",
+    "path",
+    "line",
+}
+
+
+def without_optional_fields(data, keep=("state",)):
+    """A copy of data with the optional fields removed at every level, except where GitLab always sends them"""
+    if isinstance(data, dict):
+        return {
+            key: without_optional_fields(value)
+            for key, value in data.items()
+            if key not in OPTIONAL_FIELDS or (key in keep and "iid" in data)
+        }
+    if isinstance(data, list):
+        return [without_optional_fields(item) for item in data]
+    return data
+
+
+def gitlab_routes(sparse):
+    """(method, path regex, status, body) of the fake GitLab API; bytes bodies are streamed as is"""
+    project = "/api/v4/projects/123"
+    routes = [
+        ("get", r"/api/v4/projects", 200, [PROJECT]),
+        ("get", rf"{project}/merge_requests", 200, [MERGE_REQUEST]),
+        ("get", rf"{project}/merge_requests/42", 200, MERGE_REQUEST),
+        ("get", rf"{project}/merge_requests/42/pipelines", 200, [PIPELINE]),
+        ("get", rf"{project}/merge_requests/42/changes", 200, {"changes": [{"diff": "+a\n-b\n"}]}),
+        ("get", rf"{project}/merge_requests/42/discussions", 200, DISCUSSIONS),
+        ("get", rf"{project}/merge_requests/42/approvals", 200, {"approved_by": [{"user": USER}], "approvals_left": 1}),
+        ("get", rf"{project}/merge_requests/42/commits", 200, COMMITS),
+        ("get", rf"{project}/repository/commits/\w+/comments", 200, COMMIT_COMMENTS),
+        ("get", rf"{project}/pipelines/100/jobs", 200, JOBS),
+        ("get", rf"{project}/pipelines/100/bridges", 200, BRIDGES),
+        ("get", rf"{project}/pipelines/200/jobs", 403, {"message": "403 Forbidden"}),
+        ("get", rf"{project}/pipelines/200/bridges", 403, {"message": "403 Forbidden"}),
+        ("get", rf"{project}/pipelines/100/test_report", 200, json.dumps(TEST_REPORT).encode()),
+        ("get", rf"{project}/pipelines/100/test_report_summary", 200, TEST_SUMMARY),
+        ("get", rf"{project}/jobs/\d+", 200, {"id": 7, "status": "failed"}),
+        ("get", rf"{project}/jobs/\d+/trace", 200, b"ok\n" if sparse else TRACE),
+        ("get", rf"{project}/members/all", 200, MEMBERS),
+        ("get", rf"{project}/labels", 200, LABELS),
+    ]
+    if sparse:
+        routes = [(method, path, status, without_optional_fields(body)) for method, path, status, body in routes]
+    return routes
+
+
+class FakeContent:
+    def __init__(self, data):
+        self._data = data
+
+    async def iter_chunked(self, size):
+        for index in range(0, len(self._data), size):
+            yield self._data[index : index + size]
+
+
+class FakeResponse:
+    def __init__(self, status, body):
+        self.status = status
+        self._body = body if isinstance(body, bytes) else json.dumps(body).encode()
+        self.headers = {}
+        self.content_type = "application/octet-stream" if isinstance(body, bytes) else "application/json"
+        self.content_length = len(self._body)
+        self.content = FakeContent(self._body)
+
+    async def json(self):
+        return json.loads(self._body)
+
+    async def text(self):
+        return self._body.decode()
+
+    async def read(self):
+        return self._body
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return None
+
+
+class FakeGitLab:
+    """Session answering each request from the first route whose path matches the URL"""
+
+    def __init__(self, routes):
+        self.routes = routes
+
+    def request(self, method, url, **kwargs):
+        path = url.removeprefix(GITLAB_URL)
+        for route_method, pattern, status, body in self.routes:
+            if route_method == method and re.fullmatch(pattern, path):
+                return FakeResponse(status, copy.deepcopy(body))
+        return FakeResponse(404, {"message": "404 Not Found"})
+
+    def get(self, url, **kwargs):
+        return self.request("get", url, **kwargs)
+
+
+@pytest.fixture(params=["full", "sparse"])
+def fake_gitlab(request, monkeypatch):
+    session = FakeGitLab(gitlab_routes(sparse=request.param == "sparse"))
+
+    @contextlib.asynccontextmanager
+    async def get_session(gitlab_url=None):
+        yield session
+
+    monkeypatch.setattr(gitlab_api, "get_session", get_session)
+    monkeypatch.setattr(gitlab_api, "trace_store", TraceStore(max_bytes=0))
+    monkeypatch.delenv("GITLAB_OUTPUT_FORMAT", raising=False)
+    gitlab_api._job_graph_cache.clear()
+    gitlab_api._section_index_cache.clear()
+    job_log_module._follow_offsets.clear()
+    return session
+
+
+CALLS = [
+    ("search_projects", {"search": "api"}),
+    ("list_my_projects", {}),
+    ("list_merge_requests", {}),
+    ("get_merge_request_reviews", {"merge_request_iid": 42}),
+    ("get_merge_request_details", {"merge_request_iid": 42}),
+    ("get_merge_requests_overview", {"merge_request_iids": ["42", "group/other!7"]}),
+    ("get_merge_request_pipeline", {"merge_request_iid": 42}),
+    ("get_pipeline_failure_digest", {"merge_request_iid": 42}),
+    ("get_merge_request_test_report", {"merge_request_iid": 42}),
+    ("get_pipeline_test_summary", {"merge_request_iid": 42}),
+    ("get_job_log", {"job_id": 7}),
+    ("get_job_log", {"job_id": 7, "mode": "errors"}),
+    ("get_job_log", {"job_id": 7, "section": "step_script"}),
+    ("get_job_log", {"job_id": 7, "section": "missing"}),
+    ("get_job_log", {"job_id": 7, "mode": "follow"}),
+    ("grep_job_log", {"job_id": 7, "pattern": "error", "ignore_case": True}),
+    ("get_branch_merge_requests", {"branch_name": "feature"}),
+    ("get_commit_discussions", {"merge_request_iid": 42, "commit_shas": ["abcdef1", "1234567"]}),
+    ("list_project_members", {}),
+    ("list_project_labels", {}),
+]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("name, arguments", CALLS, ids=[f"{name}-{index}" for index, (name, _) in enumerate(CALLS)])
+async def test_structured_output_matches_schema(fake_gitlab, name, arguments):
+    spec = registry[name]
+
+    result = await spec.call(CONFIG, {**arguments, "output_format": "json"})
+
+    assert isinstance(result, dict)
+    jsonschema.validate(result, spec.output_schema)
+
+
+@pytest.mark.asyncio
+async def test_fetch_more_output_matches_schema():
+    cursor = result_store.add(["first part\n", "second part\n"], "lines")
+    try:
+        result = await registry["fetch_more"].call(CONFIG, {"cursor": cursor, "output_format": "json"})
+    finally:
+        result_store.clear()
+
+    jsonschema.validate(result, registry["fetch_more"].output_schema)
+
+
+def test_every_read_tool_is_covered():
+    covered = {name for name, _ in CALLS} | {"fetch_more"}
+    assert covered == {spec.name for spec in registry if spec.read_only}
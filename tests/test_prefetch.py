@@ -0,0 +1,224 @@
+"""Tests for the speculative prefetch engine and its rules."""
+
+import asyncio
+
+import pytest
+
+from gitlab_mr_mcp import prefetch_rules
+from gitlab_mr_mcp.governor import INTERACTIVE, PREFETCH, request_group, request_priority
+from gitlab_mr_mcp.prefetch import PrefetchEngine, SessionPrefetchEngines
+from gitlab_mr_mcp.registry import ToolRegistry, ToolSpec
+
+INSTANCE = {
+    "name": "default",
+    "gitlab_url": "https://gitlab.example.com",
+    "access_token": "token",
+    "project_id": "123",
+    "path_prefixes": [],
+    "max_connections": None,
+}
+
+CONFIG = {"instances": [INSTANCE]}
+
+SCHEMA = {"type": "object", "properties": {"compact": {"type": "boolean", "default": True}}}
+
+
+class Tools:
+    """Tools recording their calls; ``details`` waits for ``release`` when it is set"""
+
+    def __init__(self):
+        self.calls = []
+        self.release = None
+        self.groups = []
+
+    async def listing(self, gitlab_url, project_id, access_token, args):
+        self.calls.append(("listing", args, request_priority.get()))
+        return ["listing"]
+
+    async def details(self, gitlab_url, project_id, access_token, args):
+        self.calls.append(("details", args, request_priority.get()))
+        self.groups.append(request_group.get())
+        if self.release is not None:
+            await self.release.wait()
+        return [f"details {args['iid']}"]
+
+    async def approve(self, gitlab_url, project_id, access_token, args):
+        self.calls.append(("approve", args, request_priority.get()))
+        return ["approved"]
+
+    def registry(self):
+        return ToolRegistry(
+            [
+                ToolSpec("listing", "Listing", "Listing", SCHEMA, self.listing),
+                ToolSpec("details", "Details", "Details", SCHEMA, self.details),
+                ToolSpec("approve", "Approve", "Approve", SCHEMA, self.approve, read_only=False),
+            ]
+        )
+
+
+async def predict_top_details(gitlab_url, project_id, access_token, args):
+    return [("details", {"iid": 1})]
+
+
+def make_engine(tools, max_requests=20):
+    return PrefetchEngine(tools.registry(), {"listing": predict_top_details}, max_requests)
+
+
+async def settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+@pytest.mark.asyncio
+async def test_predicted_call_is_answered_from_the_prefetch():
+    tools = Tools()
+    engine = make_engine(tools)
+
+    assert await engine.call(engine.tools["listing"], CONFIG, {}) == ["listing"]
+    await settle()
+    assert tools.calls[-1] == ("details", {"iid": 1}, PREFETCH)
+
+    assert await engine.call(engine.tools["details"], CONFIG, {"iid": 1, "project_id": "123"}) == ["details 1"]
+    assert len(tools.calls) == 2
+    assert engine.stats == {"prefetched": 1, "hits": 1, "cancelled": 0}
+
+    # Prefetched results answer a single call
+    await engine.call(engine.tools["details"], CONFIG, {"iid": 1})
+    assert tools.calls[-1] == ("details", {"iid": 1}, INTERACTIVE)
+
+
+@pytest.mark.asyncio
+async def test_arguments_at_their_default_match_omitted_ones():
+    tools = Tools()
+    engine = make_engine(tools)
+
+    await engine.call(engine.tools["listing"], CONFIG, {})
+    await settle()
+    assert await engine.call(engine.tools["details"], CONFIG, {"iid": 1, "compact": True}) == ["details 1"]
+    assert engine.stats["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_write_call_drops_prefetched_results():
+    tools = Tools()
+    engine = make_engine(tools)
+
+    await engine.call(engine.tools["listing"], CONFIG, {})
+    await settle()
+    assert len(engine.results) == 1
+
+    await engine.call(engine.tools["approve"], CONFIG, {"iid": 1})
+    assert len(engine.results) == 0
+    await engine.call(engine.tools["details"], CONFIG, {"iid": 1})
+    assert [name for name, _args, _priority in tools.calls] == ["listing", "details", "approve", "details"]
+    assert engine.stats["hits"] == 0
+
+
+@pytest.mark.asyncio
+async def test_foreground_call_takes_over_the_matching_prefetch_in_flight():
+    tools = Tools()
+    tools.release = asyncio.Event()
+    engine = make_engine(tools)
+
+    await engine.call(engine.tools["listing"], CONFIG, {})
+    await settle()
+    assert tools.groups[0].priority == PREFETCH
+    foreground = asyncio.create_task(engine.call(engine.tools["details"], CONFIG, {"iid": 1}))
+    await settle()
+    # The requests of the prefetch now queue at the priority of the call waiting for it
+    assert tools.groups[0].priority == INTERACTIVE
+    tools.release.set()
+
+    assert await foreground == ["details 1"]
+    assert [name for name, _args, _priority in tools.calls] == ["listing", "details"]
+    assert len(engine.results) == 0
+
+
+@pytest.mark.asyncio
+async def test_other_foreground_calls_cancel_the_speculation():
+    tools = Tools()
+    tools.release = asyncio.Event()
+    engine = make_engine(tools)
+
+    await engine.call(engine.tools["listing"], CONFIG, {})
+    await settle()
+    tools.release.set()
+    await engine.call(engine.tools["details"], CONFIG, {"iid": 2})
+    await settle()
+
+    assert engine.stats["cancelled"] == 1
+    assert len(engine.results) == 0
+
+
+class Session:
+    pass
+
+
+@pytest.mark.asyncio
+async def test_sessions_keep_their_prefetches_apart():
+    tools = Tools()
+    tools.release = asyncio.Event()
+    engines = SessionPrefetchEngines(tools.registry(), {"listing": predict_top_details})
+    first, second = Session(), Session()
+    first_engine = engines.for_session(first)
+    assert engines.for_session(first) is first_engine
+
+    await first_engine.call(first_engine.tools["listing"], CONFIG, {})
+    await settle()
+    # Another session's calls neither cancel the prefetch nor take it over
+    other = asyncio.create_task(engines.for_session(second).call(first_engine.tools["details"], CONFIG, {"iid": 1}))
+    await settle()
+    tools.release.set()
+    assert await other == ["details 1"]
+    await settle()
+
+    assert [priority for name, _args, priority in tools.calls if name == "details"] == [PREFETCH, INTERACTIVE]
+    assert len(first_engine.results) == 1
+    assert engines.stats == {"prefetched": 1, "hits": 0, "cancelled": 0}
+
+
+@pytest.mark.asyncio
+async def test_disabled_engine_does_not_prefetch():
+    tools = Tools()
+    engine = make_engine(tools, max_requests=0)
+
+    await engine.call(engine.tools["listing"], CONFIG, {})
+    await settle()
+    assert [name for name, _args, _priority in tools.calls] == ["listing"]
+
+
+@pytest.mark.asyncio
+async def test_failed_job_logs_rule(mocker):
+    mocker.patch.object(
+        prefetch_rules, "get_merge_request_pipeline", return_value=(200, {"id": 50, "status": "failed"}, "")
+    )
+    graph = {
+        "pipelines": [
+            {"project_id": "123", "jobs": [{"id": 1, "status": "success"}, {"id": 2, "status": "failed"}]},
+            {"project_id": 456, "jobs": [{"id": 3, "status": "failed"}]},
+        ]
+    }
+    get_graph = mocker.patch.object(prefetch_rules, "get_pipeline_job_graph", return_value=(200, graph, ""))
+
+    predictions = await prefetch_rules.failed_job_logs(
+        "https://gitlab.example.com", "123", "token", {"merge_request_iid": 7}
+    )
+
+    assert predictions == [
+        ("get_job_log", {"project_id": "123", "job_id": 2, "mode": "tail"}),
+        ("get_job_log", {"project_id": "456", "job_id": 3, "mode": "tail"}),
+    ]
+    assert get_graph.call_args.kwargs["max_depth"] == 2
+
+
+@pytest.mark.asyncio
+async def test_top_merge_request_details_rule(mocker):
+    get_merge_requests = mocker.patch.object(prefetch_rules, "get_merge_requests", return_value=(200, [{"iid": 9}], ""))
+
+    predictions = await prefetch_rules.top_merge_request_details(
+        "https://gitlab.example.com", "123", "token", {"state": "merged"}
+    )
+
+    assert predictions == [("get_merge_request_details", {"project_id": "123", "merge_request_iid": 9})]
+    assert get_merge_requests.call_args.args[3]["state"] == "merged"
+    assert get_merge_requests.call_args.args[3]["per_page"] == 1
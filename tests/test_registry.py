@@ -0,0 +1,135 @@
+"""Tests for the tool registry."""
+
+import pytest
+
+from gitlab_mr_mcp.governor import BULK, INTERACTIVE, PREFETCH, request_priority
+from gitlab_mr_mcp.registry import DEFAULT_PROJECT, INSTANCES, LOCAL, ToolRegistry, ToolSpec
+from gitlab_mr_mcp.tool_specs import registry
+
+DEFAULT_INSTANCE = {
+    "name": "default",
+    "gitlab_url": "https://gitlab.example.com",
+    "access_token": "token",
+    "project_id": "123",
+    "path_prefixes": [],
+    "max_connections": None,
+}
+
+OTHER_INSTANCE = {
+    "name": "internal",
+    "gitlab_url": "https://gitlab.internal.example.com",
+    "access_token": "internal-token",
+    "project_id": None,
+    "path_prefixes": ["platform/", "platform/infra/"],
+    "max_connections": 4,
+}
+
+CONFIG = {"instances": [DEFAULT_INSTANCE]}
+
+MULTI_CONFIG = {"instances": [DEFAULT_INSTANCE, OTHER_INSTANCE]}
+
+SCHEMA = {"type": "object", "properties": {"value": {"type": "string"}}}
+
+
+async def echo_project(gitlab_url, project_id, access_token, args):
+    return (gitlab_url, project_id, access_token, args)
+
+
+def make_spec(name="echo", handler=echo_project, **kwargs):
+    return ToolSpec(name=name, title="Echo", description="Echo", input_schema=SCHEMA, handler=handler, **kwargs)
+
+
+def test_registry_declares_every_tool_once():
+    names = [spec.name for spec in registry]
+    assert len(names) == len(set(names)) == len(registry)
+    assert "fetch_more" in registry
+    assert registry["merge_merge_request"].annotations == {"readOnlyHint": False, "destructiveHint": True}
+    assert not registry["fetch_more"].cacheable
+    assert registry["get_merge_request_details"].cacheable
+
+
+def test_definitions_are_built_once():
+    assert registry.definitions(False) is registry.definitions(False)
+    assert [tool.name for tool in registry.definitions(True)] == [spec.name for spec in registry]
+
+
+def test_read_only_specs_accept_output_format():
+    spec = make_spec()
+    assert "output_format" in spec.input_schema["properties"]
+    assert "output_format" not in SCHEMA["properties"]
+    assert "output_format" not in make_spec(read_only=False).input_schema["properties"]
+
+
+def test_register_rejects_duplicates():
+    tools = ToolRegistry([make_spec()])
+    with pytest.raises(ValueError):
+        tools.register(make_spec())
+
+
+@pytest.mark.asyncio
+async def test_call_passes_arguments_by_scope():
+    assert await make_spec().call(CONFIG, {"project_id": "g/p"}) == (
+        "https://gitlab.example.com",
+        "g/p",
+        "token",
+        {"project_id": "g/p"},
+    )
+    assert (await make_spec().call(CONFIG, {}))[1] == "123"
+    no_default_project = {"instances": [{**DEFAULT_INSTANCE, "project_id": None}]}
+    with pytest.raises(ValueError, match="project_id is required"):
+        await make_spec().call(no_default_project, {})
+
+    assert (await make_spec(scope=DEFAULT_PROJECT).call(no_default_project, {}))[1] is None
+
+    async def echo_instances(instances, args):
+        return ([instance["name"] for instance in instances], args)
+
+    assert await make_spec(handler=echo_instances, scope=INSTANCES).call(MULTI_CONFIG, {}) == (
+        ["default", "internal"],
+        {},
+    )
+    assert (await make_spec(handler=echo_instances, scope=INSTANCES).call(MULTI_CONFIG, {"instance": "internal"}))[
+        0
+    ] == ["internal"]
+
+    async def echo_local(args):
+        return args
+
+    assert await make_spec(handler=echo_local, scope=LOCAL).call(CONFIG, {"cursor": "c"}) == {"cursor": "c"}
+
+
+@pytest.mark.asyncio
+async def test_call_is_routed_to_an_instance():
+    spec = make_spec()
+    assert (await spec.call(MULTI_CONFIG, {"project_id": "platform/infra/tools"}))[:3] == (
+        "https://gitlab.internal.example.com",
+        "platform/infra/tools",
+        "internal-token",
+    )
+    assert (await spec.call(MULTI_CONFIG, {"project_id": "web/app"}))[0] == "https://gitlab.example.com"
+    assert (await spec.call(MULTI_CONFIG, {"project_id": "42", "instance": "internal"}))[0] == (
+        "https://gitlab.internal.example.com"
+    )
+    with pytest.raises(ValueError, match="Unknown instance 'missing'"):
+        await spec.call(MULTI_CONFIG, {"project_id": "42", "instance": "missing"})
+
+
+def test_instance_argument_is_declared_with_several_instances():
+    spec = make_spec()
+    assert "instance" not in spec.definition(False, CONFIG["instances"]).inputSchema["properties"]
+    instance_property = spec.definition(False, MULTI_CONFIG["instances"]).inputSchema["properties"]["instance"]
+    assert instance_property["enum"] == ["default", "internal"]
+    assert (
+        "instance" not in make_spec(scope=LOCAL).definition(False, MULTI_CONFIG["instances"]).inputSchema["properties"]
+    )
+
+
+@pytest.mark.asyncio
+async def test_call_sets_the_request_priority():
+    async def current_priority(gitlab_url, project_id, access_token, args):
+        return request_priority.get()
+
+    assert await make_spec(handler=current_priority).call(CONFIG, {}) == INTERACTIVE
+    assert await make_spec(handler=current_priority, priority=BULK).call(CONFIG, {}) == BULK
+    assert await make_spec(handler=current_priority).call(CONFIG, {}, priority=PREFETCH) == PREFETCH
+    assert request_priority.get() == INTERACTIVE
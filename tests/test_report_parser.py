@@ -0,0 +1,113 @@
+"""Test the streaming test report parser."""
+
+import asyncio
+import json
+import tracemalloc
+
+import pytest
+
+from gitlab_mr_mcp.report_parser import TestReportParser, parse_test_report_stream
+
+
+def build_report(suites=3, cases_per_suite=50, fail_every=10):
+    test_suites = []
+    for s in range(suites):
+        test_cases = []
+        for i in range(cases_per_suite):
+            status = "success"
+            if i % fail_every == 0:
+                status = "failed"
+            elif i % fail_every == 1:
+                status = "skipped"
+            test_cases.append(
+                {
+                    "status": status,
+                    "name": f"test_{s}_{i}",
+                    "classname": f"tests.Suite{s}",
+                    "execution_time": 0.5,
+                    "system_output": "AssertionError: ünïcode" if status == "failed" else None,
+                }
+            )
+        test_suites.append(
+            {"name": f"suite-{s}", "total_time": 1.5, "total_count": cases_per_suite, "test_cases": test_cases}
+        )
+    return {"total_time": 4.5, "total_count": suites * cases_per_suite, "failed_count": 15, "test_suites": test_suites}
+
+
+async def iter_chunks(data, size):
+    for start in range(0, len(data), size):
+        yield data[start : start + size]
+
+
+def parse(data, chunk_size):
+    return asyncio.run(parse_test_report_stream(iter_chunks(data, chunk_size)))
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 4096])
+def test_parser_keeps_only_non_passing_cases(chunk_size):
+    report = build_report()
+    data = json.dumps(report, indent=1).encode()
+
+    parsed = parse(data, chunk_size)
+
+    assert parsed["total_count"] == 150
+    assert parsed["failed_count"] == 15
+    for original, suite in zip(report["test_suites"], parsed["test_suites"]):
+        expected = [tc for tc in original["test_cases"] if tc["status"] != "success"]
+        assert suite["test_cases"] == expected
+        assert suite["name"] == original["name"]
+        assert suite["total_count"] == 50
+
+
+def test_parser_fills_missing_suite_counts():
+    parsed = parse(json.dumps(build_report(suites=1)).encode(), 64)
+    suite = parsed["test_suites"][0]
+
+    assert suite["failed_count"] == 5
+    assert suite["skipped_count"] == 5
+    assert suite["success_count"] == 40
+
+
+def test_parser_handles_empty_report():
+    parsed = parse(b'{"total_count": 0, "test_suites": []}', 3)
+
+    assert parsed == {"total_count": 0, "test_suites": []}
+
+
+def test_parser_rejects_truncated_report():
+    parser = TestReportParser()
+    parser.feed('{"total_count": 3, "test_suites": [{"name": "a", "test_cases": [')
+
+    with pytest.raises(ValueError):
+        parser.close()
+
+
+def test_parser_rejects_malformed_report():
+    parser = TestReportParser()
+
+    with pytest.raises(ValueError):
+        parser.feed('{"test_suites": [] "total_count": 1}')
+
+
+def test_parser_rejects_malformed_test_case_without_waiting_for_eof():
+    parser = TestReportParser()
+
+    # The stream is still open, so only malformed input can make this fail
+    with pytest.raises(ValueError):
+        parser.feed('{"test_suites": [{"name": "a", "test_cases": [{"status": "failed" "name": "x"}, ')
+
+
+def test_parser_peak_memory_is_far_below_json_loads():
+    data = json.dumps(build_report(suites=50, cases_per_suite=1000, fail_every=1000)).encode()
+
+    tracemalloc.start()
+    json.loads(data)
+    _, json_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    tracemalloc.start()
+    parse(data, 64 * 1024)
+    _, stream_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert stream_peak * 50 < json_peak
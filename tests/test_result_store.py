@@ -0,0 +1,65 @@
+"""Tests for the result store behind fetch_more."""
+
+import time
+
+import pytest
+
+from gitlab_mr_mcp.result_store import ResultStore
+
+
+def test_take_returns_chunks_within_budget():
+    store = ResultStore()
+    cursor = store.add(["aaaa", "bbbb", "cccc"], "items")
+
+    chunks, noun, next_cursor = store.take(cursor, budget=9)
+
+    assert (chunks, noun) == (["aaaa", "bbbb"], "items")
+    assert cursor not in store
+    assert store.remaining(next_cursor) == 1
+    assert store.take(next_cursor, budget=9) == (["cccc"], "items", None)
+    assert len(store) == 0
+    assert store.total_bytes == 0
+
+
+def test_take_always_makes_progress():
+    store = ResultStore()
+    cursor = store.add(["x" * 100, "y"], "items")
+
+    chunks, _noun, next_cursor = store.take(cursor, budget=10)
+
+    assert chunks == ["x" * 100]
+    assert store.remaining(next_cursor) == 1
+
+
+def test_unknown_and_expired_cursors(monkeypatch):
+    store = ResultStore(ttl=60)
+    cursor = store.add(["a"], "items")
+    assert store.take("missing", budget=None) is None
+
+    now = time.monotonic()
+    monkeypatch.setattr("gitlab_mr_mcp.result_store.time.monotonic", lambda: now + 61)
+
+    assert store.take(cursor, budget=None) is None
+    assert store.total_bytes == 0
+
+
+def test_store_is_bounded_by_size():
+    store = ResultStore(max_bytes=10)
+    first = store.add(["aaaaaa"], "items")
+    second = store.add(["bbbbbb"], "items")
+
+    assert first not in store
+    assert second in store
+    assert store.add(["c" * 11], "items") is None
+    assert ResultStore(max_bytes=0).add(["a"], "items") is None
+
+
+@pytest.mark.parametrize("max_mb, expected", [("1", 1024 * 1024), ("0", 0), ("lots", 32 * 1024 * 1024)])
+def test_from_env(monkeypatch, max_mb, expected):
+    monkeypatch.setenv("GITLAB_RESULT_STORE_MAX_MB", max_mb)
+    monkeypatch.setenv("GITLAB_RESULT_STORE_TTL", "60")
+
+    store = ResultStore.from_env()
+
+    assert store.max_bytes == expected
+    assert store.ttl == 60
@@ -0,0 +1,83 @@
+"""Tests for structured (JSON) tool output."""
+
+import importlib
+import json
+
+import jsonschema
+import pytest
+from mcp.shared.memory import create_connected_server_and_client_session
+
+from gitlab_mr_mcp.output_schemas import LIST_PROJECT_LABELS_OUTPUT_SCHEMA
+from gitlab_mr_mcp.server import GitLabMCPServer
+from gitlab_mr_mcp.structured import configured_output_format, dump_json, wants_json
+from gitlab_mr_mcp.tool_specs import registry
+
+labels_module = importlib.import_module("gitlab_mr_mcp.tools.list_project_labels")
+
+LABELS = [{"id": 1, "name": "bug", "color": "#ff0000", "description": None, "is_project_label": True}]
+
+
+@pytest.fixture
+def server(monkeypatch, mocker):
+    monkeypatch.setenv("GITLAB_ACCESS_TOKEN", "test-token")
+    monkeypatch.setenv("GITLAB_PROJECT_ID", "123")
+    mocker.patch.object(labels_module, "api_get_project_labels", return_value=(200, LABELS, ""))
+    return GitLabMCPServer().server
+
+
+def test_output_format_defaults_to_markdown(monkeypatch):
+    monkeypatch.delenv("GITLAB_OUTPUT_FORMAT", raising=False)
+    assert configured_output_format() == "markdown"
+    assert not wants_json({})
+    assert wants_json({"output_format": "json"})
+
+
+def test_output_format_from_env(monkeypatch):
+    monkeypatch.setenv("GITLAB_OUTPUT_FORMAT", "JSON")
+    assert wants_json({})
+    assert not wants_json({"output_format": "markdown"})
+
+    monkeypatch.setenv("GITLAB_OUTPUT_FORMAT", "yaml")
+    assert configured_output_format() == "markdown"
+
+
+def test_dump_json_is_compact():
+    assert dump_json({"a": [1, 2], "b": "é"}) == '{"a":[1,2],"b":"é"}'
+
+
+@pytest.mark.asyncio
+async def test_read_tools_accept_output_format(server, monkeypatch):
+    monkeypatch.delenv("GITLAB_OUTPUT_FORMAT", raising=False)
+    async with create_connected_server_and_client_session(server) as client:
+        tools = (await client.list_tools()).tools
+
+    for tool in tools:
+        if tool.annotations.readOnlyHint:
+            assert "output_format" in tool.inputSchema["properties"], tool.name
+            jsonschema.Draft202012Validator.check_schema(registry[tool.name].output_schema)
+        else:
+            assert "output_format" not in tool.inputSchema["properties"], tool.name
+        assert tool.outputSchema is None
+
+
+@pytest.mark.asyncio
+async def test_json_per_call(server, monkeypatch):
+    monkeypatch.delenv("GITLAB_OUTPUT_FORMAT", raising=False)
+    async with create_connected_server_and_client_session(server) as client:
+        result = await client.call_tool("list_project_labels", {"output_format": "json"})
+
+    assert not result.isError
+    assert result.structuredContent == {"labels": [{k: v for k, v in LABELS[0].items() if k != "id"}]}
+    assert json.loads(result.content[0].text) == result.structuredContent
+
+
+@pytest.mark.asyncio
+async def test_json_server_default_declares_output_schema(server, monkeypatch):
+    monkeypatch.setenv("GITLAB_OUTPUT_FORMAT", "json")
+    async with create_connected_server_and_client_session(server) as client:
+        tools = {tool.name: tool for tool in (await client.list_tools()).tools}
+        structured = await client.call_tool("list_project_labels", {})
+
+    assert tools["list_project_labels"].outputSchema == LIST_PROJECT_LABELS_OUTPUT_SCHEMA
+    assert tools["merge_merge_request"].outputSchema is None
+    assert structured.structuredContent["labels"][0]["name"] == "bug"
@@ -0,0 +1,77 @@
+import pytest
+
+from gitlab_mr_mcp.trace_store import TraceStore, iter_view
+
+
+async def chunks_of(*chunks):
+    for chunk in chunks:
+        yield chunk
+
+
+async def write(store, key, *chunks, read=None):
+    with store.writer(key) as writer:
+        async for _ in writer.tee(chunks_of(*chunks)):
+            if read is not None:
+                read -= 1
+                if read == 0:
+                    break
+
+
+@pytest.mark.asyncio
+async def test_stored_trace_is_read_through_mmap(tmp_path):
+    store = TraceStore(tmp_path, max_bytes=1024)
+    await write(store, "a", b"one\n", b"two\nthree")
+
+    assert "a" in store
+    assert store.line_count("a") == 3
+    with store.open("a") as view:
+        assert view[4:7] == b"two"
+        assert [chunk async for chunk in iter_view(view, 5)] == [b"one\nt", b"wo\nth", b"ree"]
+
+
+@pytest.mark.asyncio
+async def test_partially_read_trace_is_not_stored(tmp_path):
+    store = TraceStore(tmp_path, max_bytes=1024)
+    await write(store, "a", b"one\n", b"two\n", read=1)
+
+    assert "a" not in store
+    assert store.total_bytes == 0
+    assert not list(tmp_path.glob("*/*"))
+    with store.open("a") as view:
+        assert view is None
+
+
+@pytest.mark.asyncio
+async def test_least_recently_used_traces_are_evicted(tmp_path):
+    store = TraceStore(tmp_path, max_bytes=10)
+    await write(store, "a", b"aaaa")
+    await write(store, "b", b"bbbb")
+    with store.open("a"):
+        pass
+    await write(store, "c", b"cccc")
+
+    assert "a" in store and "c" in store
+    assert "b" not in store
+    assert store.total_bytes == 8
+    assert len(list(tmp_path.glob("*/*.trace"))) == 2
+
+
+@pytest.mark.asyncio
+async def test_oversized_and_disabled_stores_keep_nothing(tmp_path):
+    store = TraceStore(tmp_path, max_bytes=3)
+    await write(store, "a", b"aaaa")
+    assert "a" not in store
+
+    disabled = TraceStore(tmp_path, max_bytes=0)
+    await write(disabled, "a", b"a")
+    assert not disabled.enabled
+    assert "a" not in disabled
+
+
+def test_from_env(monkeypatch, tmp_path):
+    monkeypatch.setenv("GITLAB_TRACE_STORE_DIR", str(tmp_path))
+    monkeypatch.setenv("GITLAB_TRACE_STORE_MAX_MB", "2")
+    store = TraceStore.from_env()
+
+    assert store.max_bytes == 2 * 1024 * 1024
+    assert store.directory.startswith(str(tmp_path))
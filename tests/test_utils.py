@@ -4,6 +4,8 @@ from gitlab_mr_mcp.utils import (
     analyze_mr_readiness,
     calculate_change_stats,
     format_date,
+    format_note_time,
+    format_participants,
     get_mr_priority,
     get_pipeline_status_icon,
     get_state_explanation,
@@ -23,6 +25,18 @@ def test_format_date_invalid():
     assert result == "not-a-date"
 
 
+def test_format_note_time_elides_same_day():
+    assert format_note_time("2024-01-15T18:05:00Z", "2024-01-15T10:30:00Z") == "18:05 UTC"
+    assert format_note_time("2024-01-16T08:00:00Z", "2024-01-15T10:30:00Z") == "2024-01-16 08:00 UTC"
+    assert format_note_time("2024-01-15T10:30:00Z") == "2024-01-15 10:30 UTC"
+
+
+def test_format_participants_dedupes_users():
+    users = [{"name": "Alice", "username": "alice"}, None, {"name": "Alice", "username": "alice"}]
+    assert format_participants(users) == "| User | Name |\n| ---- | ---- |\n| @alice | Alice |\n\n"
+    assert format_participants([]) == ""
+
+
 def test_get_pipeline_status_icon():
     """Test pipeline status icons."""
     assert get_pipeline_status_icon("success") == "[pass]"
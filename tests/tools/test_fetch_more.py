@@ -0,0 +1,61 @@
+"""Tests for fetch_more tool using pytest-mock."""
+
+import importlib
+
+import pytest
+
+from gitlab_mr_mcp.result_store import result_store
+
+# Import the actual module file directly
+fetch_more_module = importlib.import_module("gitlab_mr_mcp.tools.fetch_more")
+pipeline_module = importlib.import_module("gitlab_mr_mcp.tools.get_merge_request_pipeline")
+
+
+@pytest.fixture(autouse=True)
+def empty_store():
+    result_store.clear()
+    yield
+    result_store.clear()
+
+
+@pytest.mark.asyncio
+async def test_fetch_more_continues_truncated_pipeline(mocker, monkeypatch):
+    jobs = [{"id": i, "name": f"unit-{i}", "stage": "test", "status": "success", "duration": 5} for i in range(300)]
+    graph = {"pipelines": [{"id": 100, "project_id": "123", "depth": 0, "jobs": jobs, "bridges": []}]}
+    mocker.patch.object(
+        pipeline_module, "api_get_merge_request_pipeline", return_value=(200, {"id": 100, "status": "success"}, "")
+    )
+    graph_api = mocker.patch.object(pipeline_module, "get_pipeline_job_graph", return_value=(200, graph, ""))
+    monkeypatch.setenv("GITLAB_OUTPUT_TOKEN_BUDGET", "1000")
+
+    result = await pipeline_module.get_merge_request_pipeline(
+        "https://gitlab.example.com", "123", "test-token", {"merge_request_iid": 42}
+    )
+    text = result[0].text
+    cursor = text.split('fetch_more(cursor="')[1].split('"')[0]
+
+    pages = []
+    while cursor:
+        page = await fetch_more_module.fetch_more({"cursor": cursor, "output_format": "json"})
+        pages.append(page["text"])
+        cursor = page["next_cursor"]
+
+    shown = text + "".join(pages)
+    assert all(f"**unit-{i}** (ID: `{i}`" in shown for i in range(300))
+    assert len(pages) > 1
+    assert graph_api.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_fetch_more_markdown_marks_the_end():
+    cursor = result_store.add(["- one\n", "- two\n"], "jobs")
+
+    result = await fetch_more_module.fetch_more({"cursor": cursor})
+
+    assert result[0].text == "- one\n- two\n\n*End of the omitted jobs.*\n"
+
+
+@pytest.mark.asyncio
+async def test_fetch_more_rejects_unknown_cursor():
+    with pytest.raises(ValueError, match="Unknown or expired cursor"):
+        await fetch_more_module.fetch_more({"cursor": "nope"})
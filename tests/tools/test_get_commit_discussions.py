@@ -0,0 +1,117 @@
+"""Tests for get_commit_discussions tool using pytest-mock."""
+
+import importlib
+
+import pytest
+
+# Import the actual module file directly
+commit_discussions_module = importlib.import_module("gitlab_mr_mcp.tools.get_commit_discussions")
+
+
+@pytest.fixture
+def commits():
+    """Return two commits of a merge request."""
+    return [
+        {
+            "id": f"{sha}" * 40,
+            "short_id": f"{sha}" * 8,
+            "title": f"Commit {sha}",
+            "author_name": "Developer",
+            "committed_date": "2024-01-15T10:00:00Z",
+        }
+        for sha in ("a", "b")
+    ]
+
+
+@pytest.fixture
+def discussions():
+    """Return a discussion with a note on the first commit and a general one."""
+    return [
+        {
+            "id": "disc-1",
+            "notes": [
+                {
+                    "body": "Please rename this",
+                    "author": {"name": "Reviewer", "username": "reviewer"},
+                    "created_at": "2024-01-16T10:00:00Z",
+                    "position": {"head_sha": "a" * 40, "new_path": "app.py", "new_line": 3},
+                }
+            ],
+        },
+        {"id": "disc-2", "notes": [{"body": "LGTM", "author": {"name": "Lead", "username": "lead"}}]},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_get_commit_discussions_groups_notes_by_commit(mocker, commits, discussions):
+    mocker.patch.object(commit_discussions_module, "get_merge_request_commits", return_value=(200, commits, ""))
+    mocker.patch.object(
+        commit_discussions_module, "get_merge_request_discussions_paginated", return_value=(200, discussions, "")
+    )
+    mock_comments = mocker.patch.object(commit_discussions_module, "get_commit_comments")
+
+    result = await commit_discussions_module.get_commit_discussions(
+        "https://gitlab.example.com", "123", "test-token", {"merge_request_iid": 42}
+    )
+
+    text = result[0].text
+    assert "Commits with discussions: 1" in text
+    assert "## Commit: aaaaaaaa" in text
+    assert "## Commit: bbbbbbbb" not in text
+    assert "Please rename this" in text
+    mock_comments.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_get_commit_discussions_fetches_requested_commit_comments(mocker, commits, discussions):
+    mocker.patch.object(commit_discussions_module, "get_merge_request_commits", return_value=(200, commits, ""))
+    mocker.patch.object(
+        commit_discussions_module, "get_merge_request_discussions_paginated", return_value=(200, discussions, "")
+    )
+    comment = {"note": "Nice commit", "author": {"name": "Lead", "username": "lead"}, "created_at": None}
+    mock_comments = mocker.patch.object(
+        commit_discussions_module, "get_commit_comments", return_value=(200, [comment], "")
+    )
+
+    result = await commit_discussions_module.get_commit_discussions(
+        "https://gitlab.example.com",
+        "123",
+        "test-token",
+        {"merge_request_iid": 42, "commit_shas": ["bbbbbbbb", "cccccccc"]},
+    )
+
+    text = result[0].text
+    assert "Nice commit" in text
+    assert "`cccccccc`" in text
+    mock_comments.assert_called_once_with("https://gitlab.example.com", "123", "test-token", "b" * 40)
+
+
+def test_match_requested_commits_rejects_short_prefixes(commits):
+    with pytest.raises(ValueError, match="at least 7 characters"):
+        commit_discussions_module.match_requested_commits(commits, ["bbbbbbb", "b"])
+
+
+@pytest.mark.asyncio
+async def test_get_commit_discussions_compact(mocker, commits, discussions):
+    discussions[0]["notes"].append(
+        {
+            "body": "Also here",
+            "author": {"name": "Reviewer", "username": "reviewer"},
+            "created_at": "2024-01-16T11:30:00Z",
+            "position": {"head_sha": "a" * 40, "new_path": "app.py", "new_line": 9},
+        }
+    )
+    mocker.patch.object(commit_discussions_module, "get_merge_request_commits", return_value=(200, commits, ""))
+    mocker.patch.object(
+        commit_discussions_module, "get_merge_request_discussions_paginated", return_value=(200, discussions, "")
+    )
+
+    result = await commit_discussions_module.get_commit_discussions(
+        "https://gitlab.example.com", "123", "test-token", {"merge_request_iid": 42, "compact": True}
+    )
+
+    text = result[0].text
+    assert text.count("| @reviewer | Reviewer |") == 1
+    assert text.count("### Comment by @reviewer") == 2
+    assert "**Posted**: 2024-01-16 10:00 UTC" in text
+    assert "**Posted**: 11:30 UTC" in text
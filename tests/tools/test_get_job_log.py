@@ -1,9 +1,16 @@
 """Tests for get_job_log tool using pytest-mock."""
 
+import contextlib
 import importlib
+import json
 
+import jsonschema
 import pytest
 
+from gitlab_mr_mcp import gitlab_api, log_analysis
+from gitlab_mr_mcp.output_schemas import GET_JOB_LOG_OUTPUT_SCHEMA
+from gitlab_mr_mcp.trace_store import TraceStore
+
 # Import the actual module file directly
 job_log_module = importlib.import_module("gitlab_mr_mcp.tools.get_job_log")
 
@@ -13,13 +20,14 @@ async def test_get_job_log_returns_log_content(mocker):
     """Test that get_job_log returns log content."""
     mock_log = "Running tests...\nTest 1 passed\nTest 2 passed\nAll tests passed!"
 
-    mocker.patch.object(job_log_module, "get_job_trace", return_value=(200, mock_log, mock_log))
+    window = {"start": 0, "end": len(mock_log), "total_size": len(mock_log)}
+    mocker.patch.object(job_log_module, "get_job_trace", return_value=(200, mock_log, window))
 
     result = await job_log_module.get_job_log(
         "https://gitlab.example.com",
         "123",
         "test-token",
-        {"job_id": 789},
+        {"job_id": 789, "mode": "tail"},
     )
 
     assert len(result) == 1
@@ -36,7 +44,296 @@ async def test_get_job_log_handles_error(mocker):
             "https://gitlab.example.com",
             "123",
             "test-token",
-            {"job_id": 789},
+            {"job_id": 789, "mode": "tail"},
         )
 
     assert "404" in str(exc_info.value) or "Not found" in str(exc_info.value)
+
+
+@pytest.mark.asyncio
+async def test_get_job_log_requests_tail_and_offers_earlier_output(mocker):
+    """Test that get_job_log reads the end of the log and points at the previous page."""
+    window = {"start": 285000, "end": 300000, "total_size": 300000}
+    mock_trace = mocker.patch.object(job_log_module, "get_job_trace", return_value=(200, "tail output", window))
+
+    result = await job_log_module.get_job_log(
+        "https://gitlab.example.com", "123", "test-token", {"job_id": 789, "mode": "tail"}
+    )
+
+    # A larger window is read, as the tail is compacted before it is cut
+    assert mock_trace.call_args.kwargs == {"offset": None, "length": 60000}
+    assert "bytes 285,000-300,000 of 300,000" in result[0].text
+    assert "offset=270000, length=15000" in result[0].text
+    assert "Later output" not in result[0].text
+
+
+@pytest.mark.asyncio
+async def test_get_job_log_defaults_to_tail(mocker):
+    """Test that without a mode the end of the log is read rather than the whole log scanned."""
+    window = {"start": 0, "end": 11, "total_size": 11}
+    mock_trace = mocker.patch.object(job_log_module, "get_job_trace", return_value=(200, "tail output", window))
+    mock_analysis = mocker.patch.object(job_log_module, "get_job_trace_analysis")
+
+    await job_log_module.get_job_log("https://gitlab.example.com", "123", "test-token", {"job_id": 789})
+
+    mock_trace.assert_called_once()
+    mock_analysis.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_get_job_log_reports_offset_past_end(mocker):
+    """Test get_job_log with an offset beyond the end of the log."""
+    window = {"start": 5000, "end": 5000, "total_size": 1200}
+    mocker.patch.object(job_log_module, "get_job_trace", return_value=(200, "", window))
+
+    result = await job_log_module.get_job_log(
+        "https://gitlab.example.com", "123", "test-token", {"job_id": 789, "offset": 5000}
+    )
+
+    assert "past the end of the log (1,200 bytes)" in result[0].text
+
+
+def make_chunks(text, size=7):
+    async def chunks():
+        data = text.encode()
+        for index in range(0, len(data), size):
+            yield data[index : index + size]
+
+    return chunks()
+
+
+@pytest.mark.asyncio
+async def test_get_job_log_errors_mode_shows_failure_windows(mocker):
+    """Test that errors mode returns deduplicated failures with context."""
+    log = "setup\n" * 50 + "worker 1: ERROR connection refused\nretrying\n"
+    log += "ok\n" * 50 + "worker 2: ERROR connection refused\n" + "ok\n" * 50 + "Job failed: exit code 1\n"
+    analysis = await log_analysis.analyze_trace_stream(make_chunks(log), tail_bytes=100)
+    mock_analysis = mocker.patch.object(job_log_module, "get_job_trace_analysis", return_value=(200, analysis, ""))
+
+    result = await job_log_module.get_job_log(
+        "https://gitlab.example.com", "123", "test-token", {"job_id": 789, "mode": "errors"}
+    )
+    text = result[0].text
+
+    assert "error at line 51 (x2)" in text
+    assert "     50 | setup" in text
+    assert "     52 | retrying" in text
+    assert "exit_code at line 154" in text
+    assert mock_analysis.call_args.kwargs["tail_bytes"] == 15000
+
+
+@pytest.mark.asyncio
+async def test_get_job_log_errors_mode_falls_back_to_tail(mocker):
+    """Test that a log without failures shows its end instead."""
+    analysis = await log_analysis.analyze_trace_stream(make_chunks("all good\n" * 10), tail_bytes=18)
+    mocker.patch.object(job_log_module, "get_job_trace_analysis", return_value=(200, analysis, ""))
+
+    result = await job_log_module.get_job_log(
+        "https://gitlab.example.com", "123", "test-token", {"job_id": 789, "mode": "errors"}
+    )
+
+    assert "No failure patterns matched" in result[0].text
+    assert "bytes 72-90 of 90" in result[0].text
+
+
+@pytest.mark.asyncio
+async def test_get_job_log_errors_mode_json_output(mocker):
+    """Test that structured output carries the failure windows without Markdown."""
+    log = "setup\n" * 5 + "ERROR connection refused\n" + "ok\n" * 5
+    analysis = await log_analysis.analyze_trace_stream(make_chunks(log), tail_bytes=100)
+    mocker.patch.object(job_log_module, "get_job_trace_analysis", return_value=(200, analysis, ""))
+
+    result = await job_log_module.get_job_log(
+        "https://gitlab.example.com", "123", "test-token", {"job_id": 789, "mode": "errors", "output_format": "json"}
+    )
+
+    jsonschema.validate(result, GET_JOB_LOG_OUTPUT_SCHEMA)
+    assert result["mode"] == "errors"
+    assert result["failures"][0]["signatures"][0]["line_number"] == 6
+    assert "ERROR connection refused" in result["failures"][0]["lines"]
+    assert "text" not in result
+
+
+@pytest.mark.asyncio
+async def test_get_job_log_rejects_invalid_pattern(mocker):
+    """Test that invalid extra patterns fail before the log is fetched."""
+    mock_analysis = mocker.patch.object(job_log_module, "get_job_trace_analysis")
+
+    with pytest.raises(ValueError):
+        await job_log_module.get_job_log(
+            "https://gitlab.example.com", "123", "test-token", {"job_id": 789, "mode": "errors", "patterns": ["("]}
+        )
+
+    mock_analysis.assert_not_called()
+
+
+@pytest.fixture
+def sections():
+    return [
+        {"name": "prepare_script", "depth": 0, "start": 0, "end": 100, "start_line": 1, "end_line": 4, "duration": 2},
+        {
+            "name": "step_script",
+            "depth": 0,
+            "start": 100,
+            "end": 60100,
+            "start_line": 5,
+            "end_line": 900,
+            "duration": 492,
+        },
+    ]
+
+
+@pytest.mark.asyncio
+async def test_get_job_log_section_reads_end_of_section(mocker, sections):
+    """Test that a section request fetches only the end of that section's bytes."""
+    mocker.patch.object(job_log_module, "get_job_trace_sections", return_value=(200, sections, ""))
+    window = {"start": 45100, "end": 60100, "total_size": 70000, "line_count": None}
+    mock_trace = mocker.patch.object(
+        job_log_module, "get_job_trace", return_value=(200, "\x1b[31mFAILED test_x\x1b[0m\n", window)
+    )
+
+    result = await job_log_module.get_job_log(
+        "https://gitlab.example.com", "123", "test-token", {"job_id": 789, "section": "step_script"}
+    )
+    text = result[0].text
+
+    assert mock_trace.call_args.kwargs == {"offset": 45100, "length": 15000}
+    assert "## Section `step_script` (8m 12s, last 15,000 of 60,000 bytes)" in text
+    assert "FAILED test_x" in text
+    assert "\x1b" not in text
+
+
+@pytest.mark.asyncio
+async def test_get_job_log_unknown_section_lists_sections(mocker, sections):
+    """Test that an unknown section name lists the available sections."""
+    mocker.patch.object(job_log_module, "get_job_trace_sections", return_value=(200, sections, ""))
+    mock_trace = mocker.patch.object(job_log_module, "get_job_trace")
+
+    result = await job_log_module.get_job_log(
+        "https://gitlab.example.com", "123", "test-token", {"job_id": 789, "section": "build"}
+    )
+
+    assert "Section `build` not found" in result[0].text
+    assert "| `step_script` | 8m 12s (slowest) | 5-900 |" in result[0].text
+    mock_trace.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_get_job_log_follow_returns_only_new_output(mocker):
+    """Test that follow mode continues from the offset it last returned and stops once the job is done."""
+    job_log_module._follow_offsets.clear()
+    mock_job = mocker.patch.object(job_log_module, "get_job", return_value=(200, {"status": "running"}, "OK"))
+    mock_trace = mocker.patch.object(
+        job_log_module,
+        "get_job_trace",
+        side_effect=[
+            (200, "first lines", {"start": 100, "end": 400, "total_size": 400, "line_count": None}),
+            (200, "", {"start": 400, "end": 400, "total_size": 400, "line_count": None}),
+            (200, "last lines", {"start": 400, "end": 450, "total_size": 450, "line_count": None}),
+        ],
+    )
+    args = {"job_id": 789, "mode": "follow", "length": 300}
+
+    first = await job_log_module.get_job_log("https://gitlab.example.com", "123", "test-token", args)
+    second = await job_log_module.get_job_log("https://gitlab.example.com", "123", "test-token", args)
+    mock_job.return_value = (200, {"status": "failed"}, "OK")
+    third = await job_log_module.get_job_log("https://gitlab.example.com", "123", "test-token", args)
+
+    assert [call.kwargs["offset"] for call in mock_trace.call_args_list] == [None, 400, 400]
+    assert "last 300 bytes" in first[0].text and "[running] running" in first[0].text
+    assert "No new output since byte 400" in second[0].text
+    assert "New output (bytes 400-450)" in third[0].text
+    assert "following has stopped" in third[0].text
+    assert job_log_module._follow_offsets.get(("https://gitlab.example.com", "123", 789)) is None
+
+
+@pytest.mark.asyncio
+async def test_get_job_log_follow_keeps_following_finished_job_until_caught_up(mocker):
+    """Test that a finished job is followed until its whole log has been returned."""
+    job_log_module._follow_offsets.clear()
+    mocker.patch.object(job_log_module, "get_job", return_value=(200, {"status": "success"}, "OK"))
+    mocker.patch.object(
+        job_log_module,
+        "get_job_trace",
+        return_value=(200, "chunk", {"start": 0, "end": 100, "total_size": 250, "line_count": None}),
+    )
+
+    result = await job_log_module.get_job_log(
+        "https://gitlab.example.com", "123", "test-token", {"job_id": 789, "mode": "follow", "offset": 0}
+    )
+
+    assert "More output is waiting" in result[0].text
+    assert job_log_module._follow_offsets.get(("https://gitlab.example.com", "123", 789)) == 100
+
+
+class UnsizedTraceResponse:
+    """A job or trace response without Content-Range or Content-Length"""
+
+    def __init__(self, status, body):
+        self.status = status
+        self.headers = {}
+        self.content_length = None
+        self._body = body
+
+    async def json(self):
+        return json.loads(self._body)
+
+    async def text(self):
+        return self._body.decode()
+
+    async def read(self):
+        return self._body
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return None
+
+
+@pytest.mark.asyncio
+async def test_get_job_log_follow_stops_when_trace_size_is_unknown(monkeypatch):
+    """Test that a short read without Content-Range counts as caught up, so following a finished job stops."""
+    job_log_module._follow_offsets.clear()
+
+    class Session:
+        def get(self, url, headers):
+            if url.endswith("/trace"):
+                return UnsizedTraceResponse(206, b"last lines\n")
+            return UnsizedTraceResponse(200, b'{"id": 789, "status": "success"}')
+
+    @contextlib.asynccontextmanager
+    async def get_session(gitlab_url=None):
+        yield Session()
+
+    monkeypatch.setattr(gitlab_api, "get_session", get_session)
+    monkeypatch.setattr(gitlab_api, "trace_store", TraceStore(max_bytes=0))
+
+    result = await job_log_module.get_job_log(
+        "https://gitlab.example.com", "123", "test-token", {"job_id": 789, "mode": "follow", "offset": 100}
+    )
+
+    assert "following has stopped" in result[0].text
+    assert "More output is waiting" not in result[0].text
+    assert job_log_module._follow_offsets.get(("https://gitlab.example.com", "123", 789)) is None
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("compact", [True, False])
+async def test_get_job_log_compacts_progress_lines(mocker, compact):
+    """Test that raw output collapses progress spam unless compact is false."""
+    log = "npm install\n" + "".join(f"fetch {i} packages\n" for i in range(500)) + "npm ERR! 404\n"
+    window = {"start": 0, "end": len(log), "total_size": len(log)}
+    mocker.patch.object(job_log_module, "get_job_trace", return_value=(200, log, window))
+
+    result = await job_log_module.get_job_log(
+        "https://gitlab.example.com", "123", "test-token", {"job_id": 789, "mode": "tail", "compact": compact}
+    )
+
+    text = result[0].text
+    assert "npm ERR! 404" in text
+    if compact:
+        assert "fetch 0 packages\n… 498 similar lines …\nfetch 499 packages" in text
+        assert "498 repeated or progress lines collapsed" in text
+    else:
+        assert text.count("packages") == 500
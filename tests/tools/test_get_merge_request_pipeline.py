@@ -0,0 +1,106 @@
+"""Tests for get_merge_request_pipeline tool using pytest-mock."""
+
+import importlib
+
+import jsonschema
+import pytest
+
+from gitlab_mr_mcp.output_schemas import GET_MERGE_REQUEST_PIPELINE_OUTPUT_SCHEMA
+
+# Import the actual module file directly
+pipeline_module = importlib.import_module("gitlab_mr_mcp.tools.get_merge_request_pipeline")
+
+
+@pytest.fixture
+def job_graph():
+    return {
+        "pipelines": [
+            {
+                "id": 100,
+                "project_id": "123",
+                "depth": 0,
+                "triggered_by": None,
+                "status": None,
+                "jobs": [{"id": 1, "name": "build", "stage": "build", "status": "success", "duration": 30}],
+                "bridges": [],
+            },
+            {
+                "id": 200,
+                "project_id": 456,
+                "depth": 1,
+                "triggered_by": "deploy",
+                "status": "failed",
+                "jobs": [{"id": 2, "name": "e2e", "stage": "test", "status": "failed", "duration": 90}],
+                "bridges": [],
+            },
+        ]
+    }
+
+
+@pytest.fixture
+def patch_api(mocker, job_graph):
+    mocker.patch.object(
+        pipeline_module,
+        "api_get_merge_request_pipeline",
+        return_value=(200, {"id": 100, "status": "failed"}, ""),
+    )
+    return mocker.patch.object(pipeline_module, "get_pipeline_job_graph", return_value=(200, job_graph, ""))
+
+
+@pytest.mark.asyncio
+async def test_pipeline_includes_downstream_jobs(patch_api):
+    result = await pipeline_module.get_merge_request_pipeline(
+        "https://gitlab.example.com", "123", "test-token", {"merge_request_iid": 42}
+    )
+    text = result[0].text
+
+    assert "**Total**: 2" in text
+    assert "**e2e** (ID: `2`, Stage: test, 1m 30s, Pipeline: #200, Project: `456`)" in text
+    assert "**deploy** -> Pipeline #200" in text
+    # get_job_log reads the tail unless asked for the failures
+    assert 'Use `get_job_log` with Job ID and mode="errors"' in text
+    assert patch_api.call_args.kwargs["max_depth"] == 2
+
+
+@pytest.mark.asyncio
+async def test_pipeline_passes_downstream_depth(patch_api):
+    await pipeline_module.get_merge_request_pipeline(
+        "https://gitlab.example.com", "123", "test-token", {"merge_request_iid": 42, "downstream_depth": 0}
+    )
+
+    assert patch_api.call_args.kwargs["max_depth"] == 0
+
+
+@pytest.mark.asyncio
+async def test_pipeline_json_output(patch_api):
+    result = await pipeline_module.get_merge_request_pipeline(
+        "https://gitlab.example.com", "123", "test-token", {"merge_request_iid": 42, "output_format": "json"}
+    )
+
+    jsonschema.validate(result, GET_MERGE_REQUEST_PIPELINE_OUTPUT_SCHEMA)
+    assert result["pipeline"]["status"] == "failed"
+    assert [(job["name"], job["pipeline_id"]) for job in result["jobs"]] == [("build", 100), ("e2e", 200)]
+    assert result["downstream_pipelines"][0]["triggered_by"] == "deploy"
+
+
+@pytest.mark.asyncio
+async def test_pipeline_drops_passed_jobs_first_at_output_budget(mocker, monkeypatch):
+    jobs = [{"id": 1, "name": "lint", "stage": "test", "status": "failed", "duration": 5}]
+    jobs += [{"id": i, "name": f"unit-{i}", "stage": "test", "status": "success", "duration": 5} for i in range(2, 200)]
+    graph = {"pipelines": [{"id": 100, "project_id": "123", "depth": 0, "jobs": jobs, "bridges": []}]}
+    mocker.patch.object(
+        pipeline_module, "api_get_merge_request_pipeline", return_value=(200, {"id": 100, "status": "failed"}, "")
+    )
+    mocker.patch.object(pipeline_module, "get_pipeline_job_graph", return_value=(200, graph, ""))
+    monkeypatch.setenv("GITLAB_OUTPUT_TOKEN_BUDGET", "500")
+
+    result = await pipeline_module.get_merge_request_pipeline(
+        "https://gitlab.example.com", "123", "test-token", {"merge_request_iid": 42}
+    )
+    text = result[0].text
+
+    assert len(text) <= 2000
+    assert "**lint** (ID: `1`" in text
+    assert "**unit-199**" not in text
+    assert "more jobs omitted (output budget reached) (" in text
+    assert text.rstrip().endswith("One or more jobs failed")
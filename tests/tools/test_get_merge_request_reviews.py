@@ -0,0 +1,154 @@
+"""Tests for get_merge_request_reviews tool using pytest-mock."""
+
+import importlib
+
+import pytest
+
+# Import the actual module file directly
+reviews_module = importlib.import_module("gitlab_mr_mcp.tools.get_merge_request_reviews")
+
+
+def make_discussion(discussion_id, resolved=False, username="reviewer", path=None, created_at="2024-01-15T10:00:00Z"):
+    note = {
+        "id": f"note-{discussion_id}",
+        "body": f"Comment {discussion_id}",
+        "author": {"username": username, "name": username.title()},
+        "created_at": created_at,
+        "system": False,
+        "position": {"new_path": path} if path else None,
+    }
+    return {"id": discussion_id, "resolved": resolved, "notes": [note]}
+
+
+@pytest.fixture
+def discussions():
+    """Return a mix of resolved, unresolved and system-only threads."""
+    return [
+        make_discussion("d1", resolved=True, path="src/app.py"),
+        make_discussion("d2", username="alice", path="src/api/views.py", created_at="2024-03-01T10:00:00Z"),
+        make_discussion("d3", path="docs/index.md"),
+        {"id": "d4", "notes": [{"id": "n4", "body": "added 1 commit", "system": True}]},
+    ]
+
+
+@pytest.fixture
+def patch_api(mocker, discussions):
+    mocker.patch.object(
+        reviews_module,
+        "api_get_merge_request_reviews",
+        return_value={"discussions": (200, discussions, ""), "approvals": (200, {"approved_by": []}, "")},
+    )
+    mocker.patch.object(reviews_module, "get_merge_request_details", return_value=(404, None, "Not found"))
+    mocker.patch.object(reviews_module, "get_merge_request_pipeline", return_value=(200, None, ""))
+    mocker.patch.object(reviews_module, "get_merge_request_changes", return_value=(404, None, ""))
+
+
+async def run_tool(args):
+    result = await reviews_module.get_merge_request_reviews(
+        "https://gitlab.example.com", "123", "test-token", {"merge_request_iid": 42, **args}
+    )
+    assert len(result) == 1
+    return result[0].text
+
+
+@pytest.mark.asyncio
+async def test_reviews_skip_system_only_threads(patch_api):
+    text = await run_tool({})
+
+    assert "Discussion `d1`" in text
+    assert "Discussion `d4`" not in text
+    assert "of 3 matching" in text
+
+
+@pytest.mark.asyncio
+async def test_reviews_filter_unresolved_and_path(patch_api):
+    text = await run_tool({"unresolved_only": True, "file_path": "src/"})
+
+    assert "Discussion `d2`" in text
+    assert "Discussion `d1`" not in text
+    assert "Discussion `d3`" not in text
+
+
+@pytest.mark.asyncio
+async def test_reviews_filter_author_and_since(patch_api):
+    assert "Discussion `d2`" in await run_tool({"author": "@Alice"})
+    text = await run_tool({"since": "2024-02-01"})
+
+    assert "Discussion `d2`" in text
+    assert "Discussion `d3`" not in text
+
+
+@pytest.mark.asyncio
+async def test_reviews_paging(patch_api):
+    text = await run_tool({"offset": 1, "limit": 1})
+
+    # Unresolved threads come first: d2, d3, d1
+    assert "Discussion `d3`" in text
+    assert "Discussion `d2`" not in text
+    assert "Discussion `d1`" not in text
+    assert "offset=2" in text
+
+
+@pytest.mark.asyncio
+async def test_reviews_invalid_since(patch_api):
+    with pytest.raises(ValueError):
+        await run_tool({"since": "yesterday"})
+
+
+@pytest.mark.asyncio
+async def test_reviews_json_output(patch_api):
+    result = await reviews_module.get_merge_request_reviews(
+        "https://gitlab.example.com",
+        "123",
+        "test-token",
+        {"merge_request_iid": 42, "unresolved_only": True, "output_format": "json"},
+    )
+
+    assert result["overview"] is None
+    assert result["discussions"] == {"total": 4, "resolved": 1, "unresolved": 3}
+    assert [thread["id"] for thread in result["threads"]] == ["d2", "d3"]
+    assert result["threads"][0]["notes"][0]["author"] == "alice"
+    assert result["action_items"] == ["Resolve 3 pending discussion(s)"]
+
+
+@pytest.mark.asyncio
+async def test_reviews_stop_at_output_budget(patch_api, monkeypatch):
+    monkeypatch.setenv("GITLAB_OUTPUT_TOKEN_BUDGET", "150")
+    text = await run_tool({})
+
+    assert "Discussion `d2`" in text
+    assert "Discussion `d1`" not in text
+    assert "more threads omitted (output budget reached); call again with offset=" in text
+    assert text.rstrip().endswith("Resolve 3 pending discussion(s)")
+
+
+@pytest.mark.asyncio
+async def test_reviews_compact_lists_participants_once(patch_api):
+    text = await run_tool({"compact": True})
+
+    assert "| @alice | Alice |" in text
+    assert text.count("| @reviewer | Reviewer |") == 1
+    assert "**@alice** (2024-03-01 10:00 UTC)" in text
+    assert "Reviewer (@reviewer)" not in text
+
+
+@pytest.mark.asyncio
+async def test_reviews_compact_participants_cover_only_shown_threads(patch_api, monkeypatch):
+    monkeypatch.setenv("GITLAB_OUTPUT_TOKEN_BUDGET", "170")
+    text = await run_tool({"compact": True})
+
+    assert "Discussion `d2`" in text
+    assert "Discussion `d3`" not in text
+    assert "| @alice | Alice |" in text
+    assert "| @reviewer |" not in text
+
+
+@pytest.mark.asyncio
+async def test_reviews_tolerate_null_note_body(patch_api, discussions):
+    discussions[1]["notes"][0]["body"] = None
+
+    assert "Discussion `d2`" in await run_tool({})
+    result = await reviews_module.get_merge_request_reviews(
+        "https://gitlab.example.com", "123", "test-token", {"merge_request_iid": 42, "output_format": "json"}
+    )
+    assert result["threads"][0]["notes"][0]["body"] == ""
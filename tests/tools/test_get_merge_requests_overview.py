@@ -0,0 +1,108 @@
+"""Tests for get_merge_requests_overview tool using pytest-mock."""
+
+import importlib
+
+import pytest
+
+# Import the actual module file directly
+overview_module = importlib.import_module("gitlab_mr_mcp.tools.get_merge_requests_overview")
+
+INSTANCE = {
+    "name": "default",
+    "gitlab_url": "https://gitlab.example.com",
+    "access_token": "test-token",
+    "project_id": None,
+    "path_prefixes": [],
+    "max_connections": None,
+}
+
+
+def make_merge_request(iid, **overrides):
+    return {
+        "iid": iid,
+        "title": f"Change {iid}",
+        "state": "opened",
+        "has_conflicts": False,
+        "merge_status": "can_be_merged",
+        "head_pipeline": {"status": "success"},
+        **overrides,
+    }
+
+
+@pytest.fixture
+def patch_api(mocker):
+    merge_requests = {
+        ("123", 1): make_merge_request(1),
+        ("123", 2): make_merge_request(2, has_conflicts=True, head_pipeline={"status": "failed"}),
+        ("group/other", 7): make_merge_request(7, state="merged"),
+    }
+
+    async def details(gitlab_url, project_id, access_token, mr_iid):
+        mr_data = merge_requests.get((project_id, mr_iid))
+        return (200, mr_data, "") if mr_data else (404, {"message": "404 Not found"}, "Not found")
+
+    get_details = mocker.patch.object(overview_module, "get_merge_request_details", side_effect=details)
+    mocker.patch.object(
+        overview_module,
+        "get_merge_request_approvals",
+        return_value=(200, {"approved_by": [{"user": {"username": "alice"}}], "approvals_required": 1}, ""),
+    )
+    return get_details
+
+
+async def run_tool(refs, project_id="123", instances=(INSTANCE,)):
+    result = await overview_module.get_merge_requests_overview(
+        list(instances), {"project_id": project_id, "merge_request_iids": refs}
+    )
+    assert len(result) == 1
+    return result[0].text
+
+
+@pytest.mark.asyncio
+async def test_overview_lists_each_merge_request(patch_api):
+    text = await run_tool([1, 2, 99])
+
+    assert "**Ready to merge**: 1 | **Blocked**: 1 | **Unavailable**: 1" in text
+    assert "| !1 | Change 1 | [open] opened | [pass] success | 1/1 | No | Ready to merge |" in text
+    assert "Blocked: Merge conflicts, Pipeline failed" in text
+    assert "| !99 | Could not fetch: 404" in text
+
+
+@pytest.mark.asyncio
+async def test_overview_accepts_references_across_projects(patch_api):
+    text = await run_tool([1, "group/other!7", "123!1"])
+
+    assert "| 123!1 |" in text
+    assert "| group/other!7 | Change 7 | [merged] merged |" in text
+    assert text.count("123!1") == 1
+
+
+@pytest.mark.asyncio
+async def test_overview_fetches_references_from_the_instance_of_their_project(patch_api):
+    internal = {
+        **INSTANCE,
+        "name": "internal",
+        "gitlab_url": "https://gitlab.internal.example.com",
+        "access_token": "internal-token",
+        "path_prefixes": ["group/"],
+    }
+
+    text = await run_tool([1, "group/other!7"], instances=(INSTANCE, internal))
+
+    assert "| group/other!7 | Change 7 |" in text
+    assert {call.args[:3] for call in patch_api.call_args_list} == {
+        ("https://gitlab.example.com", "123", "test-token"),
+        ("https://gitlab.internal.example.com", "group/other", "internal-token"),
+    }
+
+
+def test_parse_refs_requires_project_for_bare_iids():
+    with pytest.raises(ValueError, match="project_id is required"):
+        overview_module.parse_merge_request_refs([5], None)
+
+    assert overview_module.parse_merge_request_refs(["group/project!5"], None) == [("group/project", 5)]
+
+
+def test_parse_refs_rejects_invalid_reference():
+    with pytest.raises(ValueError, match="Invalid merge request reference"):
+        overview_module.parse_merge_request_refs(["group/project!abc"], "123")
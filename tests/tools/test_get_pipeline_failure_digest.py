@@ -0,0 +1,107 @@
+"""Tests for get_pipeline_failure_digest tool using pytest-mock."""
+
+import importlib
+
+import pytest
+
+# Import the actual module file directly
+digest_module = importlib.import_module("gitlab_mr_mcp.tools.get_pipeline_failure_digest")
+
+FLAKY_LOG = "collecting...\ntests/test_api.py::test_retry FAILED\nFAILED tests/test_api.py::test_retry - Timeout 3s\n"
+
+
+def shard(job_id, status="failed"):
+    return {"id": job_id, "name": f"test {job_id}/4", "stage": "test", "status": status}
+
+
+@pytest.fixture
+def patch_api(mocker):
+    graph = {
+        "pipelines": [
+            {
+                "id": 100,
+                "project_id": "123",
+                "depth": 0,
+                "jobs": [
+                    shard(1),
+                    shard(2),
+                    shard(3),
+                    shard(4, "success"),
+                    {"id": 5, "name": "lint", "status": "failed"},
+                ],
+                "bridges": [],
+            },
+            {"id": 200, "project_id": 456, "depth": 1, "jobs": [{"id": 6, "name": "e2e", "status": "failed"}]},
+        ]
+    }
+    logs = {
+        1: FLAKY_LOG.replace("3s", "5s"),
+        2: FLAKY_LOG,
+        3: FLAKY_LOG,
+        5: "src/app.py:10: error: Missing return statement\n",
+        6: "Deploying...\nDone\n",
+    }
+
+    async def fake_trace(gitlab_url, project_id, access_token, job_id, length=None):
+        if job_id == 6 and project_id != 456:
+            return (404, "Not found", "Not found")
+        text = logs[job_id]
+        return (200, text, {"start": 0, "end": len(text), "total_size": len(text), "line_count": None})
+
+    mocker.patch.object(
+        digest_module, "api_get_merge_request_pipeline", return_value=(200, {"id": 100, "status": "failed"}, "")
+    )
+    mocker.patch.object(digest_module, "get_pipeline_job_graph", return_value=(200, graph, ""))
+    return mocker.patch.object(digest_module, "get_job_trace", side_effect=fake_trace)
+
+
+@pytest.mark.asyncio
+async def test_digest_groups_identical_failures_across_jobs(patch_api):
+    result = await digest_module.get_pipeline_failure_digest(
+        "https://gitlab.example.com", "123", "test-token", {"merge_request_iid": 42}
+    )
+    text = result[0].text
+
+    assert "**Failed jobs**: 5" in text
+    assert sorted(call.args[3] for call in patch_api.call_args_list) == [1, 2, 3, 5, 6]
+    assert all(call.kwargs["length"] == 64 * 1024 for call in patch_api.call_args_list)
+    # The three shards share one entry, listed first
+    assert text.index("in 3 jobs") < text.index("in 1 job\n")
+    assert text.count("test_retry FAILED") == 1
+    assert "`test 1/4` (1), `test 2/4` (2), `test 3/4` (3)" in text
+    assert "Missing return statement" in text
+    assert "`e2e` (6, Project: `456`), last lines:" in text
+
+
+@pytest.mark.asyncio
+async def test_digest_without_failed_jobs(mocker):
+    graph = {"pipelines": [{"id": 100, "project_id": "123", "depth": 0, "jobs": [shard(1, "success")]}]}
+    mocker.patch.object(
+        digest_module, "api_get_merge_request_pipeline", return_value=(200, {"id": 100, "status": "success"}, "")
+    )
+    mocker.patch.object(digest_module, "get_pipeline_job_graph", return_value=(200, graph, ""))
+    mock_trace = mocker.patch.object(digest_module, "get_job_trace")
+
+    result = await digest_module.get_pipeline_failure_digest(
+        "https://gitlab.example.com", "123", "test-token", {"merge_request_iid": 42}
+    )
+
+    assert "No failed jobs in this pipeline." in result[0].text
+    mock_trace.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_digest_rejects_invalid_patterns(mocker):
+    mock_pipeline = mocker.patch.object(digest_module, "api_get_merge_request_pipeline")
+
+    with pytest.raises(ValueError):
+        await digest_module.get_pipeline_failure_digest(
+            "https://gitlab.example.com", "123", "test-token", {"merge_request_iid": 42, "patterns": ["("]}
+        )
+    mock_pipeline.assert_not_called()
+
+
+def test_last_log_lines_are_cleaned():
+    text = "setup\n\x1b[31mDone\x1b[0m\r\nprogress 1\rprogress 2\n\n"
+
+    assert digest_module.last_log_lines(text, 2) == ["Done", "progress 2"]
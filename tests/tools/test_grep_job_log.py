@@ -0,0 +1,88 @@
+"""Tests for grep_job_log tool using pytest-mock."""
+
+import importlib
+
+import jsonschema
+import pytest
+
+from gitlab_mr_mcp import log_analysis
+from gitlab_mr_mcp.output_schemas import GREP_JOB_LOG_OUTPUT_SCHEMA
+
+# Import the actual module file directly
+grep_module = importlib.import_module("gitlab_mr_mcp.tools.grep_job_log")
+
+
+async def search(text, pattern, **options):
+    async def chunks():
+        data = text.encode()
+        for index in range(0, len(data), 64):
+            yield data[index : index + 64]
+
+    return await log_analysis.grep_trace_stream(chunks(), pattern, **options)
+
+
+@pytest.mark.asyncio
+async def test_grep_job_log_returns_matching_regions(mocker):
+    """Test that grep_job_log formats matches with line numbers and byte offsets."""
+    log = "".join(f"step {index}\n" for index in range(100)) + "psql: connection refused\n" + "retry\n" * 5
+    result_data = await search(log, "connection refused", before=1, after=1, max_matches=50)
+    mock_grep = mocker.patch.object(grep_module, "grep_job_trace", return_value=(200, result_data, ""))
+
+    result = await grep_module.grep_job_log(
+        "https://gitlab.example.com", "123", "test-token", {"job_id": 789, "pattern": "connection refused"}
+    )
+    text = result[0].text
+
+    assert "**Matches**: 1 (searched" in text
+    assert f"## Line 100 (byte offset {log.index('step 99'):,})" in text
+    assert ">    101 | psql: connection refused" in text
+    assert "     102 | retry" in text
+    assert mock_grep.call_args.kwargs["max_matches"] == 50
+
+
+@pytest.mark.asyncio
+async def test_grep_job_log_json_output(mocker):
+    """Test that structured output lists each region's lines with their offsets."""
+    result_data = await search("ok\nerror here\nok\n", "error", before=1, after=0, max_matches=50)
+    mocker.patch.object(grep_module, "grep_job_trace", return_value=(200, result_data, ""))
+
+    result = await grep_module.grep_job_log(
+        "https://gitlab.example.com",
+        "123",
+        "test-token",
+        {"job_id": 789, "pattern": "error", "output_format": "json"},
+    )
+
+    jsonschema.validate(result, GREP_JOB_LOG_OUTPUT_SCHEMA)
+    assert result["match_count"] == 1
+    assert result["regions"] == [
+        [
+            {"line": 1, "offset": 0, "text": "ok", "matched": False},
+            {"line": 2, "offset": 3, "text": "error here", "matched": True},
+        ]
+    ]
+
+
+@pytest.mark.asyncio
+async def test_grep_job_log_reports_limit(mocker):
+    """Test that grep_job_log says when the match limit stopped the search."""
+    result_data = await search("error\n" * 10, "error", before=0, after=0, max_matches=3)
+    mocker.patch.object(grep_module, "grep_job_trace", return_value=(200, result_data, ""))
+
+    result = await grep_module.grep_job_log(
+        "https://gitlab.example.com", "123", "test-token", {"job_id": 789, "pattern": "error", "max_matches": 3}
+    )
+
+    assert "first 3 (limit reached" in result[0].text
+    assert "More matches may follow" in result[0].text
+
+
+@pytest.mark.asyncio
+async def test_grep_job_log_rejects_invalid_pattern(mocker):
+    """Test that an invalid regex fails before the log is fetched."""
+    mock_grep = mocker.patch.object(grep_module, "grep_job_trace")
+
+    with pytest.raises(ValueError):
+        await grep_module.grep_job_log("https://gitlab.example.com", "123", "test-token", {"job_id": 1, "pattern": "["})
+
+    mock_grep.assert_not_called()
@@ -0,0 +1,59 @@
+"""Tests for search_projects across several GitLab instances."""
+
+import importlib
+
+import pytest
+
+search_module = importlib.import_module("gitlab_mr_mcp.tools.search_projects")
+
+PUBLIC = {"name": "public", "gitlab_url": "https://gitlab.com", "access_token": "public-token"}
+INTERNAL = {"name": "internal", "gitlab_url": "https://gitlab.internal.example.com", "access_token": "internal-token"}
+MIRROR = {"name": "mirror", "gitlab_url": "https://mirror.example.com", "access_token": "mirror-token"}
+
+
+def project(project_id, name, last_activity_at):
+    return {
+        "id": project_id,
+        "name": name,
+        "path_with_namespace": f"group/{name}",
+        "web_url": f"https://example.com/group/{name}",
+        "last_activity_at": last_activity_at,
+    }
+
+
+@pytest.fixture
+def api_search(mocker):
+    async def fake_search(gitlab_url, access_token, search, membership, limit):
+        if gitlab_url == MIRROR["gitlab_url"]:
+            return 503, None, "Service Unavailable"
+        if gitlab_url == INTERNAL["gitlab_url"]:
+            return 200, [project(7, "infra", "2026-01-03T00:00:00Z")], ""
+        return 200, [project(1, "web", "2026-01-02T00:00:00Z"), project(2, "old", "2025-01-01T00:00:00Z")], ""
+
+    return mocker.patch.object(search_module, "api_search_projects", side_effect=fake_search)
+
+
+@pytest.mark.asyncio
+async def test_search_projects_merges_instances(api_search):
+    result = await search_module.search_projects(
+        [PUBLIC, INTERNAL, MIRROR], {"search": "a", "limit": 2, "output_format": "json"}
+    )
+
+    assert [(p["name"], p["instance"]) for p in result["projects"]] == [("infra", "internal"), ("web", "public")]
+    assert result["unavailable"] == ["mirror: 503 - Service Unavailable"]
+    assert api_search.call_count == 3
+
+
+@pytest.mark.asyncio
+async def test_search_projects_single_instance_is_untagged(api_search):
+    result = await search_module.search_projects([PUBLIC], {"search": "a"})
+
+    text = result[0].text
+    assert "Found 2 project(s)" in text
+    assert "Instance" not in text
+
+
+@pytest.mark.asyncio
+async def test_search_projects_fails_when_no_instance_answers(api_search):
+    with pytest.raises(Exception, match="Error searching projects: 503 - Service Unavailable"):
+        await search_module.search_projects([MIRROR], {})